@@ -12,6 +12,7 @@ from pydantic import Field
 from openai import AzureOpenAI, AsyncAzureOpenAI
 
 from agentuniverse.base.util.env_util import get_from_env
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
@@ -129,15 +130,16 @@ class AzureOpenAIEmbedding(Embedding):
         if not self.azure_api_version:
             raise Exception("AZURE_API_VERSION is missing")
 
-        if self.client is None:
-            self.client = AzureOpenAI(
-                api_key=self.azure_api_key,
-                api_version=self.azure_api_version,
-                azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
-            )
-        if self.async_client is None:
-            self.async_client = AsyncAzureOpenAI(
-                api_key=self.azure_api_key,
-                api_version=self.azure_api_version,
-                azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
-            )
\ No newline at end of file
+        # the pooled clients are shared by all the components of the same endpoint
+        self.client = HttpClientRegistry().get_client(
+            AzureOpenAI,
+            api_key=self.azure_api_key,
+            api_version=self.azure_api_version,
+            azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
+        )
+        self.async_client = HttpClientRegistry().get_async_client(
+            AsyncAzureOpenAI,
+            api_key=self.azure_api_key,
+            api_version=self.azure_api_version,
+            azure_endpoint=f"https://{self.resource_name}.openai.azure.com"
+        )
\ No newline at end of file
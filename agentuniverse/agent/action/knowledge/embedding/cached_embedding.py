@@ -0,0 +1,228 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:10
+# @FileName: cached_embedding.py
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings as LCEmbeddings
+
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+
+
+class EmbeddingCache(object):
+    """A two tier embedding cache, an in-process LRU and an optional sqlite file
+    storing the vectors as float32 blobs.
+
+    The sqlite connection is created lazily in the current process, so the cache
+    can be built before gunicorn forks its workers.
+    """
+
+    def __init__(self, max_size: int = 10000, disk_cache_path: Optional[str] = None):
+        self.max_size = max_size
+        self.disk_cache_path = disk_cache_path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.__lru: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__conn: Optional[sqlite3.Connection] = None
+        self.__conn_pid: Optional[int] = None
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if not self.disk_cache_path:
+            return None
+        if self.__conn is None or self.__conn_pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.disk_cache_path))
+            os.makedirs(directory, exist_ok=True)
+            self.__conn = sqlite3.connect(self.disk_cache_path, check_same_thread=False)
+            self.__conn_pid = os.getpid()
+            with self.__conn:
+                self.__conn.execute('''
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        vector BLOB
+                    )
+                ''')
+        return self.__conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings of the keys, missing keys are absent in the result."""
+        result = {}
+        with self.__lock:
+            disk_keys = []
+            for key in keys:
+                embedding = self.__lru.get(key)
+                if embedding is not None:
+                    self.__lru.move_to_end(key)
+                    result[key] = embedding
+                else:
+                    disk_keys.append(key)
+            self.hits += len(result)
+            conn = self._get_conn() if disk_keys else None
+            if conn is not None:
+                # keep the statement below the sqlite variable limit
+                for i in range(0, len(disk_keys), 500):
+                    chunk = disk_keys[i:i + 500]
+                    rows = conn.execute(
+                        f'SELECT cache_key, vector FROM embedding_cache '
+                        f'WHERE cache_key IN ({",".join("?" * len(chunk))})', chunk).fetchall()
+                    for key, vector in rows:
+                        embedding = np.frombuffer(vector, dtype=np.float32).tolist()
+                        result[key] = embedding
+                        self._put_lru(key, embedding)
+                        self.disk_hits += 1
+            self.misses += len(keys) - len(result)
+        return result
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """Put the embeddings into both tiers."""
+        with self.__lock:
+            for key, embedding in items.items():
+                self._put_lru(key, embedding)
+            conn = self._get_conn()
+            if conn is not None and items:
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO embedding_cache (cache_key, vector) VALUES (?, ?)',
+                        [(key, np.asarray(embedding, dtype=np.float32).tobytes())
+                         for key, embedding in items.items()])
+
+    def _put_lru(self, key: str, embedding: List[float]):
+        if self.max_size <= 0:
+            return
+        self.__lru[key] = embedding
+        self.__lru.move_to_end(key)
+        while len(self.__lru) > self.max_size:
+            self.__lru.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Return the hit counters and the hit rate of the cache."""
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / total if total else 0.0,
+            'size': len(self.__lru)
+        }
+
+
+class CachedEmbedding(Embedding):
+    """The embedding wrapper caching the results of another embedding component.
+
+    Cache entries are keyed by the model name, the dimensions, the text type and
+    the text hash, so the same text is sent to the embedding api only once.
+    Stores, rag routers and memory storages use it by setting their embedding
+    model to the name of this component, e.g.
+
+        name: 'cached_dashscope_embedding'
+        embedding: 'dashscope_embedding'
+        cache_size: 10000
+        disk_cache_path: './embedding_cache/dashscope.db'
+        metadata:
+          type: 'EMBEDDING'
+          module: 'agentuniverse.agent.action.knowledge.embedding.cached_embedding'
+          class: 'CachedEmbedding'
+
+    Attributes:
+        embedding (Optional[str]): The name of the wrapped embedding component.
+        cache_size (int): The max entry count of the in-process LRU tier.
+        disk_cache_path (Optional[str]): The sqlite file of the on-disk tier, no disk tier when it is empty.
+    """
+
+    embedding: Optional[str] = None
+    cache_size: int = 10000
+    disk_cache_path: Optional[str] = None
+    cache: Any = None
+
+    def _get_cache(self) -> EmbeddingCache:
+        if self.cache is None:
+            self.cache = EmbeddingCache(max_size=self.cache_size, disk_cache_path=self.disk_cache_path)
+        return self.cache
+
+    def _get_embedding(self) -> Embedding:
+        if not self.embedding:
+            raise ValueError(f"Must provide the wrapped `embedding` of the cached embedding {self.name}.")
+        return EmbeddingManager().get_instance_obj(self.embedding)
+
+    def _cache_keys(self, embedding: Embedding, texts: List[str], **kwargs) -> List[str]:
+        model_name = embedding.embedding_model_name or embedding.name
+        prefix = f"{model_name}|{embedding.embedding_dims}|{kwargs.get('text_type', '')}|"
+        return [prefix + hashlib.sha256(text.encode('utf-8')).hexdigest() for text in texts]
+
+    def _split_misses(self, keys: List[str], texts: List[str]):
+        cached = self._get_cache().get_many(list(dict.fromkeys(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        return cached, missing
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Get the embeddings, only the texts missing in the cache are sent to the wrapped embedding."""
+        embedding = self._get_embedding()
+        keys = self._cache_keys(embedding, texts, **kwargs)
+        cached, missing = self._split_misses(keys, texts)
+        if missing:
+            missing_texts = list(missing.values())
+            new_embeddings = embedding.get_embeddings(missing_texts, **kwargs) if kwargs \
+                else embedding.get_embeddings(missing_texts)
+            new_items = dict(zip(missing.keys(), new_embeddings))
+            self._get_cache().put_many(new_items)
+            cached.update(new_items)
+        return [cached[key] for key in keys]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Asynchronously get the embeddings, only the texts missing in the cache are sent to the
+        wrapped embedding."""
+        embedding = self._get_embedding()
+        keys = self._cache_keys(embedding, texts, **kwargs)
+        cached, missing = self._split_misses(keys, texts)
+        if missing:
+            missing_texts = list(missing.values())
+            new_embeddings = await embedding.async_get_embeddings(missing_texts, **kwargs) if kwargs \
+                else await embedding.async_get_embeddings(missing_texts)
+            new_items = dict(zip(missing.keys(), new_embeddings))
+            self._get_cache().put_many(new_items)
+            cached.update(new_items)
+        return [cached[key] for key in keys]
+
+    def get_cache_stats(self) -> dict:
+        """Return the hit counters and the hit rate of the cache."""
+        return self._get_cache().get_stats()
+
+    def as_langchain(self) -> LCEmbeddings:
+        """Convert the wrapped embedding to the langchain embedding class, bypassing the cache."""
+        return self._get_embedding().as_langchain()
+
+    def create_copy(self):
+        # The copies share the cache, deep copying it would drop the cached embeddings.
+        return self
+
+    def _initialize_by_component_configer(self,
+                                          embedding_configer: ComponentConfiger) -> 'Embedding':
+        """Initialize the cached embedding by the ComponentConfiger object.
+
+        Args:
+            embedding_configer(ComponentConfiger): A configer contains cached embedding
+            basic info.
+        Returns:
+            Embedding: A cached embedding instance.
+        """
+        super()._initialize_by_component_configer(embedding_configer)
+        if hasattr(embedding_configer, "embedding"):
+            self.embedding = embedding_configer.embedding
+        if hasattr(embedding_configer, "cache_size"):
+            self.cache_size = embedding_configer.cache_size
+        if hasattr(embedding_configer, "disk_cache_path"):
+            self.disk_cache_path = embedding_configer.disk_cache_path
+        return self
@@ -14,6 +14,7 @@ from pydantic import Field
 
 from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
 from agentuniverse.base.util.env_util import get_from_env
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
@@ -43,7 +44,8 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.client = OpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        self.client = HttpClientRegistry().get_client(OpenAI, api_key=self.openai_api_key,
+                                                      **self.openai_client_args or {})
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
         try:
@@ -76,7 +78,8 @@ class OpenAIEmbedding(Embedding):
          Raises:
              ValueError: If texts exceed the embedding model token limit or missing some required parameters.
          """
-        self.async_client = AsyncOpenAI(api_key=self.openai_api_key, **self.openai_client_args or {})
+        self.async_client = HttpClientRegistry().get_async_client(AsyncOpenAI, api_key=self.openai_api_key,
+                                                                  **self.openai_client_args or {})
         if self.embedding_model_name is None:
             raise ValueError("Must provide `embedding_model_name`")
         try:
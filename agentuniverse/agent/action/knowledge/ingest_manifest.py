@@ -0,0 +1,143 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:40
+# @FileName: ingest_manifest.py
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from agentuniverse.agent.action.knowledge.ingest_pipeline import IngestStageMetrics
+
+MANIFEST_VERSION = 1
+
+
+class SourceFingerprint(BaseModel):
+    """The fingerprint of an indexed source file and the chunks it produced.
+
+    Attributes:
+        mtime_ns (int): The modification time of the file in nanoseconds.
+        size (int): The size of the file in bytes.
+        content_hash (str): The sha256 of the file content.
+        chunk_ids (List[str]): The ids of the documents written into the stores.
+    """
+    mtime_ns: int = 0
+    size: int = 0
+    content_hash: str = ''
+    chunk_ids: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def stat(cls, path: str) -> 'SourceFingerprint':
+        """Fingerprint the file by its stat, the content hash is left empty."""
+        stat_result = os.stat(path)
+        return cls(mtime_ns=stat_result.st_mtime_ns, size=stat_result.st_size)
+
+    def same_stat(self, other: 'SourceFingerprint') -> bool:
+        return self.mtime_ns == other.mtime_ns and self.size == other.size
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the sha256 of the file content, read in chunks of `chunk_size` bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest(object):
+    """The sources indexed by a knowledge, persisted as a json file.
+
+    A source is unchanged when its mtime and size match the manifest, the
+    content is hashed only when they don't, so touching a file does not
+    re-ingest it. A chunk id may be produced by several sources, e.g. a
+    header repeated in every file, so a chunk is only orphaned when no source
+    of the manifest refers to it anymore.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.sources: Dict[str, SourceFingerprint] = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'IngestManifest':
+        manifest = cls(path)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            manifest.sources = {source: SourceFingerprint(**fingerprint)
+                                for source, fingerprint in data.get('sources', {}).items()}
+        return manifest
+
+    def save(self):
+        """Write the manifest atomically, a crash never leaves a truncated file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        data = {'version': MANIFEST_VERSION,
+                'sources': {source: fingerprint.model_dump() for source, fingerprint in sorted(self.sources.items())}}
+        fd, tmp_path = tempfile.mkstemp(prefix='.au_manifest_', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def chunk_ids(self, exclude: Iterable[str] = ()) -> Set[str]:
+        """Return the chunk ids referred by the sources, but the excluded ones."""
+        exclude = set(exclude)
+        return {chunk_id for source, fingerprint in self.sources.items() if source not in exclude
+                for chunk_id in fingerprint.chunk_ids}
+
+    def sources_under(self, source_path: str) -> List[str]:
+        """Return the recorded sources in the file or the directory."""
+        source_path = os.path.abspath(source_path)
+        prefix = source_path.rstrip(os.sep) + os.sep
+        return [source for source in self.sources if source == source_path or source.startswith(prefix)]
+
+
+class ReindexReport(object):
+    """The diff of a re-index, the planned one of a dry run.
+
+    Attributes:
+        added (List[str]): The new sources.
+        changed (List[str]): The sources whose content changed.
+        unchanged (List[str]): The sources skipped without being read.
+        removed (List[str]): The recorded sources which no longer exist.
+        new_chunk_ids (List[str]): The chunks written into the stores.
+        orphan_chunk_ids (List[str]): The chunks deleted from the stores.
+        dry_run (bool): Whether the stores and the manifest were left untouched.
+        metrics (Dict[str, IngestStageMetrics]): The metrics of the ingest pipeline.
+    """
+
+    def __init__(self, dry_run: bool = False):
+        self.added: List[str] = []
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+        self.new_chunk_ids: List[str] = []
+        self.orphan_chunk_ids: List[str] = []
+        self.dry_run: bool = dry_run
+        self.metrics: Optional[Dict[str, IngestStageMetrics]] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'dry_run': self.dry_run,
+            'added': self.added,
+            'changed': self.changed,
+            'unchanged': self.unchanged,
+            'removed': self.removed,
+            'new_chunk_count': len(self.new_chunk_ids),
+            'orphan_chunk_count': len(self.orphan_chunk_ids),
+            'metrics': {name: stage.to_dict() for name, stage in self.metrics.items()} if self.metrics else None
+        }
+
+    def __str__(self) -> str:
+        return (f"{'planned ' if self.dry_run else ''}re-index: {len(self.added)} added, "
+                f"{len(self.changed)} changed, {len(self.unchanged)} unchanged, {len(self.removed)} removed sources, "
+                f"{len(self.new_chunk_ids)} new and {len(self.orphan_chunk_ids)} orphan chunks")
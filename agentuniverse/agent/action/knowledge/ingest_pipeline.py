@@ -0,0 +1,147 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 01:30
+# @FileName: ingest_pipeline.py
+import queue
+import time
+import traceback
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import iter_document_batches
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent_serve.web.thread_with_result import ThreadWithReturnValue
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+_END_OF_BATCHES = object()
+
+
+class IngestStageMetrics(object):
+    """The documents and the busy time of one stage of the ingest pipeline."""
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.document_count: int = 0
+        self.batch_count: int = 0
+        self.busy_time: float = 0.0
+        self.error: Optional[Exception] = None
+
+    def add(self, document_count: int, busy_time: float):
+        self.document_count += document_count
+        self.batch_count += 1
+        self.busy_time += busy_time
+
+    @property
+    def throughput(self) -> float:
+        """Documents per busy second of the stage."""
+        return self.document_count / self.busy_time if self.busy_time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'document_count': self.document_count,
+            'batch_count': self.batch_count,
+            'busy_time': self.busy_time,
+            'throughput': self.throughput,
+            'error': str(self.error) if self.error else None
+        }
+
+
+class IngestPipeline(object):
+    """Flow the documents of a reader through the processors into the stores in
+    bounded batches.
+
+    The calling thread reads and processes one batch at a time while every
+    store writes, and embeds, the previous batches in a thread of its own. The
+    queue of each store holds at most `queue_size` batches, so the reader is
+    blocked by the slowest store and no more than about
+    `(queue_size + 2) * batch_size` documents are in memory, whatever the size
+    of the source. A failing store is logged and skipped, the other stores
+    keep ingesting.
+    """
+
+    def __init__(self, batch_size: int = 64, queue_size: int = 4, name: Optional[str] = None):
+        """Initialize the IngestPipeline.
+
+        Args:
+            batch_size(int): The max document count of a batch read from the source.
+            queue_size(int): The max count of batches waiting for a store.
+            name(Optional[str]): The name used in the log, usually the knowledge name.
+        """
+        self.batch_size = max(1, batch_size or 1)
+        self.queue_size = max(1, queue_size or 1)
+        self.name = name or ''
+
+    def run(self, documents: Iterable[Document],
+            process: Callable[[List[Document]], List[Document]],
+            writers: Dict[str, Callable[[List[Document]], Any]]) -> Dict[str, IngestStageMetrics]:
+        """Run the pipeline.
+
+        Args:
+            documents(Iterable[Document]): The documents of the source, usually a generator.
+            process(Callable): The processors of a batch, e.g. the text splitters.
+            writers(Dict[str, Callable]): The store names and the functions writing a batch into them.
+
+        Returns:
+            Dict[str, IngestStageMetrics]: The metrics of the `read` and `process` stages
+            and of every store.
+        """
+        metrics = {'read': IngestStageMetrics('read'), 'process': IngestStageMetrics('process')}
+        batch_queues = {}
+        threads = []
+        for store_name, writer in writers.items():
+            metrics[store_name] = IngestStageMetrics(store_name)
+            batch_queues[store_name] = queue.Queue(self.queue_size)
+            thread = ThreadWithReturnValue(target=self._write_batches,
+                                           args=(writer, batch_queues[store_name], metrics[store_name]),
+                                           name=f'au_ingest_{store_name}')
+            thread.start()
+            threads.append(thread)
+        try:
+            batches = iter_document_batches(documents, self.batch_size)
+            while True:
+                start = time.perf_counter()
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                read = time.perf_counter()
+                metrics['read'].add(len(batch), read - start)
+                batch = process(batch)
+                metrics['process'].add(len(batch), time.perf_counter() - read)
+                if not batch:
+                    continue
+                for batch_queue in batch_queues.values():
+                    # blocks while the store is `queue_size` batches behind
+                    batch_queue.put(batch)
+        finally:
+            for batch_queue in batch_queues.values():
+                batch_queue.put(_END_OF_BATCHES)
+            for thread in threads:
+                thread.join()
+        self._log_metrics(metrics)
+        return metrics
+
+    @staticmethod
+    def _write_batches(writer: Callable[[List[Document]], Any], batch_queue: queue.Queue,
+                       metrics: IngestStageMetrics):
+        while True:
+            batch = batch_queue.get()
+            if batch is _END_OF_BATCHES:
+                return
+            if metrics.error is not None:
+                # keep draining the queue, so the reader is never blocked by a failed store
+                continue
+            start = time.perf_counter()
+            try:
+                writer(batch)
+            except Exception as e:
+                traceback.print_exc()
+                LOGGER.error(f"Exception occurred in store {metrics.name} ingest: {e}")
+                metrics.error = e
+                continue
+            metrics.add(len(batch), time.perf_counter() - start)
+
+    def _log_metrics(self, metrics: Dict[str, IngestStageMetrics]):
+        stages = ', '.join(f"{name} {stage.document_count} docs {stage.throughput:.1f} docs/s"
+                           + (' failed' if stage.error else '')
+                           for name, stage in metrics.items())
+        LOGGER.info(f"Knowledge {self.name} ingest pipeline: {stages}")
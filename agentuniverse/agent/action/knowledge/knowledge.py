@@ -5,11 +5,12 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: knowledge.py
+import asyncio
 import os
 import re
 import traceback
 from copy import deepcopy
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 from concurrent.futures import wait, ALL_COMPLETED
 
 from langchain_core.utils.json import parse_json_markdown
@@ -17,18 +18,24 @@ from langchain.tools import Tool as LangchainTool
 
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import iter_document_batches
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
 from agentuniverse.agent.action.knowledge.doc_processor.doc_processor import DocProcessor
 from agentuniverse.agent.action.knowledge.doc_processor.doc_processor_manager import DocProcessorManager
+from agentuniverse.agent.action.knowledge.ingest_manifest import IngestManifest, ReindexReport, SourceFingerprint, \
+    hash_file
+from agentuniverse.agent.action.knowledge.ingest_pipeline import IngestPipeline, IngestStageMetrics
 from agentuniverse.agent.action.knowledge.query_paraphraser.query_paraphraser import QueryParaphraser
 from agentuniverse.agent.action.knowledge.query_paraphraser.query_paraphraser_manager import QueryParaphraserManager
+from agentuniverse.agent.action.knowledge.rag_router.base_router import BaseRouter
 from agentuniverse.agent.action.knowledge.rag_router.rag_router_manager import RagRouterManager
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.reader.reader_manager import ReaderManager
 from agentuniverse.base.annotation.trace import trace_knowledge
 from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.util.blocking_executor import run_blocking
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
 
@@ -63,6 +70,17 @@ class Knowledge(ComponentBase):
         insert_executor (ThreadPoolExecutor): Used for performing insert and search
         operations concurrently in multiple stores.
 
+        ingest_batch_size (int): The max document count of a batch flowing from the reader into the stores.
+
+        ingest_queue_size (int): The max count of batches waiting for a store, the reader is paused when
+            a store falls this far behind.
+
+        reader_process_num (int): The count of the processes parsing the source in the ingestion, the
+            files of a directory and the shards of a large file are parsed in parallel when it is more than 1.
+
+        manifest_path (Optional[str]): The json file recording the fingerprints and the chunks of the sources
+            indexed by `reindex_knowledge`.
+
         ext_info (Optional[Dict]): The extended information of the knowledge.
     """
 
@@ -80,6 +98,10 @@ class Knowledge(ComponentBase):
     readers: Dict[str, str] = dict()
     insert_executor: Optional[ThreadPoolExecutorWithReturnValue] = None
     query_executor: Optional[ThreadPoolExecutorWithReturnValue] = None
+    ingest_batch_size: int = 64
+    ingest_queue_size: int = 4
+    reader_process_num: int = 0
+    manifest_path: Optional[str] = None
     tracing: Optional[bool] = None
     ext_info: Optional[Dict] = None
 
@@ -94,11 +116,9 @@ class Knowledge(ComponentBase):
             thread_name_prefix="Knowledge query"
         )
 
-    def _load_data(self,  *args: Any, **kwargs: Any) -> List[Document]:
+    def _get_reader(self, source_path: Optional[str]) -> Reader:
         # check if source is a local file or remote url
-        if kwargs.get("source_path"):
-            source_path = kwargs.get("source_path")
-        else:
+        if not source_path:
             raise Exception("No file to load.")
         url_pattern = re.compile(
             r'^(https?:\/\/)?' 
@@ -116,10 +136,26 @@ class Knowledge(ComponentBase):
         else:
             raise Exception(f"Knowledge load data error: Unknown source type:{source_path}")
         if source_type in self.readers:
-            reader = ReaderManager().get_instance_obj(self.readers[source_type])
-        else:
-            reader = ReaderManager().get_file_default_reader(source_type)
-        return reader.load_data(source_path)
+            return ReaderManager().get_instance_obj(self.readers[source_type])
+        return ReaderManager().get_file_default_reader(source_type)
+
+    def _load_data(self,  *args: Any, **kwargs: Any) -> List[Document]:
+        source_path = kwargs.get("source_path")
+        return self._get_reader(source_path).load_data(source_path)
+
+    def _lazy_load_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        source_path = kwargs.get("source_path")
+        if source_path and (os.path.isdir(source_path)
+                            or (self.reader_process_num > 1 and os.path.isfile(source_path))):
+            return self._load_data_in_processes(source_path)
+        return self._get_reader(source_path).lazy_load_data(source_path)
+
+    def _load_data_in_processes(self, source_path: str) -> Iterator[Document]:
+        # a directory is parsed file by file, in a process pool when configured
+        batches = ReaderManager().load_data_in_processes([source_path], process_num=max(1, self.reader_process_num),
+                                                         readers=self.readers)
+        for batch in batches:
+            yield from batch
 
     def _insert_process(self, origin_docs: List[Document]) -> List[Document]:
         for _processor_code in self.insert_processors:
@@ -146,57 +182,168 @@ class Knowledge(ComponentBase):
             origin_query = query_paraphraser.query_paraphrase(origin_query)
         return origin_query
 
-    def insert_knowledge(self, **kwargs) -> None:
+    def insert_knowledge(self, **kwargs) -> Dict[str, IngestStageMetrics]:
         """Insert the knowledge.
 
-        Load data by the reader and insert the documents into the store.
+        Load data by the reader and insert the documents into the store. The
+        documents flow from the reader through the insert processors into the
+        stores in batches of `ingest_batch_size`, so the source is never held
+        in memory as a whole and the stores start writing while it is read.
+
+        Returns:
+            Dict[str, IngestStageMetrics]: The throughput of the read, process and store stages.
         """
-        document_list: List[Document] = self._load_data(**kwargs)
-        document_list = self._insert_process(document_list)
-        futures = []
-        if "stores" in kwargs:
-            stores = kwargs["stores"]
-        else:
-            stores = self.stores
-        for _store_code in stores:
-            futures.append(
-                self.insert_executor.submit(
-                    StoreManager().get_instance_obj(_store_code).insert_document,
-                    document_list))
-        wait(futures, return_when=ALL_COMPLETED)
-        for future in futures:
-            try:
-                future.result()
-            except Exception as e:
-                traceback.print_exc()
-                LOGGER.error(f"Exception occurred in knowledge insert: {e}")
+        metrics = self._ingest(self._insert_process, 'insert_document', **kwargs)
         LOGGER.info("Knowledge insert complete.")
+        return metrics
 
-    def update_knowledge(self, **kwargs) -> None:
+    def update_knowledge(self, **kwargs) -> Dict[str, IngestStageMetrics]:
         """Update the knowledge.
 
-        Load data by the reader and update the documents into the store.
+        Load data by the reader and update the documents into the store, batch
+        by batch like `insert_knowledge`.
+
+        Returns:
+            Dict[str, IngestStageMetrics]: The throughput of the read, process and store stages.
         """
-        document_list: List[Document] = self._load_data(**kwargs)
-        document_list = self._update_process(document_list)
-        futures = []
+        metrics = self._ingest(self._update_process, 'update_document', **kwargs)
+        LOGGER.info("Knowledge update complete.")
+        return metrics
+
+    def _ingest(self, process, store_method: str, **kwargs) -> Dict[str, IngestStageMetrics]:
         if "stores" in kwargs:
             stores = kwargs["stores"]
         else:
             stores = self.stores
+        writers = {_store_code: getattr(StoreManager().get_instance_obj(_store_code), store_method)
+                   for _store_code in stores}
+        pipeline = IngestPipeline(batch_size=self.ingest_batch_size, queue_size=self.ingest_queue_size,
+                                  name=self.name)
+        return pipeline.run(self._lazy_load_data(**kwargs), process, writers)
+
+    def reindex_knowledge(self, source_path: str, dry_run: bool = False, **kwargs) -> ReindexReport:
+        """Re-index the local file or directory incrementally.
+
+        The sources are compared with the manifest of the knowledge, see
+        `manifest_path`. The unchanged sources are skipped without being read,
+        the new and the changed ones are read and processed by the insert
+        processors, and only their chunks which are not indexed yet are
+        embedded and written into the stores. The chunks no source refers to
+        anymore, of the changed and the removed sources, are deleted from all
+        the stores. Delete the manifest to re-index everything, e.g. after
+        changing the insert processors.
+
+        A dry run reads and processes the changed sources to report the diff,
+        but leaves the stores and the manifest untouched. The manifest is not
+        updated either when a store fails, so the next run retries.
+
+        Args:
+            source_path(str): The local file or directory.
+            dry_run(bool): Only report the diff.
+            **kwargs: `stores`, the stores to re-index, the stores of the knowledge by default,
+                and `manifest_path` overriding the one of the knowledge.
+
+        Returns:
+            ReindexReport: The added, changed, unchanged and removed sources and the new and orphan chunks.
+        """
+        manifest_path = kwargs.get("manifest_path") or self.manifest_path
+        if not manifest_path:
+            raise Exception(f"Knowledge {self.name} re-index error: no manifest_path configured.")
+        if not source_path or not os.path.exists(source_path):
+            raise Exception(f"Knowledge re-index error: no such file or directory:{source_path}")
+        stores = kwargs["stores"] if "stores" in kwargs else self.stores
+        manifest = IngestManifest.load(manifest_path)
+        report = ReindexReport(dry_run=dry_run)
+        fingerprints = self._diff_sources(manifest, source_path, report)
+
+        indexed_ids = manifest.chunk_ids()
+        stale_sources = report.changed + report.removed
+        chunks = self._iter_new_chunks(report.added + report.changed, fingerprints, indexed_ids, report)
+        if dry_run:
+            for _ in chunks:
+                pass
+        else:
+            writers = {_store_code: StoreManager().get_instance_obj(_store_code).insert_document
+                       for _store_code in stores}
+            pipeline = IngestPipeline(batch_size=self.ingest_batch_size, queue_size=self.ingest_queue_size,
+                                      name=self.name)
+            report.metrics = pipeline.run(chunks, lambda batch: batch, writers)
+
+        referred_ids = manifest.chunk_ids(exclude=stale_sources)
+        for source in report.added + report.changed:
+            referred_ids.update(fingerprints[source].chunk_ids)
+        report.orphan_chunk_ids = sorted(
+            {chunk_id for source in stale_sources for chunk_id in manifest.sources[source].chunk_ids}
+            - referred_ids)
+        if dry_run:
+            LOGGER.info(f"Knowledge {self.name} {report}")
+            return report
+
+        failed_stores = [name for name, stage in report.metrics.items() if stage.error]
         for _store_code in stores:
-            futures.append(
-                self.insert_executor.submit(
-                    StoreManager().get_instance_obj(_store_code).update_document,
-                    document_list))
-        wait(futures, return_when=ALL_COMPLETED)
-        for future in futures:
+            if _store_code in failed_stores or not report.orphan_chunk_ids:
+                continue
             try:
-                future.result()
+                StoreManager().get_instance_obj(_store_code).delete_documents(report.orphan_chunk_ids)
             except Exception as e:
                 traceback.print_exc()
-                LOGGER.error(f"Exception occurred in knowledge update: {e}")
-        LOGGER.info("Knowledge update complete.")
+                LOGGER.error(f"Exception occurred in store {_store_code} orphan deletion: {e}")
+                failed_stores.append(_store_code)
+        if failed_stores:
+            LOGGER.error(f"Knowledge {self.name} re-index failed in the stores {failed_stores}, "
+                         f"the manifest is not updated.")
+            return report
+        manifest.sources.update(fingerprints)
+        for source in report.removed:
+            manifest.sources.pop(source)
+        manifest.save()
+        LOGGER.info(f"Knowledge {self.name} {report}")
+        return report
+
+    def _diff_sources(self, manifest: IngestManifest, source_path: str,
+                      report: ReindexReport) -> Dict[str, SourceFingerprint]:
+        """Sort the sources into the report, return the new fingerprints of the sources which are not skipped."""
+        fingerprints = {}
+        found = set()
+        for file in ReaderManager().iter_files([source_path]):
+            if ReaderManager().get_file_reader(os.path.splitext(file)[1][1:], self.readers) is None:
+                continue
+            source = os.path.abspath(file)
+            found.add(source)
+            fingerprint = SourceFingerprint.stat(source)
+            recorded = manifest.sources.get(source)
+            if recorded is not None and recorded.same_stat(fingerprint):
+                report.unchanged.append(source)
+                continue
+            fingerprint.content_hash = hash_file(source)
+            if recorded is None:
+                report.added.append(source)
+            elif recorded.content_hash == fingerprint.content_hash:
+                # only touched, the new stat skips the hash next time
+                fingerprint.chunk_ids = recorded.chunk_ids
+                report.unchanged.append(source)
+            else:
+                report.changed.append(source)
+            fingerprints[source] = fingerprint
+        report.removed = [source for source in manifest.sources_under(source_path) if source not in found]
+        return fingerprints
+
+    def _iter_new_chunks(self, sources: List[str], fingerprints: Dict[str, SourceFingerprint],
+                         indexed_ids: set, report: ReindexReport) -> Iterator[Document]:
+        """Read and process the sources batch by batch, record their chunk ids and yield the chunks
+        which are not indexed yet."""
+        for source in sources:
+            reader = ReaderManager().get_file_reader(os.path.splitext(source)[1][1:], self.readers)
+            chunk_ids = {}
+            for batch in iter_document_batches(reader.lazy_load_data(source), self.ingest_batch_size):
+                for document in self._insert_process(batch):
+                    chunk_ids[document.id] = None
+                    if document.id in indexed_ids:
+                        continue
+                    indexed_ids.add(document.id)
+                    report.new_chunk_ids.append(document.id)
+                    yield document
+            fingerprints[source].chunk_ids = list(chunk_ids)
 
     def _route_rag(self, query: Query):
         return RagRouterManager().get_instance_obj(self.rag_router).rag_route(query, self.stores)
@@ -218,20 +365,58 @@ class Knowledge(ComponentBase):
                     StoreManager().get_instance_obj(query_task[1]).query,
                     query_task[0]))
         wait(futures, return_when=ALL_COMPLETED)
-        retrieved_docs = {}
+        task_results = []
         for future in futures:
             try:
-                task_result = future.result()
-                for _doc in task_result:
-                    if _doc.id not in retrieved_docs:
-                        retrieved_docs[_doc.id] = _doc
+                task_results.append(future.result())
             except Exception as e:
-                traceback.print_exc()
-                LOGGER.error(f"Exception occurred in knowledge query: {e}")
-        retrieved_docs = list(retrieved_docs.values())
+                task_results.append(e)
+        retrieved_docs = self._merge_query_results(task_results)
         retrieved_docs = self._rag_post_process(retrieved_docs, query)
         return retrieved_docs
 
+    @trace_knowledge
+    async def async_query_knowledge(self, **kwargs) -> List[Document]:
+        """Asynchronously query the knowledge.
+
+        The stores are queried concurrently through their `async_query`, the
+        paraphrasers, a non default rag router and the post processors run on
+        the blocking executor since they may call llms synchronously.
+        """
+        query = Query(**kwargs)
+        router = RagRouterManager().get_instance_obj(self.rag_router)
+        if self.query_paraphrasers or not isinstance(router, BaseRouter):
+            query, query_tasks = await run_blocking(self._prepare_query, query)
+        else:
+            query_tasks = router.rag_route(query, self.stores)
+
+        task_results = await asyncio.gather(
+            *[StoreManager().get_instance_obj(query_task[1]).async_query(query_task[0])
+              for query_task in query_tasks],
+            return_exceptions=True)
+        retrieved_docs = self._merge_query_results(task_results)
+        if self.post_processors:
+            retrieved_docs = await run_blocking(self._rag_post_process, retrieved_docs, query)
+        return retrieved_docs
+
+    def _prepare_query(self, query: Query):
+        query = self._paraphrase_query(query)
+        return query, self._route_rag(query)
+
+    @staticmethod
+    def _merge_query_results(task_results: list) -> List[Document]:
+        """Merge the documents of the store queries, the failed queries are logged and skipped."""
+        retrieved_docs = {}
+        for task_result in task_results:
+            if isinstance(task_result, BaseException):
+                traceback.print_exception(task_result)
+                LOGGER.error(f"Exception occurred in knowledge query: {task_result}")
+                continue
+            for _doc in task_result:
+                if _doc.id not in retrieved_docs:
+                    retrieved_docs[_doc.id] = _doc
+        return list(retrieved_docs.values())
+
     def to_llm(self, retrieved_docs: List[Document]) -> Any:
         """Transfer list docs to llm input"""
         retrieved_texts = [doc.text for doc in retrieved_docs]
@@ -268,6 +453,14 @@ class Knowledge(ComponentBase):
             self.readers = knowledge_configer.readers
         if hasattr(knowledge_configer, "tracing"):
             self.tracing = knowledge_configer.tracing
+        if hasattr(knowledge_configer, "ingest_batch_size"):
+            self.ingest_batch_size = knowledge_configer.ingest_batch_size
+        if hasattr(knowledge_configer, "ingest_queue_size"):
+            self.ingest_queue_size = knowledge_configer.ingest_queue_size
+        if hasattr(knowledge_configer, "reader_process_num"):
+            self.reader_process_num = knowledge_configer.reader_process_num
+        if hasattr(knowledge_configer, "manifest_path"):
+            self.manifest_path = knowledge_configer.manifest_path
         return self
 
     def langchain_query(self, query: str) -> str:
@@ -279,6 +472,12 @@ class Knowledge(ComponentBase):
         knowledge = self.query_knowledge(**parse_query)
         return "This is Query Result:\n"+self.to_llm(knowledge)
 
+    async def async_langchain_query(self, query: str) -> str:
+        """Asynchronously query the knowledge using LangChain."""
+        parse_query = parse_json_markdown(query)
+        knowledge = await self.async_query_knowledge(**parse_query)
+        return "This is Query Result:\n"+self.to_llm(knowledge)
+
     def as_langchain_tool(self) -> LangchainTool:
         """Convert the Knowledge object to a LangChain tool.
 
@@ -298,6 +497,7 @@ class Knowledge(ComponentBase):
             name=self.name,
             description=self.description or '' + args_description,
             func=self.langchain_query,
+            coroutine=self.async_langchain_query,
         )
 
     def create_copy(self):
@@ -7,7 +7,7 @@
 
 import csv
 from pathlib import Path
-from typing import List, Union, Optional, Dict
+from typing import Iterator, List, Union, Optional, Dict
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -17,8 +17,14 @@ class CSVReader(Reader):
     """CSV file reader.
     
     Used to read and parse CSV format files, supports local file paths or file objects as input.
+
+    Attributes:
+        lazy_rows_per_document (int): The row count of a document yielded by `lazy_load_data`,
+            which streams large files instead of reading them into one document.
     """
 
+    lazy_rows_per_document: int = 1000
+
     def _load_data(self, 
                   file: Union[str, Path], 
                   delimiter: str = ",",
@@ -40,37 +46,59 @@ class CSVReader(Reader):
             ValueError: Raised when file reading fails
         """
         try:
-            if isinstance(file, str):
-                file = Path(file)
-            
-            if isinstance(file, Path):
-                if not file.exists():
-                    raise FileNotFoundError(f"File not found: {file}")
-                file_content = file.open(newline="", mode="r", encoding="utf-8")
-            else:
-                file.seek(0)
-                file_content = file
+            # Combine all valid rows into final text
+            final_content = "\n".join(self._iter_rows(file, delimiter, quotechar))
+            return [Document(text=final_content, metadata=self._get_metadata(file, ext_info))]
+        except Exception as e:
+            raise ValueError(f"Failed to read CSV file: {str(e)}") from e
 
+    def _lazy_load_data(self,
+                        file: Union[str, Path],
+                        delimiter: str = ",",
+                        quotechar: str = '"',
+                        ext_info: Optional[Dict] = None) -> Iterator[Document]:
+        """Parse CSV file into documents of `lazy_rows_per_document` rows each."""
+        try:
             csv_content = []
-            with file_content as csvfile:
-                csv_reader = csv.reader(csvfile, delimiter=delimiter, quotechar=quotechar)
-                for row in csv_reader:
-                    # Filter out completely empty rows
-                    if any(cell.strip() for cell in row):
-                        # Remove empty values at the end of row
-                        while row and not row[-1].strip():
-                            row.pop()
-                        # Only add non-empty values to result
-                        csv_content.append(", ".join(filter(None, row)))
-            
-            # Combine all valid rows into final text
-            final_content = "\n".join(csv_content)
-
-            # Get metadata
-            metadata = {"file_name": getattr(file, 'name', 'unknown')}
-            if ext_info:
-                metadata.update(ext_info)
-            # print(f"csv_content: {final_content} \n metadata: {metadata}")
-            return [Document(text=final_content, metadata=metadata)]
+            for row in self._iter_rows(file, delimiter, quotechar):
+                csv_content.append(row)
+                if len(csv_content) >= self.lazy_rows_per_document:
+                    yield Document(text="\n".join(csv_content), metadata=self._get_metadata(file, ext_info))
+                    csv_content = []
+            if csv_content:
+                yield Document(text="\n".join(csv_content), metadata=self._get_metadata(file, ext_info))
         except Exception as e:
             raise ValueError(f"Failed to read CSV file: {str(e)}") from e
+
+    @staticmethod
+    def _iter_rows(file: Union[str, Path], delimiter: str, quotechar: str) -> Iterator[str]:
+        if isinstance(file, str):
+            file = Path(file)
+
+        if isinstance(file, Path):
+            if not file.exists():
+                raise FileNotFoundError(f"File not found: {file}")
+            file_content = file.open(newline="", mode="r", encoding="utf-8")
+        else:
+            file.seek(0)
+            file_content = file
+
+        with file_content as csvfile:
+            csv_reader = csv.reader(csvfile, delimiter=delimiter, quotechar=quotechar)
+            for row in csv_reader:
+                # Filter out completely empty rows
+                if any(cell.strip() for cell in row):
+                    # Remove empty values at the end of row
+                    while row and not row[-1].strip():
+                        row.pop()
+                    # Only add non-empty values to result
+                    yield ", ".join(filter(None, row))
+
+    @staticmethod
+    def _get_metadata(file: Union[str, Path], ext_info: Optional[Dict]) -> dict:
+        if isinstance(file, str):
+            file = Path(file)
+        metadata = {"file_name": getattr(file, 'name', 'unknown')}
+        if ext_info:
+            metadata.update(ext_info)
+        return metadata
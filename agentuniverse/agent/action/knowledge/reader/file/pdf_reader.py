@@ -6,14 +6,21 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: pdf_parser.py
 from pathlib import Path
-from typing import List, Optional, Dict, Union
+from typing import Iterator, List, Optional, Dict, Tuple, Union
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
 
 
 class PdfReader(Reader):
-    """PDF reader."""
+    """PDF reader.
+
+    Attributes:
+        shard_pages (int): The page count of a shard parsed by one process in the
+            process pool parsing mode of the ReaderManager.
+    """
+
+    shard_pages: int = 32
 
     def _load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Document]:
         """Parse the pdf file.
@@ -21,12 +28,25 @@ class PdfReader(Reader):
         Note:
             `pypdf` is required to read PDF files: `pip install pypdf`
         """
-        try:
-            import pypdf
-        except ImportError:
-            raise ImportError(
-                "pypdf is required to read PDF files: `pip install pypdf`"
-            )
+        return list(self._lazy_load_data(file, ext_info))
+
+    def get_shards(self, file: Union[str, Path], ext_info: Optional[Dict] = None) -> List[Tuple[int, int]]:
+        """Split the pdf file into page ranges of `shard_pages` pages."""
+        pypdf = self._import_pypdf()
+        with open(file, "rb") as fp:
+            num_pages = len(pypdf.PdfReader(fp).pages)
+        shard_pages = max(1, self.shard_pages)
+        return [(start, min(start + shard_pages, num_pages)) for start in range(0, num_pages, shard_pages)]
+
+    def load_shard(self, shard: Optional[Tuple[int, int]], file: Union[str, Path],
+                   ext_info: Optional[Dict] = None) -> List[Document]:
+        """Parse the pages of the page range of the pdf file."""
+        return list(self._lazy_load_data(file, ext_info, page_range=shard))
+
+    def _lazy_load_data(self, file: Union[str, Path], ext_info: Optional[Dict] = None,
+                        page_range: Optional[Tuple[int, int]] = None) -> Iterator[Document]:
+        """Parse the pdf file page by page."""
+        pypdf = self._import_pypdf()
         if isinstance(file, str):
             file = Path(file)
         with open(file, "rb") as fp:
@@ -35,17 +55,28 @@ class PdfReader(Reader):
 
             # Get the number of pages in the PDF document
             num_pages = len(pdf.pages)
+            # the page labels are computed for the whole document on every access
+            page_labels = pdf.page_labels
+            start, end = page_range if page_range else (0, num_pages)
 
             # Iterate over every page
-            docs = []
-            for page in range(num_pages):
+            for page in range(start, min(end, num_pages)):
                 # Extract the text from the page
                 page_text = pdf.pages[page].extract_text()
-                page_label = pdf.page_labels[page]
+                page_label = page_labels[page]
 
                 metadata = {"page_label": page_label, "file_name": file.name}
                 if ext_info is not None:
                     metadata.update(ext_info)
 
-                docs.append(Document(text=page_text, metadata=metadata))
-            return docs
+                yield Document(text=page_text, metadata=metadata)
+
+    @staticmethod
+    def _import_pypdf():
+        try:
+            import pypdf
+        except ImportError:
+            raise ImportError(
+                "pypdf is required to read PDF files: `pip install pypdf`"
+            )
+        return pypdf
@@ -1,6 +1,6 @@
 
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -9,8 +9,9 @@ from agentuniverse.agent.action.knowledge.store.document import Document
 class LineTxtReader(Reader):
 
     def _load_data(self, fpath: Path, ext_info: Optional[Dict] = None) -> List[Document]:
-        dlist = []
+        return list(self._lazy_load_data(fpath, ext_info))
 
+    def _lazy_load_data(self, fpath: Path, ext_info: Optional[Dict] = None) -> Iterator[Document]:
         with open(fpath, 'r', encoding='utf-8') as file:
 
             metadata = {"file_name": file.name}
@@ -18,9 +19,7 @@ class LineTxtReader(Reader):
                 metadata.update(ext_info)
 
             for line in file:
-                dlist.append(Document(text=line, metadata=metadata or {}))
-
-        return dlist
+                yield Document(text=line, metadata=metadata or {})
 
 
 class TxtReader(Reader):
@@ -6,7 +6,7 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: reader.py
 from abc import abstractmethod
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Iterator
 
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.base.component.component_base import ComponentEnum
@@ -24,10 +24,31 @@ class Reader(ComponentBase):
         """Load data from the input params."""
         return self._load_data(*args, **kwargs)
 
+    def lazy_load_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        """Load data from the input params one document at a time."""
+        return self._lazy_load_data(*args, **kwargs)
+
+    def get_shards(self, *args: Any, **kwargs: Any) -> List[Any]:
+        """Split the input into the shards parsed by separate processes, e.g. the
+        page ranges of a file. The input is a single shard by default."""
+        return [None]
+
+    def load_shard(self, shard: Any, *args: Any, **kwargs: Any) -> List[Document]:
+        """Load data of one shard returned by `get_shards` from the input params."""
+        return self.load_data(*args, **kwargs)
+
     @abstractmethod
     def _load_data(self, *args: Any, **kwargs: Any) -> List[Document]:
         """Load data from the input params."""
 
+    def _lazy_load_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        """Load data from the input params one document at a time.
+
+        All the documents are loaded at once by default, readers of large
+        sources override it to yield the documents as they are parsed.
+        """
+        yield from self.load_data(*args, **kwargs)
+
     def _initialize_by_component_configer(self,
                                          reader_configer: ComponentConfiger) \
             -> 'Reader':
@@ -6,11 +6,27 @@
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: reader_manager.py
 
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.base.annotation.singleton import singleton
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.component.component_manager_base import \
     ComponentManagerBase, ComponentTypeVar
 from agentuniverse.agent.action.knowledge.reader.reader import Reader
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+
+def _load_shard(reader: Reader, shard: Any, file: str, ext_info: Optional[Dict]) -> List[Document]:
+    """Parse one shard of a file, run in the worker processes."""
+    if ext_info is None:
+        return reader.load_shard(shard, file)
+    return reader.load_shard(shard, file, ext_info=ext_info)
 
 
 @singleton
@@ -33,3 +49,77 @@ class ReaderManager(ComponentManagerBase[Reader]):
             return self.get_instance_obj(self.DEFAULT_READER[file_type])
         else:
             return None
+
+    def get_file_reader(self, file_type: str, readers: Optional[Dict[str, str]] = None) -> Reader | None:
+        """Return the reader of the file type, the configured readers come first."""
+        if readers and file_type in readers:
+            return self.get_instance_obj(readers[file_type])
+        return self.get_file_default_reader(file_type)
+
+    def load_data_in_processes(self, sources: List[Union[str, Path]], process_num: Optional[int] = None,
+                               readers: Optional[Dict[str, str]] = None,
+                               ext_info: Optional[Dict] = None) -> Iterator[List[Document]]:
+        """Parse the files in a process pool.
+
+        The directories are split by file and the large files by the shards of
+        their reader, e.g. the page ranges of a pdf, so bulk parsing is spread
+        over the cores. The documents are yielded batch by batch in the order of
+        the files and the shards, at most `2 * process_num` shards are parsed
+        or waiting at a time.
+
+        Args:
+            sources(List[Union[str, Path]]): The files and the directories to parse.
+            process_num(Optional[int]): The count of the worker processes, the cpu count by default,
+                the files are parsed in the calling process when it is 1.
+            readers(Optional[Dict[str, str]]): The reader names by file type, the default readers are
+                used for the other file types.
+            ext_info(Optional[Dict]): The extended metadata of the documents.
+
+        Returns:
+            Iterator[List[Document]]: The documents of every shard.
+        """
+        process_num = process_num or os.cpu_count() or 1
+        shards = self._iter_shards(sources, readers, ext_info)
+        if process_num <= 1:
+            for reader, shard, file in shards:
+                yield _load_shard(reader, shard, file, ext_info)
+            return
+        # the forked children would inherit the locks held by the threads of the server
+        with ProcessPoolExecutor(max_workers=process_num,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            pending = deque()
+            try:
+                for reader, shard, file in shards:
+                    pending.append(executor.submit(_load_shard, reader, shard, file, ext_info))
+                    if len(pending) >= process_num * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _iter_shards(self, sources: List[Union[str, Path]], readers: Optional[Dict[str, str]],
+                     ext_info: Optional[Dict]) -> Iterator[Tuple[Reader, Any, str]]:
+        for file in self.iter_files(sources):
+            reader = self.get_file_reader(os.path.splitext(file)[1][1:], readers)
+            if reader is None:
+                LOGGER.warn(f"No reader for the file {file}, it is skipped.")
+                continue
+            shards = reader.get_shards(file) if ext_info is None else reader.get_shards(file, ext_info=ext_info)
+            for shard in shards:
+                yield reader, shard, file
+
+    @staticmethod
+    def iter_files(sources: List[Union[str, Path]]) -> Iterator[str]:
+        """Yield the files and the files in the directories, in a stable order, hidden entries are skipped."""
+        for source in sources:
+            source = str(source)
+            if not os.path.isdir(source):
+                yield source
+                continue
+            for root, dirs, files in os.walk(source):
+                dirs[:] = sorted(directory for directory in dirs if not directory.startswith('.'))
+                for file in sorted(files):
+                    if not file.startswith('.'):
+                        yield os.path.join(root, file)
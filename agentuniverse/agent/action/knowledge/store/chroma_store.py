@@ -6,21 +6,55 @@
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: chroma_store.py
 from urllib.parse import urlparse
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Iterable, Callable, Tuple
 from pydantic import SkipValidation
 
 import chromadb
+import httpx
 from chromadb import QueryResult
 from chromadb.config import Settings
 from chromadb.api.models.Collection import Collection
 
 from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import BatchIngestor, IngestMetrics
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
+# the port of a remote chroma server given without one
+DEFAULT_CHROMA_PORT = 8000
+
+
+class ChromaHttpClient(object):
+    """The async client of the http api of a remote chroma server, the chroma
+    package only ships a sync one. It is pooled by the `HttpClientRegistry`."""
+
+    def __init__(self, http_client: httpx.AsyncClient, base_url: str):
+        self.http_client = http_client
+        self.base_url = base_url.rstrip('/')
+
+    async def query(self, collection_id: str, query_embeddings: List[List[float]], n_results: int) -> QueryResult:
+        """Query the nearest neighbors of the embeddings in the collection."""
+        response = await self.http_client.post(f'{self.base_url}/api/v1/collections/{collection_id}/query', json={
+            'query_embeddings': query_embeddings,
+            'n_results': n_results,
+            'where': {},
+            'where_document': {},
+            'include': ['metadatas', 'documents', 'distances']
+        })
+        response.raise_for_status()
+        body = response.json()
+        return QueryResult(ids=body['ids'],
+                           distances=body.get('distances'),
+                           embeddings=body.get('embeddings'),
+                           metadatas=body.get('metadatas'),
+                           documents=body.get('documents'),
+                           uris=body.get('uris'),
+                           data=None)
+
 
 class ChromaStore(Store):
     """Object encapsulating the ChromaDB store that has vector search enabled.
@@ -31,6 +65,9 @@ class ChromaStore(Store):
         collection_name (str): The name of the chroma collection to use.
         collection (Collection): A chroma collection object.
         persist_path (Optional[str]): Path to save the chroma database.
+        ingest_batch_size (int): The max document count embedded and written in one batch.
+        ingest_batch_max_tokens (Optional[int]): The max estimated token count of one batch.
+        ingest_concurrency (int): The max count of batches embedded concurrently.
     """
 
     collection_name: Optional[str] = 'chroma_db'
@@ -38,17 +75,27 @@ class ChromaStore(Store):
     persist_path: Optional[str] = None
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
+    ingest_batch_size: int = 32
+    ingest_batch_max_tokens: Optional[int] = 8192
+    ingest_concurrency: int = 4
+
+    def _remote_server(self) -> Optional[Tuple[str, str, int]]:
+        """Return the scheme, host and port of the remote chroma server, None for a local database."""
+        if not self.persist_path or not self.persist_path.startswith('http'):
+            return None
+        parsed_url = urlparse(self.persist_path)
+        return parsed_url.scheme, parsed_url.hostname, parsed_url.port or DEFAULT_CHROMA_PORT
 
     def _new_client(self) -> Any:
         """Initialize the chroma client."""
-        if self.persist_path.startswith('http') or \
-                self.persist_path.startswith('https'):
+        remote_server = self._remote_server()
+        if remote_server is not None:
             # Remote database URL
-            parsed_url = urlparse(self.persist_path)
+            _, host, port = remote_server
             settings = Settings(
                 chroma_api_impl="chromadb.api.fastapi.FastAPI",
-                chroma_server_host=parsed_url.hostname,
-                chroma_server_http_port=str(parsed_url.port)
+                chroma_server_host=host,
+                chroma_server_http_port=str(port)
             )
         else:
             settings = Settings(
@@ -97,6 +144,39 @@ class ChromaStore(Store):
         # convert to the agentUniverse(aU) document format
         return self.to_documents(query_result)
 
+    async def async_query(self, query: Query, **kwargs) -> List[Document]:
+        """Asynchronously query the chroma collection.
+
+        A remote chroma server is queried by the pooled async http client, the
+        query being embedded by `async_get_embeddings` of the embedding model. A
+        local database, or a query left to the embedding function of the
+        collection, is queried on the blocking executor. A store without
+        collection, e.g. without `persist_path`, finds nothing.
+        """
+        if self.collection is None:
+            return []
+        remote_server = self._remote_server()
+        if remote_server is None:
+            return await super().async_query(query, **kwargs)
+        embedding = query.embeddings
+        if self.embedding_model is not None and len(embedding) == 0:
+            embedding = (await EmbeddingManager().get_instance_obj(
+                self.embedding_model
+            ).async_get_embeddings([query.query_str], text_type="query"))[0]
+        if len(embedding) == 0:
+            return await super().async_query(query, **kwargs)
+        # a single embedding is queried like by the sync collection
+        query_embeddings = [embedding] if isinstance(embedding[0], (int, float)) else embedding
+        scheme, host, port = remote_server
+        client: ChromaHttpClient = HttpClientRegistry().get_async_client(
+            ChromaHttpClient, base_url=f'{scheme}://{host}:{port}')
+        query_result = await client.query(
+            str(self.collection.id),
+            query_embeddings,
+            n_results=query.similarity_top_k if query.similarity_top_k else self.similarity_top_k
+        )
+        return self.to_documents(query_result)
+
     def insert_document(self, documents: List[Document], **kwargs: Any):
         """Insert documents to the chroma collection.
 
@@ -107,50 +187,58 @@ class ChromaStore(Store):
         Note:
             If there is no embedding in the specific document, but the embedding model is configured in the store,
             the embedding data of the document is automatically obtained by the embedding model.
+            Documents are embedded and written in batches, see `ingest_batch_size`.
         """
-
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.add(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if len(embedding) > 0 else None,
-                ids=[document.id]
-            )
+        self._batch_write(documents, self.collection.add)
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.upsert(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._batch_write(documents, self.collection.upsert)
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update document into the store."""
-        for document in documents:
-            embedding = document.embedding
-            if self.embedding_model is not None and len(embedding) == 0:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([document.text])[0]
-            self.collection.update(
-                documents=[document.text],
-                metadatas=[document.metadata],
-                embeddings=[embedding] if embedding is not None else None,
-                ids=[document.id]
-            )
+        self._batch_write(documents, self.collection.update)
+
+    def delete_document(self, document_id: str, **kwargs):
+        """Delete the specific document by the document id."""
+        self.collection.delete(ids=[document_id])
+
+    def delete_documents(self, document_ids: List[str], **kwargs):
+        """Delete the documents by their ids with one collection call."""
+        if document_ids:
+            self.collection.delete(ids=list(document_ids))
+
+    def _batch_write(self, documents: Iterable[Document], write_method: Callable) -> IngestMetrics:
+        """Embed the documents once per batch and write every batch with one collection call.
+
+        Args:
+            documents (Iterable[Document]): The documents to be written.
+            write_method (Callable): The collection method, add, upsert or update.
+
+        Returns:
+            IngestMetrics: The ingestion metrics.
+        """
+
+        def write_batch(batch: List[Document], embeddings: List[List[float]]):
+            # chroma requires embeddings for all or none of the records in one call,
+            # records without embedding are embedded by the collection embedding function.
+            with_embedding = [i for i, embedding in enumerate(embeddings) if len(embedding) > 0]
+            without_embedding = [i for i, embedding in enumerate(embeddings) if len(embedding) == 0]
+            for indexes, has_embedding in ((with_embedding, True), (without_embedding, False)):
+                if not indexes:
+                    continue
+                write_method(
+                    documents=[batch[i].text for i in indexes],
+                    metadatas=[batch[i].metadata for i in indexes],
+                    embeddings=[embeddings[i] for i in indexes] if has_embedding else None,
+                    ids=[batch[i].id for i in indexes]
+                )
+
+        return BatchIngestor(embedding_model=self.embedding_model,
+                             batch_size=self.ingest_batch_size,
+                             batch_max_tokens=self.ingest_batch_max_tokens,
+                             concurrency=self.ingest_concurrency,
+                             name=self.name).ingest(documents, write_batch)
 
     @staticmethod
     def to_documents(query_result: QueryResult) -> List[Document]:
@@ -182,4 +270,10 @@ class ChromaStore(Store):
             self.embedding_model = chroma_store_configer.embedding_model
         if hasattr(chroma_store_configer, "similarity_top_k"):
             self.similarity_top_k = chroma_store_configer.similarity_top_k
+        if hasattr(chroma_store_configer, "ingest_batch_size"):
+            self.ingest_batch_size = chroma_store_configer.ingest_batch_size
+        if hasattr(chroma_store_configer, "ingest_batch_max_tokens"):
+            self.ingest_batch_max_tokens = chroma_store_configer.ingest_batch_max_tokens
+        if hasattr(chroma_store_configer, "ingest_concurrency"):
+            self.ingest_concurrency = chroma_store_configer.ingest_concurrency
         return self
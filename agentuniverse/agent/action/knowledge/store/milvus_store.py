@@ -5,15 +5,26 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: milvus_store.py
+import asyncio
+import json
+import weakref
 from typing import List, Optional, Any
 
+from pydantic import PrivateAttr
+
 try:
     from pymilvus import connections, Collection, CollectionSchema, \
         FieldSchema, DataType, utility
 except ImportError as e:
     raise ImportError(
         "pymilvus is not installed. Please install it with 'pip install pymilvus'") from e
+try:
+    # the async client is shipped since pymilvus 2.5.3
+    from pymilvus import AsyncMilvusClient
+except ImportError:
+    AsyncMilvusClient = None
 
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import BatchIngestor, IngestMetrics
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent.action.knowledge.store.store import Store
@@ -48,7 +59,11 @@ class MilvusStore(Store):
     embedding_model: Optional[str] = None
     similarity_top_k: Optional[int] = 10
     query_embedding: bool = False
-
+    ingest_batch_size: int = 64
+    ingest_batch_max_tokens: Optional[int] = 8192
+    ingest_concurrency: int = 4
+    # event loop -> the async client, the grpc aio channels can not cross loops
+    _async_clients: weakref.WeakKeyDictionary = PrivateAttr(default_factory=weakref.WeakKeyDictionary)
 
     def _connect_to_milvus(self, connection_args: dict):
         """Connect to Milvus server."""
@@ -93,6 +108,12 @@ class MilvusStore(Store):
             self.similarity_top_k = milvus_store_configer.similarity_top_k
         if hasattr(milvus_store_configer, "query_embedding"):
             self.similarity_top_k = milvus_store_configer.query_embedding
+        if hasattr(milvus_store_configer, "ingest_batch_size"):
+            self.ingest_batch_size = milvus_store_configer.ingest_batch_size
+        if hasattr(milvus_store_configer, "ingest_batch_max_tokens"):
+            self.ingest_batch_max_tokens = milvus_store_configer.ingest_batch_max_tokens
+        if hasattr(milvus_store_configer, "ingest_concurrency"):
+            self.ingest_concurrency = milvus_store_configer.ingest_concurrency
         return self
 
     def _create_or_load_collection(self,
@@ -191,12 +212,16 @@ class MilvusStore(Store):
                         documents: List[Document],
                         max_length: int = 65535,
                         index_params: dict = None,
-                        **kwargs):
+                        **kwargs) -> IngestMetrics:
         """
         This method inserts new documents or updates existing documents in the collection.
         The upsert operation ensures that the documents are either added if they do not
         already exist or updated if they do.
 
+        The documents are upserted in batches of `ingest_batch_size`, the documents of a
+        batch without embedding are embedded with one call of the embedding model and the
+        batch is written with one columnar upsert.
+
         Parameters:
         - documents (List[Document]): A list of Document objects to be upserted into the collection.
         - max_length (int): The maximum length of the collection, default is 65535.
@@ -204,39 +229,96 @@ class MilvusStore(Store):
           can include specific configurations for the index creation or updating.
 
         Returns:
-        None
+        IngestMetrics: The ingestion metrics.
         """
-        for document in documents:
-            embedding = document.embedding
-            if len(embedding) == 0:
-                if not self.embedding_model:
-                    raise Exception("Milvus store can only save vector, "
-                                    "you should provide embedding in your document or specify an embedding model.")
-                else:
-                    embedding = EmbeddingManager().get_instance_obj(
-                        self.embedding_model
-                    ).get_embeddings([document.text])[0]
 
+        def write_batch(batch: List[Document], embeddings: List[List[float]]):
+            if any(len(embedding) == 0 for embedding in embeddings):
+                raise Exception("Milvus store can only save vector, "
+                                "you should provide embedding in your document or specify an embedding model.")
             if not self.collection:
                 self._create_or_load_collection(
-                    dim=len(embedding),
+                    dim=len(embeddings[0]),
                     max_length=max_length,
                     index_params=index_params
                 )
-            expr = f'id == "{document.id}"'
-            existing_docs = self.collection.query(expr)
-            entities = [
-                [document.id],
-                [embedding],
-                [document.text],
-                [document.metadata]
-            ]
-            if existing_docs:
-                self.collection.delete(expr)
-                self.collection.insert(entities)
-            else:
-                self.collection.insert(entities)
+            # milvus rejects a primary key repeated in one upsert, the last document wins
+            positions = sorted({document.id: i for i, document in enumerate(batch)}.values())
+            self.collection.upsert([
+                [batch[i].id for i in positions],
+                [embeddings[i] for i in positions],
+                [batch[i].text for i in positions],
+                [batch[i].metadata for i in positions]
+            ])
+
+        metrics = BatchIngestor(embedding_model=self.embedding_model,
+                                batch_size=self.ingest_batch_size,
+                                batch_max_tokens=self.ingest_batch_max_tokens,
+                                concurrency=self.ingest_concurrency,
+                                name=self.name).ingest(documents, write_batch)
+        if metrics.document_count:
             self.collection.load()
+        return metrics
+
+    async def async_query(self,
+                          query: Query,
+                          search_args: dict = None,
+                          **kwargs) -> List[Document]:
+        """
+        Asynchronously query the Milvus collection with the given query and return the top k results.
+
+        The collection is searched by the `AsyncMilvusClient` of the running event loop and the
+        query is embedded by `async_get_embeddings` of the embedding model. Without the async
+        client, pymilvus older than 2.5.3, the sync query runs on the blocking executor.
+
+        Parameters:
+        - query (Query): The query object that contains the parameters and data for the search.
+        - search_args (dict, optional): A dictionary of additional arguments for the search.
+
+        Returns:
+        - List[Document]: A list of Document objects that are the top k results from the query.
+        """
+        if AsyncMilvusClient is None:
+            return await super().async_query(query, search_args=search_args, **kwargs)
+        if not self.collection:
+            return []
+        embedding = query.embeddings
+        if self.embedding_model is not None and len(embedding) == 0:
+            embedding = await EmbeddingManager().get_instance_obj(
+                self.embedding_model
+            ).async_get_embeddings([query.query_str], text_type="query")
+        if len(embedding) == 0:
+            return []
+        if self.query_embedding:
+            output_fields = ["id", "text", "embedding", "metadata"]
+        else:
+            output_fields = ["id", "text", "metadata"]
+        query_result = await self._get_async_client().search(
+            collection_name=self.collection_name,
+            data=embedding,
+            anns_field="embedding",
+            search_params=search_args or self.search_args,
+            limit=query.similarity_top_k if query.similarity_top_k else self.similarity_top_k,
+            output_fields=output_fields
+        )
+        return [Document(id=hit["entity"].get("id", hit.get("id")),
+                         text=hit["entity"].get("text"),
+                         embedding=hit["entity"].get("embedding") or [],
+                         metadata=hit["entity"].get("metadata") or None)
+                for hits in query_result for hit in hits]
+
+    def _get_async_client(self) -> Any:
+        """Return the async client of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            connection_args = dict(self.connection_args)
+            host = connection_args.pop("host", DEFAULT_CONNECTION_ARGS["host"])
+            port = connection_args.pop("port", DEFAULT_CONNECTION_ARGS["port"])
+            uri = connection_args.pop("uri", None) or f"http://{host}:{port}"
+            client = AsyncMilvusClient(uri=uri, **connection_args)
+            self._async_clients[loop] = client
+        return client
 
     def insert_document(self,
                          documents: List[Document],
@@ -250,6 +332,20 @@ class MilvusStore(Store):
         """Update document into the store."""
         self.upsert_document(documents)
 
+    def delete_document(self, document_id: str, **kwargs):
+        """Delete the specific document by the document id."""
+        self.delete_documents([document_id])
+
+    def delete_documents(self, document_ids: List[str], **kwargs):
+        """Delete the documents by their ids with one delete expression."""
+        if not document_ids:
+            return
+        if not self.collection:
+            if not utility.has_collection(self.collection_name, using=self.connection_name):
+                return
+            self.collection = Collection(self.collection_name, using=self.connection_name)
+        self.collection.delete(f'id in {json.dumps(list(document_ids))}')
+
     @staticmethod
     def to_documents(query_result) -> List[Document]:
         """Convert the query results of Milvus to the AgentUniverse(AU)
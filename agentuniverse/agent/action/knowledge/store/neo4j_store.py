@@ -18,6 +18,7 @@ except ImportError:
     )
 
 
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import iter_document_batches
 from agentuniverse.agent.action.knowledge.store.graph_document import GraphDocument
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
@@ -25,8 +26,33 @@ from agentuniverse.agent.action.knowledge.store.store import Store
 from agentuniverse.base.config.component_configer.component_configer import \
     ComponentConfiger
 
+MERGE_DOCUMENTS_CYPHER = """
+UNWIND $rows AS row
+MERGE (d:Document {id: row.id})
+SET d.text = row.text,
+    d.metadata = row.metadata
+"""
+
+UPDATE_DOCUMENTS_CYPHER = """
+UNWIND $rows AS row
+MATCH (d:Document {id: row.id})
+SET d.text = row.text,
+    d.metadata = row.metadata
+"""
+
+DELETE_DOCUMENTS_CYPHER = """
+UNWIND $ids AS id
+MATCH (d:Document {id: id})
+DETACH DELETE d
+"""
+
 
 class Neo4jStore(Store):
+    """Graph store backed by neo4j.
+
+    The documents are written in batches of `ingest_batch_size`, every batch is
+    one `UNWIND $rows` statement in a transaction of its own.
+    """
 
     uri: Optional[str] = None
     user: Optional[str] = None
@@ -34,6 +60,7 @@ class Neo4jStore(Store):
     database: Optional[str] = None
     driver: Any = None
     async_driver: Any = None
+    ingest_batch_size: int = 500
 
     def _new_client(self) -> Any:
         if self.database:
@@ -137,35 +164,39 @@ class Neo4jStore(Store):
 
 
     def insert_document(self, documents: List[Document], **kwargs: Any):
-        session = self.driver.session()
-        try:
-            for doc in documents:
-                cypher = f"""
-                MERGE (d:Document {{id: '{doc.id}'}})
-                SET d.text = $text,
-                    d.metadata = $metadata
-                """
-                session.run(cypher, text=doc.text, metadata=doc.metadata)
-        finally:
-            session.close()
-
+        """Merge the documents into the graph by their ids."""
+        self._write_batches(MERGE_DOCUMENTS_CYPHER, documents)
 
     def upsert_document(self, documents: List[Document], **kwargs):
 
         self.insert_document(documents, **kwargs)
 
     def update_document(self, documents: List[Document], **kwargs):
-        session = self.driver.session()
-        try:
-            for doc in documents:
-                cypher = f"""
-                MATCH (d:Document {{id: '{doc.id}'}})
-                SET d.text = $text,
-                    d.metadata = $metadata
-                """
-                session.run(cypher, text=doc.text, metadata=doc.metadata)
-        finally:
-            session.close()
+        """Update the documents already in the graph, the unknown ids are skipped."""
+        self._write_batches(UPDATE_DOCUMENTS_CYPHER, documents)
+
+    def delete_document(self, document_id: str, **kwargs):
+        """Delete the specific document by the document id."""
+        self.delete_documents([document_id])
+
+    def delete_documents(self, document_ids: List[str], **kwargs):
+        """Delete the documents with their relationships, one transaction per batch."""
+        document_ids = list(document_ids)
+        with self.driver.session() as session:
+            for start in range(0, len(document_ids), self.ingest_batch_size):
+                session.execute_write(self._run_batch, DELETE_DOCUMENTS_CYPHER,
+                                      ids=document_ids[start:start + self.ingest_batch_size])
+
+    def _write_batches(self, cypher: str, documents: List[Document]):
+        with self.driver.session() as session:
+            for batch in iter_document_batches(documents, self.ingest_batch_size):
+                rows = [{'id': doc.id, 'text': doc.text, 'metadata': doc.metadata} for doc in batch]
+                session.execute_write(self._run_batch, cypher, rows=rows)
+
+    @staticmethod
+    def _run_batch(tx, cypher: str, **params):
+        # the unit of work may be retried by the driver, it is idempotent
+        tx.run(cypher, **params).consume()
 
     def _initialize_by_component_configer(self,
                                           neo4j_store_configer: ComponentConfiger) -> 'Neo4jStore':
@@ -178,4 +209,6 @@ class Neo4jStore(Store):
             self.password = neo4j_store_configer.password
         if hasattr(neo4j_store_configer, "database"):
             self.database = neo4j_store_configer.database
+        if hasattr(neo4j_store_configer, "ingest_batch_size"):
+            self.ingest_batch_size = neo4j_store_configer.ingest_batch_size
         return self
@@ -0,0 +1,640 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 03:20
+# @FileName: numpy_store.py
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from pydantic import PrivateAttr
+
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import BatchIngestor, IngestMetrics
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+META_FILE = 'meta.json'
+META_VERSION = 1
+METRICS = ('cosine', 'ip', 'l2')
+# the rows scored in one matrix product when assigning the ivf lists
+_CHUNK_ROWS = 65536
+
+
+class _FilterIndex(object):
+    """The rows of every metadata value by metadata key, shared by the snapshots
+    of a generation.
+
+    A key is indexed on its first lookup, the rows appended since the last
+    lookup are indexed on the next one, so a key is scanned once per
+    generation. The rows of a value are ascending, a snapshot only sees the
+    ones below its row count. Tombstones are masked by the snapshots.
+    """
+
+    def __init__(self):
+        # key -> (the count of the indexed rows, {json value: rows})
+        self._keys: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def mask(self, metadatas: List[Optional[dict]], count: int, key: str, values: list) -> np.ndarray:
+        """Return the mask of the first `count` rows whose metadata value of the key is in the values."""
+        with self._lock:
+            indexed, value_rows = self._keys.get(key, (0, {}))
+            for row in range(indexed, count):
+                metadata = metadatas[row]
+                if metadata and key in metadata:
+                    value = json.dumps(metadata[key], sort_keys=True, ensure_ascii=False)
+                    value_rows.setdefault(value, []).append(row)
+            self._keys[key] = (max(indexed, count), value_rows)
+            key_mask = np.zeros(count, dtype=bool)
+            for value in values:
+                rows = value_rows.get(json.dumps(value, sort_keys=True, ensure_ascii=False))
+                if rows:
+                    key_mask[rows[:bisect.bisect_left(rows, count)]] = True
+            return key_mask
+
+
+class _Snapshot(object):
+    """A consistent view of the rows of the store, queried without any lock.
+
+    The writer never changes a snapshot, it publishes a new one. The id, text
+    and metadata lists and the filter index are append only and may be shared
+    with the next snapshot, only their first `count` entries belong to this
+    one.
+    """
+
+    def __init__(self, generation: int = 0, dim: int = 0, vectors: Optional[np.ndarray] = None,
+                 ids: Optional[List[str]] = None, texts: Optional[List[str]] = None,
+                 metadatas: Optional[List[Optional[dict]]] = None, deleted: Optional[np.ndarray] = None,
+                 squared_norms: Optional[np.ndarray] = None, filter_index: Optional[_FilterIndex] = None):
+        self.generation = generation
+        self.dim = dim
+        self.vectors = vectors if vectors is not None else np.empty((0, dim), dtype=np.float32)
+        self.count = len(self.vectors)
+        self.ids = ids if ids is not None else []
+        self.texts = texts if texts is not None else []
+        self.metadatas = metadatas if metadatas is not None else []
+        self.deleted = deleted if deleted is not None else np.zeros(self.count, dtype=bool)
+        self.live_count = self.count - int(self.deleted.sum())
+        self._squared_norms = squared_norms
+        self.filter_index = filter_index if filter_index is not None else _FilterIndex()
+        self._lock = threading.Lock()
+
+    def squared_norms(self) -> np.ndarray:
+        """The squared l2 norms of the rows, computed once and extended by the next snapshots."""
+        with self._lock:
+            norms = self._squared_norms if self._squared_norms is not None else np.empty(0, dtype=np.float32)
+            done = len(norms)
+            if done < self.count:
+                rest = np.asarray(self.vectors[done:self.count])
+                norms = np.concatenate([norms, np.einsum('ij,ij->i', rest, rest)])
+                self._squared_norms = norms
+            return norms[:self.count]
+
+    def filter_mask(self, metadata_filter: Dict[str, Any]) -> np.ndarray:
+        """Return the mask of the rows whose metadata match all the filter items, a list value
+        matches any of its values."""
+        mask = np.ones(self.count, dtype=bool)
+        for key, value in metadata_filter.items():
+            mask &= self.filter_index.mask(self.metadatas, self.count, key,
+                                           value if isinstance(value, list) else [value])
+        return mask
+
+
+class _IvfIndex(object):
+    """The inverted file lists of a snapshot generation, the rows grouped by their nearest centroid."""
+
+    def __init__(self, generation: int, centroids: np.ndarray, assign: np.ndarray):
+        self.generation = generation
+        self.centroids = centroids
+        self.assign = assign
+        self.order = np.argsort(assign, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=len(centroids)))])
+
+    @property
+    def row_count(self) -> int:
+        return len(self.assign)
+
+    def rows(self, lists: np.ndarray) -> np.ndarray:
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+
+
+class NumpyStore(Store):
+    """In-process vector store backed by a float32 matrix in a memory-mapped file.
+
+    The vectors are appended to a raw float32 file and the ids, texts and
+    metadata to a json lines file, both mapped by the rows count committed in
+    the `meta.json` of the `persist_path` directory. Queries are exact: one
+    vectorized dot product over the mapped matrix and an `argpartition` of
+    the top k, or over the rows of the `ivf_nprobe` nearest lists when the
+    ivf index is enabled and the store holds at least `ivf_min_rows` rows.
+
+    Deleted and replaced rows are tombstoned in the meta, the files are
+    compacted into a new generation once the tombstones exceed
+    `compaction_threshold` of the rows. Every change publishes a new meta
+    atomically, so a crash never corrupts the store.
+
+    A single process writes the store. The gunicorn workers open it with
+    `read_only`, they share the mapped pages through the page cache and pick
+    up the changes of the writer within `refresh_interval` seconds.
+
+    Attributes:
+        persist_path (Optional[str]): The directory of the store files.
+        embedding_model (Optional[str]): The embedding of the documents and the queries without one.
+        similarity_top_k (Optional[int]): The default count of the documents returned by a query.
+        metric (str): The similarity, `cosine`, `ip` for the inner product or `l2`.
+        read_only (bool): Only query the store, reloading it when the writer changes it.
+        refresh_interval (float): The min seconds between the checks for the changes of the writer.
+        ivf_nlist (int): The count of the ivf lists, the ivf index is disabled when it is 0.
+        ivf_nprobe (int): The count of the nearest lists scanned by a query.
+        ivf_min_rows (int): The min row count for the ivf index, smaller stores are scanned.
+        compaction_threshold (float): The tombstone ratio triggering a compaction.
+        ingest_batch_size (int): The max document count embedded and written in one batch.
+        ingest_batch_max_tokens (Optional[int]): The max estimated token count of one batch.
+        ingest_concurrency (int): The max count of batches embedded concurrently.
+    """
+
+    persist_path: Optional[str] = None
+    embedding_model: Optional[str] = None
+    similarity_top_k: Optional[int] = 10
+    metric: str = 'cosine'
+    read_only: bool = False
+    refresh_interval: float = 1.0
+    ivf_nlist: int = 0
+    ivf_nprobe: int = 8
+    ivf_min_rows: int = 10000
+    compaction_threshold: float = 0.2
+    ingest_batch_size: int = 32
+    ingest_batch_max_tokens: Optional[int] = 8192
+    ingest_concurrency: int = 4
+
+    _snapshot: Optional[_Snapshot] = PrivateAttr(default=None)
+    _id_to_row: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _deleted: Set[int] = PrivateAttr(default_factory=set)
+    _meta_stat: Optional[tuple] = PrivateAttr(default=None)
+    _rows_offset: int = PrivateAttr(default=0)
+    _next_refresh: float = PrivateAttr(default=0.0)
+    _ivf: Optional[_IvfIndex] = PrivateAttr(default=None)
+    _write_lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _ivf_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _new_client(self) -> Any:
+        """Open the store files, the ones left by a crashed write are truncated to the committed rows."""
+        if self.metric not in METRICS:
+            raise Exception(f"Numpy store metric must be one of {METRICS}, got {self.metric}.")
+        if not self.persist_path:
+            raise Exception("Numpy store requires a persist_path directory.")
+        with self._write_lock:
+            if not self.read_only:
+                os.makedirs(self.persist_path, exist_ok=True)
+            self._snapshot = self._load()
+            if not self.read_only:
+                self._recover()
+
+    def query(self, query: Query, **kwargs) -> List[Document]:
+        """Return the top k documents of the query embedding.
+
+        Args:
+            query (Query): The query, `ext_info['metadata_filter']` restricts the documents to the
+                ones whose metadata match all its items, a list value matches any of its values.
+            **kwargs: `metadata_filter` overriding the one of the query.
+
+        Note:
+            If there is no embedding in the query, but the embedding model is configured in the store,
+            the embedding of the query is automatically obtained by the embedding model.
+
+        Returns:
+            List[Document]: The documents, the most similar first.
+        """
+        embedding = query.embeddings[0] if query.embeddings else None
+        if embedding is None and self.embedding_model is not None and query.query_str:
+            embedding = EmbeddingManager().get_instance_obj(
+                self.embedding_model
+            ).get_embeddings([query.query_str], text_type="query")[0]
+        if embedding is None or len(embedding) == 0:
+            return []
+        metadata_filter = kwargs.get('metadata_filter', (query.ext_info or {}).get('metadata_filter'))
+        snapshot = self._get_snapshot()
+        rows = self.search(snapshot, np.asarray(embedding, dtype=np.float32),
+                           query.similarity_top_k or self.similarity_top_k, metadata_filter)
+        return [Document(id=snapshot.ids[row], text=snapshot.texts[row], metadata=snapshot.metadatas[row])
+                for row in rows]
+
+    def search(self, snapshot: _Snapshot, embedding: np.ndarray, top_k: int,
+               metadata_filter: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Return the rows of the top k vectors of the snapshot, the most similar first."""
+        if snapshot.live_count == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if len(embedding) != snapshot.dim:
+            raise Exception(f"Numpy store query dimension {len(embedding)} does not match "
+                            f"the store dimension {snapshot.dim}.")
+        if self.metric == 'cosine':
+            embedding = self._normalize(embedding)
+        valid = ~snapshot.deleted
+        if metadata_filter:
+            valid &= snapshot.filter_mask(metadata_filter)
+        valid_count = int(valid.sum())
+        if valid_count == 0:
+            return np.empty(0, dtype=np.int64)
+
+        ivf = self._get_ivf(snapshot)
+        if ivf is not None:
+            candidates = ivf.rows(self._top_k(self._scores(ivf.centroids, embedding),
+                                              min(self.ivf_nprobe, len(ivf.centroids))))
+            # the index may cover the rows of a newer snapshot
+            candidates = candidates[candidates < snapshot.count]
+            candidates = np.sort(candidates[valid[candidates]])
+        elif valid_count < snapshot.count / 4:
+            # a selective filter, gather the few rows rather than scanning all of them
+            candidates = np.flatnonzero(valid)
+        else:
+            scores = self._scores(snapshot.vectors, embedding,
+                                  snapshot.squared_norms() if self.metric == 'l2' else None)
+            scores[~valid] = -np.inf
+            return self._top_k(scores, min(top_k, valid_count))
+        if len(candidates) == 0:
+            return candidates
+        squared_norms = snapshot.squared_norms()[candidates] if self.metric == 'l2' else None
+        scores = self._scores(snapshot.vectors[candidates], embedding, squared_norms)
+        return candidates[self._top_k(scores, min(top_k, len(candidates)))]
+
+    def insert_document(self, documents: List[Document], **kwargs: Any):
+        """Insert documents into the store, a document replaces the one with the same id.
+
+        Note:
+            If there is no embedding in the specific document, but the embedding model is configured in the store,
+            the embedding data of the document is automatically obtained by the embedding model.
+            Documents are embedded and written in batches, see `ingest_batch_size`.
+        """
+        self.upsert_document(documents, **kwargs)
+
+    def upsert_document(self, documents: List[Document], **kwargs) -> IngestMetrics:
+        """Upsert documents into the store."""
+        self._check_writable()
+        return BatchIngestor(embedding_model=self.embedding_model,
+                             batch_size=self.ingest_batch_size,
+                             batch_max_tokens=self.ingest_batch_max_tokens,
+                             concurrency=self.ingest_concurrency,
+                             name=self.name).ingest(documents, self._append)
+
+    def update_document(self, documents: List[Document], **kwargs):
+        """Update document into the store."""
+        self.upsert_document(documents, **kwargs)
+
+    def delete_document(self, document_id: str, **kwargs):
+        """Delete the specific document by the document id."""
+        self.delete_documents([document_id])
+
+    def delete_documents(self, document_ids: List[str], **kwargs):
+        """Tombstone the documents, the files are compacted once the tombstones exceed the threshold."""
+        self._check_writable()
+        with self._write_lock:
+            snapshot = self._get_snapshot()
+            rows = [self._id_to_row[document_id] for document_id in set(document_ids)
+                    if document_id in self._id_to_row]
+            if not rows:
+                return
+            self._commit(snapshot.generation, snapshot.dim, snapshot.count, self._deleted.union(rows))
+            for row in rows:
+                self._id_to_row.pop(snapshot.ids[row])
+            self._deleted.update(rows)
+            deleted = snapshot.deleted.copy()
+            deleted[rows] = True
+            self._publish(_Snapshot(snapshot.generation, snapshot.dim, snapshot.vectors, snapshot.ids,
+                                    snapshot.texts, snapshot.metadatas, deleted, snapshot.squared_norms()
+                                    if self.metric == 'l2' else None, snapshot.filter_index))
+            self._compact_if_needed()
+
+    def compact(self):
+        """Rewrite the live rows into the files of a new generation and drop the tombstones."""
+        self._check_writable()
+        with self._write_lock:
+            snapshot = self._get_snapshot()
+            keep = np.flatnonzero(~snapshot.deleted)
+            generation = snapshot.generation + 1
+            with open(self._vectors_path(generation), 'wb') as f:
+                for start in range(0, len(keep), _CHUNK_ROWS):
+                    np.asarray(snapshot.vectors[keep[start:start + _CHUNK_ROWS]], dtype=np.float32).tofile(f)
+            with open(self._rows_path(generation), 'w', encoding='utf-8') as f:
+                for row in keep:
+                    f.write(self._dump_row(snapshot.ids[row], snapshot.texts[row], snapshot.metadatas[row]))
+            self._commit(generation, snapshot.dim, len(keep), set())
+            for path in (self._vectors_path(snapshot.generation), self._rows_path(snapshot.generation)):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._publish(self._load())
+            LOGGER.info(f"Numpy store {self.name} compacted {snapshot.count} rows into {len(keep)}.")
+
+    def _append(self, batch: List[Document], embeddings: List[List[float]]):
+        if any(len(embedding) == 0 for embedding in embeddings):
+            raise Exception("Numpy store can only save vector, "
+                            "you should provide embedding in your document or specify an embedding model.")
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        with self._write_lock:
+            snapshot = self._get_snapshot()
+            dim = snapshot.dim or matrix.shape[1]
+            if matrix.shape[1] != dim:
+                raise Exception(f"Numpy store document dimension {matrix.shape[1]} does not match "
+                                f"the store dimension {dim}.")
+            if self.metric == 'cosine':
+                matrix = self._normalize(matrix)
+            new_rows, replaced = {}, []
+            for offset, document in enumerate(batch):
+                previous = new_rows.get(document.id, self._id_to_row.get(document.id))
+                if previous is not None:
+                    replaced.append(previous)
+                new_rows[document.id] = snapshot.count + offset
+            count = snapshot.count + len(batch)
+            try:
+                with open(self._vectors_path(snapshot.generation), 'ab') as f:
+                    matrix.tofile(f)
+                with open(self._rows_path(snapshot.generation), 'a', encoding='utf-8') as f:
+                    f.writelines(self._dump_row(document.id, document.text, document.metadata)
+                                 for document in batch)
+                self._commit(snapshot.generation, dim, count, self._deleted.union(replaced))
+            except BaseException:
+                self._recover()
+                raise
+            self._id_to_row.update(new_rows)
+            self._deleted.update(replaced)
+            # the lists are shared with the previous snapshot, which only reads its first rows
+            snapshot.ids.extend(document.id for document in batch)
+            snapshot.texts.extend(document.text for document in batch)
+            snapshot.metadatas.extend(document.metadata for document in batch)
+            deleted = np.concatenate([snapshot.deleted, np.zeros(len(batch), dtype=bool)])
+            deleted[replaced] = True
+            self._publish(_Snapshot(snapshot.generation, dim, self._map_vectors(snapshot.generation, count, dim),
+                                    snapshot.ids, snapshot.texts, snapshot.metadatas, deleted,
+                                    snapshot.squared_norms() if self.metric == 'l2' else None,
+                                    snapshot.filter_index))
+            self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        snapshot = self._snapshot
+        if snapshot.count and snapshot.count - snapshot.live_count > self.compaction_threshold * snapshot.count:
+            self.compact()
+
+    def _get_snapshot(self) -> _Snapshot:
+        if self._snapshot is None:
+            self._new_client()
+        elif self.read_only and time.monotonic() >= self._next_refresh:
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            try:
+                stat = os.stat(self._meta_path())
+                meta_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                meta_stat = None
+            if meta_stat != self._meta_stat:
+                with self._write_lock:
+                    self._snapshot = self._refresh()
+        return self._snapshot
+
+    def _refresh(self) -> _Snapshot:
+        """Pick up the changes of the writer, the rows appended to the current generation are read
+        from the end of the rows file, a compacted store is reloaded."""
+        snapshot = self._snapshot
+        meta = self._read_meta()
+        if meta is not None and meta['generation'] == snapshot.generation and meta['count'] >= snapshot.count \
+                and snapshot.dim in (0, meta['dim']) and meta.get('metric', self.metric) == self.metric:
+            try:
+                return self._tail(snapshot, meta)
+            except (FileNotFoundError, ValueError):
+                # the generation was compacted meanwhile
+                pass
+        return self._load()
+
+    def _tail(self, snapshot: _Snapshot, meta: dict) -> _Snapshot:
+        """Extend the snapshot with the rows committed after it, read from the last rows file offset."""
+        count, dim = meta['count'], meta['dim']
+        ids, texts, metadatas = [], [], []
+        with open(self._rows_path(snapshot.generation), 'rb') as f:
+            f.seek(self._rows_offset)
+            for _ in range(count - snapshot.count):
+                row = json.loads(f.readline())
+                ids.append(row['id'])
+                texts.append(row['text'])
+                metadatas.append(row['metadata'])
+            rows_offset = f.tell()
+        vectors = self._map_vectors(snapshot.generation, count, dim)
+        deleted = np.zeros(count, dtype=bool)
+        deleted[meta['deleted']] = True
+        # the lists are shared with the previous snapshot, which only reads its first rows
+        snapshot.ids.extend(ids)
+        snapshot.texts.extend(texts)
+        snapshot.metadatas.extend(metadatas)
+        self._rows_offset = rows_offset
+        for row in range(snapshot.count, count):
+            if not deleted[row]:
+                self._id_to_row[snapshot.ids[row]] = row
+        for row in set(meta['deleted']).difference(self._deleted):
+            if self._id_to_row.get(snapshot.ids[row]) == row:
+                self._id_to_row.pop(snapshot.ids[row])
+        self._deleted = set(meta['deleted'])
+        return _Snapshot(snapshot.generation, dim, vectors, snapshot.ids, snapshot.texts, snapshot.metadatas,
+                         deleted, snapshot.squared_norms() if self.metric == 'l2' else None,
+                         snapshot.filter_index)
+
+    def _get_ivf(self, snapshot: _Snapshot) -> Optional[_IvfIndex]:
+        """Return the ivf index of the snapshot, built in the process on the first query and extended
+        with the rows appended since, rebuilt when the rows doubled or the store was compacted."""
+        if self.ivf_nlist <= 0 or snapshot.live_count < max(self.ivf_min_rows, self.ivf_nlist):
+            return None
+        with self._ivf_lock:
+            ivf = self._ivf
+            if ivf is None or ivf.generation != snapshot.generation or ivf.row_count * 2 < snapshot.count:
+                start = time.perf_counter()
+                centroids = self._train_centroids(snapshot)
+                ivf = _IvfIndex(snapshot.generation, centroids, self._nearest(snapshot.vectors, centroids))
+                LOGGER.info(f"Numpy store {self.name} built {len(centroids)} ivf lists over {snapshot.count} "
+                            f"rows in {time.perf_counter() - start:.2f}s.")
+            elif ivf.row_count < snapshot.count:
+                ivf = _IvfIndex(ivf.generation, ivf.centroids, np.concatenate(
+                    [ivf.assign, self._nearest(snapshot.vectors[ivf.row_count:snapshot.count], ivf.centroids)]))
+            self._ivf = ivf
+            return ivf
+
+    def _train_centroids(self, snapshot: _Snapshot, iterations: int = 10) -> np.ndarray:
+        """Train the centroids with k-means on a sample of the live rows."""
+        rng = np.random.default_rng(0)
+        live = np.flatnonzero(~snapshot.deleted)
+        sample = np.sort(rng.choice(live, min(len(live), self.ivf_nlist * 64), replace=False))
+        data = np.asarray(snapshot.vectors[sample])
+        centroids = data[rng.choice(len(data), self.ivf_nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = self._nearest(data, centroids)
+            counts = np.bincount(assign, minlength=self.ivf_nlist)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            if self.metric == 'cosine':
+                centroids = self._normalize(centroids)
+        return centroids
+
+    def _nearest(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Return the nearest centroid of every vector, scored in chunks to bound the memory."""
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids) if self.metric == 'l2' else None
+        assign = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _CHUNK_ROWS):
+            scores = np.asarray(vectors[start:start + _CHUNK_ROWS]) @ centroids.T
+            if centroid_norms is not None:
+                scores = 2 * scores - centroid_norms
+            assign[start:start + _CHUNK_ROWS] = np.argmax(scores, axis=1)
+        return assign
+
+    def _scores(self, vectors: np.ndarray, embedding: np.ndarray,
+                squared_norms: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score the vectors, the higher the more similar, l2 scores are the negative squared
+        distances less the constant squared norm of the embedding."""
+        scores = np.asarray(vectors @ embedding, dtype=np.float32)
+        if self.metric == 'l2':
+            if squared_norms is None:
+                squared_norms = np.einsum('ij,ij->i', vectors, vectors)
+            scores = 2 * scores - squared_norms
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind='stable')]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+    def _load(self) -> _Snapshot:
+        """Load the committed rows, retried when the writer compacts the files meanwhile."""
+        for _ in range(3):
+            meta = self._read_meta()
+            if meta is None:
+                self._id_to_row, self._deleted, self._rows_offset = {}, set(), 0
+                return _Snapshot()
+            if meta.get('metric', self.metric) != self.metric:
+                raise Exception(f"Numpy store {self.persist_path} was written with the metric "
+                                f"{meta['metric']}, not {self.metric}.")
+            generation, dim, count = meta['generation'], meta['dim'], meta['count']
+            try:
+                vectors = self._map_vectors(generation, count, dim)
+                ids, texts, metadatas = [], [], []
+                with open(self._rows_path(generation), 'rb') as f:
+                    for _ in range(count):
+                        row = json.loads(f.readline())
+                        ids.append(row['id'])
+                        texts.append(row['text'])
+                        metadatas.append(row['metadata'])
+                    rows_offset = f.tell()
+            except FileNotFoundError:
+                continue
+            deleted = np.zeros(count, dtype=bool)
+            deleted[meta['deleted']] = True
+            self._deleted = set(meta['deleted'])
+            self._id_to_row = {document_id: row for row, document_id in enumerate(ids) if not deleted[row]}
+            self._rows_offset = rows_offset
+            return _Snapshot(generation, dim, vectors, ids, texts, metadatas, deleted)
+        raise Exception(f"Numpy store {self.persist_path} changed while loading, retry later.")
+
+    def _recover(self):
+        """Truncate the rows appended after the last commit, e.g. by a crashed write."""
+        snapshot = self._snapshot
+        vectors_path = self._vectors_path(snapshot.generation)
+        if os.path.exists(vectors_path) and os.path.getsize(vectors_path) > snapshot.count * snapshot.dim * 4:
+            os.truncate(vectors_path, snapshot.count * snapshot.dim * 4)
+        if os.path.exists(self._rows_path(snapshot.generation)):
+            with open(self._rows_path(snapshot.generation), 'rb+') as f:
+                for _ in range(snapshot.count):
+                    f.readline()
+                f.truncate()
+
+    def _commit(self, generation: int, dim: int, count: int, deleted: Set[int]):
+        """Publish the committed rows and tombstones atomically."""
+        meta = {'version': META_VERSION, 'generation': generation, 'dim': dim, 'metric': self.metric,
+                'count': count, 'deleted': sorted(deleted)}
+        fd, tmp_path = tempfile.mkstemp(prefix='.meta_', dir=self.persist_path)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self._meta_path())
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _publish(self, snapshot: _Snapshot):
+        self._snapshot = snapshot
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            stat = os.stat(self._meta_path())
+            with open(self._meta_path(), encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            self._meta_stat = None
+            return None
+        self._meta_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        return meta
+
+    def _map_vectors(self, generation: int, count: int, dim: int) -> np.ndarray:
+        if count == 0:
+            return np.empty((0, dim), dtype=np.float32)
+        return np.memmap(self._vectors_path(generation), dtype=np.float32, mode='r', shape=(count, dim))
+
+    def _check_writable(self):
+        if self.read_only:
+            raise Exception(f"Numpy store {self.name} is read only.")
+        if self._snapshot is None:
+            self._new_client()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.persist_path, META_FILE)
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.persist_path, f'vectors.{generation}.f32')
+
+    def _rows_path(self, generation: int) -> str:
+        return os.path.join(self.persist_path, f'rows.{generation}.jsonl')
+
+    @staticmethod
+    def _dump_row(document_id: str, text: Optional[str], metadata: Optional[dict]) -> str:
+        return json.dumps({'id': document_id, 'text': text, 'metadata': metadata}, ensure_ascii=False) + '\n'
+
+    def _initialize_by_component_configer(self,
+                                          numpy_store_configer: ComponentConfiger) -> 'NumpyStore':
+        super()._initialize_by_component_configer(numpy_store_configer)
+        if hasattr(numpy_store_configer, "persist_path"):
+            self.persist_path = numpy_store_configer.persist_path
+        if hasattr(numpy_store_configer, "embedding_model"):
+            self.embedding_model = numpy_store_configer.embedding_model
+        if hasattr(numpy_store_configer, "similarity_top_k"):
+            self.similarity_top_k = numpy_store_configer.similarity_top_k
+        if hasattr(numpy_store_configer, "metric"):
+            self.metric = numpy_store_configer.metric
+        if hasattr(numpy_store_configer, "read_only"):
+            self.read_only = numpy_store_configer.read_only
+        if hasattr(numpy_store_configer, "refresh_interval"):
+            self.refresh_interval = numpy_store_configer.refresh_interval
+        if hasattr(numpy_store_configer, "ivf_nlist"):
+            self.ivf_nlist = numpy_store_configer.ivf_nlist
+        if hasattr(numpy_store_configer, "ivf_nprobe"):
+            self.ivf_nprobe = numpy_store_configer.ivf_nprobe
+        if hasattr(numpy_store_configer, "ivf_min_rows"):
+            self.ivf_min_rows = numpy_store_configer.ivf_min_rows
+        if hasattr(numpy_store_configer, "compaction_threshold"):
+            self.compaction_threshold = numpy_store_configer.compaction_threshold
+        if hasattr(numpy_store_configer, "ingest_batch_size"):
+            self.ingest_batch_size = numpy_store_configer.ingest_batch_size
+        if hasattr(numpy_store_configer, "ingest_batch_max_tokens"):
+            self.ingest_batch_max_tokens = numpy_store_configer.ingest_batch_max_tokens
+        if hasattr(numpy_store_configer, "ingest_concurrency"):
+            self.ingest_concurrency = numpy_store_configer.ingest_concurrency
+        return self
@@ -5,13 +5,14 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: sqlite_store.py
+import heapq
 import sqlite3
 import json
-import math
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from collections import Counter
 
 import jieba
+import numpy as np
 
 from agentuniverse.agent.action.knowledge.store.store import Store
 from agentuniverse.agent.action.knowledge.store.document import Document
@@ -22,6 +23,13 @@ from agentuniverse.base.config.component_configer.component_configer import \
 
 
 class SQLiteStore(Store):
+    """Keyword store with a persisted BM25 index.
+
+    The inverted index works as the postings table, every row keeps the term
+    frequency of the keyword in the document, the document length is kept in
+    the documents table and the corpus statistics are maintained incrementally
+    in the corpus_stats table, so a query never re-tokenizes the documents.
+    """
     db_path: str = 'sqlite_store.db'
     conn: Optional[sqlite3.Connection] = None
     k1: float = 1.5
@@ -47,9 +55,44 @@ class SQLiteStore(Store):
                 CREATE TABLE IF NOT EXISTS inverted_index (
                     term TEXT,
                     doc_id TEXT,
+                    term_freq INT,
                     FOREIGN KEY (doc_id) REFERENCES documents (id)
                 )
             ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS corpus_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    doc_count INT,
+                    total_word_count INT
+                )
+            ''')
+            columns = [row[1] for row in self.conn.execute('PRAGMA table_info(inverted_index)')]
+            if 'term_freq' not in columns:
+                self.conn.execute('ALTER TABLE inverted_index ADD COLUMN term_freq INT')
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_inverted_index_term ON inverted_index (term)')
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_inverted_index_doc_id ON inverted_index (doc_id)')
+            if self.conn.execute('SELECT 1 FROM corpus_stats WHERE id = 0').fetchone() is None:
+                self.conn.execute(
+                    'INSERT INTO corpus_stats (id, doc_count, total_word_count) '
+                    'SELECT 0, COUNT(*), COALESCE(SUM(word_count), 0) FROM documents')
+        self._backfill_term_freq()
+
+    def _backfill_term_freq(self):
+        """Fill the term frequency of the postings written by the earlier
+        versions, which only kept the (term, doc_id) pairs."""
+        with self.conn:
+            doc_ids = [row[0] for row in self.conn.execute(
+                'SELECT DISTINCT doc_id FROM inverted_index WHERE term_freq IS NULL')]
+            for doc_id in doc_ids:
+                row = self.conn.execute('SELECT text FROM documents WHERE id = ?', (doc_id,)).fetchone()
+                doc_counter = Counter(jieba.lcut(row[0])) if row and row[0] else Counter()
+                terms = [term_row[0] for term_row in self.conn.execute(
+                    'SELECT DISTINCT term FROM inverted_index WHERE doc_id = ?', (doc_id,))]
+                self.conn.executemany(
+                    'UPDATE inverted_index SET term_freq = ? WHERE doc_id = ? AND term = ?',
+                    [(doc_counter[term], doc_id, term) for term in terms])
 
     def _initialize_by_component_configer(self,
                                           sqlite_store_configer: ComponentConfiger) -> 'DocProcessor':
@@ -66,48 +109,75 @@ class SQLiteStore(Store):
             self.similarity_top_k = sqlite_store_configer.similarity_top_k
         return self
 
+    def _get_corpus_stats(self) -> Tuple[int, int]:
+        """Return the document count and the total word count of the corpus."""
+        row = self.conn.execute(
+            'SELECT doc_count, total_word_count FROM corpus_stats WHERE id = 0').fetchone()
+        if row is None:
+            return 0, 0
+        return row[0] or 0, row[1] or 0
 
     def _get_all_docs_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM documents')
-            count = cursor.fetchone()[0]
-            cursor.close()
-        return count
+        return self._get_corpus_stats()[0]
 
     def _get_all_docs_words_count(self) -> int:
-        with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT SUM(word_count) FROM documents')
-            total_word_count = cursor.fetchone()[0]
-            cursor.close()
-        return total_word_count if total_word_count is not None else 0
-
-    def compute_bm25(self, query_text, doc_text, inverted_index,
-                     total_doc_count, total_word_count):
-        k1 = self.k1
-        b = self.b
-        query_words = jieba.lcut(query_text)
-        doc_words = jieba.lcut(doc_text)
-        doc_length = len(doc_words)
-        avg_doc_length = total_word_count / total_doc_count
-        bm25_score = 0
+        return self._get_corpus_stats()[1]
 
-        doc_counter = Counter(doc_words)
+    def _update_corpus_stats(self, doc_count_delta: int, word_count_delta: int):
+        self.conn.execute(
+            'UPDATE corpus_stats SET doc_count = doc_count + ?, '
+            'total_word_count = total_word_count + ? WHERE id = 0',
+            (doc_count_delta, word_count_delta))
 
-        for term in query_words:
-            if term in inverted_index:
-                term_freq = doc_counter[term]
-                num_docs_with_term = len(inverted_index[term])
-                idf = math.log((total_doc_count - num_docs_with_term + 0.5) / (
-                        num_docs_with_term + 0.5) + 1)
-                bm25_term_score = idf * (term_freq * (k1 + 1)) / (
-                        term_freq + k1 * (
-                        1 - b + b * (doc_length / avg_doc_length)))
-                bm25_score += bm25_term_score
+    def _remove_document(self, document_id: str):
+        """Remove the document with its postings and keep the corpus statistics in sync,
+        must be called inside a transaction."""
+        row = self.conn.execute('SELECT word_count FROM documents WHERE id = ?', (document_id,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute('DELETE FROM documents WHERE id = ?', (document_id,))
+        self.conn.execute('DELETE FROM inverted_index WHERE doc_id = ?', (document_id,))
+        self._update_corpus_stats(-1, -(row[0] or 0))
 
-        return bm25_score
+    def _write_documents(self, documents: List[Document]):
+        """Write the documents and their postings, tokenize each document only once."""
+        with self.conn:
+            for document in documents:
+                self._remove_document(document.id)
+                doc_words = jieba.lcut(document.text)
+                doc_counter = Counter(doc_words)
+                metadata = json.dumps(
+                    document.metadata) if document.metadata else None
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
+                    (document.id, document.text, len(doc_words), metadata)
+                )
+                self._get_document_keyword(document)
+                self.conn.executemany(
+                    'INSERT INTO inverted_index (term, doc_id, term_freq) VALUES (?, ?, ?)',
+                    [(term, document.id, doc_counter[term]) for term in set(document.keywords)]
+                )
+                self._update_corpus_stats(1, len(doc_words))
+
+    def compute_bm25(self, query_weights: np.ndarray, term_freqs: np.ndarray, doc_lengths: np.ndarray,
+                     doc_freqs: np.ndarray, total_doc_count: int, avg_doc_length: float) -> np.ndarray:
+        """Compute the bm25 score contribution of every posting in one vectorized pass.
 
+        Args:
+            query_weights(np.ndarray): How many times the posting term appears in the query.
+            term_freqs(np.ndarray): The term frequency of the posting term in the document.
+            doc_lengths(np.ndarray): The word count of the posting document.
+            doc_freqs(np.ndarray): The number of documents containing the posting term.
+            total_doc_count(int): The number of documents in the corpus.
+            avg_doc_length(float): The average word count of the documents in the corpus.
+        Returns:
+            np.ndarray: The bm25 score contribution of every posting.
+        """
+        k1 = self.k1
+        b = self.b
+        idf = np.log((total_doc_count - doc_freqs + 0.5) / (doc_freqs + 0.5) + 1)
+        return query_weights * idf * (term_freqs * (k1 + 1)) / (
+                term_freqs + k1 * (1 - b + b * (doc_lengths / avg_doc_length)))
 
     def _get_document_keyword(self, document: Document) -> Set[str]:
         if not self.keyword_extractor:
@@ -120,53 +190,19 @@ class SQLiteStore(Store):
             return _doc[0].keywords
 
     def insert_document(self, documents: List[Document], **kwargs):
-        with self.conn:
-            for document in documents:
-                metadata = json.dumps(
-                    document.metadata) if document.metadata else None
-                self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (document.id, document.text, len(jieba.lcut(document.text)), metadata)
-                )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
+        self._write_documents(documents)
 
     def delete_document(self, document_id: int):
         with self.conn:
-            self.conn.execute(
-                'DELETE FROM documents WHERE id = ?',
-                (document_id,)
-            )
-            self.conn.execute(
-                'DELETE FROM inverted_index WHERE doc_id = ?',
-                (document_id,)
-            )
+            self._remove_document(document_id)
 
-    def upsert_document(self, documents: List[Document], **kwargs):
+    def delete_documents(self, document_ids: List[str], **kwargs):
         with self.conn:
-            for document in documents:
-                metadata = json.dumps(
-                    document.metadata) if document.metadata else None
-                self.conn.execute(
-                    'INSERT OR REPLACE INTO documents (id, text, word_count, metadata) VALUES (?, ?, ?, ?)',
-                    (
-                    document.id, document.text, len(jieba.lcut(document.text)),
-                    metadata)
-                )
-                self.conn.execute(
-                    'DELETE FROM inverted_index WHERE doc_id = ?',
-                    (document.id,)
-                )
-                self._get_document_keyword(document)
-                for term in set(document.keywords):
-                    self.conn.execute(
-                        'INSERT INTO inverted_index (term, doc_id) VALUES (?, ?)',
-                        (term, document.id)
-                    )
+            for document_id in document_ids:
+                self._remove_document(document_id)
+
+    def upsert_document(self, documents: List[Document], **kwargs):
+        self._write_documents(documents)
 
     def query(self, query: Query, **kwargs) -> List[Document]:
         if len(query.keywords) > 0:
@@ -174,50 +210,56 @@ class SQLiteStore(Store):
         else:
             query_terms = self._get_document_keyword(Document(text=query.query_str))
             query.keywords = query_terms
+        query_terms = list(query_terms)
+        if not query_terms:
+            return []
+        # Only the keywords which are also words of the query contribute to the score.
+        query_counter = Counter(jieba.lcut(query.query_str or ''))
+        top_k = query.similarity_top_k or self.similarity_top_k
 
-        # Get doc_id from inverted index.
-        relevant_docs = set()
-        inverted_index = {}
+        # Fetch all postings of the query terms in one statement.
+        placeholders = ','.join('?' * len(query_terms))
         with self.conn:
-            for keyword in query_terms:
-                cursor = self.conn.cursor()
-                cursor.execute(
-                    'SELECT doc_id FROM inverted_index WHERE term = ?',
-                    (keyword,))
-                docs_with_keyword = [row[0] for row in cursor.fetchall()]
-                inverted_index[keyword] = docs_with_keyword
-                relevant_docs.update(docs_with_keyword)
-                cursor.close()
-
-        # Count every document's bm25.
-        doc_scores = []
-        total_doc_count = self._get_all_docs_count()
-        total_word_count = self._get_all_docs_words_count()
-        for doc_id in relevant_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT text FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_text = cursor.fetchone()[0]
-            cursor.close()
-
-            bm25_score = self.compute_bm25(query.query_str, doc_text,
-                                           inverted_index, total_doc_count, total_word_count)
-            doc_scores.append((doc_id, bm25_score))
+            total_doc_count, total_word_count = self._get_corpus_stats()
+            rows = self.conn.execute(
+                f'SELECT i.term, i.doc_id, i.term_freq, d.word_count FROM inverted_index i '
+                f'JOIN documents d ON d.id = i.doc_id WHERE i.term IN ({placeholders})',
+                query_terms).fetchall()
+        if not rows or total_doc_count <= 0:
+            return []
+
+        # Count every document's bm25 in one vectorized pass.
+        doc_index = {}
+        term_doc_freq = Counter(row[0] for row in rows)
+        doc_positions = np.fromiter((doc_index.setdefault(row[1], len(doc_index)) for row in rows),
+                                    dtype=np.int64, count=len(rows))
+        contributions = self.compute_bm25(
+            query_weights=np.fromiter((query_counter[row[0]] for row in rows), dtype=np.float64, count=len(rows)),
+            term_freqs=np.fromiter((row[2] or 0 for row in rows), dtype=np.float64, count=len(rows)),
+            doc_lengths=np.fromiter((row[3] or 0 for row in rows), dtype=np.float64, count=len(rows)),
+            doc_freqs=np.fromiter((term_doc_freq[row[0]] for row in rows), dtype=np.float64, count=len(rows)),
+            total_doc_count=total_doc_count,
+            avg_doc_length=total_word_count / total_doc_count if total_word_count else 1.0)
+        doc_scores = np.bincount(doc_positions, weights=contributions, minlength=len(doc_index))
 
         # Order the docs with bm25, and return top k.
-        doc_scores.sort(key=lambda x: x[1], reverse=True)
-        top_docs = doc_scores[:self.similarity_top_k]
+        doc_ids = list(doc_index.keys())
+        top_positions = heapq.nlargest(top_k, range(len(doc_ids)), key=doc_scores.__getitem__)
+        top_doc_ids = [doc_ids[position] for position in top_positions]
+        placeholders = ','.join('?' * len(top_doc_ids))
+        with self.conn:
+            doc_rows = self.conn.execute(
+                f'SELECT id, text, word_count, metadata FROM documents WHERE id IN ({placeholders})',
+                top_doc_ids).fetchall()
+        doc_row_map = {doc_row[0]: doc_row for doc_row in doc_rows}
         results = []
-        for doc_id, score in top_docs:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM documents WHERE id = ?',
-                           (doc_id,))
-            doc_row = cursor.fetchone()
-            cursor.close()
-
+        for doc_id in top_doc_ids:
+            doc_row = doc_row_map.get(doc_id)
+            if doc_row is None:
+                continue
             document = Document(id=doc_row[0], text=doc_row[1],
                                 word_count=doc_row[2],
-                                metadata=json.loads(doc_row[3]))
+                                metadata=json.loads(doc_row[3]) if doc_row[3] else None)
             results.append(document)
 
         return results
@@ -13,6 +13,7 @@ from agentuniverse.base.config.component_configer.component_configer import Comp
 from agentuniverse.agent.action.knowledge.store.document import Document
 from agentuniverse.agent.action.knowledge.store.query import Query
 from agentuniverse.agent_serve.web.post_fork_queue import add_post_fork
+from agentuniverse.base.util.blocking_executor import run_blocking
 
 
 class Store(ComponentBase):
@@ -65,8 +66,12 @@ class Store(ComponentBase):
         raise NotImplementedError
 
     async def async_query(self, query: Query, **kwargs) -> List[Document]:
-        """Asynchronously query documents."""
-        raise NotImplementedError
+        """Asynchronously query documents.
+
+        The sync query runs on the blocking executor by default, stores with an async
+        client should override it with a native coroutine.
+        """
+        return await run_blocking(self.query, query, **kwargs)
 
     def insert_document(self, documents: List[Document], **kwargs):
         """Insert documents into the store."""
@@ -74,7 +79,7 @@ class Store(ComponentBase):
 
     async def async_insert_document(self, documents: List[Document], **kwargs):
         """Asynchronously insert documents into the store."""
-        raise NotImplementedError
+        return await run_blocking(self.insert_document, documents, **kwargs)
 
     def delete_document(self, document_id: str, **kwargs):
         """Delete the specific document by the document id."""
@@ -82,7 +87,16 @@ class Store(ComponentBase):
 
     async def async_delete_document(self, document_id: str, **kwargs):
         """Asynchronously delete the specific document by the document id."""
-        raise NotImplementedError
+        return await run_blocking(self.delete_document, document_id, **kwargs)
+
+    def delete_documents(self, document_ids: List[str], **kwargs):
+        """Delete the documents by their ids.
+
+        The documents are deleted one by one by default, stores supporting a
+        bulk delete should override it.
+        """
+        for document_id in document_ids:
+            self.delete_document(document_id, **kwargs)
 
     def upsert_document(self, documents: List[Document], **kwargs):
         """Upsert document into the store."""
@@ -90,7 +104,7 @@ class Store(ComponentBase):
 
     async def async_upsert_document(self, documents: List[Document], **kwargs):
         """Asynchronously upsert documents into the store."""
-        raise NotImplementedError
+        return await run_blocking(self.upsert_document, documents, **kwargs)
 
     def update_document(self, documents: List[Document], **kwargs):
         """Update document into the store."""
@@ -98,7 +112,7 @@ class Store(ComponentBase):
 
     async def async_update_document(self, documents: List[Document], **kwargs):
         """Asynchronously update documents into the store."""
-        raise NotImplementedError
+        return await run_blocking(self.update_document, documents, **kwargs)
 
     def create_copy(self):
         # TODO: Store copy need to solve thread lock problem
@@ -18,6 +18,7 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.tool_configer import ToolConfiger
+from agentuniverse.base.util.blocking_executor import run_blocking
 
 
 class ToolInput(BaseModel):
@@ -70,6 +71,13 @@ class Tool(ComponentBase):
         tool_input = ToolInput(kwargs)
         return self.execute(tool_input)
 
+    @trace_tool
+    async def async_run(self, **kwargs):
+        """The asynchronous callable method that runs the tool."""
+        self.input_check(kwargs)
+        tool_input = ToolInput(kwargs)
+        return await self.async_execute(tool_input)
+
     def input_check(self, kwargs: dict) -> None:
         """Check whether the input parameters of the tool contain input keys of the tool"""
         if self.input_keys:
@@ -87,6 +95,16 @@ class Tool(ComponentBase):
             tool_input.add_data(key, parse_result[key])
         return self.execute(tool_input)
 
+    @trace_tool
+    async def async_langchain_run(self, *args, callbacks=None, **kwargs):
+        """The asynchronous callable method that runs the tool in langchain."""
+        kwargs["callbacks"] = callbacks
+        tool_input = ToolInput(kwargs)
+        parse_result = self.parse_react_input(args[0])
+        for key in self.input_keys:
+            tool_input.add_data(key, parse_result[key])
+        return await self.async_execute(tool_input)
+
     def parse_react_input(self, input_str: str):
         """
             parse react string to you input
@@ -100,10 +118,19 @@ class Tool(ComponentBase):
     def execute(self, tool_input: ToolInput):
         raise NotImplementedError
 
+    async def async_execute(self, tool_input: ToolInput):
+        """Asynchronously execute the tool.
+
+        The sync `execute` runs on the blocking executor by default, tools doing network
+        io should override it with a native coroutine.
+        """
+        return await run_blocking(self.execute, tool_input)
+
     def as_langchain(self) -> LangchainTool:
         """Convert the agentUniverse(aU) tool class to the langchain tool class."""
         return LangchainTool(name=self.name,
                              func=self.langchain_run,
+                             coroutine=self.async_langchain_run,
                              description=self.description)
 
     def get_instance_code(self) -> str:
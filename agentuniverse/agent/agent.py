@@ -5,6 +5,7 @@
 # @Author  : heji
 # @Email   : lc299034@antgroup.com
 # @FileName: agent.py
+import functools
 import json
 import uuid
 from abc import abstractmethod, ABC
@@ -38,6 +39,7 @@ from agentuniverse.base.config.component_configer.configers.agent_configer \
     import AgentConfiger
 from agentuniverse.base.util.agent_util import process_agent_llm_config
 from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.fan_out_executor import run_actions, async_run_actions
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.memory_util import generate_messages, get_memory_string
@@ -142,7 +144,18 @@ class Agent(ComponentBase, ABC):
         return planner_result
 
     async def async_execute(self, input_object: InputObject, agent_input: dict) -> dict:
-        pass
+        """Asynchronously execute agent instance.
+
+        Args:
+            input_object (InputObject): input parameters passed by the user.
+            agent_input (dict): agent input parsed from `input_object` by the user.
+
+        Returns:
+            dict: planner result generated by the planner execution.
+        """
+        planner_base: Planner = PlannerManager().get_instance_obj(self.agent_model.plan.get('planner').get('name'))
+        planner_result = await planner_base.async_invoke(self.agent_model, agent_input, input_object)
+        return planner_result
 
     def pre_parse_input(self, input_object) -> dict:
         """Agent execution parameter pre-parsing.
@@ -220,6 +233,19 @@ class Agent(ComponentBase, ABC):
             result_dict[key] = output_object.get_data(key)
         return result_dict
 
+    async def async_langchain_run(self, input: str, callbacks=None, **kwargs):
+        """Asynchronously run the agent model using LangChain."""
+        try:
+            parse_result = parse_json_markdown(input)
+        except Exception as e:
+            LOGGER.error(f"langchain run parse_json_markdown error,input(parse_result) error({str(e)})")
+            return "Error , Your Action Input is not a valid JSON string"
+        output_object = await self.async_run(**parse_result, callbacks=callbacks, **kwargs)
+        result_dict = {}
+        for key in self.output_keys():
+            result_dict[key] = output_object.get_data(key)
+        return result_dict
+
     def as_langchain_tool(self):
         """Convert to LangChain tool."""
         from langchain.agents.tools import Tool
@@ -236,6 +262,7 @@ class Agent(ComponentBase, ABC):
         return Tool(
             name=self.agent_model.info.get("name"),
             func=self.langchain_run,
+            coroutine=self.async_langchain_run,
             description=self.agent_model.info.get("description") + args_description
         )
 
@@ -328,33 +355,82 @@ class Agent(ComponentBase, ABC):
         if not tool_names:
             return ''
 
-        tool_results: list = list()
+        actions: list = list()
 
         for tool_name in tool_names:
             tool: Tool = ToolManager().get_instance_obj(tool_name)
             if tool is None:
                 continue
             tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
-            tool_results.append(str(tool.run(**tool_input)))
-        return "\n\n".join(tool_results)
+            actions.append((tool_name, functools.partial(tool.run, **tool_input)))
+        tool_results = run_actions(actions, self._action_timeout())
+        return "\n\n".join([str(tool_result) for tool_result in tool_results])
+
+    async def async_invoke_tools(self, input_object: InputObject, **kwargs) -> str:
+        tool_names = kwargs.get('tool_names') or self.agent_model.action.get('tool', [])
+        if not tool_names:
+            return ''
+
+        actions: list = list()
+
+        for tool_name in tool_names:
+            tool: Tool = ToolManager().get_instance_obj(tool_name)
+            if tool is None:
+                continue
+            tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
+            actions.append((tool_name, functools.partial(tool.async_run, **tool_input)))
+        tool_results = await async_run_actions(actions, self._action_timeout())
+        return "\n\n".join([str(tool_result) for tool_result in tool_results])
 
     def invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
         knowledge_names = kwargs.get('knowledge_names') or self.agent_model.action.get('knowledge', [])
         if not knowledge_names or not query_str:
             return ''
 
-        knowledge_results: list = list()
+        actions: list = list()
+
+        for knowledge_name in knowledge_names:
+            knowledge: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
+            if knowledge is None:
+                continue
+
+            def query_knowledge(knowledge: Knowledge = knowledge) -> str:
+                knowledge_res: List[Document] = knowledge.query_knowledge(
+                    query_str=query_str,
+                    **input_object.to_dict()
+                )
+                return knowledge.to_llm(knowledge_res)
+
+            actions.append((knowledge_name, query_knowledge))
+        return "\n\n".join(run_actions(actions, self._action_timeout()))
+
+    async def async_invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
+        knowledge_names = kwargs.get('knowledge_names') or self.agent_model.action.get('knowledge', [])
+        if not knowledge_names or not query_str:
+            return ''
+
+        actions: list = list()
 
         for knowledge_name in knowledge_names:
             knowledge: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
             if knowledge is None:
                 continue
-            knowledge_res: List[Document] = knowledge.query_knowledge(
-                query_str=query_str,
-                **input_object.to_dict()
-            )
-            knowledge_results.append(knowledge.to_llm(knowledge_res))
-        return "\n\n".join(knowledge_results)
+
+            async def query_knowledge(knowledge: Knowledge = knowledge) -> str:
+                knowledge_res: List[Document] = await knowledge.async_query_knowledge(
+                    query_str=query_str,
+                    **input_object.to_dict()
+                )
+                return knowledge.to_llm(knowledge_res)
+
+            actions.append((knowledge_name, query_knowledge))
+        return "\n\n".join(await async_run_actions(actions, self._action_timeout()))
+
+    def _action_timeout(self) -> Optional[float]:
+        """The seconds each tool, knowledge or sub-agent action may take, from
+        the `timeout` in the action configuration. A timed out action is only
+        abandoned, the tools must enforce their own timeouts to stop."""
+        return (self.agent_model.action or {}).get('timeout')
 
     def process_prompt(self, agent_input: dict, **kwargs) -> ChatPrompt:
         expert_framework = agent_input.pop('expert_framework', '') or ''
@@ -6,14 +6,17 @@
 # @Email   : weizhongjie.wzj@antgroup.com
 # @FileName: trace_memory.py
 
+import atexit
 import datetime
 import json
 import queue
+import threading
+import time
 import traceback
 import uuid
 from concurrent.futures.thread import ThreadPoolExecutor
 from threading import Thread
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from agentuniverse.agent.agent_manager import AgentManager
 
@@ -27,6 +30,9 @@ from agentuniverse.base.config.application_configer.application_config_manager i
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.logging.logging_util import LOGGER
 
+# the seconds waited at exit for the trace event processed by the consumer thread
+EXIT_TIMEOUT = 5
+
 
 def generate_relation_str(source: str, target: str, source_type: str, target_type: str, type: str):
     if source_type == 'agent' and target_type == 'agent' and type == 'input':
@@ -96,28 +102,43 @@ def generate_relation_str_en(source: str, target: str, source_type: str, target_
     return None
 
 
-def sync_to_sub_agent_memory(message: ConversationMessage, session_id: str, memory_name: str):
-    def add_message(agent_name: str, memory_names: list, collect_type: str):
+def get_sub_agent_memory_names(message: ConversationMessage) -> List[str]:
+    """Return the conversation memories of the agents sending or receiving the message,
+    which collect the message type."""
+
+    def get_memory_name(agent_name: str, collect_type: str) -> Optional[str]:
         agent_instance = AgentManager().get_instance_obj(agent_name)
         agent_memory = agent_instance.agent_model.memory.get('conversation_memory')
         collection_types = agent_instance.agent_model.memory.get('collection_types')
         if collection_types and collect_type not in collection_types:
-            return
-        if agent_memory:
-            memory_instance = MemoryManager().get_instance_obj(agent_memory)
-            memory_instance.add([message], session_id=session_id)
-            memory_names.append(agent_memory)
+            return None
+        return agent_memory
 
-    memory_names = [memory_name]
+    memory_names = []
     if message.source_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.source, memory_names, message.target_type)
-
+        memory_names.append(get_memory_name(message.source, message.target_type))
     if message.target_type == ConversationMessageSourceType.AGENT.value:
-        add_message(message.target, memory_names, message.source_type)
+        memory_names.append(get_memory_name(message.target, message.source_type))
+    return [memory_name for memory_name in memory_names if memory_name]
+
+
+def sync_to_sub_agent_memory(message: ConversationMessage, session_id: str, memory_name: str):
+    for agent_memory in get_sub_agent_memory_names(message):
+        memory_instance = MemoryManager().get_instance_obj(agent_memory)
+        memory_instance.add([message], session_id=session_id)
 
 
 @singleton
 class ConversationMemoryModule:
+    """The module collecting the conversation between the users, agents, tools,
+    knowledge and llms into the conversation memories.
+
+    The trace events are queued by the callers and turned into messages by a
+    consumer thread. The messages are buffered and written in batches, one
+    `Memory.add` per memory and session, every `flush_interval` seconds or once
+    `batch_size` messages are pending, so a request costs a few bulk writes
+    instead of a round-trip per agent, tool and llm hop.
+    """
 
     def __init__(self):
         conversation_memory_configer = ApplicationConfigManager().app_configer.conversation_memory_configer
@@ -127,21 +148,105 @@ class ConversationMemoryModule:
         self.collection_types = conversation_memory_configer.get('collection_types', ['agent', 'user'])
         self.conversation_format = conversation_memory_configer.get('conversation_format', 'cn')
         self.max_content_length = conversation_memory_configer.get('max_content_length', 8000)
+        self.flush_interval = float(conversation_memory_configer.get('flush_interval', 0.5))
+        self.batch_size = int(conversation_memory_configer.get('batch_size', 100))
         self.queue = queue.Queue(1000)
+        # the memories of a batch are written in parallel
         self.thread_pool = ThreadPoolExecutor(max_workers=conversation_memory_configer.get('thread_pool', 4))
+        # (memory name, session id, message) waiting for the next batch
+        self.__pending: List[Tuple[str, str, ConversationMessage]] = []
+        self.__pending_lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
         Thread(target=self._consume_queue, daemon=True).start()
+        atexit.register(self.flush_at_exit)
+
+    def _process(self, func) -> None:
+        try:
+            func()
+        except Exception as e:
+            LOGGER.error(f"Failed to process trace info: {e}")
+            # 打印详细堆栈信息
+            traceback.print_exc()
+        finally:
+            self.queue.task_done()
 
     def _consume_queue(self):
+        next_flush = None
         while True:
-            func = self.queue.get()
+            timeout = None if next_flush is None else max(next_flush - time.monotonic(), 0)
             try:
-                self.thread_pool.submit(func)
-            except Exception as e:
-                LOGGER.error(f"Failed to process trace info: {e}")
-                # 打印详细堆栈信息
-                traceback.print_exc()
-            finally:
-                self.queue.task_done()
+                func = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                func = None
+            if func is not None:
+                self._process(func)
+            pending_count = self.pending_count()
+            if pending_count == 0:
+                next_flush = None
+                continue
+            if next_flush is None:
+                next_flush = time.monotonic() + self.flush_interval
+            if pending_count >= self.batch_size or time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = None
+
+    def pending_count(self) -> int:
+        """Return the number of the messages waiting for the next batch."""
+        with self.__pending_lock:
+            return len(self.__pending)
+
+    def _add_message(self, memory_name: str, message: ConversationMessage, session_id: str) -> None:
+        with self.__pending_lock:
+            self.__pending.append((memory_name, session_id, message))
+
+    def flush(self) -> None:
+        """Write the pending messages, one deduplicated batch per memory and session."""
+        with self.__flush_lock:
+            with self.__pending_lock:
+                pending, self.__pending = self.__pending, []
+            if not pending:
+                return
+            batches: Dict[Tuple[str, str], Dict[str, ConversationMessage]] = {}
+            for memory_name, session_id, message in pending:
+                batches.setdefault((memory_name, session_id), {}).setdefault(message.id, message)
+            futures = []
+            for (memory_name, session_id), messages in batches.items():
+                try:
+                    futures.append(self.thread_pool.submit(self._write_batch, memory_name, session_id,
+                                                           list(messages.values())))
+                except RuntimeError:
+                    # the pool is shut down, e.g. at the interpreter exit before the atexit hooks run
+                    self._write_batch(memory_name, session_id, list(messages.values()))
+            for future in futures:
+                future.result()
+
+    def flush_at_exit(self) -> None:
+        """Turn the queued trace events into messages and write all the pending
+        messages, run at the interpreter exit.
+
+        The consumer thread is a daemon, so the events left in the queue are
+        processed here, after waiting at most `EXIT_TIMEOUT` seconds for the
+        one it is processing. The thread pool is already shut down by then, so
+        the batches are written inline.
+        """
+        while True:
+            try:
+                func = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._process(func)
+        with self.queue.all_tasks_done:
+            self.queue.all_tasks_done.wait_for(lambda: not self.queue.unfinished_tasks, timeout=EXIT_TIMEOUT)
+        self.flush()
+
+    @staticmethod
+    def _write_batch(memory_name: str, session_id: str, messages: List[ConversationMessage]) -> None:
+        try:
+            memory = MemoryManager().get_instance_obj(memory_name)
+            if memory:
+                memory.add(messages, session_id=session_id)
+        except Exception as e:
+            LOGGER.error(f"Failed to write {len(messages)} messages to the memory {memory_name}: {e}")
 
     def _add_trace_info(self, source: str,
                         source_type: str,
@@ -208,10 +313,9 @@ class ConversationMemoryModule:
             content=f"{content}"
         )
         if self.instance_name:
-            memory = MemoryManager().get_instance_obj(self.instance_name)
-            if memory:
-                memory.add([message], session_id=kwargs.get('session_id'))
-        sync_to_sub_agent_memory(message, kwargs.get('session_id'), self.instance_name)
+            self._add_message(self.instance_name, message, kwargs.get('session_id'))
+        for agent_memory in get_sub_agent_memory_names(message):
+            self._add_message(agent_memory, message, kwargs.get('session_id'))
 
     def _add_trace(self, start_info, target_info: dict, type: str, params: dict, session_id: str, trace_id: str,
                    pair_id: str):
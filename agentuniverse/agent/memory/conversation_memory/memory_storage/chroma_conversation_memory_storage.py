@@ -9,7 +9,7 @@ import json
 import uuid
 from datetime import datetime
 from urllib.parse import urlparse
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 
 import chromadb
 from pydantic import SkipValidation
@@ -105,12 +105,17 @@ class ChromaConversationMemoryStorage(MemoryStorage):
             self._init_collection()
         if not message_list:
             return
+        # one embedding call and one collection add for the whole batch
+        messages: Dict[str, ConversationMessage] = {}
         for message in message_list:
-            embedding = []
-            if self.embedding_model:
-                embedding = EmbeddingManager().get_instance_obj(
-                    self.embedding_model
-                ).get_embeddings([message.content])[0]
+            messages.setdefault(message.id if message.id else str(uuid.uuid4()), message)
+        embeddings = None
+        if self.embedding_model:
+            embeddings = EmbeddingManager().get_instance_obj(
+                self.embedding_model
+            ).get_embeddings([message.content for message in messages.values()])
+        metadatas = []
+        for message in messages.values():
             metadata = {'timestamp': datetime.now().isoformat()}
             if session_id:
                 metadata['session_id'] = session_id
@@ -125,12 +130,14 @@ class ChromaConversationMemoryStorage(MemoryStorage):
             metadata['prefix'] = message.metadata.get('prefix')
             metadata['pair_id'] = message.metadata.get('pair_id')
             metadata['additional_args'] = json.dumps(message.additional_args)
-            self._collection.add(
-                ids=[message.id if message.id else str(uuid.uuid4())],
-                documents=[message.content],
-                metadatas=[metadata],
-                embeddings=[embedding] if len(embedding) > 0 else None,
-            )
+            metadatas.append(metadata)
+        # the ids already in the collection are skipped by chroma
+        self._collection.add(
+            ids=list(messages.keys()),
+            documents=[message.content for message in messages.values()],
+            metadatas=metadatas,
+            embeddings=embeddings if embeddings else None,
+        )
 
     def get(self, session_id: str = None, agent_id: str = None, top_k=50, input: str = '', **kwargs) -> \
             List[ConversationMessage]:
@@ -143,12 +143,17 @@ class ElasticsearchMemoryStorage(MemoryStorage):
             agent_id (str): The agent id of the memory to add.
         """
         message_list = ConversationMessage.check_and_convert_message(message_list, session_id)
-        actions = []
+        if not message_list:
+            return
+        actions = {}
         for message in message_list:
-            action = self.memory_converter.to_es_action(message, session_id=session_id, agent_id=agent_id, **kwargs)
-            actions.append(action)
+            if message.id in actions:
+                continue
+            actions[message.id] = self.memory_converter.to_es_action(message, session_id=session_id,
+                                                                     agent_id=agent_id, op_type='create', **kwargs)
 
-        bulk_data = '\n'.join(actions) + '\n'  # Elasticsearch bulk data format requires newlines between actions
+        # Elasticsearch bulk data format requires newlines between actions
+        bulk_data = '\n'.join(actions.values()) + '\n'
         response = self.client.post(
             f"/{self.index_name}/_bulk",
             content=bulk_data,
@@ -156,6 +161,14 @@ class ElasticsearchMemoryStorage(MemoryStorage):
         )
         if response.status_code != 200:
             raise Exception(f"Failed to add documents: {response.text}")
+        result = response.json()
+        if result.get('errors'):
+            # the messages already stored are rejected by the create actions with a conflict
+            failed_items = [item for item in result.get('items', [])
+                            if item.get('create', {}).get('status', 200) >= 300
+                            and item.get('create', {}).get('status') != 409]
+            if failed_items:
+                raise Exception(f"Failed to add documents: {failed_items[0].get('create', {}).get('error')}")
 
     def get(self, session_id: str = None, agent_id: str = None, top_k=50, trace_id: str = None, **kwargs) -> List[
         ConversationMessage]:
@@ -275,8 +288,10 @@ class DefaultMemoryConverter:
             'additional_args': es_hit['_source'].get('additional_args')
         })
 
-    def to_es_action(self, message: ConversationMessage, session_id: str = None, agent_id: str = None, **kwargs) -> str:
-        """Convert a message to an Elasticsearch action (index operation)."""
+    def to_es_action(self, message: ConversationMessage, session_id: str = None, agent_id: str = None,
+                     op_type: str = 'index', **kwargs) -> str:
+        """Convert a message to an Elasticsearch action, an index operation by default or a create
+        operation leaving the stored document untouched."""
         document = {
             "session_id": session_id,
             "content": message.content,
@@ -294,6 +309,6 @@ class DefaultMemoryConverter:
 
         }
         index_info = {
-            "index": {"_index": self.index_name, "_id": message.id}
+            op_type: {"_index": self.index_name, "_id": message.id}
         }
         return f'{json.dumps(index_info)}\n{json.dumps(document)}'  # Format for Elasticsearch bulk requests
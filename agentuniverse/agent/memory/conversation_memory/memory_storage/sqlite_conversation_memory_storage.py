@@ -9,11 +9,14 @@ import datetime
 import json
 import uuid
 from abc import abstractmethod
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func, or_, create_engine, Engine, insert
+from sqlalchemy import Integer, String, DateTime, Text, Column, Index, and_, func, or_, create_engine, Engine, insert, \
+    select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
 from agentuniverse.agent.memory.conversation_memory.enum import ConversationMessageEnum, ConversationMessageSourceType
@@ -85,6 +88,8 @@ def create_memory_model(table_name: str, DynamicBase: Any) -> Any:
             Index(f"idx_{table_name}_session_id_source", 'session_id', 'source', 'source_type'),
             Index(f"idx_{table_name}_session_id_source_type", 'session_id', 'target', 'target_type'),
             Index(f"idx_{table_name}_session_id_gmt_created", 'session_id', 'timestamp'),
+            # the latest messages of a session filtered by type or target are read backwards along the index
+            Index(f"idx_{table_name}_session_id_type_target_timestamp", 'session_id', 'type', 'target', 'timestamp'),
             Index(f"idx_{table_name}_message_id_unique", 'message_id', unique=True)
         )
 
@@ -195,8 +200,14 @@ class SqliteMemoryStorage(MemoryStorage):
     def _create_table_if_not_exists(self) -> None:
         """Create the db table if it does not exist."""
         with self.engine.connect() as conn:
-            if not conn.dialect.has_table(conn, self.sqldb_table_name):
-                self.memory_converter.get_sql_model_class().__table__.create(conn)
+            table_exists = conn.dialect.has_table(conn, self.sqldb_table_name)
+        table = self.memory_converter.get_sql_model_class().__table__
+        if not table_exists:
+            table.create(self.engine)
+        else:
+            # the tables created by the former versions lack the newer indexes
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
 
     def delete(self, session_id: str = None, agent_id: str = None, trace_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -251,18 +262,45 @@ class SqliteMemoryStorage(MemoryStorage):
         message_list = ConversationMessage.check_and_convert_message(message_list, session_id)
         if self.engine is None:
             self._init_db()
-        if message_list is None:
+        if not message_list:
             return
 
-        with self.session() as session:
-            for message in message_list:
-                existing_message = session.query(self.memory_converter.get_sql_model_class()).filter_by(
-                    message_id=message.id).first()
-                if not existing_message:
-                    session.add(self.memory_converter.to_sql_model(message=message,
-                                                                   session_id=session_id if session_id else None,
-                                                                   agent_id=agent_id, **kwargs))
-            session.commit()
+        # one insert ignoring the stored messages for the whole batch, instead of a lookup per message
+        rows: Dict[str, dict] = {}
+        model_class = self.memory_converter.get_sql_model_class()
+        columns = [column.name for column in model_class.__table__.columns if column.name != 'id']
+        for message in message_list:
+            sql_model = self.memory_converter.to_sql_model(message=message,
+                                                           session_id=session_id if session_id else None,
+                                                           agent_id=agent_id, **kwargs)
+            row = {column: getattr(sql_model, column) for column in columns
+                   if getattr(sql_model, column) is not None}
+            rows.setdefault(row.get('message_id'), row)
+        # the rows leaving different columns to their defaults are inserted separately
+        grouped_rows: Dict[tuple, List[dict]] = {}
+        for row in rows.values():
+            grouped_rows.setdefault(tuple(row.keys()), []).append(row)
+        with self.engine.begin() as conn:
+            for group in grouped_rows.values():
+                statement = self._insert_ignore_statement(conn, model_class.__table__, group)
+                if statement is not None:
+                    conn.execute(statement, group)
+
+    @staticmethod
+    def _insert_ignore_statement(conn: Any, table: Any, rows: List[dict]) -> Any:
+        """Build the insert skipping the rows whose message_id is already stored."""
+        dialect = conn.dialect.name
+        if dialect == 'sqlite':
+            return sqlite_insert(table).on_conflict_do_nothing(index_elements=['message_id'])
+        if dialect == 'postgresql':
+            return postgresql_insert(table).on_conflict_do_nothing(index_elements=['message_id'])
+        if dialect in ('mysql', 'mariadb'):
+            return insert(table).prefix_with('IGNORE')
+        # the other databases drop the stored messages by one lookup
+        message_ids = [row['message_id'] for row in rows]
+        stored_ids = set(conn.execute(select(table.c.message_id).where(table.c.message_id.in_(message_ids))).scalars())
+        rows[:] = [row for row in rows if row['message_id'] not in stored_ids]
+        return insert(table) if rows else None
 
     def get(self, session_id: str = None, agent_id: str = None, top_k=20, trace_id: str = None, **kwargs) -> List[
         ConversationMessage]:
@@ -321,12 +359,14 @@ class SqliteMemoryStorage(MemoryStorage):
             query = session.query(self.memory_converter.model_class)
             if conditions:
                 query = query.where(and_(*conditions))
-            query = query.order_by(model_class.timestamp.asc())
+            # let the database pick the latest top_k messages, then restore the chronological order
+            query = query.order_by(model_class.timestamp.desc(), model_class.id.desc())
+            if top_k and top_k > 0:
+                query = query.limit(top_k)
 
             # Execute the query and fetch the results
             records = query.all()
-
-            records = records[-top_k:]
+            records.reverse()
 
             messages = []
             for record in records:
@@ -5,6 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: memory.py
+from itertools import accumulate
 from typing import Optional, List
 from langchain_core.memory import BaseMemory
 from pydantic import Extra
@@ -21,7 +22,7 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.memory_configer import MemoryConfiger
-from agentuniverse.base.util.memory_util import get_memory_tokens, get_memory_string
+from agentuniverse.base.util.memory_util import get_message_tokens, get_memory_string
 
 
 class Memory(ComponentBase):
@@ -99,16 +100,25 @@ class Memory(ComponentBase):
         new_memories = memories[:]
 
         agent_llm_name = self.agent_llm_name if hasattr(self, 'agent_llm_name') else None
-        tokens = get_memory_tokens(new_memories, agent_llm_name)
+        message_tokens = get_message_tokens(new_memories, agent_llm_name)
+        tokens = sum(message_tokens)
 
         if tokens <= self.max_tokens:
             return new_memories
 
-        pruned_memories = []
-        while tokens > self.max_tokens:
-            pruned_memory = new_memories.pop(0)
-            pruned_memories.append(pruned_memory)
-            tokens = get_memory_tokens(new_memories, agent_llm_name)
+        # the tokens left after pruning the first i messages never increase with i,
+        # so the fewest messages to prune are found by a binary search.
+        suffix_tokens = list(accumulate(reversed(message_tokens)))[::-1] + [0]
+        low, high = 1, len(new_memories)
+        while low < high:
+            mid = (low + high) // 2
+            if suffix_tokens[mid] <= self.max_tokens:
+                high = mid
+            else:
+                low = mid + 1
+        pruned_memories = new_memories[:low]
+        new_memories = new_memories[low:]
+        tokens = suffix_tokens[low]
 
         if pruned_memories:
             memory_compressor: MemoryCompressor = MemoryCompressorManager().get_instance_obj(self.memory_compressor)
@@ -5,20 +5,89 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: ram_memory_storage.py
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, List, Dict
 
+from pydantic import PrivateAttr
+
 from agentuniverse.agent.memory.memory_storage.memory_storage import MemoryStorage
 from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
 
 
 class RamMemoryStorage(MemoryStorage):
     """The ram memory storage class.
 
+    The storage is bounded, so the sessions of a long-lived worker do not stay
+    resident forever: every agent of a session keeps its latest
+    `max_session_messages` messages, and once more than `max_sessions` sessions
+    or more than `max_bytes` of message content are resident, the least recently
+    used sessions are evicted. A session not used for `session_ttl` seconds
+    expires. The evicted sessions are dropped, or spilled to the sqlite file at
+    `spill_path` and loaded back when they are used again.
+
     Attributes:
-        messages (dict[str, dict[str, list[Message]]]): The messages in the ram memory.
+        messages (dict[str, dict[str, list[Message]]]): The messages in the ram memory, the least
+            recently used session first.
+        max_session_messages (int): The max number of the messages of an agent in a session, 0 for no limit.
+        max_sessions (int): The max number of the resident sessions, 0 for no limit.
+        max_bytes (int): The max size of the resident message content, 0 for no limit.
+        session_ttl (float): The seconds an unused session is kept, 0 for no expiry.
+        spill_path (Optional[str]): The sqlite file the evicted sessions are spilled to, None to drop them.
     """
 
-    messages: Optional[Dict[str, Dict[str, List[Message]]]] = dict()
+    messages: Optional[Dict[str, Dict[str, List[Message]]]] = OrderedDict()
+    max_session_messages: int = 1000
+    max_sessions: int = 10000
+    max_bytes: int = 0
+    session_ttl: float = 0
+    spill_path: Optional[str] = None
+
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    _session_bytes: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _session_touched: Dict[str, float] = PrivateAttr(default_factory=dict)
+    _resident_bytes: int = PrivateAttr(default=0)
+    _counters: Dict[str, int] = PrivateAttr(default_factory=lambda: {
+        'evicted_sessions': 0, 'evicted_messages': 0, 'expired_sessions': 0, 'spilled_sessions': 0,
+        'restored_sessions': 0})
+    _spill_conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _spill_pid: Optional[int] = PrivateAttr(default=None)
+    _spill_purged: float = PrivateAttr(default=0)
+
+    def model_post_init(self, __context) -> None:
+        if not isinstance(self.messages, OrderedDict):
+            self.messages = OrderedDict(self.messages or {})
+        for session_id, session in self.messages.items():
+            self._session_touched[session_id] = time.monotonic()
+            self._update_session_bytes(session_id, sum(self._message_size(message)
+                                                       for agent_messages in session.values()
+                                                       for message in agent_messages))
+
+    def _initialize_by_component_configer(self, memory_storage_config: ComponentConfiger) -> 'RamMemoryStorage':
+        """Initialize the RamMemoryStorage by the ComponentConfiger object.
+
+        Args:
+            memory_storage_config(ComponentConfiger): A configer contains ram_memory_storage basic info.
+        Returns:
+            RamMemoryStorage: A RamMemoryStorage instance.
+        """
+        super()._initialize_by_component_configer(memory_storage_config)
+        if getattr(memory_storage_config, 'max_session_messages', None) is not None:
+            self.max_session_messages = int(memory_storage_config.max_session_messages)
+        if getattr(memory_storage_config, 'max_sessions', None) is not None:
+            self.max_sessions = int(memory_storage_config.max_sessions)
+        if getattr(memory_storage_config, 'max_bytes', None) is not None:
+            self.max_bytes = int(memory_storage_config.max_bytes)
+        if getattr(memory_storage_config, 'session_ttl', None) is not None:
+            self.session_ttl = float(memory_storage_config.session_ttl)
+        if getattr(memory_storage_config, 'spill_path', None):
+            self.spill_path = memory_storage_config.spill_path
+        return self
 
     def add(self, message_list: List[Message], session_id: str = '', agent_id: str = '', **kwargs) -> None:
         """Add messages to the memory db.
@@ -30,9 +99,18 @@ class RamMemoryStorage(MemoryStorage):
         """
         if not message_list:
             return
-        session = self.messages.setdefault(session_id, {})
-        agent_messages = session.setdefault(agent_id, [])
-        agent_messages.extend(message_list)
+        with self._lock:
+            self._expire_sessions()
+            session = self._load_session(session_id, create=True)
+            agent_messages = session.setdefault(agent_id, [])
+            agent_messages.extend(message_list)
+            self._update_session_bytes(session_id, sum(self._message_size(message) for message in message_list))
+            if 0 < self.max_session_messages < len(agent_messages):
+                trimmed = agent_messages[:len(agent_messages) - self.max_session_messages]
+                del agent_messages[:len(trimmed)]
+                self._counters['evicted_messages'] += len(trimmed)
+                self._update_session_bytes(session_id, -sum(self._message_size(message) for message in trimmed))
+            self._evict_sessions(keep=session_id)
 
     def delete(self, session_id: str = None, agent_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -41,11 +119,19 @@ class RamMemoryStorage(MemoryStorage):
             session_id (str): The session id of the memory to delete.
             agent_id (str): The agent id of the memory to delete.
         """
-        if session_id is not None:
+        if session_id is None:
+            return
+        with self._lock:
             if agent_id is None:
-                self.messages.pop(session_id, None)
-            else:
-                self.messages.get(session_id, {}).pop(agent_id, None)
+                self._drop_session(session_id)
+                self._delete_spilled(session_id)
+                return
+            session = self._load_session(session_id, create=False)
+            if session is None:
+                return
+            removed = session.pop(agent_id, None)
+            if removed:
+                self._update_session_bytes(session_id, -sum(self._message_size(message) for message in removed))
 
     def get(self, session_id: str = '', agent_id: str = '', top_k=10, **kwargs) -> \
             List[Message]:
@@ -59,5 +145,134 @@ class RamMemoryStorage(MemoryStorage):
         Returns:
             List[Message]: The list of aU messages.
         """
-        memories = self.messages.get(session_id, {}).get(agent_id, [])
-        return memories[-top_k:]
+        with self._lock:
+            self._expire_sessions()
+            session = self._load_session(session_id, create=False)
+            if session is None:
+                return []
+            memories = session.get(agent_id, [])
+            result = memories[-top_k:]
+            self._evict_sessions(keep=session_id)
+            return result
+
+    def get_stats(self) -> dict:
+        """Return the resident size of the storage and the eviction counters."""
+        with self._lock:
+            stats = {
+                'resident_sessions': len(self.messages),
+                'resident_messages': sum(len(agent_messages) for session in self.messages.values()
+                                         for agent_messages in session.values()),
+                'resident_bytes': self._resident_bytes,
+            }
+            stats.update(self._counters)
+            return stats
+
+    @staticmethod
+    def _message_size(message: Message) -> int:
+        """The approximate size of the message, the length of its content and metadata."""
+        size = len(message.content) if isinstance(message.content, str) else len(str(message.content or ''))
+        if message.metadata:
+            size += len(str(message.metadata))
+        return size
+
+    def _update_session_bytes(self, session_id: str, delta: int) -> None:
+        self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + delta
+        self._resident_bytes += delta
+
+    def _load_session(self, session_id: str, create: bool) -> Optional[Dict[str, List[Message]]]:
+        """Return the resident session marked as the most recently used, loading it back
+        from the spill store when it was evicted."""
+        session = self.messages.get(session_id)
+        if session is None:
+            session = self._restore_spilled(session_id)
+            if session is None:
+                if not create:
+                    return None
+                session = {}
+            self.messages[session_id] = session
+            self._session_bytes[session_id] = 0
+            self._update_session_bytes(session_id, sum(self._message_size(message)
+                                                       for agent_messages in session.values()
+                                                       for message in agent_messages))
+        self.messages.move_to_end(session_id)
+        self._session_touched[session_id] = time.monotonic()
+        return session
+
+    def _drop_session(self, session_id: str) -> Optional[Dict[str, List[Message]]]:
+        session = self.messages.pop(session_id, None)
+        self._resident_bytes -= self._session_bytes.pop(session_id, 0)
+        self._session_touched.pop(session_id, None)
+        return session
+
+    def _evict_sessions(self, keep: str) -> None:
+        """Evict the least recently used sessions until the storage is within its budgets."""
+        while self.messages:
+            over_sessions = 0 < self.max_sessions < len(self.messages)
+            over_bytes = 0 < self.max_bytes < self._resident_bytes
+            if not over_sessions and not over_bytes:
+                return
+            session_id = next(iter(self.messages))
+            if session_id == keep:
+                # the session in use alone exceeds the budget
+                return
+            session = self._drop_session(session_id)
+            self._counters['evicted_sessions'] += 1
+            if self.spill_path:
+                self._spill(session_id, session)
+            else:
+                self._counters['evicted_messages'] += sum(len(agent_messages) for agent_messages in session.values())
+
+    def _expire_sessions(self) -> None:
+        """Drop the sessions not used for `session_ttl` seconds, the least recently used come first."""
+        if self.session_ttl <= 0:
+            return
+        deadline = time.monotonic() - self.session_ttl
+        while self.messages:
+            session_id = next(iter(self.messages))
+            if self._session_touched.get(session_id, 0) > deadline:
+                break
+            session = self._drop_session(session_id)
+            self._delete_spilled(session_id)
+            self._counters['expired_sessions'] += 1
+            self._counters['evicted_messages'] += sum(len(agent_messages) for agent_messages in session.values())
+        # the spilled sessions are purged at most once per ttl
+        if self.spill_path and time.monotonic() - self._spill_purged > self.session_ttl:
+            conn = self._get_spill_conn()
+            conn.execute('DELETE FROM spilled_session WHERE touched < ?', (time.time() - self.session_ttl,))
+            conn.commit()
+            self._spill_purged = time.monotonic()
+
+    def _get_spill_conn(self) -> sqlite3.Connection:
+        # the sqlite connections can not be shared with the forked workers
+        if self._spill_conn is None or self._spill_pid != os.getpid():
+            self._spill_conn = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._spill_conn.execute('CREATE TABLE IF NOT EXISTS spilled_session '
+                                     '(session_id TEXT PRIMARY KEY, data BLOB, touched REAL)')
+            self._spill_pid = os.getpid()
+        return self._spill_conn
+
+    def _spill(self, session_id: str, session: Dict[str, List[Message]]) -> None:
+        conn = self._get_spill_conn()
+        conn.execute('INSERT OR REPLACE INTO spilled_session (session_id, data, touched) VALUES (?, ?, ?)',
+                     (session_id, pickle.dumps(session), time.time()))
+        conn.commit()
+        self._counters['spilled_sessions'] += 1
+
+    def _restore_spilled(self, session_id: str) -> Optional[Dict[str, List[Message]]]:
+        if not self.spill_path:
+            return None
+        conn = self._get_spill_conn()
+        row = conn.execute('SELECT data FROM spilled_session WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('DELETE FROM spilled_session WHERE session_id = ?', (session_id,))
+        conn.commit()
+        self._counters['restored_sessions'] += 1
+        return pickle.loads(row[0])
+
+    def _delete_spilled(self, session_id: str) -> None:
+        if not self.spill_path:
+            return
+        conn = self._get_spill_conn()
+        conn.execute('DELETE FROM spilled_session WHERE session_id = ?', (session_id,))
+        conn.commit()
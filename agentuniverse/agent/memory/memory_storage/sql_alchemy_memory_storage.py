@@ -73,6 +73,8 @@ def create_memory_model(table_name: str, DynamicBase: Any) -> Any:
             Index('idx_session_id_source', 'session_id', 'agent_id', 'source'),
             Index('idx_agent_id_source', 'agent_id', 'source'),
             Index('idx_gmt_created', 'gmt_created'),
+            # the latest messages of a session are read backwards along the index
+            Index(f'idx_{table_name}_session_id_agent_id_gmt_created', 'session_id', 'agent_id', 'gmt_created'),
         )
 
     return MemoryModel
@@ -147,9 +149,16 @@ class SqlAlchemyMemoryStorage(MemoryStorage):
 
     def _create_table_if_not_exists(self) -> None:
         """Create the db table if it does not exist."""
-        with self._sqldb_wrapper.sql_database._engine.connect() as conn:
-            if not conn.dialect.has_table(conn, self.sqldb_table_name):
-                self.memory_converter.get_sql_model_class().__table__.create(conn)
+        engine = self._sqldb_wrapper.sql_database._engine
+        with engine.connect() as conn:
+            table_exists = conn.dialect.has_table(conn, self.sqldb_table_name)
+        table = self.memory_converter.get_sql_model_class().__table__
+        if not table_exists:
+            table.create(engine)
+        else:
+            # the tables created by the former versions lack the newer indexes
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
 
     def delete(self, session_id: str = None, agent_id: str = None, **kwargs) -> None:
         """Delete the memory from the database.
@@ -241,12 +250,14 @@ class SqlAlchemyMemoryStorage(MemoryStorage):
             query = session.query(self.memory_converter.model_class)
             if conditions:
                 query = query.where(and_(*conditions))
-            query = query.order_by(model_class.gmt_created.asc())
+            # let the database pick the latest top_k messages, then restore the chronological order
+            query = query.order_by(model_class.gmt_created.desc(), model_class.id.desc())
+            if top_k and top_k > 0:
+                query = query.limit(top_k)
 
             # Execute the query and fetch the results
             records = query.all()
-
-            records = records[-top_k:]
+            records.reverse()
 
             messages = []
             for record in records:
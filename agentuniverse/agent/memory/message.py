@@ -5,12 +5,13 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: message.py
-from typing import Optional, List, Union, Dict
+import hashlib
+from typing import Optional, List, Union, Dict, Tuple
 
 from langchain_core.messages import HumanMessage
 from langchain_core.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate, AIMessagePromptTemplate
 from langchain_core.prompts.chat import BaseStringMessagePromptTemplate
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from agentuniverse.agent.memory.enum import ChatMessageEnum
 
@@ -30,6 +31,15 @@ class Message(BaseModel):
     content: Optional[Union[str, List[Union[str, Dict]]]] = None
     source: Optional[str] = None
     metadata: Optional[dict] = None
+    _token_counts: Dict[Tuple[str, str], int] = PrivateAttr(default_factory=dict)
+
+    def get_cached_tokens(self, tokenizer_key: str, message_str: str) -> Optional[int]:
+        """Return the cached number of tokens of the message string counted by the tokenizer."""
+        return self._token_counts.get((tokenizer_key, hashlib.md5(message_str.encode()).hexdigest()))
+
+    def cache_tokens(self, tokenizer_key: str, message_str: str, tokens: int) -> None:
+        """Cache the number of tokens of the message string counted by the tokenizer."""
+        self._token_counts[(tokenizer_key, hashlib.md5(message_str.encode()).hexdigest())] = tokens
 
     def as_langchain(self):
         """Convert the agentUniverse(aU) message class to the langchain message class."""
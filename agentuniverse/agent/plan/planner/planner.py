@@ -6,6 +6,7 @@
 # @FileName: planner.py
 """Base class for Planner."""
 from abc import abstractmethod
+import functools
 import logging
 from queue import Queue
 from typing import Optional, List, Any
@@ -28,6 +29,9 @@ from agentuniverse.base.config.component_configer.configers.planner_configer imp
 from agentuniverse.llm.llm import LLM
 from agentuniverse.llm.llm_manager import LLMManager
 from agentuniverse.prompt.prompt import Prompt
+from agentuniverse.base.util.blocking_executor import run_blocking
+from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.fan_out_executor import run_actions, async_run_actions
 from agentuniverse.base.util.memory_util import generate_messages, get_memory_string
 
 logging.getLogger().setLevel(logging.ERROR)
@@ -63,6 +67,22 @@ class Planner(ComponentBase):
         """
         pass
 
+    async def async_invoke(self, agent_model: AgentModel, planner_input: dict,
+                           input_object: InputObject) -> dict:
+        """Asynchronously invoke the planner.
+
+        The sync `invoke` runs on the blocking executor by default, planners should
+        override it with a native coroutine.
+
+        Args:
+            agent_model (AgentModel): Agent model object.
+            planner_input (dict): Planner input object.
+            input_object (InputObject): The input parameters passed by the user.
+        Returns:
+            dict: The planner result.
+        """
+        return await run_blocking(self.invoke, agent_model, planner_input, input_object)
+
     def handle_memory(self, agent_model: AgentModel, planner_input: dict) -> Memory | None:
         """Memory module processing.
 
@@ -106,34 +126,102 @@ class Planner(ComponentBase):
         knowledge: list = action.get('knowledge') or list()
         agents: list = action.get('agent') or list()
 
-        action_result: list = list()
+        # the tools, the knowledge and the agents run concurrently, their results keep this order.
+        actions: list = list()
+
+        for tool_name in tools:
+            tool = ToolManager().get_instance_obj(tool_name)
+            if tool is None:
+                continue
+            tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
+            actions.append((tool_name, functools.partial(tool.run, **tool_input)))
+
+        for knowledge_name in knowledge:
+            knowledge_instance: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
+            if knowledge_instance is None:
+                continue
+
+            def query_knowledge(knowledge_instance: Knowledge = knowledge_instance) -> str:
+                knowledge_res: List[Document] = knowledge_instance.query_knowledge(
+                    query_str=input_object.get_data(self.input_key),
+                    **input_object.to_dict()
+                )
+                return knowledge_instance.to_llm(knowledge_res)
+
+            actions.append((knowledge_name, query_knowledge))
+
+        for agent_name in agents:
+            agent = AgentManager().get_instance_obj(agent_name)
+            if agent is None:
+                continue
+
+            def run_agent(agent=agent) -> str:
+                agent_input = {key: input_object.get_data(key) for key in agent.input_keys()}
+                output_object = agent.run(**agent_input)
+                return "\n".join([output_object.get_data(key)
+                                  for key in agent.output_keys()
+                                  if output_object.get_data(key) is not None])
+
+            actions.append((agent_name, run_agent))
+
+        action_result: list = run_actions(actions, action.get('timeout'))
+
+        planner_input['background'] = planner_input['background'] or '' + "\n".join(action_result)
+
+    async def async_run_all_actions(self, agent_model: AgentModel, planner_input: dict, input_object: InputObject):
+        """Asynchronously process the tools and the knowledge.
+
+        The async version of `run_all_actions`, the tools, the knowledge and
+        the agents are awaited concurrently on the running event loop.
+
+        Args:
+            agent_model (AgentModel): Agent model object.
+            planner_input (dict): Planner input object.
+            input_object (InputObject): Agent input object.
+        """
+        action: dict = agent_model.action or dict()
+        tools: list = action.get('tool') or list()
+        knowledge: list = action.get('knowledge') or list()
+        agents: list = action.get('agent') or list()
+
+        actions: list = list()
 
         for tool_name in tools:
             tool = ToolManager().get_instance_obj(tool_name)
             if tool is None:
                 continue
             tool_input = {key: input_object.get_data(key) for key in tool.input_keys}
-            action_result.append(tool.run(**tool_input))
+            actions.append((tool_name, functools.partial(tool.async_run, **tool_input)))
 
         for knowledge_name in knowledge:
-            knowledge: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
-            if knowledge is None:
+            knowledge_instance: Knowledge = KnowledgeManager().get_instance_obj(knowledge_name)
+            if knowledge_instance is None:
                 continue
-            knowledge_res: List[Document] = knowledge.query_knowledge(
-                query_str=input_object.get_data(self.input_key),
-                **input_object.to_dict()
-            )
-            action_result.append(knowledge.to_llm(knowledge_res))
+
+            async def query_knowledge(knowledge_instance: Knowledge = knowledge_instance) -> str:
+                knowledge_res: List[Document] = await knowledge_instance.async_query_knowledge(
+                    query_str=input_object.get_data(self.input_key),
+                    **input_object.to_dict()
+                )
+                return knowledge_instance.to_llm(knowledge_res)
+
+            actions.append((knowledge_name, query_knowledge))
 
         for agent_name in agents:
             agent = AgentManager().get_instance_obj(agent_name)
             if agent is None:
                 continue
-            agent_input = {key: input_object.get_data(key) for key in agent.input_keys()}
-            output_object = agent.run(**agent_input)
-            action_result.append("\n".join([output_object.get_data(key)
-                                            for key in agent.output_keys()
-                                            if output_object.get_data(key) is not None]))
+
+            async def run_agent(agent=agent) -> str:
+                agent_input = {key: input_object.get_data(key) for key in agent.input_keys()}
+                output_object = await agent.async_run(**agent_input)
+                return "\n".join([output_object.get_data(key)
+                                  for key in agent.output_keys()
+                                  if output_object.get_data(key) is not None])
+
+            actions.append((agent_name, run_agent))
+
+        action_result: list = await async_run_actions(actions, action.get('timeout'))
 
         planner_input['background'] = planner_input['background'] or '' + "\n".join(action_result)
 
@@ -183,9 +271,7 @@ class Planner(ComponentBase):
             data (dict): The data to be streamed.
         """
         output_stream: Queue = input_object.get_data('output_stream', None)
-        if output_stream is None:
-            return
-        output_stream.put_nowait(data)
+        stream_output(output_stream, data)
 
     def invoke_chain(self, agent_model: AgentModel, chain: RunnableSerializable[Any, str], planner_input: dict,
                      chat_history,
@@ -205,3 +291,21 @@ class Planner(ComponentBase):
             })
             result.append(token)
         return "".join(result)
+
+    async def async_invoke_chain(self, agent_model: AgentModel, chain: RunnableSerializable[Any, str],
+                                 planner_input: dict, chat_history, input_object: InputObject):
+        """The async version of `invoke_chain`, the llm is called by `LLM.acall`."""
+        if not input_object.get_data('output_stream'):
+            res = await chain.ainvoke(input=planner_input, config={"configurable": {"session_id": "unused"}})
+            return res
+        result = []
+        async for token in chain.astream(input=planner_input, config={"configurable": {"session_id": "unused"}}):
+            self.stream_output(input_object, {
+                'type': 'token',
+                'data': {
+                    'chunk': token,
+                    'agent_info': agent_model.info
+                }
+            })
+            result.append(token)
+        return "".join(result)
@@ -50,6 +50,34 @@ class PlanningPlanner(Planner):
                                content=f"Human: {planner_input.get(self.input_key)}, AI: {res}")
         return {**planner_input, self.output_key: res}
 
+    async def async_invoke(self, agent_model: AgentModel, planner_input: dict,
+                           input_object: InputObject) -> dict:
+        """Asynchronously invoke the planner.
+
+        Args:
+            agent_model (AgentModel): Agent model object.
+            planner_input (dict): Planner input object.
+            input_object (InputObject): The input parameters passed by the user.
+        Returns:
+            dict: The planner result.
+        """
+        memory: Memory = self.handle_memory(agent_model, planner_input)
+
+        llm: LLM = self.handle_llm(agent_model)
+
+        prompt: Prompt = self.handle_prompt(agent_model, planner_input)
+        process_llm_token(llm, prompt.as_langchain(), agent_model.profile, planner_input)
+
+        assemble_memory_input(memory, planner_input)
+        chain = prompt.as_langchain() | llm.as_langchain_runnable(agent_model.llm_params()) | StrOutputParser()
+
+        res = await self.async_invoke_chain(agent_model, chain, planner_input, None, input_object)
+
+        assemble_memory_output(memory=memory,
+                               agent_input=planner_input,
+                               content=f"Human: {planner_input.get(self.input_key)}, AI: {res}")
+        return {**planner_input, self.output_key: res}
+
     def handle_prompt(self, agent_model: AgentModel, planner_input: dict) -> Prompt:
         """Prompt module processing.
 
@@ -76,6 +76,41 @@ class ReActPlanner(Planner):
                                      chat_history=planner_input.get(memory.memory_key) if memory else '',
                                      config=self.get_run_config(agent_model, input_object))
 
+    async def async_invoke(self, agent_model: AgentModel, planner_input: dict,
+                           input_object: InputObject) -> dict:
+        """Asynchronously invoke the planner.
+
+        The agent executor is awaited by `ainvoke`, so the llm and the tools are
+        called through their coroutines.
+
+        Args:
+            agent_model (AgentModel): Agent model object.
+            planner_input (dict): Planner input object.
+            input_object (InputObject): The input parameters passed by the user.
+        Returns:
+            dict: The planner result.
+        """
+        memory: Memory = self.handle_memory(agent_model, planner_input)
+
+        llm: LLM = self.handle_llm(agent_model)
+        tools = self.acquire_tools(agent_model.action)
+        prompt: Prompt = self.handle_prompt(agent_model, planner_input)
+        process_llm_token(llm, prompt.as_langchain(), agent_model.profile, planner_input)
+        assemble_memory_input(memory, planner_input)
+        stop_sequence = []
+        if agent_model.plan.get('stop_sequence'):
+            stop_sequence = agent_model.profile.get('stop_sequence')
+        agent = create_react_agent(llm.as_langchain(), tools, prompt.as_langchain(), stop_sequence=stop_sequence,
+                                   bind_params=agent_model.llm_params())
+        agent_executor = AgentExecutor(agent=agent, tools=tools,
+                                       verbose=True,
+                                       handle_parsing_errors=True,
+                                       max_iterations=agent_model.plan.get('planner').get("max_iterations", 15))
+
+        return await agent_executor.ainvoke(input=planner_input, memory=memory.as_langchain() if memory else None,
+                                            chat_history=planner_input.get(memory.memory_key) if memory else '',
+                                            config=self.get_run_config(agent_model, input_object))
+
     @staticmethod
     def get_run_config(agent_model: AgentModel, input_object: InputObject) -> RunnableConfig:
         config = RunnableConfig()
@@ -103,6 +103,13 @@ class AgentTemplate(Agent, ABC):
         return super().invoke_knowledge(query_str=query_str, input_object=input_object,
                                         knowledge_names=self.knowledge_names)
 
+    async def async_invoke_tools(self, input_object: InputObject, **kwargs) -> str:
+        return await super().async_invoke_tools(input_object=input_object, tool_names=self.tool_names)
+
+    async def async_invoke_knowledge(self, query_str: str, input_object: InputObject, **kwargs) -> str:
+        return await super().async_invoke_knowledge(query_str=query_str, input_object=input_object,
+                                                    knowledge_names=self.knowledge_names)
+
     def process_prompt(self, agent_input: dict, **kwargs) -> ChatPrompt:
         return super().process_prompt(agent_input=agent_input, prompt_version=self.prompt_version)
 
@@ -7,8 +7,6 @@
 # @FileName: executing_agent_template.py
 import asyncio
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
 from typing import Optional
 
 from langchain_core.output_parsers import StrOutputParser
@@ -23,14 +21,21 @@ from agentuniverse.base.config.component_configer.configers.agent_configer impor
 from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
 from agentuniverse.base.util.agent_util import assemble_memory_input, assemble_memory_output
 from agentuniverse.base.util.common_util import stream_output
+from agentuniverse.base.util.fan_out_executor import FanOutExecutor
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.prompt_util import process_llm_token
+from agentuniverse.base.util.rate_limiter import TokenBucket, TokenBucketRegistry
 from agentuniverse.llm.llm import LLM
 from agentuniverse.prompt.prompt import Prompt
 
 
 class ExecutingAgentTemplate(AgentTemplate):
-    _context_values: Optional[dict] = {}
+    # The max count of the subtasks running at the same time.
+    concurrency: int = 10
+    # The token bucket pacing of the subtask starts, the pacing of the llm is
+    # used when unset.
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -53,79 +58,80 @@ class ExecutingAgentTemplate(AgentTemplate):
 
     async def customized_async_execute(self, input_object: InputObject, agent_input: dict, memory: Memory, llm: LLM,
                                        prompt: Prompt, **kwargs) -> dict:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._execute_tasks, input_object, agent_input, memory,
-                                          llm, prompt)
+        return await asyncio.to_thread(self._execute_tasks, input_object, agent_input, memory, llm, prompt)
 
     def _execute_tasks(self, input_object: InputObject, agent_input: dict, memory: Memory, llm: LLM,
                        prompt: Prompt, **kwargs) -> dict:
-        self._context_values: dict = FrameworkContextManager().get_all_contexts()
-        _context_values: dict = FrameworkContextManager().get_all_contexts()
+        context_snapshot = FrameworkContextManager().snapshot()
         framework = agent_input.get('framework', [])
+        output_stream = input_object.get_data('output_stream', None)
 
         if len(framework) == 0:
             return {'executing_result': [],
-                    'output_stream': input_object.get_data('output_stream', None)}
-
-        with ThreadPoolExecutor(max_workers=min(len(framework), 10),
-                                thread_name_prefix="executing_agent_template") as thread_executor:
-            futures = []
-            for i, subtask in enumerate(framework):
-                future = thread_executor.submit(self._execute_subtask, subtask, input_object, agent_input, i, memory,
-                                                llm, prompt, context_values=_context_values)
-                futures.append(future)
-                time.sleep(1)
-
-            executing_result = [future.result() for future in as_completed(futures)]
+                    'output_stream': output_stream}
+
+        def execute_subtask(index: int) -> dict:
+            return context_snapshot.run(self._execute_subtask, framework[index], input_object, agent_input, index,
+                                        memory, llm, prompt)
+
+        executing_result = []
+        for result in FanOutExecutor().map_as_completed(execute_subtask, range(len(framework)),
+                                                        concurrency=self.concurrency,
+                                                        rate_limiter=self._get_rate_limiter(llm)):
+            # stream every subtask result as soon as it completes.
+            stream_output(output_stream, {"data": {
+                'output': result,
+                "agent_info": self.agent_model.info
+            }, "type": "executing_subtask"})
+            executing_result.append(result)
 
         executing_result.sort(key=lambda x: x['index'])
-        return {'executing_result': [result for result in executing_result],
-                'output_stream': input_object.get_data('output_stream', None)}
+        return {'executing_result': executing_result,
+                'output_stream': output_stream}
+
+    def _get_rate_limiter(self, llm: LLM) -> Optional[TokenBucket]:
+        if self.requests_per_second:
+            return TokenBucketRegistry().get_bucket(f'agent.{self.agent_model.info.get("name")}',
+                                                    self.requests_per_second, self.burst or 1)
+        return llm.get_rate_limiter()
 
     def _execute_subtask(self, subtask, input_object, agent_input, index, memory, llm, prompt, **kwargs) -> dict:
-        context_tokens = {}
-        FrameworkContextManager().set_all_contexts(kwargs.get('context_values', {}))
-        try:
-            pair_id = uuid.uuid4().hex
-            ConversationMemoryModule().add_agent_input_info(
-                start_info=input_object.get_data('memory_source_info'),
-                instance=self,
-                params={'input': agent_input.get('framework')[index]},
-                pair_id=pair_id,
-                auto=False
-            )
-            input_object_copy = InputObject(input_object.to_dict())
-            agent_input_copy = dict(agent_input)
-
-            self._process_tool_inputs(input_object_copy, subtask)
-
-            knowledge_res = self.invoke_knowledge(subtask, input_object_copy)
-            tools_res = self.invoke_tools(input_object_copy)
-            agent_input_copy['background'] = f"knowledge result: {knowledge_res} \n\n tools result: {tools_res}"
-            agent_input_copy['input'] = subtask
-
-            process_llm_token(llm, prompt.as_langchain(), self.agent_model.profile, agent_input_copy)
-            self.load_memory(memory, agent_input_copy)
-            chain = prompt.as_langchain() | llm.as_langchain_runnable(
-                self.agent_model.llm_params()) | StrOutputParser()
-            res = self.invoke_chain(chain, agent_input_copy, input_object_copy)
-            self.add_memory(memory, f"Human: {agent_input.get('input')}, AI: {res}", agent_input=agent_input)
-            ConversationMemoryModule().add_agent_result_info(
-                agent_instance=self,
-                agent_result={'output': res},
-                target_info=input_object.get_data('memory_source_info'),
-                pair_id=pair_id,
-                auto=False
-            )
-            return {
-                'index': index,
-                'input': f"Question {index + 1}: {subtask}",
-                'output': f"Answer {index + 1}: {res}"
-            }
-        finally:
-            # clear the framework context.
-            for var_name, token in context_tokens.items():
-                FrameworkContextManager().reset_context(var_name, token)
+        pair_id = uuid.uuid4().hex
+        ConversationMemoryModule().add_agent_input_info(
+            start_info=input_object.get_data('memory_source_info'),
+            instance=self,
+            params={'input': agent_input.get('framework')[index]},
+            pair_id=pair_id,
+            auto=False
+        )
+        input_object_copy = InputObject(input_object.to_dict())
+        agent_input_copy = dict(agent_input)
+
+        self._process_tool_inputs(input_object_copy, subtask)
+
+        knowledge_res = self.invoke_knowledge(subtask, input_object_copy)
+        tools_res = self.invoke_tools(input_object_copy)
+        agent_input_copy['background'] = f"knowledge result: {knowledge_res} \n\n tools result: {tools_res}"
+        agent_input_copy['input'] = subtask
+
+        process_llm_token(llm, prompt.as_langchain(), self.agent_model.profile, agent_input_copy)
+        self.load_memory(memory, agent_input_copy)
+        chain = prompt.as_langchain() | llm.as_langchain_runnable(
+            self.agent_model.llm_params()) | StrOutputParser()
+        res = self.invoke_chain(chain, agent_input_copy, input_object_copy)
+        self.add_memory(memory, f"Human: {agent_input.get('input')}, AI: {res}", agent_input=agent_input)
+        ConversationMemoryModule().add_agent_result_info(
+            agent_instance=self,
+            agent_result={'output': res},
+            target_info=input_object.get_data('memory_source_info'),
+            pair_id=pair_id,
+            auto=False
+        )
+        return {
+            'index': index,
+            'input': f"Question {index + 1}: {subtask}",
+            'output': f"Answer {index + 1}: {res}"
+        }
 
     def parse_result(self, agent_result: dict) -> dict:
         # add executing agent final result into the stream output.
@@ -158,6 +164,12 @@ class ExecutingAgentTemplate(AgentTemplate):
     def initialize_by_component_configer(self, component_configer: AgentConfiger) -> 'ExecutingAgentTemplate':
         super().initialize_by_component_configer(component_configer)
         self.prompt_version = self.agent_model.profile.get('prompt_version', 'default_executing_agent.cn')
+        if hasattr(component_configer, "concurrency"):
+            self.concurrency = component_configer.concurrency
+        if hasattr(component_configer, "requests_per_second"):
+            self.requests_per_second = component_configer.requests_per_second
+        if hasattr(component_configer, "burst"):
+            self.burst = component_configer.burst
         self.validate_required_params()
         return self
 
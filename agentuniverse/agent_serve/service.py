@@ -46,11 +46,19 @@ class Service(ComponentBase):
 
     def run(self, **kwargs) -> str:
         """The executed function when the service is called."""
+        self._set_streaming(**kwargs)
+        return self.agent.run(**kwargs).to_json_str()
+
+    async def async_run(self, **kwargs) -> str:
+        """The executed coroutine when the service is called asynchronously."""
+        self._set_streaming(**kwargs)
+        return (await self.agent.async_run(**kwargs)).to_json_str()
+
+    def _set_streaming(self, **kwargs):
         if hasattr(self.agent, 'agent_model') and 'streaming' in kwargs:
             llm_model = self.agent.agent_model.profile.get('llm_model', {})
             llm_model['streaming'] = kwargs['streaming']
             self.agent.agent_model.profile['llm_model'] = llm_model
-        return self.agent.run(**kwargs).to_json_str()
 
     @property
     def service_code(self):
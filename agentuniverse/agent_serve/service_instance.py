@@ -32,3 +32,7 @@ class ServiceInstance(object):
     def run(self, **kwargs) -> str:
         """Call the service run."""
         return self.__service.run(**kwargs)
+
+    async def async_run(self, **kwargs) -> str:
+        """Call the service async run."""
+        return await self.__service.async_run(**kwargs)
@@ -5,10 +5,14 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: request_library.py
+import atexit
 import datetime
+import os
+import threading
+from typing import Dict, Optional
 
 from sqlalchemy import JSON, Integer, String, DateTime, Text, Column
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, bindparam
 from sqlalchemy.orm import declarative_base
 
 from .entity.request_do import RequestDO
@@ -19,13 +23,28 @@ from agentuniverse.base.config.component_configer.configers.sqldb_wrapper_config
 from agentuniverse.base.annotation.singleton import singleton
 from agentuniverse.database.sqldb_wrapper import SQLDBWrapper
 from agentuniverse.database.sqldb_wrapper_manager import SQLDBWrapperManager
+from agentuniverse.base.util.logging.logging_util import LOGGER
 
 REQUEST_TABLE_NAME = 'request_task'
+# The columns never rewritten by an update of the request.
+IMMUTABLE_COLUMNS = ('id', 'request_id', 'gmt_create', 'gmt_modified')
+MAX_FLUSH_RETRIES = 3
 Base = declarative_base()
 
 
 @singleton
 class RequestLibrary:
+    """The persistence of the request tasks in the system database.
+
+    The writes are buffered and coalesced per request id by default, a flusher
+    thread writes them in bulk every `write_behind_interval` seconds or once
+    `write_behind_batch_size` requests are pending, so a streaming request
+    costs one row write per flush instead of a session round trip per step.
+    The buffer is flushed before every query, when a request task ends and at
+    process exit. Set `write_behind_interval` to 0 in the `DB` section to write
+    synchronously.
+    """
+
     def __init__(self, configer: Configer = None):
         """Init the database connection. Use uri in config file or use sqlite
         as default database."""
@@ -50,7 +69,7 @@ class RequestLibrary:
             """SQLAlchemy ORM Model for RequestDO."""
             __tablename__ = request_table_name
             id = Column(Integer, primary_key=True, autoincrement=True)
-            request_id = Column(String(50), nullable=False)
+            request_id = Column(String(50), nullable=False, index=True)
             query = Column(Text)
             session_id = Column(String(50))
             state = Column(String(20))
@@ -74,11 +93,29 @@ class RequestLibrary:
         SQLDBWrapperManager().register(self.sqldb_wrapper.get_instance_code(),
                                        self.sqldb_wrapper)
 
+        self.write_behind_interval = float(configer.get('DB', {}).get('write_behind_interval', 1))
+        self.write_behind_batch_size = int(configer.get('DB', {}).get('write_behind_batch_size', 200))
+        # request_id -> {'insert': bool, 'data': dict or None, 'touch': bool, 'retries': int}
+        self.__pending: Dict[str, dict] = {}
+        self.__pending_lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
+        self.__flush_event = threading.Event()
+        self.__flusher: Optional[threading.Thread] = None
+        self.__flusher_pid: Optional[int] = None
+        self.__table_inited = False
+        atexit.register(self.flush)
+
     def __init_request_table(self):
-        with self.sqldb_wrapper.sql_database._engine.connect() as conn:
-            if not conn.dialect.has_table(conn, self.request_table_name):
-                Base.metadata.create_all(
-                    self.sqldb_wrapper.sql_database._engine)
+        engine = self.sqldb_wrapper.sql_database._engine
+        with engine.connect() as conn:
+            table_exists = conn.dialect.has_table(conn, self.request_table_name)
+        if not table_exists:
+            Base.metadata.create_all(engine)
+        else:
+            # the tables created by the former versions have no request_id index
+            for index in self.request_orm.__table__.indexes:
+                index.create(engine, checkfirst=True)
+        self.__table_inited = True
 
     def get_session(self):
         if not self.session:
@@ -95,6 +132,7 @@ class RequestLibrary:
         Return:
             The target RequestDO or none when no such data.
         """
+        self.flush()
         session = self.get_session()
         try:
             result = session.execute(
@@ -106,52 +144,136 @@ class RequestLibrary:
         finally:
             session.close()
 
-    def add_request(self, request_do: RequestDO) -> int:
+    def add_request(self, request_do: RequestDO) -> Optional[int]:
         """Add the given RequestDO to database.
 
         Args:
             request_do(`RequestDO`): A new RequestDO to be added.
 
         Return:
-            A int stands unique data id in table.
+            A int stands unique data id in table, None when the write is
+            buffered.
         """
-        session = self.get_session()
-        try:
-            request_orm = self.request_orm(**request_do.model_dump())
-            session.add(request_orm)
-            session.commit()
-            return request_orm.id
-        finally:
-            session.close()
+        if self.write_behind_interval <= 0:
+            session = self.get_session()
+            try:
+                request_orm = self.request_orm(**request_do.model_dump())
+                session.add(request_orm)
+                session.commit()
+                return request_orm.id
+            finally:
+                session.close()
+        data = request_do.model_dump(exclude={'id'})
+        with self.__pending_lock:
+            self.__pending[request_do.request_id] = {'insert': True, 'data': data, 'touch': False, 'retries': 0}
+        self.__schedule_flush()
+        return None
 
     def update_request(self, request_do: RequestDO):
         """Update the request data with same request id as the given
         RequestDO."""
-        session = self.get_session()
-        try:
-            db_request_do = session.query(self.request_orm).filter(
-                self.request_orm.request_id == request_do.request_id).first()
-            if db_request_do:
-                update_data = request_do.model_dump(exclude_unset=True)
-                for key, value in update_data.items():
-                    setattr(db_request_do, key, value)
-                session.commit()
-                session.refresh(db_request_do)
-        finally:
-            session.close()
+        data = request_do.model_dump(exclude_unset=True)
+        with self.__pending_lock:
+            entry = self.__pending.get(request_do.request_id)
+            if entry is None:
+                self.__pending[request_do.request_id] = {'insert': False, 'data': data, 'touch': False,
+                                                         'retries': 0}
+            elif entry['data'] is None:
+                entry['data'] = data
+            else:
+                entry['data'].update(data)
+        self.__schedule_flush()
 
     def update_gmt_modified(self, request_id: str):
         """Update the request task latest active time."""
-        session = self.get_session()
-        try:
-            db_request_do = session.query(self.request_orm).filter(
-                self.request_orm.request_id == request_id).first()
-            if db_request_do:
-                setattr(db_request_do, "gmt_modified", datetime.datetime.now())
-                session.commit()
-                session.refresh(db_request_do)
-        finally:
-            session.close()
+        with self.__pending_lock:
+            entry = self.__pending.get(request_id)
+            if entry is None:
+                self.__pending[request_id] = {'insert': False, 'data': None, 'touch': True, 'retries': 0}
+            else:
+                entry['touch'] = True
+        self.__schedule_flush()
+
+    def flush(self):
+        """Write all the buffered request data to database in bulk."""
+        with self.__flush_lock:
+            with self.__pending_lock:
+                if not self.__pending:
+                    return
+                pending, self.__pending = self.__pending, {}
+            try:
+                self.__write(pending)
+            except Exception as e:
+                LOGGER.error(f"flush {len(pending)} request records fail: {str(e)}")
+                self.__requeue(pending)
+
+    def __schedule_flush(self):
+        if self.write_behind_interval <= 0:
+            self.flush()
+            return
+        if len(self.__pending) >= self.write_behind_batch_size:
+            self.__flush_event.set()
+        if self.__flusher is None or self.__flusher_pid != os.getpid():
+            with self.__pending_lock:
+                if self.__flusher is None or self.__flusher_pid != os.getpid():
+                    self.__flusher_pid = os.getpid()
+                    self.__flusher = threading.Thread(target=self.__run_flusher,
+                                                      name='au_request_flusher', daemon=True)
+                    self.__flusher.start()
+
+    def __run_flusher(self):
+        while True:
+            self.__flush_event.wait(self.write_behind_interval)
+            self.__flush_event.clear()
+            self.flush()
+
+    def __write(self, pending: Dict[str, dict]):
+        if not self.__table_inited:
+            self.__init_request_table()
+        table = self.request_orm.__table__
+        now = datetime.datetime.now()
+        inserts = []
+        # the bulk updates are grouped by the updated columns
+        updates: Dict[tuple, list] = {}
+        touches = []
+        for request_id, entry in pending.items():
+            data = entry['data']
+            if entry['insert']:
+                row = dict(data)
+                if entry['touch']:
+                    row['gmt_modified'] = now
+                inserts.append(row)
+            elif data is not None:
+                row = {key: value for key, value in data.items() if key not in IMMUTABLE_COLUMNS}
+                row['gmt_modified'] = now
+                row['b_request_id'] = request_id
+                updates.setdefault(tuple(sorted(row.keys())), []).append(row)
+            elif entry['touch']:
+                touches.append(request_id)
+        with self.sqldb_wrapper.sql_database._engine.begin() as conn:
+            if inserts:
+                conn.execute(insert(table), inserts)
+            for rows in updates.values():
+                conn.execute(update(table).where(table.c.request_id == bindparam('b_request_id')), rows)
+            if touches:
+                conn.execute(update(table).where(table.c.request_id.in_(touches)).values(gmt_modified=now))
+
+    def __requeue(self, pending: Dict[str, dict]):
+        with self.__pending_lock:
+            for request_id, entry in pending.items():
+                entry['retries'] += 1
+                if entry['retries'] >= MAX_FLUSH_RETRIES:
+                    LOGGER.error(f"drop the request record {request_id} after {MAX_FLUSH_RETRIES} failed flushes.")
+                    continue
+                newer = self.__pending.get(request_id)
+                if newer is None:
+                    self.__pending[request_id] = entry
+                    continue
+                # merge the failed entry under the newer one
+                newer['insert'] = newer['insert'] or entry['insert']
+                newer['touch'] = newer['touch'] or entry['touch']
+                if entry['data'] is not None:
+                    newer['data'] = {**entry['data'], **(newer['data'] or {})}
 
     def __request_orm_to_do(self, request_orm) -> RequestDO:
         """Transfer a RequestORM to RequestDO."""
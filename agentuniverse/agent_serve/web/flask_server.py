@@ -8,7 +8,7 @@ import opentracing
 from ..service_instance import ServiceInstance, ServiceNotFoundError
 from .request_task import RequestTask
 from .web_util import request_param, service_run_queue, make_standard_response, FlaskServerManager
-from .thread_with_result import ThreadPoolExecutorWithReturnValue
+from .request_executor import RequestExecutor, ServiceOverloadedError
 from ...base.util.logging.logging_util import LOGGER
 from agentuniverse.base.util.logging.log_type_enum import LogTypeEnum
 from agentuniverse.base.util.logging.general_logger import get_context_prefix
@@ -118,9 +118,8 @@ def service_run(service_id: str, params: dict, saved: bool = False):
         params = {} if params is None else params
         request_task = RequestTask(ServiceInstance(service_id).run, saved,
                                    **params)
-        with ThreadPoolExecutorWithReturnValue() as executor:
-            future = executor.submit(request_task.run)
-            result = future.result(timeout=FlaskServerManager().sync_service_timeout)
+        future = RequestExecutor().submit(request_task.run)
+        result = future.result(timeout=FlaskServerManager().sync_service_timeout)
     except TimeoutError:
         return make_standard_response(success=False,
                                       message="AU sync service timeout",
@@ -216,6 +215,11 @@ def handle_http_exception(e):
 @app.errorhandler(Exception)
 def handle_exception(e):
     """A global non http exception handler"""
+    if isinstance(e, ServiceOverloadedError):
+        LOGGER.warn(str(e))
+        return make_standard_response(success=False,
+                                      message=str(e),
+                                      status_code=429)
     LOGGER.error(traceback.format_exc())
     if isinstance(e, ServiceNotFoundError):
         return make_standard_response(success=False,
@@ -248,9 +252,8 @@ def openai_protocol_chat(model: str, messages: list):
         params = {} if params is None else params
         request_task = RequestTask(ServiceInstance(params.get('service_id')).run, False,
                                    **params)
-        with ThreadPoolExecutorWithReturnValue() as executor:
-            future = executor.submit(request_task.run)
-            result = future.result(timeout=FlaskServerManager().sync_service_timeout)
+        future = RequestExecutor().submit(request_task.run)
+        result = future.result(timeout=FlaskServerManager().sync_service_timeout)
     except TimeoutError:
         return make_standard_response(success=False,
                                       message="AU sync service timeout",
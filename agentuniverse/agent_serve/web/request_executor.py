@@ -0,0 +1,219 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 19:20
+# @FileName: request_executor.py
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_MAX_WORKERS = 64
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_WATCHDOG_INTERVAL = 60
+
+
+class ServiceOverloadedError(Exception):
+    """Raised when the request executor has no room for a new request."""
+
+
+@singleton
+class RequestExecutor(object):
+    """The process-wide bounded pool running the web service requests.
+
+    The sync and the async service requests are run by a fixed count of worker
+    threads instead of a new thread pool or new threads per request. At most
+    `max_workers` requests run at the same time and at most `queue_size` more
+    wait for a worker, a request beyond that is rejected with a
+    `ServiceOverloadedError` at once, so an overloaded server answers 429
+    instead of piling up threads. The context variables of the submitting thread
+    are copied into the worker for every request. The pool is created lazily in
+    the current process, so it can be configured before gunicorn forks its
+    workers.
+
+    The pool is configured by the `HTTP_SERVER` section of config.toml, e.g.
+
+        [HTTP_SERVER]
+        request_max_workers = 64
+        request_queue_size = 256
+    """
+
+    def __init__(self):
+        self.max_workers: int = DEFAULT_MAX_WORKERS
+        self.queue_size: int = DEFAULT_QUEUE_SIZE
+        self.__lock = threading.Lock()
+        self.__pid: Optional[int] = None
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__in_flight = 0
+        self.__running = 0
+        self.__reset_stats()
+
+    def init_by_configer(self, configer: Configer):
+        """Read the pool settings from the `HTTP_SERVER` section of the configer."""
+        config: dict = configer.value.get('HTTP_SERVER', {}) if configer else {}
+        self.max_workers = int(config.get('request_max_workers', DEFAULT_MAX_WORKERS))
+        self.queue_size = int(config.get('request_queue_size', DEFAULT_QUEUE_SIZE))
+        self.shutdown()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Submit a request to the pool.
+
+        Args:
+            fn: The callable running the request.
+            *args: The positional arguments of the callable.
+            **kwargs: The keyword arguments of the callable.
+
+        Returns:
+            Future: The future of the request result.
+
+        Raises:
+            ServiceOverloadedError: All the workers are busy and the queue is full.
+        """
+        with self.__lock:
+            if self.__in_flight >= self.max_workers + self.queue_size:
+                self.__rejected += 1
+                raise ServiceOverloadedError(
+                    f"The service is overloaded, {self.__in_flight} requests are running or queued.")
+            executor = self._get_executor()
+            self.__in_flight += 1
+            self.__submitted += 1
+        context = contextvars.copy_context()
+        submit_time = time.perf_counter()
+
+        def run():
+            queue_wait = time.perf_counter() - submit_time
+            with self.__lock:
+                self.__running += 1
+                self.__total_queue_wait += queue_wait
+                self.__max_queue_wait = max(self.__max_queue_wait, queue_wait)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self.__lock:
+                    self.__running -= 1
+
+        try:
+            future = executor.submit(run)
+        except Exception:
+            with self.__lock:
+                self.__in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _):
+        with self.__lock:
+            # the counters may be reset by a shutdown meanwhile
+            self.__in_flight = max(self.__in_flight - 1, 0)
+            self.__completed += 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # the worker threads of the parent process do not exist in the forked workers
+        if self.__executor is None or self.__pid != os.getpid():
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                 thread_name_prefix='au_request')
+            self.__pid = os.getpid()
+            self.__in_flight = 0
+            self.__running = 0
+        return self.__executor
+
+    def get_stats(self) -> dict:
+        """Return the load and the queue wait time of the pool."""
+        with self.__lock:
+            started = self.__submitted - (self.__in_flight - self.__running)
+            return {
+                'max_workers': self.max_workers,
+                'queue_size': self.queue_size,
+                'running': self.__running,
+                'queued': self.__in_flight - self.__running,
+                'submitted': self.__submitted,
+                'completed': self.__completed,
+                'rejected': self.__rejected,
+                'avg_queue_wait': self.__total_queue_wait / started if started else 0.0,
+                'max_queue_wait': self.__max_queue_wait,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Shut the pool down, the next request creates a new one."""
+        with self.__lock:
+            executor = self.__executor
+            self.__executor = None
+            self.__in_flight = 0
+            self.__running = 0
+            self.__reset_stats()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __reset_stats(self):
+        self.__submitted = 0
+        self.__completed = 0
+        self.__rejected = 0
+        self.__total_queue_wait = 0.0
+        self.__max_queue_wait = 0.0
+
+
+@singleton
+class RequestWatchdog(object):
+    """A single daemon thread supervising all the running async request tasks.
+
+    Every `interval` seconds it calls `check_state` of the watched tasks, which
+    refreshes the modified time of the running requests and fails the requests
+    whose service stopped without an end state. A task is unwatched once its
+    `check_state` returns True.
+    """
+
+    def __init__(self):
+        self.interval: float = DEFAULT_WATCHDOG_INTERVAL
+        self.__lock = threading.Lock()
+        self.__tasks: Dict[str, object] = {}
+        self.__thread: Optional[threading.Thread] = None
+        self.__pid: Optional[int] = None
+        self.__wakeup = threading.Event()
+
+    def init_by_configer(self, configer: Configer):
+        """Read the check interval `request_watchdog_interval` from the `HTTP_SERVER` section."""
+        config: dict = configer.value.get('HTTP_SERVER', {}) if configer else {}
+        self.interval = float(config.get('request_watchdog_interval', DEFAULT_WATCHDOG_INTERVAL))
+
+    def watch(self, task):
+        """Supervise the request task until its `check_state` returns True."""
+        with self.__lock:
+            self.__tasks[task.request_id] = task
+            if self.__thread is None or self.__pid != os.getpid() or not self.__thread.is_alive():
+                self.__pid = os.getpid()
+                self.__thread = threading.Thread(target=self._run, name='au_request_watchdog', daemon=True)
+                self.__thread.start()
+
+    def watched_count(self) -> int:
+        with self.__lock:
+            return len(self.__tasks)
+
+    def check(self):
+        """Check all the watched tasks once."""
+        with self.__lock:
+            tasks = list(self.__tasks.items())
+        for request_id, task in tasks:
+            try:
+                finished = task.check_state()
+            except Exception as e:
+                LOGGER.error(f"request {request_id} state check fail: {str(e)}")
+                finished = False
+            if finished:
+                with self.__lock:
+                    self.__tasks.pop(request_id, None)
+
+    def wakeup(self):
+        """Run the next check at once."""
+        self.__wakeup.set()
+
+    def _run(self):
+        while True:
+            self.__wakeup.wait(self.interval)
+            self.__wakeup.clear()
+            self.check()
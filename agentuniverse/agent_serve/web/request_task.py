@@ -13,14 +13,17 @@ import json
 import queue
 import time
 import uuid
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from threading import Thread
 from typing import Optional, AsyncIterator
 from loguru import logger
 
 from .dal.request_library import RequestLibrary
 from .dal.entity.request_do import RequestDO
+from .request_executor import RequestExecutor, RequestWatchdog, ServiceOverloadedError
+from .stream_queue import StreamQueue, AsyncStreamQueue, CallbackStream
 from .thread_with_result import ThreadWithReturnValue
+from .web_util import FlaskServerManager
 from agentuniverse.base.util.logging.logging_util import LOGGER
 from ...agent.output_object import OutputObject
 from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
@@ -28,6 +31,9 @@ from agentuniverse.base.util.logging.general_logger import get_context_prefix
 from agentuniverse.base.util.logging.log_type_enum import LogTypeEnum
 
 EOF_SIGNAL = '{"type": "EOF"}'
+# A SSE comment frame, ignored by the clients but keeping the proxies from
+# closing an idle connection.
+HEARTBEAT_FRAME = ": heartbeat\n\n"
 
 
 @enum.unique
@@ -63,15 +69,20 @@ class RequestTask:
         if not request_id:
             request_id = uuid.uuid4().hex
         self.request_id = request_id
-        self.queue = queue.Queue(maxsize=1000)
+        self.queue = StreamQueue(maxsize=1000)
         self.thread: Optional[ThreadWithReturnValue] = None
+        # The future of the service run by the request executor in async mode.
+        self.future: Optional[Future] = None
+        self.stop_checked = False
         self.state = TaskStateEnum.INIT.value
         # Whether save to Database.
         self.saved = saved
         self.last_update_time = time.time()
         self.__request_do__ = self.add_request_do()
-        self.async_queue = asyncio.Queue(maxsize=2000)
+        # Created in the event loop of the response by `async_stream_run`.
+        self.async_queue: Optional[AsyncStreamQueue] = None
         self.async_task = None
+        self.stream_timed_out = False
 
     def update_request_do(self, force: bool = False):
         current_time = time.time()
@@ -80,6 +91,9 @@ class RequestTask:
         if if_update or force:
             self.last_update_time = current_time
             RequestLibrary().update_request(self.__request_do__)
+        if force:
+            # the end state of the task must not wait in the write-behind buffer
+            RequestLibrary().flush()
 
 
     def receive_steps(self):
@@ -87,12 +101,10 @@ class RequestTask:
         self.next_state(TaskStateEnum.RUNNING)
         first_chunk = True
         start_time = time.time()
-        while True:
-            output: str = self.queue.get()
+        for output in self.iter_stream_output():
             if output is None:
-                break
-            if output == EOF_SIGNAL:
-                break
+                yield HEARTBEAT_FRAME
+                continue
             if first_chunk:
                 first_chunk = False
                 cost_time = time.time() - start_time
@@ -108,6 +120,7 @@ class RequestTask:
                 self.__request_do__.result['result'] = {
                     "result": "The task's tracking status has been canceled."}
             else:
+                self.check_stream_error()
                 result = self.thread.result()
                 if isinstance(result, OutputObject):
                     result = result.to_dict()
@@ -131,12 +144,10 @@ class RequestTask:
         self.next_state(TaskStateEnum.RUNNING)
         first_chunk = True
         start_time = time.time()
-        while True:
-            output: str = self.queue.get()
+        for output in self.iter_stream_output():
             if output is None:
-                break
-            if output == EOF_SIGNAL:
-                break
+                yield HEARTBEAT_FRAME
+                continue
             if first_chunk:
                 first_chunk = False
                 cost_time = time.time() - start_time
@@ -152,6 +163,7 @@ class RequestTask:
                 self.__request_do__.result['result'] = {
                     "result": "The task's tracking status has been canceled."}
             else:
+                self.check_stream_error()
                 result = self.thread.result()
                 if isinstance(result, OutputObject):
                     result = result.to_dict()
@@ -168,20 +180,15 @@ class RequestTask:
             yield "data:" + json.dumps({"error": {"error_msg": str(e)}}) + "\n\n "
 
     async def async_receive_steps(self) -> AsyncIterator[str]:
+        """Yield the stream data as soon as the service coroutine puts it into
+        the queue."""
         self.next_state(TaskStateEnum.RUNNING)
         first_chunk = True
         start_time = time.time()
-        while True:
-            try:
-                output: str = await asyncio.wait_for(self.async_queue.get(), timeout=0.5)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(1)
-                print("Waiting for data timed out. Retrying...")
-                continue
+        async for output in self.async_iter_stream_output():
             if output is None:
-                break
-            if output == EOF_SIGNAL:
-                break
+                yield HEARTBEAT_FRAME
+                continue
             if first_chunk:
                 first_chunk = False
                 cost_time = time.time() - start_time
@@ -197,12 +204,14 @@ class RequestTask:
                 self.__request_do__.result['result'] = {
                     "result": "The task's tracking status has been canceled."}
             else:
+                self.check_stream_error()
                 result = await self.async_task
                 if isinstance(result, OutputObject):
                     result = result.to_dict()
                 yield "data:" + json.dumps({"result": result},
                                            ensure_ascii=False) + "\n\n"
                 self.__request_do__.result["result"] = result
+                self.next_state(TaskStateEnum.FINISHED)
             if self.saved:
                 self.update_request_do(force=True)
         except Exception as e:
@@ -213,25 +222,97 @@ class RequestTask:
                 self.update_request_do(force=True)
             yield "data:" + json.dumps({"error": {"error_msg": str(e)}}) + "\n\n"
 
-    def append_steps(self):
-        """Tracing async service running state and update it to database."""
+    def iter_stream_output(self):
+        """Yield the stream data of the service thread until the EOF.
+
+        The queue is waited on with the heartbeat interval as timeout, a None is
+        yielded whenever the interval passes without data so the caller can
+        send a heartbeat. The iteration stops when the stream stays idle longer
+        than the idle timeout, or when the service thread ends without an EOF.
+        The queue is closed once the iteration ends, including a client
+        disconnect, so the service thread never blocks on a full queue.
+        """
+        heartbeat_interval = FlaskServerManager().sse_heartbeat_interval
+        idle_timeout = FlaskServerManager().sse_idle_timeout
+        last_output_time = time.time()
         try:
-            self.next_state(TaskStateEnum.RUNNING)
             while True:
-                output: str = self.queue.get()
-                if output is None:
+                try:
+                    output: str = self.queue.get(timeout=heartbeat_interval)
+                except queue.Empty:
+                    if self.thread is not None and not self.thread.is_alive() and self.queue.empty():
+                        break
+                    if idle_timeout and time.time() - last_output_time >= idle_timeout:
+                        self.stream_timed_out = True
+                        break
+                    yield None
+                    continue
+                if output is None or output == EOF_SIGNAL:
                     break
-                if output == EOF_SIGNAL:
+                last_output_time = time.time()
+                yield output
+        finally:
+            self.queue.close()
+
+    async def async_iter_stream_output(self):
+        """The async version of `iter_stream_output`, awaiting the queue of the
+        service coroutine."""
+        heartbeat_interval = FlaskServerManager().sse_heartbeat_interval
+        idle_timeout = FlaskServerManager().sse_idle_timeout
+        last_output_time = time.time()
+        try:
+            while True:
+                try:
+                    output: str = await asyncio.wait_for(self.async_queue.get(), timeout=heartbeat_interval)
+                except asyncio.TimeoutError:
+                    if self.async_task.done() and self.async_queue.empty():
+                        break
+                    if idle_timeout and time.time() - last_output_time >= idle_timeout:
+                        self.stream_timed_out = True
+                        self.async_task.cancel()
+                        break
+                    yield None
+                    continue
+                if output is None or output == EOF_SIGNAL:
                     break
-                if output != "" and output != " ":
-                    self.__request_do__.steps.append(output)
-                if self.saved:
-                    self.update_request_do()
+                last_output_time = time.time()
+                yield output
+        finally:
+            self.async_queue.close()
+
+    def _on_async_task_done(self, _):
+        # Wake up the response when the coroutine ends without putting an EOF.
+        self.async_queue.finish(EOF_SIGNAL)
+
+    def check_stream_error(self):
+        """Raise an error if the stream was stopped by the idle timeout, or by a
+        queue staying full, so the response ends with an error event rather
+        than a result missing a part of its stream data."""
+        if self.stream_timed_out:
+            raise TimeoutError(f"No stream data in {FlaskServerManager().sse_idle_timeout}s, "
+                               f"the stream is stopped.")
+        stream_queue = self.async_queue if self.async_queue is not None else self.queue
+        if stream_queue is not None and stream_queue.error is not None:
+            raise RuntimeError(stream_queue.error)
+
+    def append_step(self, output: str):
+        """Record a stream data of the async service as a step and update it to
+        database."""
+        if output is None or output == EOF_SIGNAL or self.canceled():
+            return
+        if output != "" and output != " ":
+            self.__request_do__.steps.append(output)
+        if self.saved:
+            self.update_request_do()
+
+    def finish_async_run(self, future: Future):
+        """Record the result of the async service and update it to database."""
+        try:
             if self.canceled():
                 self.__request_do__.result['result'] = {
                     "result": "The task's tracking status has been canceled."}
             else:
-                self.__request_do__.result['result'] = self.thread.result()
+                self.__request_do__.result['result'] = future.result()
                 self.next_state(TaskStateEnum.FINISHED)
             if self.saved:
                 self.update_request_do(force=True)
@@ -243,13 +324,27 @@ class RequestTask:
                 self.update_request_do(force=True)
 
     def async_run(self):
-        """Run the service in async mode."""
-        self.kwargs['output_stream'] = self.queue
-        self.thread = ThreadWithReturnValue(target=self.func,
-                                            kwargs=self.kwargs)
-        self.thread.start()
-        Thread(target=self.append_steps).start()
-        Thread(target=self.check_state).start()
+        """Run the service in async mode by the request executor.
+
+        The stream data is recorded as steps when it is put, and the result when
+        the service ends, so no thread waits on the request. The shared request
+        watchdog supervises the task state.
+
+        Raises:
+            ServiceOverloadedError: The request executor has no room for the request.
+        """
+        self.kwargs['output_stream'] = CallbackStream(self.append_step)
+        self.next_state(TaskStateEnum.RUNNING)
+        try:
+            self.future = RequestExecutor().submit(self.func, **self.kwargs)
+        except ServiceOverloadedError as e:
+            self.__request_do__.result['result'] = {"error_msg": str(e)}
+            self.next_state(TaskStateEnum.FAIL)
+            if self.saved:
+                self.update_request_do(force=True)
+            raise
+        self.future.add_done_callback(self.finish_async_run)
+        RequestWatchdog().watch(self)
 
     def stream_run(self):
         """Run the service in a separate thread and yield result stream."""
@@ -268,9 +363,11 @@ class RequestTask:
         return self.user_receive_steps()
 
     async def async_stream_run(self) -> AsyncIterator[str]:
+        self.async_queue = AsyncStreamQueue(maxsize=2000)
         self.kwargs['output_stream'] = self.async_queue
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         self.async_task = loop.create_task(self.func(**self.kwargs))
+        self.async_task.add_done_callback(self._on_async_task_done)
         async for item in self.async_receive_steps():
             yield item
 
@@ -289,6 +386,7 @@ class RequestTask:
         finally:
             if self.saved:
                 RequestLibrary().update_request(self.__request_do__)
+                RequestLibrary().flush()
 
     def next_state(self, next_state: TaskStateEnum):
         """Update request task state if the transition is valid."""
@@ -298,27 +396,31 @@ class RequestTask:
         else:
             raise Exception("Invalid state transition")
 
-    def check_state(self):
-        """Keep check request task thread state every minute, if the thread
-        is alive, update the request modified time in database."""
-        while True:
-            if self.thread is not None and self.thread.is_alive():
-                LOGGER.debug(
-                    "request:" + str(self.request_id) + "task thread alive")
-                if self.saved:
-                    RequestLibrary().update_gmt_modified(self.request_id)
-                time.sleep(60)
-                continue
-            elif self.__request_do__.state == TaskStateEnum.RUNNING.value:
-                # Waiting one minute to avoid skipping the state change step.
-                time.sleep(60)
-                if self.__request_do__.state == TaskStateEnum.RUNNING.value:
-                    LOGGER.debug("request:" + str(self.request_id) +
-                                 " task thread stop but state not end")
-                    self.__request_do__.state = TaskStateEnum.FAIL.value
-                    if self.saved:
-                        self.update_request_do(force=True)
-            break
+    def check_state(self) -> bool:
+        """Check the request task state, called by the request watchdog at every
+        check interval. If the service is running, update the request modified
+        time in database.
+
+        Returns:
+            bool: Whether the task needs no more checks.
+        """
+        if self.future is not None and not self.future.done():
+            LOGGER.debug(
+                "request:" + str(self.request_id) + "task thread alive")
+            if self.saved:
+                RequestLibrary().update_gmt_modified(self.request_id)
+            return False
+        if self.__request_do__.state == TaskStateEnum.RUNNING.value:
+            # Waiting one more interval to avoid skipping the state change step.
+            if not self.stop_checked:
+                self.stop_checked = True
+                return False
+            LOGGER.debug("request:" + str(self.request_id) +
+                         " task thread stop but state not end")
+            self.__request_do__.state = TaskStateEnum.FAIL.value
+            if self.saved:
+                self.update_request_do(force=True)
+        return True
 
     def add_request_do(self):
         query_keys = ['question', 'query_content', 'query', 'request', 'input']
@@ -343,6 +445,8 @@ class RequestTask:
 
     def result(self):
         """Get the result from service running thread."""
+        if self.future is not None:
+            return self.future.result()
         return self.thread.result()
 
     @staticmethod
@@ -361,7 +465,7 @@ class RequestTask:
         the EOF into the queue."""
         self.next_state(TaskStateEnum.CANCELED)
         if self.queue is not None:
-            self.queue.put_nowait(EOF_SIGNAL)
+            self.queue.finish(EOF_SIGNAL)
 
     def request_state(self):
         """Return the request task state."""
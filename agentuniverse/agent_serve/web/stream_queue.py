@@ -0,0 +1,182 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 18:30
+# @FileName: stream_queue.py
+import asyncio
+import concurrent.futures
+import queue
+from typing import Optional
+
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_PUT_TIMEOUT = 30
+
+
+class StreamQueue(queue.Queue):
+    """The bounded queue between the service thread and the sync SSE response.
+
+    The producers (`stream_output`, the stream callbacks) call `put`, it waits
+    for at most `put_timeout` seconds while the queue is full, so a slow client
+    slows the service down rather than failing it at once, while `put_nowait`
+    never blocks. A put still finding the queue full fails the stream: the
+    queued data is sent, then the response ends with an error instead of
+    silently missing chunks, and the subsequent puts are dropped. Once the
+    response is closed the queue is closed too and the puts are dropped, so the
+    service thread never blocks on a gone client.
+    """
+
+    def __init__(self, maxsize: int = 1000, put_timeout: float = DEFAULT_PUT_TIMEOUT):
+        super().__init__(maxsize)
+        self.put_timeout = put_timeout
+        self.closed = False
+        self.error: Optional[str] = None
+
+    def put(self, item, block=True, timeout=None):
+        if self.closed or self.error is not None:
+            return
+        if block and timeout is None:
+            timeout = self.put_timeout
+        try:
+            super().put(item, block, timeout)
+        except queue.Full:
+            self.fail(f"The stream queue is full for {timeout if block else 0}s, the stream is stopped.")
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def put_wait(self, item):
+        """Put the item, waiting for at most `put_timeout` seconds while the queue is full."""
+        self.put(item)
+
+    def finish(self, item=None):
+        """Put the end of the stream regardless of the maxsize, so the response
+        ends once the queued data is sent."""
+        with self.mutex:
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def fail(self, error: str):
+        """Stop the stream with an error after the queued data."""
+        if self.closed or self.error is not None:
+            return
+        LOGGER.warn(error)
+        self.error = error
+        self.finish()
+
+    def close(self):
+        """Drop the queued data and the subsequent puts, waking up the blocked producers."""
+        self.closed = True
+        while True:
+            try:
+                self.get_nowait()
+            except queue.Empty:
+                break
+
+
+class AsyncStreamQueue(asyncio.Queue):
+    """The bounded queue between the service coroutine and the async SSE response.
+
+    It must be created in the event loop of the response. The coroutines await
+    `put`, it waits for at most `put_timeout` seconds while the queue is full,
+    and `put_nowait` never blocks. The producers running in other threads (e.g.
+    the sync tools and llms run on the blocking executor) call `put_wait`, which
+    hands the item over to the loop thread-safely, so the waiting response is
+    woken up at once, and waits for at most `put_timeout` seconds too. As in
+    `StreamQueue`, a put still finding the queue full fails the stream with an
+    error after the queued data.
+    """
+
+    def __init__(self, maxsize: int = 2000, put_timeout: float = DEFAULT_PUT_TIMEOUT):
+        super().__init__(maxsize)
+        self.put_timeout = put_timeout
+        self.closed = False
+        self.error: Optional[str] = None
+        self.__owner_loop = asyncio.get_running_loop()
+
+    def _in_owner_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.__owner_loop
+        except RuntimeError:
+            return False
+
+    async def put(self, item):
+        if self.closed or self.error is not None:
+            return
+        try:
+            await asyncio.wait_for(super().put(item), self.put_timeout)
+        except asyncio.TimeoutError:
+            self.fail(f"The stream queue is full for {self.put_timeout}s, the stream is stopped.")
+
+    def put_nowait(self, item):
+        if not self._in_owner_loop():
+            self.__owner_loop.call_soon_threadsafe(self.put_nowait, item)
+            return
+        if self.closed or self.error is not None:
+            return
+        try:
+            super().put_nowait(item)
+        except asyncio.QueueFull:
+            self.fail("The stream queue is full, the stream is stopped.")
+
+    def put_wait(self, item):
+        """Put the item from any thread, waiting for at most `put_timeout`
+        seconds while the queue is full. It never blocks the loop of the queue,
+        where it is `put_nowait`."""
+        if self.closed or self.error is not None:
+            return
+        if self._in_owner_loop():
+            self.put_nowait(item)
+            return
+        future = asyncio.run_coroutine_threadsafe(self.put(item), self.__owner_loop)
+        try:
+            # the put fails the stream by itself on its timeout
+            future.result(timeout=self.put_timeout + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+
+    def finish(self, item=None):
+        """Put the end of the stream regardless of the maxsize, so the response
+        ends once the queued data is sent."""
+        if not self._in_owner_loop():
+            self.__owner_loop.call_soon_threadsafe(self.finish, item)
+            return
+        self._put(item)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+
+    def fail(self, error: str):
+        """Stop the stream with an error after the queued data."""
+        if self.closed or self.error is not None:
+            return
+        LOGGER.warn(error)
+        self.error = error
+        self.finish()
+
+    def close(self):
+        """Drop the queued data and the subsequent puts."""
+        self.closed = True
+        while True:
+            try:
+                self.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+
+class CallbackStream(object):
+    """The output stream handing every put data to a callback, used when the
+    stream data is recorded instead of sent, so no thread consumes the stream."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def put(self, item, block=True, timeout=None):
+        self.callback(item)
+
+    def put_nowait(self, item):
+        self.callback(item)
+
+    def put_wait(self, item):
+        self.callback(item)
@@ -28,27 +28,19 @@ class ThreadWithReturnValue(Thread):
         self.target = target
         self._return = None
         self.error = None
-        self._context_values: dict = FrameworkContextManager().get_all_contexts()
+        self._context_snapshot = FrameworkContextManager().snapshot()
 
     def run(self):
         """Run the target func and save result in _return."""
         if self.target is not None:
-            context_tokens = {}
-            # set the context values in the thread
-            for var_name, var_value in self._context_values.items():
-                token = FrameworkContextManager().set_context(var_name, var_value)
-                context_tokens[var_name] = token
-
             try:
-                self._return = self.target(*self.args, **self.kwargs)
+                # run the target within the context of the thread creating this thread
+                self._return = self._context_snapshot.run(self.target, *self.args, **self.kwargs)
             except Exception as e:
                 self.error = e
             finally:
                 if 'output_stream' in self.kwargs:
                     self.kwargs['output_stream'].put('{"type": "EOF"}')
-                # finally, clear the context values in the thread
-                for var_name, token in context_tokens.items():
-                    FrameworkContextManager().reset_context(var_name, token)
 
     def result(self):
         """Wait for target func finished, then return the result or raise an
@@ -22,6 +22,10 @@ from ...base.annotation.singleton import singleton
 @singleton
 class FlaskServerManager:
     _sync_service_timeout = 30
+    # Seconds without stream data before a SSE heartbeat comment is sent.
+    _sse_heartbeat_interval = 15
+    # Seconds without stream data before the SSE stream fails, 0 means never.
+    _sse_idle_timeout = 600
 
     @property
     def sync_service_timeout(self):
@@ -31,6 +35,22 @@ class FlaskServerManager:
     def sync_service_timeout(self, timeout):
         self._sync_service_timeout = timeout
 
+    @property
+    def sse_heartbeat_interval(self):
+        return self._sse_heartbeat_interval
+
+    @sse_heartbeat_interval.setter
+    def sse_heartbeat_interval(self, interval):
+        self._sse_heartbeat_interval = interval
+
+    @property
+    def sse_idle_timeout(self):
+        return self._sse_idle_timeout
+
+    @sse_idle_timeout.setter
+    def sse_idle_timeout(self, timeout):
+        self._sse_idle_timeout = timeout
+
 
 def request_param(func):
     """An annotation used to parse the flask request params."""
@@ -80,7 +100,7 @@ def service_run_queue(service_id, **kwargs):
         return res
     finally:
         if stream:
-            stream.put_nowait('{"type": "EOF"}')
+            stream.put('{"type": "EOF"}')
 
 
 def agent_run_queue(agent_id, **kwargs):
@@ -97,18 +117,37 @@ def agent_run_queue(agent_id, **kwargs):
         return res
     finally:
         if stream:
-            stream.put_nowait('{"type": "EOF"}')
+            stream.put('{"type": "EOF"}')
+
+
+async def async_service_run_queue(service_id, **kwargs):
+    """The coroutine used to run an agent service on the event loop. The result
+    will be saved in a queue if one is provided."""
+    stream: asyncio.Queue = kwargs.get('output_stream')
+    try:
+        res = await ServiceInstance(service_id).async_run(**kwargs)
+        return res
+    finally:
+        if stream:
+            await stream.put('{"type": "EOF"}')
 
 
 async def async_agent_run_queue(agent_id, **kwargs):
+    """The coroutine used to run an agent natively on the event loop, and the result will be saved in a
+    queue if provided.
+
+    Args:
+        agent_id: The agent id
+        **kwargs: Arbitrary keyword arguments.
+    """
     stream: asyncio.Queue = kwargs.get('output_stream')
     try:
-        agent: Agent = await asyncio.to_thread(AgentManager().get_instance_obj, agent_id)
-        res = await asyncio.to_thread(agent.run, **kwargs)
+        agent: Agent = AgentManager().get_instance_obj(agent_id)
+        res = await agent.async_run(**kwargs)
         return res
     finally:
         if stream:
-            await asyncio.to_thread(stream.put_nowait, '{"type": "EOF"}')
+            await stream.put('{"type": "EOF"}')
 
 
 def make_standard_response(success: bool,
@@ -7,8 +7,9 @@
 # @FileName: agentuniverse.py
 import importlib
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from agentuniverse.base.annotation.singleton import singleton
 from agentuniverse.base.component.application_component_manager import ApplicationComponentManager
@@ -16,17 +17,22 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.config.application_configer.app_configer import AppConfiger
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.config.component_scanner import ComponentScanner
 from agentuniverse.base.component.component_configer_util import ComponentConfigerUtil
 from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
 from agentuniverse.base.config.configer import Configer
 from agentuniverse.base.config.custom_configer.default_llm_configer import DefaultLLMConfiger
 from agentuniverse.base.config.custom_configer.custom_key_configer import CustomKeyConfiger
 from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.util.blocking_executor import BlockingExecutor
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
 from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.base.util.tokenizer_registry import TokenizerRegistry
 from agentuniverse.base.util.system_util import get_project_root_path, is_api_key_missing, \
     is_system_builtin, find_default_llm_config
-from agentuniverse.base.util.logging.logging_util import init_loggers
+from agentuniverse.base.util.logging.logging_util import init_loggers, LOGGER
 from agentuniverse.agent_serve.web.request_task import RequestLibrary
+from agentuniverse.agent_serve.web.request_executor import RequestExecutor, RequestWatchdog
 from agentuniverse.agent_serve.web.rpc.grpc.grpc_server_booster import set_grpc_config
 from agentuniverse.agent_serve.web.web_booster import ACTIVATE_OPTIONS
 from agentuniverse.agent_serve.web.post_fork_queue import POST_FORK_QUEUE
@@ -56,11 +62,15 @@ class AgentUniverse(object):
         self.__system_default_memory_storage_package = ['agentuniverse.agent.memory.memory_storage']
         self.__system_default_work_pattern_package = ['agentuniverse.agent.work_pattern']
         self.__system_default_log_sink_package = ['agentuniverse.base.util.logging.log_sink.log_sink']
+        self.__scanner: Optional[ComponentScanner] = None
+        self.__startup_timing: dict = {}
 
     def start(self, config_path: str = None, core_mode: bool = False):
         """Start the agentUniverse framework.
 
         """
+        self.__startup_timing = {}
+        start_time = time.perf_counter()
         # get default config path
         project_root_path = get_project_root_path()
         sys.path.append(str(project_root_path.parent))
@@ -74,6 +84,7 @@ class AgentUniverse(object):
         configer = Configer(path=config_path).load()
         app_configer = AppConfiger().load_by_configer(configer)
         self.__config_container.app_configer = app_configer
+        phase_time = self.__record_phase('load_config', start_time)
 
         # load user custom key
         custom_key_configer_path = self.__parse_sub_config_path(
@@ -86,6 +97,7 @@ class AgentUniverse(object):
             configer.value.get('SUB_CONFIG_PATH', {}).get('log_config_path'),
             config_path)
         init_loggers(log_config_path)
+        phase_time = self.__record_phase('init_loggers', phase_time)
 
         # init web request task database
         RequestLibrary(configer=configer)
@@ -100,6 +112,15 @@ class AgentUniverse(object):
         sync_service_timeout = configer.value.get('HTTP_SERVER', {}).get('sync_service_timeout')
         if sync_service_timeout:
             FlaskServerManager().sync_service_timeout = sync_service_timeout
+        sse_heartbeat_interval = configer.value.get('HTTP_SERVER', {}).get('sse_heartbeat_interval')
+        if sse_heartbeat_interval:
+            FlaskServerManager().sse_heartbeat_interval = float(sse_heartbeat_interval)
+        sse_idle_timeout = configer.value.get('HTTP_SERVER', {}).get('sse_idle_timeout')
+        if sse_idle_timeout is not None:
+            FlaskServerManager().sse_idle_timeout = float(sse_idle_timeout)
+        RequestExecutor().init_by_configer(configer)
+        BlockingExecutor().init_by_configer(configer)
+        RequestWatchdog().init_by_configer(configer)
         gunicorn_activate = configer.value.get('GUNICORN', {}).get('activate')
         if gunicorn_activate and gunicorn_activate.lower() == 'true':
             ACTIVATE_OPTIONS["gunicorn"] = True
@@ -123,11 +144,31 @@ class AgentUniverse(object):
         # init monitor module
         Monitor(configer=configer)
 
+        # init the pooled api clients
+        HttpClientRegistry().init_by_configer(configer)
+
+        # init the shared tokenizers
+        TokenizerRegistry().init_by_configer(configer)
+        phase_time = self.__record_phase('init_modules', phase_time)
+
         # scan and register the components
+        scan_cache_path = None
+        scan_config = configer.value.get('COMPONENT_SCAN', {})
+        scan_cache_activate = scan_config.get('cache_activate')
+        if scan_cache_activate and str(scan_cache_activate).lower() == 'true':
+            scan_cache_path = self.__parse_sub_config_path(
+                scan_config.get('cache_path', './.au_cache/component_scan_cache.pkl'), config_path)
+        self.__scanner = ComponentScanner(ConfigTypeEnum.YAML, scan_cache_path)
         self.__scan_and_register(self.__config_container.app_configer)
+        phase_time = time.perf_counter()
+        self.__scanner.save_cache()
+        phase_time = self.__record_phase('save_scan_cache', phase_time)
         if core_mode:
             for _func, args, kwargs in POST_FORK_QUEUE:
                 _func(*args, **kwargs)
+            self.__record_phase('post_fork', phase_time)
+        self.__startup_timing['total'] = time.perf_counter() - start_time
+        self.__log_startup_report()
 
     def __scan_and_register(self, app_configer: AppConfiger):
         """Scan the component directory and register the components.
@@ -198,15 +239,18 @@ class AgentUniverse(object):
             ComponentEnum.LLM_CHANNEL: core_llm_channel_package_list
         }
 
+        phase_time = time.perf_counter()
         component_configer_list_map = {}
         for component_enum, package_list in component_package_map.items():
             if not package_list:
                 continue
             component_configer_list = self.scan(package_list, ConfigTypeEnum.YAML, component_enum)
             component_configer_list_map[component_enum] = component_configer_list
+        phase_time = self.__record_phase('scan', phase_time)
 
         for component_enum, component_configer_list in component_configer_list_map.items():
             self.__register(component_enum, component_configer_list)
+        self.__record_phase('register', phase_time)
 
     def scan(self,
              package_list: [str],
@@ -235,17 +279,10 @@ class AgentUniverse(object):
                 if default_llm_configer and default_llm_configer.default_llm:
                     self.__config_container.app_configer.agent_llm_set.add(default_llm_configer.default_llm)
 
-        for package_name in package_list:
-            package_path = self.__package_name_to_path(package_name)
-            path = Path(package_path)
-            config_files = path.rglob(f'*.{config_type_enum.value}')
-            for config_file in config_files:
-                config_file_str = str(config_file)
-                configer = Configer(path=config_file_str).load()
-                component_configer = ComponentConfiger().load_by_configer(configer)
-                component_config_type = component_configer.get_component_config_type()
-                if component_config_type == component_enum.value:
-                    component_configer_list.append(component_configer)
+        # every package is walked and every file is parsed only once across all the component types
+        if self.__scanner is None or self.__scanner.config_type_enum != config_type_enum:
+            self.__scanner = ComponentScanner(config_type_enum)
+        component_configer_list.extend(self.__scanner.scan(package_list, component_enum))
         return component_configer_list
 
     def __register(self, component_enum: ComponentEnum, component_configer_list: list[ComponentConfiger]):
@@ -299,22 +336,24 @@ class AgentUniverse(object):
             component_instance.component_config_path = component_configer.configer.path
             component_manager_clz().register(component_instance.get_instance_code(), component_instance)
 
-    def __package_name_to_path(self, package_name: str) -> str:
-        """Convert the package name to the package path.
-
-        Args:
-            package_name(str): the package name
-
-        Returns:
-            str: the package path
-        """
-        # get the package spec
-        spec = importlib.util.find_spec(package_name)
-        if spec is None:
-            raise ImportError(f"Can not find {package_name}")
-        # get the package path
-        package_path = spec.submodule_search_locations[0] if spec.submodule_search_locations else spec.origin
-        return package_path
+    def get_startup_timing(self) -> dict:
+        """Return the cost time in seconds of each startup phase."""
+        return dict(self.__startup_timing)
+
+    def __record_phase(self, phase: str, since: float) -> float:
+        """Record the cost time of the startup phase and return the current time."""
+        now = time.perf_counter()
+        self.__startup_timing[phase] = now - since
+        return now
+
+    def __log_startup_report(self):
+        """Log the startup timing report of every phase."""
+        phase_report = ', '.join(f'{phase}: {cost * 1000:.1f}ms' for phase, cost in self.__startup_timing.items())
+        scan_stats = self.__scanner.get_scan_stats() if self.__scanner else {}
+        LOGGER.info(f"agentUniverse startup timing report: {phase_report}; "
+                    f"component files: {scan_stats.get('file_count', 0)}, "
+                    f"parsed: {scan_stats.get('parsed_count', 0)}, "
+                    f"scan cache hits: {scan_stats.get('cache_hit_count', 0)}")
 
     def __parse_sub_config_path(self, input_path: str,
                                 reference_file_path: str) -> str | None:
@@ -12,6 +12,7 @@ import time
 import uuid
 
 from functools import wraps
+from typing import Optional, Tuple
 
 from agentuniverse.agent.memory.conversation_memory.conversation_memory_module import ConversationMemoryModule
 from agentuniverse.base.util.monitor.monitor import Monitor
@@ -26,110 +27,93 @@ def trace_llm(func):
 
     @wraps(func)
     async def wrapper_async(*args, **kwargs):
-        # get llm input from arguments
-        llm_input = _get_input(func, *args, **kwargs)
-
-        source = func.__qualname__
-
         # check whether the tracing switch is enabled
-        self = llm_input.pop('self', None)
-
-        if self and hasattr(self, 'name'):
-            name = self.name
-            if name is not None:
-                source = name
-
+        self = _get_self(func, args, kwargs)
         if self and hasattr(self, 'tracing'):
             if self.tracing is False:
                 return await func(*args, **kwargs)
 
+        source = _get_llm_source(func, self)
+        monitor = Monitor()
+        trace_details = monitor.trace_details()
+        # get llm input from arguments
+        llm_input = _get_input(func, *args, **kwargs) if trace_details else None
+        if llm_input is not None:
+            llm_input.pop('self', None)
+
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'llm'})
 
         start_time = time.time()
-        Monitor().trace_llm_input(source=source, llm_input=llm_input)
+        if trace_details:
+            monitor.trace_llm_input(source=source, llm_input=llm_input)
 
         # invoke function
         result = await func(*args, **kwargs)
         # not streaming
         if isinstance(result, LLMOutput):
-            # add llm invocation info to monitor
-            Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input, llm_output=result.text,
-                                           cost_time=time.time() - start_time)
-
-            # add llm token usage to monitor
-            Monitor().trace_llm_token_usage(self, llm_input, result.text)
-            Monitor.pop_invocation_chain()
+            _trace_llm_output(func, args, kwargs, self, source, llm_input, result.text, result.get_usage(),
+                              start_time)
             return result
         else:
             # streaming
             async def gen_iterator():
                 llm_output = []
+                usage = None
                 async for chunk in result:
                     llm_output.append(chunk.text)
+                    # the provider reports the usage in the last chunk
+                    if isinstance(chunk, LLMOutput):
+                        usage = chunk.get_usage() or usage
                     yield chunk
-                # add llm invocation info to monitor
-                output_str = "".join(llm_output)
-                Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
-                                               llm_output=output_str, cost_time=time.time() - start_time)
-                # add llm token usage to monitor
-                Monitor().trace_llm_token_usage(self, llm_input, output_str)
-                Monitor.pop_invocation_chain()
+                _trace_llm_output(func, args, kwargs, self, source, llm_input, "".join(llm_output), usage,
+                                  start_time)
 
             return gen_iterator()
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
-        # get llm input from arguments
-        llm_input = _get_input(func, *args, **kwargs)
-
-        source = func.__qualname__
-
         # check whether the tracing switch is enabled
-        self = llm_input.pop('self', None)
-
-        if self and hasattr(self, 'name'):
-            name = self.name
-            if name is not None:
-                source = name
-
+        self = _get_self(func, args, kwargs)
         if self and hasattr(self, 'tracing'):
             if self.tracing is False:
                 return func(*args, **kwargs)
 
+        source = _get_llm_source(func, self)
+        monitor = Monitor()
+        trace_details = monitor.trace_details()
+        # get llm input from arguments
+        llm_input = _get_input(func, *args, **kwargs) if trace_details else None
+        if llm_input is not None:
+            llm_input.pop('self', None)
+
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'llm'})
 
         start_time = time.time()
-        Monitor().trace_llm_input(source=source, llm_input=llm_input)
+        if trace_details:
+            monitor.trace_llm_input(source=source, llm_input=llm_input)
 
         # invoke function
         result = func(*args, **kwargs)
         # not streaming
         if isinstance(result, LLMOutput):
-            # add llm invocation info to monitor
-            Monitor().trace_llm_invocation(source=source, llm_input=llm_input, llm_output=result.text,
-                                           cost_time=time.time() - start_time)
-
-            # add llm token usage to monitor
-            Monitor().trace_llm_token_usage(self, llm_input, result.text)
-            Monitor.pop_invocation_chain()
+            _trace_llm_output(func, args, kwargs, self, source, llm_input, result.text, result.get_usage(),
+                              start_time)
             return result
         else:
             # streaming
             def gen_iterator():
                 llm_output = []
+                usage = None
                 for chunk in result:
                     llm_output.append(chunk.text)
+                    # the provider reports the usage in the last chunk
+                    if isinstance(chunk, LLMOutput):
+                        usage = chunk.get_usage() or usage
                     yield chunk
-                # add llm invocation info to monitor
-                output_str = "".join(llm_output)
-                Monitor().trace_llm_invocation(source=func.__qualname__, llm_input=llm_input,
-                                               llm_output=output_str, cost_time=time.time() - start_time)
-
-                # add llm token usage to monitor
-                Monitor().trace_llm_token_usage(self, llm_input, output_str)
-                Monitor.pop_invocation_chain()
+                _trace_llm_output(func, args, kwargs, self, source, llm_input, "".join(llm_output), usage,
+                                  start_time)
 
             return gen_iterator()
 
@@ -141,6 +125,30 @@ def trace_llm(func):
         return wrapper_sync
 
 
+def _get_llm_source(func, llm: object) -> str:
+    name = getattr(llm, 'name', None) if llm else None
+    return name if name is not None else func.__qualname__
+
+
+def _trace_llm_output(func, args: tuple, kwargs: dict, llm: object, source: str, llm_input: Optional[dict],
+                      output_str: str, usage: Optional[dict], start_time: float):
+    """Add the llm invocation info and the token usage to the monitor and leave the invocation chain."""
+    monitor = Monitor()
+    cost_time = time.time() - start_time
+    monitor.record_metrics('llm', source, cost_time)
+    if llm_input is not None:
+        # add llm invocation info to monitor
+        monitor.trace_llm_invocation(source=source, llm_input=llm_input, llm_output=output_str,
+                                     cost_time=cost_time)
+    elif not (monitor.use_provider_usage and usage):
+        # the input is only materialized to count its tokens
+        llm_input = _get_input(func, *args, **kwargs)
+        llm_input.pop('self', None)
+    # add llm token usage to monitor
+    monitor.trace_llm_token_usage(llm, llm_input, output_str, usage)
+    Monitor.pop_invocation_chain()
+
+
 def get_caller_info(instance: object = None):
     source_list = Monitor.get_invocation_chain()
     if len(source_list) > 0:
@@ -163,29 +171,25 @@ def trace_agent(func):
 
     @functools.wraps(func)
     async def wrapper_async(*args, **kwargs):
-        # get agent input from arguments
-        agent_input = _get_input(func, *args, **kwargs)
         # check whether the tracing switch is enabled
-        source = func.__qualname__
-        self = agent_input.pop('self', None)
+        self = _get_self(func, args, kwargs)
+        source, tracing = _get_agent_source(func, self)
+        trace_details = tracing is not False and Monitor().trace_details()
+        memory_activate = ConversationMemoryModule().activate
+        # get agent input from arguments
+        agent_input = _get_input(func, *args, **kwargs) if trace_details or memory_activate else None
+        if agent_input is not None:
+            agent_input.pop('self', None)
 
-        tracing = None
-        if isinstance(self, object):
-            agent_model = getattr(self, 'agent_model', None)
-            if isinstance(agent_model, object):
-                info = getattr(agent_model, 'info', None)
-                profile = getattr(agent_model, 'profile', None)
-                if isinstance(info, dict):
-                    source = info.get('name', None)
-                if isinstance(profile, dict):
-                    tracing = profile.get('tracing', None)
         start_info = get_caller_info()
         pair_id = f"agent_{uuid.uuid4().hex}"
         kwargs['memory_source_info'] = start_info
-        ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
+        if memory_activate:
+            ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
         if tracing is False:
             result = await func(*args, **kwargs)
-            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+            if memory_activate:
+                ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
             return result
 
         # add invocation chain to the monitor module.
@@ -193,42 +197,38 @@ def trace_agent(func):
         Monitor.add_invocation_chain({'source': source, 'type': 'agent'})
 
         start_time = time.time()
-        Monitor().trace_agent_input(source=source, agent_input=agent_input)
+        if trace_details:
+            Monitor().trace_agent_input(source=source, agent_input=agent_input)
 
         # invoke function
         result = await func(*args, **kwargs)
-        # add agent invocation info to monitor
-        Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
-                                         cost_time=time.time() - start_time)
-        ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+        _trace_agent_output(source, agent_input, result, start_time, trace_details)
+        if memory_activate:
+            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
         Monitor.pop_invocation_chain()
         return result
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
-        # get agent input from arguments
-        agent_input = _get_input(func, *args, **kwargs)
         # check whether the tracing switch is enabled
-        source = func.__qualname__
-        self = agent_input.pop('self', None)
+        self = _get_self(func, args, kwargs)
+        source, tracing = _get_agent_source(func, self)
+        trace_details = tracing is not False and Monitor().trace_details()
+        memory_activate = ConversationMemoryModule().activate
+        # get agent input from arguments
+        agent_input = _get_input(func, *args, **kwargs) if trace_details or memory_activate else None
+        if agent_input is not None:
+            agent_input.pop('self', None)
 
-        tracing = None
-        if isinstance(self, object):
-            agent_model = getattr(self, 'agent_model', None)
-            if isinstance(agent_model, object):
-                info = getattr(agent_model, 'info', None)
-                profile = getattr(agent_model, 'profile', None)
-                if isinstance(info, dict):
-                    source = info.get('name', None)
-                if isinstance(profile, dict):
-                    tracing = profile.get('tracing', None)
         pair_id = f"agent_{uuid.uuid4().hex}"
         start_info = get_caller_info()
         kwargs['memory_source_info'] = start_info
-        ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
+        if memory_activate:
+            ConversationMemoryModule().add_agent_input_info(start_info, self, agent_input, pair_id)
         if tracing is False:
             result = func(*args, **kwargs)
-            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+            if memory_activate:
+                ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
             return result
 
         # add invocation chain to the monitor module.
@@ -236,14 +236,14 @@ def trace_agent(func):
         Monitor.add_invocation_chain({'source': source, 'type': 'agent'})
 
         start_time = time.time()
-        Monitor().trace_agent_input(source=source, agent_input=agent_input)
+        if trace_details:
+            Monitor().trace_agent_input(source=source, agent_input=agent_input)
 
         # invoke function
         result = func(*args, **kwargs)
-        # add agent invocation info to monitor
-        Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
-                                         cost_time=time.time() - start_time)
-        ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
+        _trace_agent_output(source, agent_input, result, start_time, trace_details)
+        if memory_activate:
+            ConversationMemoryModule().add_agent_result_info(self, result, start_info, pair_id)
         Monitor.pop_invocation_chain()
         return result
 
@@ -255,6 +255,30 @@ def trace_agent(func):
         return wrapper_sync
 
 
+def _get_agent_source(func, agent: object) -> Tuple[str, Optional[bool]]:
+    """Get the agent name and its tracing switch."""
+    source = func.__qualname__
+    tracing = None
+    agent_model = getattr(agent, 'agent_model', None)
+    if isinstance(agent_model, object):
+        info = getattr(agent_model, 'info', None)
+        profile = getattr(agent_model, 'profile', None)
+        if isinstance(info, dict):
+            source = info.get('name', None)
+        if isinstance(profile, dict):
+            tracing = profile.get('tracing', None)
+    return source, tracing
+
+
+def _trace_agent_output(source: str, agent_input: Optional[dict], result, start_time: float, trace_details: bool):
+    cost_time = time.time() - start_time
+    Monitor().record_metrics('agent', source, cost_time)
+    if trace_details:
+        # add agent invocation info to monitor
+        Monitor().trace_agent_invocation(source=source, agent_input=agent_input, agent_output=result,
+                                         cost_time=cost_time)
+
+
 def trace_tool(func):
     """Annotation: @trace_tool
 
@@ -262,27 +286,38 @@ def trace_tool(func):
     It monitors tool execution, tracks timing, and maintains an invocation chain.
     """
 
-    def process_tool(source, tool_input, start_info, pair_id):
+    def process_tool(source, args, kwargs, start_info, pair_id):
         """Process common tool logic
 
         Args:
             source: The source/name of the tool
-            tool_input: Input parameters for the tool
+            args: Positional arguments of the tool call
+            kwargs: Keyword arguments of the tool call
             start_info: Information about where the tool was called from
             pair_id: The ID for this tool invocation
 
         Returns:
-            tuple: (self tool instance, updated source name)
+            tuple: (self tool instance, updated source name, tool input or None when not traced, whether the
+                inputs and outputs are traced, whether the conversation memory is collected)
         """
-        self = tool_input.pop('self', None)
+        self = _get_self(func, args, kwargs)
         if isinstance(self, object):
             name = getattr(self, 'name', None)
             if name is not None:
                 source = name
-        ConversationMemoryModule().add_tool_input_info(start_info, source, tool_input, pair_id)
-        return self, source
-
-    def handle_tool_result(start_info, source, result, pair_id):
+        trace_details = not (self and hasattr(self, 'tracing') and self.tracing is False) \
+            and Monitor().trace_details()
+        memory_activate = ConversationMemoryModule().activate
+        tool_input = None
+        if trace_details or memory_activate:
+            # Extract tool input from arguments
+            tool_input = _get_input(func, *args, **kwargs)
+            tool_input.pop('self', None)
+        if memory_activate:
+            ConversationMemoryModule().add_tool_input_info(start_info, source, tool_input, pair_id)
+        return self, source, tool_input, trace_details, memory_activate
+
+    def handle_tool_result(start_info, source, result, pair_id, memory_activate):
         """Handle the tool execution result
 
         Args:
@@ -290,14 +325,16 @@ def trace_tool(func):
             source: The source/name of the tool
             result: The execution result
             pair_id: The ID for this tool invocation
+            memory_activate: Whether the conversation memory is collected
 
         Returns:
             The execution result
         """
-        ConversationMemoryModule().add_tool_output_info(start_info, source, params=result, pair_id=pair_id)
+        if memory_activate:
+            ConversationMemoryModule().add_tool_output_info(start_info, source, params=result, pair_id=pair_id)
         return result
 
-    def trace_tool_execution(source, tool_input, result, start_time):
+    def trace_tool_execution(source, tool_input, result, start_time, trace_details):
         """Trace the tool execution process
 
          Args:
@@ -305,62 +342,66 @@ def trace_tool(func):
              tool_input: Input parameters for the tool
              result: The execution result
              start_time: Timestamp when the tool execution started
+             trace_details: Whether the inputs and outputs are traced
          """
+        cost_time = time.time() - start_time
+        Monitor().record_metrics('tool', source, cost_time)
         # add invocation chain to the monitor module.
         Monitor.add_invocation_chain({'source': source, 'type': 'tool'})
-        Monitor().trace_tool_invocation(
-            source=source,
-            tool_input=tool_input,
-            tool_output=result,
-            cost_time=time.time() - start_time
-        )
+        if trace_details:
+            Monitor().trace_tool_invocation(
+                source=source,
+                tool_input=tool_input,
+                tool_output=result,
+                cost_time=cost_time
+            )
         Monitor.pop_invocation_chain()
 
     @functools.wraps(func)
     async def wrapper_async(*args, **kwargs):
-        # Extract tool input from arguments
-        tool_input = _get_input(func, *args, **kwargs)
         start_time = time.time()
         source = func.__qualname__
         start_info = get_caller_info()
         pair_id = f"tool_{uuid.uuid4().hex}"
 
-        self, source = process_tool(source, tool_input, start_info, pair_id)
+        self, source, tool_input, trace_details, memory_activate = process_tool(source, args, kwargs, start_info,
+                                                                                pair_id)
 
         # Handle case when tracing is disabled
         if self and hasattr(self, 'tracing') and self.tracing is False:
             result = await func(*args, **kwargs)
-            return handle_tool_result(start_info, source, result, pair_id)
+            return handle_tool_result(start_info, source, result, pair_id, memory_activate)
 
         # Initialize and execute with full tracing
         Monitor.init_invocation_chain()
-        Monitor().trace_tool_input(source, tool_input)
+        if trace_details:
+            Monitor().trace_tool_input(source, tool_input)
         result = await func(*args, **kwargs)
-        trace_tool_execution(source, tool_input, result, start_time)
-        return handle_tool_result(start_info, source, result, pair_id)
+        trace_tool_execution(source, tool_input, result, start_time, trace_details)
+        return handle_tool_result(start_info, source, result, pair_id, memory_activate)
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
-        # Extract tool input from arguments
-        tool_input = _get_input(func, *args, **kwargs)
         start_time = time.time()
         source = func.__qualname__
         start_info = get_caller_info()
         pair_id = f"tool_{uuid.uuid4().hex}"
 
-        self, source = process_tool(source, tool_input, start_info, pair_id)
+        self, source, tool_input, trace_details, memory_activate = process_tool(source, args, kwargs, start_info,
+                                                                                pair_id)
 
         # Handle case when tracing is disabled
         if self and hasattr(self, 'tracing') and self.tracing is False:
             result = func(*args, **kwargs)
-            return handle_tool_result(start_info, source, result, pair_id)
+            return handle_tool_result(start_info, source, result, pair_id, memory_activate)
 
         # Initialize and execute with full tracing
         Monitor.init_invocation_chain()
-        Monitor().trace_tool_input(source, tool_input)
+        if trace_details:
+            Monitor().trace_tool_input(source, tool_input)
         result = func(*args, **kwargs)
-        trace_tool_execution(source, tool_input, result, start_time)
-        return handle_tool_result(start_info, source, result, pair_id)
+        trace_tool_execution(source, tool_input, result, start_time, trace_details)
+        return handle_tool_result(start_info, source, result, pair_id, memory_activate)
 
     return wrapper_async if asyncio.iscoroutinefunction(func) else wrapper_sync
 
@@ -371,27 +412,33 @@ def trace_knowledge(func):
     Decorator to trace the knowledge invocation.
     """
 
-    def process_knowledge(source, knowledge_input, start_info, pair_id):
+    def process_knowledge(source, args, kwargs, start_info, pair_id):
         """Process common knowledge logic
 
         Args:
             source: The source/name of the knowledge
-            knowledge_input: Input parameters for the knowledge
+            args: Positional arguments of the knowledge call
+            kwargs: Keyword arguments of the knowledge call
             start_info: Information about where the knowledge was called from
             pair_id: The ID for this knowledge invocation
 
         Returns:
-            tuple: (self knowledge instance, updated source name)
+            tuple: (self knowledge instance, updated source name, whether the conversation memory is collected)
         """
-        self = knowledge_input.pop('self', None)
+        self = _get_self(func, args, kwargs)
         if isinstance(self, object):
             name = getattr(self, 'name', None)
             if name is not None:
                 source = name
-        ConversationMemoryModule().add_knowledge_input_info(start_info, source, knowledge_input, pair_id)
-        return self, source
-
-    def handle_knowledge_result(start_info, source, result, pair_id):
+        memory_activate = ConversationMemoryModule().activate
+        if memory_activate:
+            # Get knowledge input from arguments
+            knowledge_input = _get_input(func, *args, **kwargs)
+            knowledge_input.pop('self', None)
+            ConversationMemoryModule().add_knowledge_input_info(start_info, source, knowledge_input, pair_id)
+        return self, source, memory_activate
+
+    def handle_knowledge_result(start_info, source, result, pair_id, memory_activate):
         """Handle the knowledge execution result
 
         Args:
@@ -399,11 +446,13 @@ def trace_knowledge(func):
             source: The source/name of the knowledge
             result: The execution result
             pair_id: The ID for this knowledge invocation
+            memory_activate: Whether the conversation memory is collected
 
         Returns:
             The execution result
         """
-        ConversationMemoryModule().add_knowledge_output_info(start_info, source, params=result, pair_id=pair_id)
+        if memory_activate:
+            ConversationMemoryModule().add_knowledge_output_info(start_info, source, params=result, pair_id=pair_id)
         return result
 
     def trace_knowledge_execution(source):
@@ -417,52 +466,68 @@ def trace_knowledge(func):
 
     @functools.wraps(func)
     async def wrapper_async(*args, **kwargs):
-        # Get knowledge input from arguments
-        knowledge_input = _get_input(func, *args, **kwargs)
         source = func.__qualname__
         start_info = get_caller_info()
         pair_id = f"knowledge_{uuid.uuid4().hex}"
 
-        self, source = process_knowledge(source, knowledge_input, start_info, pair_id)
+        self, source, memory_activate = process_knowledge(source, args, kwargs, start_info, pair_id)
 
         # Handle case when tracing is disabled
         if self and hasattr(self, 'tracing') and self.tracing is False:
             result = await func(*args, **kwargs)
-            return handle_knowledge_result(start_info, source, result, pair_id)
+            return handle_knowledge_result(start_info, source, result, pair_id, memory_activate)
 
         # Initialize and execute with full tracing
         trace_knowledge_execution(source)
+        start_time = time.time()
         result = await func(*args, **kwargs)
+        Monitor().record_metrics('knowledge', source, time.time() - start_time)
         Monitor.pop_invocation_chain()
-        return handle_knowledge_result(start_info, source, result, pair_id)
+        return handle_knowledge_result(start_info, source, result, pair_id, memory_activate)
 
     @functools.wraps(func)
     def wrapper_sync(*args, **kwargs):
-        # Get knowledge input from arguments
-        knowledge_input = _get_input(func, *args, **kwargs)
         source = func.__qualname__
         start_info = get_caller_info()
         pair_id = f"knowledge_{uuid.uuid4().hex}"
 
-        self, source = process_knowledge(source, knowledge_input, start_info, pair_id)
+        self, source, memory_activate = process_knowledge(source, args, kwargs, start_info, pair_id)
 
         # Handle case when tracing is disabled
         if self and hasattr(self, 'tracing') and self.tracing is False:
             result = func(*args, **kwargs)
-            return handle_knowledge_result(start_info, source, result, pair_id)
+            return handle_knowledge_result(start_info, source, result, pair_id, memory_activate)
 
         # Initialize and execute with full tracing
         trace_knowledge_execution(source)
+        start_time = time.time()
         result = func(*args, **kwargs)
+        Monitor().record_metrics('knowledge', source, time.time() - start_time)
         Monitor.pop_invocation_chain()
-        return handle_knowledge_result(start_info, source, result, pair_id)
+        return handle_knowledge_result(start_info, source, result, pair_id, memory_activate)
 
     return wrapper_async if asyncio.iscoroutinefunction(func) else wrapper_sync
 
 
+@functools.lru_cache(maxsize=None)
+def _get_signature(func) -> inspect.Signature:
+    """Get the signature of the traced function, it is inspected once per function."""
+    return inspect.signature(func)
+
+
+def _get_self(func, args: tuple, kwargs: dict):
+    """Get the instance of a traced method without binding all the arguments."""
+    parameters = _get_signature(func).parameters
+    if 'self' not in parameters:
+        return None
+    if args and next(iter(parameters)) == 'self':
+        return args[0]
+    return kwargs.get('self')
+
+
 def _get_input(func, *args, **kwargs) -> dict:
     """Get the agent input from arguments."""
-    sig = inspect.signature(func)
+    sig = _get_signature(func)
     bound_args = sig.bind(*args, **kwargs)
     bound_args.apply_defaults()
     return {k: v for k, v in bound_args.arguments.items()}
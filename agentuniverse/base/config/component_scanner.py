@@ -0,0 +1,163 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 10:12
+# @FileName: component_scanner.py
+import importlib.util
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+SCAN_CACHE_VERSION = 1
+
+
+class ComponentScanner(object):
+    """The ComponentScanner class, which walks every package once, parses every
+    configuration file once and buckets the parsed component configers by component type.
+
+    The raw file content can be persisted in a scan cache keyed by the file fingerprint
+    (mtime and size), so warm restarts skip the yaml parsing entirely.
+    """
+
+    def __init__(self, config_type_enum: ConfigTypeEnum = ConfigTypeEnum.YAML, cache_path: Optional[str] = None):
+        """Initialize the ComponentScanner.
+
+        Args:
+            config_type_enum(ConfigTypeEnum): the configuration file type enumeration
+            cache_path(Optional[str]): the scan cache file path, no cache is used when it is empty
+        """
+        self.__config_type_enum: ConfigTypeEnum = config_type_enum
+        self.__cache_path: Optional[str] = cache_path
+        # file path -> (mtime_ns, size, raw value)
+        self.__cache: Dict[str, Tuple[int, int, dict]] = {}
+        self.__cache_dirty: bool = False
+        # package name -> {component type: [component configer]}
+        self.__package_bucket_map: Dict[str, Dict[str, List[ComponentConfiger]]] = {}
+        # file path -> (component type, component configer)
+        self.__file_configer_map: Dict[str, Tuple[Optional[str], ComponentConfiger]] = {}
+        self.file_count: int = 0
+        self.parsed_count: int = 0
+        self.cache_hit_count: int = 0
+        self.__load_cache()
+
+    @property
+    def config_type_enum(self) -> ConfigTypeEnum:
+        """Return the configuration file type enumeration."""
+        return self.__config_type_enum
+
+    def scan(self, package_list: List[str], component_enum: ComponentEnum) -> List[ComponentConfiger]:
+        """Return the component configer list of the given component type under the package list.
+
+        Args:
+            package_list(List[str]): the package list
+            component_enum(ComponentEnum): the component enumeration
+
+        Returns:
+            List[ComponentConfiger]: the component configer list
+        """
+        component_configer_list = []
+        for package_name in package_list:
+            bucket = self.scan_package(package_name)
+            component_configer_list.extend(bucket.get(component_enum.value, []))
+        return component_configer_list
+
+    def scan_package(self, package_name: str) -> Dict[str, List[ComponentConfiger]]:
+        """Walk the package once and bucket the component configers by component type.
+
+        Args:
+            package_name(str): the package name
+
+        Returns:
+            Dict[str, List[ComponentConfiger]]: the component configers grouped by component type
+        """
+        bucket = self.__package_bucket_map.get(package_name)
+        if bucket is not None:
+            return bucket
+        bucket = {}
+        path = Path(self.package_name_to_path(package_name))
+        for config_file in path.rglob(f'*.{self.__config_type_enum.value}'):
+            component_config_type, component_configer = self.__load_file(str(config_file))
+            bucket.setdefault(component_config_type, []).append(component_configer)
+        self.__package_bucket_map[package_name] = bucket
+        return bucket
+
+    def save_cache(self):
+        """Persist the scan cache if anything changed since it was loaded."""
+        if not self.__cache_path or not self.__cache_dirty:
+            return
+        # drop the entries of deleted files
+        cache = {k: v for k, v in self.__cache.items() if k in self.__file_configer_map or os.path.exists(k)}
+        tmp_path = f'{self.__cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.__cache_path)), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': SCAN_CACHE_VERSION, 'files': cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # atomic replacement, concurrent workers never read a partially written cache
+            os.replace(tmp_path, self.__cache_path)
+            self.__cache_dirty = False
+        except Exception as e:
+            LOGGER.warn(f"Failed to save the component scan cache {self.__cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_scan_stats(self) -> dict:
+        """Return the scan statistics."""
+        return {'file_count': self.file_count, 'parsed_count': self.parsed_count,
+                'cache_hit_count': self.cache_hit_count}
+
+    @staticmethod
+    def package_name_to_path(package_name: str) -> str:
+        """Convert the package name to the package path.
+
+        Args:
+            package_name(str): the package name
+
+        Returns:
+            str: the package path
+        """
+        spec = importlib.util.find_spec(package_name)
+        if spec is None:
+            raise ImportError(f"Can not find {package_name}")
+        return spec.submodule_search_locations[0] if spec.submodule_search_locations else spec.origin
+
+    def __load_file(self, config_file: str) -> Tuple[Optional[str], ComponentConfiger]:
+        """Parse the configuration file once, using the scan cache when the fingerprint matches."""
+        loaded = self.__file_configer_map.get(config_file)
+        if loaded is not None:
+            return loaded
+        self.file_count += 1
+        stat = os.stat(config_file)
+        cached = self.__cache.get(config_file)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            raw_value = cached[2]
+            self.cache_hit_count += 1
+        else:
+            raw_value = Configer.read_raw_yaml_file(config_file)
+            self.parsed_count += 1
+            if self.__cache_path:
+                self.__cache[config_file] = (stat.st_mtime_ns, stat.st_size, raw_value)
+                self.__cache_dirty = True
+        configer = Configer(path=config_file).load_by_raw_value(raw_value)
+        component_configer = ComponentConfiger().load_by_configer(configer)
+        loaded = (component_configer.get_component_config_type(), component_configer)
+        self.__file_configer_map[config_file] = loaded
+        return loaded
+
+    def __load_cache(self):
+        """Load the persisted scan cache, a broken or outdated cache is ignored."""
+        if not self.__cache_path or not os.path.exists(self.__cache_path):
+            return
+        try:
+            with open(self.__cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('version') == SCAN_CACHE_VERSION:
+                self.__cache = data.get('files', {})
+        except Exception as e:
+            LOGGER.warn(f"Failed to load the component scan cache {self.__cache_path}, ignore it: {e}")
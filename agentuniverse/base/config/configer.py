@@ -122,6 +122,18 @@ class Configer(object):
         """
         return self.load_by_path(self.__path)
 
+    def load_by_raw_value(self, raw_value: dict) -> 'Configer':
+        """Load the configuration from the raw (unresolved) content of the file,
+        which is usually read by `read_raw_yaml_file` before.
+
+        Args:
+            raw_value(dict): the raw value of the configuration file
+        Returns:
+            Configer: the Configer object
+        """
+        self.__value = PlaceholderResolver().resolve(raw_value)
+        return self
+
     def get(self, key: str, default=None) -> Optional[any]:
         """Return the value of the configuration file at the given key, or the default value if the key is not found
         Args:
@@ -198,7 +210,18 @@ class Configer(object):
         Returns:
             dict: the value of the yaml file
         """
-        with open(path, 'r', encoding='utf-8') as stream:
-            config_data = yaml.safe_load(stream)
+        config_data = Configer.read_raw_yaml_file(path)
         config_data = PlaceholderResolver().resolve(config_data)
         return config_data
+
+    @staticmethod
+    def read_raw_yaml_file(path: str) -> dict:
+        """Read the yaml file without resolving placeholders.
+
+        Args:
+            path(str): the path of the yaml file
+        Returns:
+            dict: the raw value of the yaml file
+        """
+        with open(path, 'r', encoding='utf-8') as stream:
+            return yaml.safe_load(stream)
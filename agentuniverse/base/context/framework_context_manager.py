@@ -5,13 +5,54 @@
 # @Author  : fanen.lhy
 # @Email   : fanen.lhy@antgroup.com
 # @FileName: framework_context_manager.py
-from contextvars import ContextVar, Token
+from contextvars import ContextVar, Token, copy_context
 import threading
 import copy
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 from agentuniverse.base.annotation.singleton import singleton
 
+_MUTABLE_TYPES = (dict, list, set)
+
+
+class ContextSnapshot:
+    """An immutable snapshot of the context of the capturing thread.
+
+    The snapshot is captured in O(1) by `contextvars.copy_context`, whatever
+    the size of the context values, and every `run` activates a fresh copy of
+    it, so one snapshot can be run by many worker threads at the same time.
+    The context values are shared with the capturing thread until the worker
+    reads a mutable one, e.g. an invocation chain or the log context, which is
+    then copied on first access. The copied accumulators registered by
+    `FrameworkContextManager.register_accumulator`, e.g. the token usage, are
+    merged back into the values of the capturing thread when the run ends.
+    """
+
+    def __init__(self):
+        self.__context = copy_context()
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn` within a copy of the snapshot."""
+        return self.__context.copy().run(self._activate_and_run, fn, args, kwargs)
+
+    @staticmethod
+    def _activate_and_run(fn: Callable, args: tuple, kwargs: dict) -> Any:
+        manager = FrameworkContextManager()
+        manager.activate_copy_on_write()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            manager.merge_back()
+
+
+class _CopyOnWriteState:
+    """The context values copied by a worker thread running a snapshot."""
+
+    def __init__(self):
+        self.copied = set()
+        # var name -> (the value of the capturing thread, its copy at the first access)
+        self.accumulators: Dict[str, Tuple[Any, Any]] = {}
+
 
 @singleton
 class FrameworkContextManager:
@@ -22,12 +63,17 @@ class FrameworkContextManager:
         add new key to this dict."""
         self.__context_dict = ContextVar("__context_dict__")
         self.__dict_edit_lock = threading.Lock()
+        self.__copy_on_write = ContextVar("__copy_on_write__", default=None)
+        self.__accumulators: List[Tuple[str, Callable[[Any, Any, Any], None]]] = []
+        self.__merge_lock = threading.Lock()
 
     @property
     def context_dict(self) -> dict:
-        if not self.__context_dict.get(None):
-            self.__context_dict.set({})
-        return self.__context_dict.get({})
+        context_dict = self.__context_dict.get(None)
+        if context_dict is None:
+            context_dict = {}
+            self.__context_dict.set(context_dict)
+        return context_dict
 
     def is_context_exist(self, var_name: str) -> bool:
         """Judge whether context variable exist in current context.
@@ -54,6 +100,9 @@ class FrameworkContextManager:
             with self.__dict_edit_lock:
                 if var_name not in self.context_dict:
                     self.context_dict[var_name] = ContextVar(var_name)
+        state: Optional[_CopyOnWriteState] = self.__copy_on_write.get()
+        if state is not None:
+            state.copied.add(var_name)
         return self.context_dict[var_name].set(var_value)
 
     def get_context(self,
@@ -67,9 +116,33 @@ class FrameworkContextManager:
             default_value (`Any`, defaults to `None`):
                 Value to be returned if target context variable doesn't exist.
         """
-        if var_name not in self.context_dict:
+        context_var = self.context_dict.get(var_name)
+        if context_var is None:
             return default_value
-        return self.context_dict[var_name].get(default_value)
+        value = context_var.get(default_value)
+        state: Optional[_CopyOnWriteState] = self.__copy_on_write.get()
+        if state is not None and var_name not in state.copied and value is not default_value:
+            value = self._copy_on_write(state, var_name, value)
+        return value
+
+    def _copy_on_write(self, state: _CopyOnWriteState, var_name: str, value: Any) -> Any:
+        """Copy a mutable value inherited from the capturing thread at its first
+        access in the worker, so the worker never mutates the value of another
+        thread."""
+        state.copied.add(var_name)
+        if not isinstance(value, _MUTABLE_TYPES):
+            return value
+        copied_value = copy.copy(value)
+        if self._get_accumulator(var_name) is not None:
+            state.accumulators[var_name] = (value, copy.copy(value))
+        self.context_dict[var_name].set(copied_value)
+        return copied_value
+
+    def _get_accumulator(self, var_name: str) -> Optional[Callable[[Any, Any, Any], None]]:
+        for suffix, merge_func in self.__accumulators:
+            if var_name.endswith(suffix):
+                return merge_func
+        return None
 
     def del_context(self, var_name: str, force: bool = False):
         """Set a context variable to None.
@@ -97,8 +170,50 @@ class FrameworkContextManager:
         """
         self.context_dict[var_name].reset(token)
 
+    def snapshot(self) -> ContextSnapshot:
+        """Capture the current context in O(1) to run it in other threads."""
+        return ContextSnapshot()
+
+    def activate_copy_on_write(self):
+        """Make the current context copy the inherited mutable values on first
+        access, called when a snapshot starts running in a worker."""
+        self.__copy_on_write.set(_CopyOnWriteState())
+
+    def merge_back(self):
+        """Merge the accumulators copied by the current context back into the
+        values they were copied from."""
+        state: Optional[_CopyOnWriteState] = self.__copy_on_write.get()
+        if state is None:
+            return
+        for var_name, (target, baseline) in state.accumulators.items():
+            value = self.context_dict[var_name].get(None) if var_name in self.context_dict else None
+            if value is None:
+                continue
+            with self.__merge_lock:
+                self._get_accumulator(var_name)(target, value, baseline)
+        state.accumulators.clear()
+
+    def register_accumulator(self, suffix: str, merge_func: Callable[[Any, Any, Any], None]):
+        """Register the accumulators merged back from the worker threads.
+
+        Args:
+            suffix (`str`):
+                Suffix of the names of the accumulator context variables.
+            merge_func (`Callable[[Any, Any, Any], None]`):
+                Called with the value of the capturing thread, the value of the
+                worker and the value of the worker at its first access, it adds
+                the changes of the worker to the value of the capturing thread.
+        """
+        with self.__dict_edit_lock:
+            self.__accumulators = [(s, f) for s, f in self.__accumulators if s != suffix]
+            self.__accumulators.append((suffix, merge_func))
+
     def get_all_contexts(self) -> Dict[str, Any]:
-        """Get all context variables and their values."""
+        """Get all context variables and their values.
+
+        The values are deep copied, use `snapshot` to hand the context over to
+        other threads cheaply.
+        """
         context_values = {}
         with self.__dict_edit_lock:
             for var_name in self.context_dict.keys():
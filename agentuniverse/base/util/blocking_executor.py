@@ -0,0 +1,70 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 05:10
+# @FileName: blocking_executor.py
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+
+DEFAULT_MAX_WORKERS = 32
+
+
+@singleton
+class BlockingExecutor(object):
+    """The process-wide pool running the sync fallbacks of the async path, e.g.
+    the planners, the tools and the stores without a native coroutine.
+
+    The fallbacks run here instead of the default executor of the event loop,
+    which is shared with the dns lookups and the file io of the loop and is
+    sized by the cpu count, so slow blocking calls can neither starve the loop
+    internals nor spawn threads beyond `max_workers`. The context of the
+    caller is seen by the worker. The pool is created lazily in the current
+    process and is configured by the `ASYNC` section of config.toml, e.g.
+
+        [ASYNC]
+        blocking_max_workers = 32
+    """
+
+    def __init__(self):
+        self.max_workers: int = DEFAULT_MAX_WORKERS
+        self.__lock = threading.Lock()
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__pid: Optional[int] = None
+
+    def init_by_configer(self, configer: Configer):
+        """Read the pool size from the `ASYNC` section of the configer."""
+        config: dict = configer.value.get('ASYNC', {}) if configer else {}
+        max_workers = int(config.get('blocking_max_workers', DEFAULT_MAX_WORKERS))
+        with self.__lock:
+            if max_workers != self.max_workers and self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+            self.max_workers = max_workers
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self.__lock:
+            # the worker threads of the parent process do not exist in the forked workers
+            if self.__executor is None or self.__pid != os.getpid():
+                self.__executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                     thread_name_prefix='au_blocking')
+                self.__pid = os.getpid()
+            return self.__executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await `fn` run in the pool within a snapshot of the context of the caller."""
+        snapshot = FrameworkContextManager().snapshot()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), functools.partial(snapshot.run, fn, *args, **kwargs))
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Await the sync `fn` run on the blocking executor."""
+    return await BlockingExecutor().run(fn, *args, **kwargs)
@@ -11,10 +11,17 @@ from queue import Queue
 def stream_output(output_stream: Queue, data: dict):
     """Add data to the output stream.
 
+    The stream queues of the SSE responses wait for a slow client for a bounded
+    time by `put_wait`, the other queues are put without waiting.
+
     Args:
         output_stream (Queue): The output stream.
         data (dict): The data to be streamed.
     """
     if output_stream is None:
         return
-    output_stream.put_nowait(data)
+    put_wait = getattr(output_stream, 'put_wait', None)
+    if put_wait is not None:
+        put_wait(data)
+    else:
+        output_stream.put_nowait(data)
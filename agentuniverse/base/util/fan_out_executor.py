@@ -0,0 +1,238 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:40
+# @FileName: fan_out_executor.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+from agentuniverse.base.util.logging.logging_util import LOGGER
+from agentuniverse.base.util.rate_limiter import TokenBucket
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_MAX_HUNG_ACTIONS = 16
+
+
+class HungActionsError(Exception):
+    """Raised when too many timed out actions are still running to start a new one."""
+
+
+@singleton
+class FanOutExecutor(object):
+    """The process-wide pool fanning out the sub tasks of the agents, e.g. the
+    steps of a plan run by the executing agent.
+
+    Every fan-out keeps at most `concurrency` of its items in flight and paces
+    their starts by an optional token bucket, the results are yielded as soon
+    as they complete. A fan-out started inside a pool worker runs its items in
+    the calling thread, so nested fan-outs can never exhaust the pool and
+    deadlock.
+
+    The actions run with a deadline by `run_actions` use a separate pool of
+    `max_workers`. A timed out action can not be stopped, its worker keeps
+    running it, so the hung actions can only hold the workers of that pool.
+    They are tracked until they finish, and beyond `max_hung_actions` a new
+    action with a deadline is refused with a `HungActionsError` instead of
+    waiting behind them.
+    """
+
+    def __init__(self):
+        self.max_workers: int = DEFAULT_MAX_WORKERS
+        self.max_hung_actions: int = DEFAULT_MAX_HUNG_ACTIONS
+        self.__lock = threading.Lock()
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__deadline_executor: Optional[ThreadPoolExecutor] = None
+        self.__pid: Optional[int] = None
+        self.__hung_actions = 0
+        self.__local = threading.local()
+
+    def _get_executor(self, deadline: bool = False) -> ThreadPoolExecutor:
+        with self.__lock:
+            # the worker threads of the parent process do not exist in the forked workers
+            if self.__executor is None or self.__pid != os.getpid():
+                self.__executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                     thread_name_prefix='au_fan_out',
+                                                     initializer=self._mark_worker)
+                self.__deadline_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                              thread_name_prefix='au_fan_out_deadline',
+                                                              initializer=self._mark_worker)
+                self.__pid = os.getpid()
+                self.__hung_actions = 0
+            return self.__deadline_executor if deadline else self.__executor
+
+    def _mark_worker(self):
+        self.__local.is_worker = True
+
+    def in_worker(self) -> bool:
+        """Whether the current thread is a worker of the pool."""
+        return getattr(self.__local, 'is_worker', False)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run `fn` in the pool within a snapshot of the context of the caller,
+        so the framework context and the trace context are seen by the worker."""
+        return self._get_executor().submit(FrameworkContextManager().snapshot().run, fn, *args, **kwargs)
+
+    def submit_with_deadline(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run `fn` in the pool of the actions with a deadline like `submit`.
+
+        Raises:
+            HungActionsError: `max_hung_actions` timed out actions are still running.
+        """
+        executor = self._get_executor(deadline=True)
+        with self.__lock:
+            if self.__hung_actions >= self.max_hung_actions:
+                raise HungActionsError(f"{self.__hung_actions} timed out actions are still running, "
+                                       f"no action with a deadline is started until they finish.")
+        return executor.submit(FrameworkContextManager().snapshot().run, fn, *args, **kwargs)
+
+    def track_hung(self, name: str, future: Future):
+        """Track a timed out action still running until it finishes."""
+        with self.__lock:
+            self.__hung_actions += 1
+            hung_actions = self.__hung_actions
+            pid = self.__pid
+        LOGGER.warn(f"The action {name} timed out but keeps running, {hung_actions} timed out actions "
+                    f"are running. The action should enforce its own timeout.")
+
+        def on_done(_):
+            with self.__lock:
+                # the counter is reset in a forked process
+                if pid == self.__pid:
+                    self.__hung_actions -= 1
+
+        future.add_done_callback(on_done)
+
+    def hung_action_count(self) -> int:
+        """The count of the timed out actions still running."""
+        with self.__lock:
+            return self.__hung_actions
+
+    def map_as_completed(self, fn: Callable, items: Iterable, concurrency: int = DEFAULT_MAX_WORKERS,
+                         rate_limiter: Optional[TokenBucket] = None) -> Iterator:
+        """Run `fn` on every item and yield the results in completion order.
+
+        Args:
+            fn (Callable): The function run on every item.
+            items (Iterable): The items.
+            concurrency (int): The max count of the items running at the same time.
+            rate_limiter (Optional[TokenBucket]): The token bucket pacing the item starts.
+
+        Returns:
+            Iterator: The results of the items, an error of an item is raised when reached.
+        """
+        if self.in_worker() or concurrency <= 1:
+            for item in items:
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+                yield fn(item)
+            return
+        executor = self._get_executor()
+        running = set()
+        try:
+            for item in items:
+                if len(running) >= concurrency:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                else:
+                    done = {future for future in running if future.done()}
+                    running -= done
+                for future in done:
+                    yield future.result()
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+                running.add(executor.submit(fn, item))
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def run_actions(actions: List[Tuple[str, Callable[[], Any]]], timeout: Optional[float] = None) -> List[Any]:
+    """Run the actions, e.g. the tools and the knowledge of an agent, concurrently
+    on the fan-out executor.
+
+    Args:
+        actions (List[Tuple[str, Callable[[], Any]]]): The action names and the callables running them.
+        timeout (Optional[float]): The seconds each action may take, no limit when None.
+
+    Returns:
+        List[Any]: The results in the order of the actions. A failed or timed out
+        action is logged and left out, the first error is raised only when all
+        the actions fail.
+
+    Note:
+        The timeout only stops the wait for an action, a running action can not
+        be interrupted, so the tools must enforce their own timeouts, e.g. on
+        their http calls. The timed out actions keep their worker until they
+        finish, see `FanOutExecutor`.
+    """
+    outcomes = []
+    executor = FanOutExecutor()
+    if (len(actions) == 1 and not timeout) or executor.in_worker():
+        for name, action in actions:
+            try:
+                outcomes.append((name, action(), None))
+            except Exception as e:
+                outcomes.append((name, None, e))
+        return _collect_action_results(outcomes)
+    futures = []
+    for name, action in actions:
+        try:
+            futures.append((name, executor.submit_with_deadline(action) if timeout else executor.submit(action)))
+        except HungActionsError as e:
+            futures.append((name, e))
+    deadline = time.monotonic() + timeout if timeout else None
+    for name, future in futures:
+        if isinstance(future, HungActionsError):
+            outcomes.append((name, None, future))
+            continue
+        try:
+            result = future.result(timeout=max(deadline - time.monotonic(), 0) if deadline else None)
+            outcomes.append((name, result, None))
+        except FutureTimeoutError:
+            if not future.cancel():
+                executor.track_hung(name, future)
+            outcomes.append((name, None, TimeoutError(f"The action {name} timed out after {timeout}s.")))
+        except Exception as e:
+            outcomes.append((name, None, e))
+    return _collect_action_results(outcomes)
+
+
+async def async_run_actions(actions: List[Tuple[str, Callable[[], Awaitable]]],
+                            timeout: Optional[float] = None) -> List[Any]:
+    """The async version of `run_actions`, the action coroutines are gathered on
+    the running event loop."""
+
+    async def run(name: str, action: Callable[[], Awaitable]):
+        try:
+            return await asyncio.wait_for(action(), timeout) if timeout else await action()
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"The action {name} timed out after {timeout}s.")
+
+    results = await asyncio.gather(*[run(name, action) for name, action in actions], return_exceptions=True)
+    outcomes = []
+    for (name, _), result in zip(actions, results):
+        if isinstance(result, Exception):
+            outcomes.append((name, None, result))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            outcomes.append((name, result, None))
+    return _collect_action_results(outcomes)
+
+
+def _collect_action_results(outcomes: List[Tuple[str, Any, Optional[Exception]]]) -> List[Any]:
+    errors = [(name, error) for name, _, error in outcomes if error is not None]
+    if errors and len(errors) == len(outcomes):
+        raise errors[0][1]
+    for name, error in errors:
+        LOGGER.warn(f"The action {name} failed and is skipped: {str(error)}")
+    return [result for _, result, error in outcomes if error is None]
@@ -0,0 +1,202 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:50
+# @FileName: http_client_registry.py
+import asyncio
+import hashlib
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_TIMEOUT = 600.0
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _freeze(value: Any) -> Any:
+    """Convert the value to a hashable registry key part."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+@singleton
+class HttpClientRegistry(object):
+    """The process-wide registry of the pooled api clients.
+
+    The LLMs, the LLM channels and the embeddings hitting the same endpoint with
+    the same credentials share one client, so they share one httpx connection pool
+    with explicit limits and keep-alive instead of building a pool and redoing the
+    TLS handshakes per instance. The clients are created lazily in the current
+    process and dropped when the process is forked, the async clients are kept per
+    event loop since the httpx async connections can not cross loops.
+
+    The pool is configured by the `HTTP_CLIENT` section of config.toml, e.g.
+
+        [HTTP_CLIENT]
+        max_connections = 200
+        max_keepalive_connections = 50
+        keepalive_expiry = 60
+        http2 = 'true'
+    """
+
+    def __init__(self):
+        self.max_connections: int = DEFAULT_MAX_CONNECTIONS
+        self.max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        self.keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+        self.http2: bool = False
+        self.__lock = threading.Lock()
+        self.__pid: int = os.getpid()
+        self.__clients: Dict[Tuple, Any] = {}
+        # event loop -> {key: async client}
+        self.__async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.__no_loop_async_clients: Dict[Tuple, Any] = {}
+
+    def init_by_configer(self, configer: Configer):
+        """Read the pool settings from the `HTTP_CLIENT` section of the configer."""
+        config: dict = configer.value.get('HTTP_CLIENT', {}) if configer else {}
+        self.max_connections = int(config.get('max_connections', DEFAULT_MAX_CONNECTIONS))
+        self.max_keepalive_connections = int(config.get('max_keepalive_connections',
+                                                        DEFAULT_MAX_KEEPALIVE_CONNECTIONS))
+        self.keepalive_expiry = float(config.get('keepalive_expiry', DEFAULT_KEEPALIVE_EXPIRY))
+        self.http2 = str(config.get('http2', False)).lower() == 'true'
+        if self.http2 and not _h2_available():
+            LOGGER.warn("HTTP/2 is enabled in the HTTP_CLIENT config but the `h2` package is not installed, "
+                        "fall back to HTTP/1.1.")
+            self.http2 = False
+        self.reset()
+
+    def get_client(self, client_class: type, proxy: Optional[str] = None,
+                   timeout: Optional[float] = None, **client_kwargs) -> Any:
+        """Return the shared client of the endpoint, creating it on first use.
+
+        Args:
+            client_class (type): The client class accepting a `http_client`, e.g. `OpenAI` or `AzureOpenAI`.
+            proxy (Optional[str]): The proxy of the http connections.
+            timeout (Optional[float]): The request timeout.
+            **client_kwargs: The other client arguments, e.g. api_key, base_url and max_retries.
+
+        Returns:
+            Any: The client instance.
+        """
+        if client_kwargs.get('http_client') is not None:
+            # the caller manages its own connection pool
+            return self._build_client(client_class, None, proxy, timeout, client_kwargs)
+        key = self._make_key(client_class, proxy, timeout, client_kwargs)
+        with self.__lock:
+            self._check_pid()
+            client = self.__clients.get(key)
+            if client is None:
+                client = self._build_client(client_class, httpx.Client, proxy, timeout, client_kwargs)
+                self.__clients[key] = client
+            return client
+
+    def get_async_client(self, client_class: type, proxy: Optional[str] = None,
+                         timeout: Optional[float] = None, **client_kwargs) -> Any:
+        """Return the shared async client of the endpoint for the running event loop.
+
+        Args:
+            client_class (type): The async client class accepting a `http_client`, e.g. `AsyncOpenAI`.
+            proxy (Optional[str]): The proxy of the http connections.
+            timeout (Optional[float]): The request timeout.
+            **client_kwargs: The other client arguments, e.g. api_key, base_url and max_retries.
+
+        Returns:
+            Any: The async client instance.
+        """
+        if client_kwargs.get('http_client') is not None:
+            return self._build_client(client_class, None, proxy, timeout, client_kwargs)
+        key = self._make_key(client_class, proxy, timeout, client_kwargs)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self.__lock:
+            self._check_pid()
+            if loop is None:
+                clients = self.__no_loop_async_clients
+            else:
+                clients = self.__async_clients.get(loop)
+                if clients is None:
+                    clients = {}
+                    self.__async_clients[loop] = clients
+            client = clients.get(key)
+            if client is None:
+                client = self._build_client(client_class, httpx.AsyncClient, proxy, timeout, client_kwargs)
+                clients[key] = client
+            return client
+
+    def get_stats(self) -> dict:
+        """Return the count of the pooled clients."""
+        with self.__lock:
+            self._check_pid()
+            return {
+                'client_count': len(self.__clients),
+                'async_client_count': (sum(len(clients) for clients in self.__async_clients.values())
+                                       + len(self.__no_loop_async_clients)),
+            }
+
+    def reset(self):
+        """Drop all the pooled clients, the next calls create new ones."""
+        with self.__lock:
+            self.__pid = os.getpid()
+            self.__clients = {}
+            self.__async_clients = weakref.WeakKeyDictionary()
+            self.__no_loop_async_clients = {}
+
+    def _check_pid(self):
+        # the connections of the parent process must not be shared by the forked workers
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__clients = {}
+            self.__async_clients = weakref.WeakKeyDictionary()
+            self.__no_loop_async_clients = {}
+
+    def _build_client(self, client_class: type, http_client_class: Optional[type], proxy: Optional[str],
+                      timeout: Optional[float], client_kwargs: dict) -> Any:
+        if timeout is not None:
+            client_kwargs = {**client_kwargs, 'timeout': timeout}
+        if http_client_class is None:
+            return client_class(**client_kwargs)
+        http_client = http_client_class(
+            proxy=proxy,
+            timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_keepalive_connections,
+                                keepalive_expiry=self.keepalive_expiry),
+            http2=self.http2,
+            follow_redirects=True,
+        )
+        return client_class(http_client=http_client, **client_kwargs)
+
+    @staticmethod
+    def _make_key(client_class: type, proxy: Optional[str], timeout: Optional[float], client_kwargs: dict) -> Tuple:
+        kwargs = dict(client_kwargs)
+        for secret_name in ('api_key', 'azure_ad_token'):
+            # only the hash of the secrets is kept in the key
+            if kwargs.get(secret_name):
+                kwargs[secret_name] = hashlib.sha256(str(kwargs[secret_name]).encode('utf-8')).hexdigest()
+        return client_class, proxy, timeout, _freeze(kwargs)
@@ -5,7 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: memory_util.py
-from typing import List
+from typing import List, Optional
 
 from langchain_core.chat_history import BaseChatMessageHistory
 
@@ -15,6 +15,8 @@ from agentuniverse.base.context.framework_context_manager import FrameworkContex
 from agentuniverse.llm.llm import LLM
 from agentuniverse.llm.llm_manager import LLMManager
 
+MESSAGE_SEPARATOR = "\n\n"
+
 
 def generate_messages(memories: list) -> List[Message]:
     """ Generate a list of messages from the given memories
@@ -57,34 +59,49 @@ def get_memory_string(messages: List[Message], agent_id=None) -> str:
     current_trace_id = FrameworkContextManager().get_context("trace_id")
     string_messages = []
     for m in messages:
-        if m.type == ChatMessageEnum.SYSTEM.value:
-            role = 'System'
-        elif m.type == ChatMessageEnum.HUMAN.value:
-            role = 'Human'
-        elif m.type == ChatMessageEnum.AI.value:
-            role = "AI"
-        elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
-            if current_trace_id == m.trace_id:
-                continue
-            role: str = m.metadata.get('prefix', "")
-            if agent_id:
-                role = role.replace(f"智能体 {agent_id}", " 你")
-                role = role.replace(f"Agent {agent_id}", " You")
-            m_str = f"{m.metadata.get('timestamp')} {role}:{m.content}"
+        m_str = get_message_string(m, agent_id, current_trace_id)
+        if m_str is not None:
             string_messages.append(m_str)
-            continue
-        else:
-            role = ""
-        m_str = ""
-        if m.metadata and m.metadata.get('gmt_created'):
-            m_str += f"{m.metadata.get('gmt_created')} "
-        if m.source:
-            m_str += f" Message source: {m.source} "
-        if role:
-            m_str += f"Message role: {role} "
-        m_str += f" :{m.content} "
-        string_messages.append(m_str)
-    return "\n\n".join(string_messages)
+    return MESSAGE_SEPARATOR.join(string_messages)
+
+
+def get_message_string(m: Message, agent_id=None, current_trace_id: str = None) -> Optional[str]:
+    """Convert the given message to its string in the memory string.
+
+    Args:
+        m(Message): The message.
+        agent_id: The id of the agent reading the memory.
+        current_trace_id(str): The trace id of the current request.
+
+    Returns:
+        Optional[str]: The string of the message, None when the message is left out,
+        e.g. the input and output of the current request.
+    """
+    if m.type == ChatMessageEnum.SYSTEM.value:
+        role = 'System'
+    elif m.type == ChatMessageEnum.HUMAN.value:
+        role = 'Human'
+    elif m.type == ChatMessageEnum.AI.value:
+        role = "AI"
+    elif m.type == ChatMessageEnum.INPUT.value or m.type == ChatMessageEnum.OUTPUT.value:
+        if current_trace_id == m.trace_id:
+            return None
+        role: str = m.metadata.get('prefix', "")
+        if agent_id:
+            role = role.replace(f"智能体 {agent_id}", " 你")
+            role = role.replace(f"Agent {agent_id}", " You")
+        return f"{m.metadata.get('timestamp')} {role}:{m.content}"
+    else:
+        role = ""
+    m_str = ""
+    if m.metadata and m.metadata.get('gmt_created'):
+        m_str += f"{m.metadata.get('gmt_created')} "
+    if m.source:
+        m_str += f" Message source: {m.source} "
+    if role:
+        m_str += f"Message role: {role} "
+    m_str += f" :{m.content} "
+    return m_str
 
 
 def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
@@ -100,3 +117,47 @@ def get_memory_tokens(memories: List[Message], llm_name: str = None) -> int:
     memory_str = get_memory_string(memories)
     llm_instance: LLM = LLMManager().get_instance_obj(llm_name)
     return llm_instance.get_num_tokens(memory_str) if llm_instance else len(memory_str)
+
+
+def get_message_tokens(memories: List[Message], llm_name: str = None) -> List[int]:
+    """Get the number of tokens of every message in the memory string, the
+    separator before the message included.
+
+    The counts are cached on the messages by the hash of the message string and
+    the llm counting them, so a message is tokenized once however many times
+    the memory is pruned. The sum of the counts approximates `get_memory_tokens`
+    of the messages, the tokenizers do not merge tokens across the separators.
+
+    Args:
+        memories(List[Message]): The list of messages.
+        llm_name(str): The name of the LLM to use for token counting.
+
+    Returns:
+        List[int]: The number of tokens of every message, 0 for a left out message.
+    """
+    current_trace_id = FrameworkContextManager().get_context("trace_id")
+    llm_instance: LLM = LLMManager().get_instance_obj(llm_name)
+    tokenizer_key = llm_name if llm_instance else ''
+
+    def count_tokens(text: str) -> int:
+        return llm_instance.get_num_tokens(text) if llm_instance else len(text)
+
+    separator_tokens = None
+    has_previous = False
+    message_tokens = []
+    for m in memories:
+        m_str = get_message_string(m, current_trace_id=current_trace_id)
+        if m_str is None:
+            message_tokens.append(0)
+            continue
+        tokens = m.get_cached_tokens(tokenizer_key, m_str)
+        if tokens is None:
+            tokens = count_tokens(m_str)
+            m.cache_tokens(tokenizer_key, m_str, tokens)
+        if has_previous:
+            if separator_tokens is None:
+                separator_tokens = count_tokens(MESSAGE_SEPARATOR)
+            tokens += separator_tokens
+        has_previous = True
+        message_tokens.append(tokens)
+    return message_tokens
@@ -8,10 +8,13 @@
 import datetime
 import json
 import os
-from typing import Union, Optional
+import random
+import threading
+import zlib
+from typing import Dict, Union, Optional
 from loguru import logger
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from agentuniverse.agent.input_object import InputObject
 from agentuniverse.agent.output_object import OutputObject
@@ -31,6 +34,15 @@ class Monitor(BaseModel):
     dir: Optional[str] = './monitor'
     activate: Optional[bool] = False
     log_activate: Optional[bool] = True
+    use_provider_usage: Optional[bool] = True
+    # `full` traces the inputs and outputs of the invocations, `metrics` only
+    # records their timings.
+    trace_mode: Optional[str] = 'full'
+    # The share of the requests whose inputs and outputs are traced in the full mode.
+    trace_sample_rate: Optional[float] = 1.0
+
+    _metrics: Dict[str, dict] = PrivateAttr(default_factory=dict)
+    _metrics_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(self, configer: Configer = None, **kwargs):
         super().__init__(**kwargs)
@@ -39,6 +51,46 @@ class Monitor(BaseModel):
             self.dir = config.get('dir', './monitor')
             self.activate = config.get('activate', False)
             self.log_activate = config.get('log_activate', True)
+            self.use_provider_usage = str(config.get('use_provider_usage', True)).lower() == 'true'
+            self.trace_mode = config.get('trace_mode', 'full')
+            self.trace_sample_rate = float(config.get('trace_sample_rate', 1.0))
+
+    def trace_details(self) -> bool:
+        """Whether the inputs and outputs of the current invocation are traced.
+
+        The requests are sampled by their trace id, so all the invocations of a
+        sampled request are traced.
+        """
+        if self.trace_mode == 'metrics' or self.trace_sample_rate <= 0:
+            return False
+        if self.trace_sample_rate >= 1:
+            return True
+        trace_id = AuTraceManager().get_trace_id()
+        if trace_id:
+            return zlib.crc32(str(trace_id).encode('utf-8')) < self.trace_sample_rate * 0x100000000
+        return random.random() < self.trace_sample_rate
+
+    def record_metrics(self, type: str, source: str, cost_time: float) -> None:
+        """Record the timing of an invocation in the in-process metrics."""
+        key = f'{type}.{source}'
+        with self._metrics_lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = {'count': 0, 'total_time': 0.0, 'max_time': 0.0}
+            metrics['count'] += 1
+            metrics['total_time'] += cost_time
+            if cost_time > metrics['max_time']:
+                metrics['max_time'] = cost_time
+
+    def get_metrics(self) -> Dict[str, dict]:
+        """Get the invocation count, the total and the max seconds per `{type}.{source}`."""
+        with self._metrics_lock:
+            return {key: dict(metrics) for key, metrics in self._metrics.items()}
+
+    def reset_metrics(self) -> None:
+        """Clear the in-process metrics."""
+        with self._metrics_lock:
+            self._metrics.clear()
 
     def trace_llm_input(self, source: str, llm_input: Union[str, dict]) -> None:
         """Trace the llm input."""
@@ -85,19 +137,25 @@ class Monitor(BaseModel):
                 context_prefix=get_context_prefix()
             ).info("Trace llm input.")
 
-    def trace_llm_token_usage(self, llm_obj: object, llm_input: dict, output_str: str) -> None:
+    def trace_llm_token_usage(self, llm_obj: object, llm_input: dict, output_str: str,
+                              provider_usage: dict = None) -> None:
         """ Trace the token usage of the given LLM object.
         Args:
             llm_obj(object): LLM object.
             llm_input(dict): Dictionary of LLM input.
             output_str(str): LLM output.
+            provider_usage(dict): The token usage reported by the llm provider, used instead of
+                tokenizing the input and the output when `use_provider_usage` is on.
         """
         trace_id = AuTraceManager().get_trace_id()
         # trace token usage for a complete request chain based on trace id
         if trace_id:
             old_token_usage: dict = FrameworkContextManager().get_context(trace_id + '_token_usage')
             if old_token_usage is not None:
-                token_usage: dict = self.get_llm_token_usage(llm_obj, llm_input, output_str)
+                if self.use_provider_usage and provider_usage:
+                    token_usage: dict = provider_usage
+                else:
+                    token_usage: dict = self.get_llm_token_usage(llm_obj, llm_input, output_str)
                 if token_usage:
                     Monitor.add_token_usage(token_usage)
 
@@ -188,8 +246,6 @@ class Monitor(BaseModel):
                 trace_id + '_invocation_chain')
             if invocation_chain:
                 invocation_chain.pop()
-                FrameworkContextManager().set_context(
-                    trace_id + '_invocation_chain', invocation_chain)
 
     @staticmethod
     def clear_invocation_chain():
@@ -207,7 +263,6 @@ class Monitor(BaseModel):
             invocation_chain = FrameworkContextManager().get_context(trace_id + '_invocation_chain')
             if invocation_chain is not None:
                 invocation_chain.append(source)
-                FrameworkContextManager().set_context(trace_id + '_invocation_chain', invocation_chain)
             invocation_chain_bak = FrameworkContextManager().get_context(trace_id + '_invocation_chain_bak')
             if invocation_chain_bak is not None:
                 invocation_chain_bak.append(source)
@@ -264,6 +319,16 @@ class Monitor(BaseModel):
         trace_id = AuTraceManager().get_trace_id()
         return FrameworkContextManager().get_context(trace_id + '_token_usage', {}) if trace_id is not None else {}
 
+    @staticmethod
+    def merge_token_usage(token_usage: dict, worker_token_usage: dict, worker_baseline: dict):
+        """Add the token usage counted by a worker thread to the token usage of the thread it was forked from."""
+        for key, value in worker_token_usage.items():
+            if not isinstance(value, (int, float)):
+                continue
+            delta = value - worker_baseline.get(key, 0)
+            if delta:
+                token_usage[key] = token_usage[key] + delta if key in token_usage else delta
+
     @staticmethod
     def get_invocation_chain_str() -> str:
         invocation_chain_str = ''
@@ -373,3 +438,8 @@ class Monitor(BaseModel):
                 return o
 
         return recursive_filter(obj)
+
+
+# the token usage counted by the worker threads running a context snapshot is
+# merged back into the token usage of the request.
+FrameworkContextManager().register_accumulator('_token_usage', Monitor.merge_token_usage)
@@ -0,0 +1,70 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:30
+# @FileName: rate_limiter.py
+import asyncio
+import threading
+import time
+from typing import Dict, Tuple
+
+from agentuniverse.base.annotation.singleton import singleton
+
+
+class TokenBucket(object):
+    """A thread-safe token bucket pacing calls to `rate` per second with bursts
+    of up to `capacity` calls.
+
+    Every acquire reserves its tokens at once and then waits for exactly the
+    time the bucket needs to refill them, so concurrent callers are paced in
+    arrival order and nobody sleeps longer than the rate requires.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        if rate <= 0:
+            raise ValueError("The rate of the token bucket must be positive.")
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.__tokens = self.capacity
+        self.__last_time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Reserve the tokens and return the seconds to wait before using them."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__last_time) * self.rate)
+            self.__last_time = now
+            self.__tokens -= tokens
+            return max(0.0, -self.__tokens / self.rate)
+
+    def acquire(self, tokens: float = 1):
+        """Block until the tokens are available."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def async_acquire(self, tokens: float = 1):
+        """Wait on the event loop until the tokens are available."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+@singleton
+class TokenBucketRegistry(object):
+    """The process-wide token buckets, shared by all the copies of a component,
+    e.g. all the agent instances calling the same llm."""
+
+    def __init__(self):
+        self.__buckets: Dict[str, Tuple[float, float, TokenBucket]] = {}
+        self.__lock = threading.Lock()
+
+    def get_bucket(self, key: str, rate: float, capacity: float = 1) -> TokenBucket:
+        """Return the bucket of the key, it is rebuilt when the rate or the capacity changed."""
+        with self.__lock:
+            entry = self.__buckets.get(key)
+            if entry is None or entry[0] != rate or entry[1] != capacity:
+                entry = (rate, capacity, TokenBucket(rate, capacity))
+                self.__buckets[key] = entry
+            return entry[2]
@@ -0,0 +1,125 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:40
+# @FileName: tokenizer_registry.py
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+
+from agentuniverse.base.annotation.singleton import singleton
+from agentuniverse.base.config.configer import Configer
+from agentuniverse.base.util.logging.logging_util import LOGGER
+
+DEFAULT_ENCODING = "cl100k_base"
+DEFAULT_CACHE_SIZE = 8192
+
+
+@singleton
+class TokenizerRegistry(object):
+    """The process-wide registry of the tiktoken encodings and the token counts.
+
+    An encoding is loaded once per model and process instead of on every
+    `get_num_tokens` call of the llms and the llm channels. The token counts are
+    kept in a bounded LRU keyed by the encoding and the hash of the text, so the
+    same prompt counted by the memory pruning, the prompt truncation and the
+    token usage monitor is tokenized once.
+
+    The registry is configured by the `TOKENIZER` section of config.toml, e.g.
+
+        [TOKENIZER]
+        cache_size = 8192
+        # load the encodings in the background at startup
+        prewarm_models = ['gpt-4o', 'qwen-max']
+    """
+
+    def __init__(self):
+        self.cache_size: int = DEFAULT_CACHE_SIZE
+        self.__lock = threading.Lock()
+        self.__encodings: Dict[str, Any] = {}
+        self.__token_counts: OrderedDict = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def init_by_configer(self, configer: Configer):
+        """Initialize the registry by the `TOKENIZER` section and prewarm the configured models."""
+        config: dict = configer.value.get('TOKENIZER', {})
+        if config.get('cache_size') is not None:
+            self.cache_size = int(config.get('cache_size'))
+        prewarm_models = config.get('prewarm_models')
+        if prewarm_models:
+            self.prewarm(prewarm_models)
+
+    def prewarm(self, model_names: List[Optional[str]]) -> threading.Thread:
+        """Load the encodings of the models in a background thread, so the first
+        requests do not pay for loading them."""
+
+        def load():
+            for model_name in model_names:
+                try:
+                    self.get_encoding(model_name)
+                except Exception as e:
+                    LOGGER.warn(f"Failed to prewarm the tokenizer of the model {model_name}: {str(e)}")
+
+        thread = threading.Thread(target=load, name='au_tokenizer_prewarm', daemon=True)
+        thread.start()
+        return thread
+
+    def get_encoding(self, model_name: Optional[str] = None) -> Any:
+        """Return the encoding of the model, the default encoding for an unknown model."""
+        key = model_name or DEFAULT_ENCODING
+        encoding = self.__encodings.get(key)
+        if encoding is None:
+            with self.__lock:
+                encoding = self.__encodings.get(key)
+                if encoding is None:
+                    encoding = self._load_encoding(model_name)
+                    self.__encodings[key] = encoding
+        return encoding
+
+    @staticmethod
+    def _load_encoding(model_name: Optional[str]) -> Any:
+        if model_name:
+            try:
+                return tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+    def count_tokens(self, text: str, model_name: Optional[str] = None) -> int:
+        """Return the number of tokens of the text counted by the encoding of the model."""
+        if not text:
+            return 0
+        encoding = self.get_encoding(model_name)
+        if self.cache_size <= 0:
+            return len(encoding.encode(text))
+        key = (encoding.name, hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest())
+        with self.__lock:
+            tokens = self.__token_counts.get(key)
+            if tokens is not None:
+                self.__token_counts.move_to_end(key)
+                self.__hits += 1
+                return tokens
+            self.__misses += 1
+        tokens = len(encoding.encode(text))
+        with self.__lock:
+            self.__token_counts[key] = tokens
+            while len(self.__token_counts) > self.cache_size:
+                self.__token_counts.popitem(last=False)
+        return tokens
+
+    def get_stats(self) -> dict:
+        """Return the loaded encodings and the hits and misses of the token count cache."""
+        with self.__lock:
+            return {'encodings': list(self.__encodings.keys()), 'cached_counts': len(self.__token_counts),
+                    'hits': self.__hits, 'misses': self.__misses}
+
+    def reset(self):
+        """Drop the loaded encodings and the cached token counts."""
+        with self.__lock:
+            self.__encodings.clear()
+            self.__token_counts.clear()
+            self.__hits = self.__misses = 0
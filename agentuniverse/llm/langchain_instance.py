@@ -17,6 +17,7 @@ from langchain_core.messages import AIMessageChunk
 from langchain_core.outputs import ChatGenerationChunk
 
 from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_output import get_stream_choice
 
 
 class LangchainOpenAI(ChatOpenAI):
@@ -87,16 +88,11 @@ class LangchainOpenAI(ChatOpenAI):
     def as_langchain_chunk(stream, run_manager=None):
         default_chunk_class = AIMessageChunk
         for llm_result in stream:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -111,16 +107,11 @@ class LangchainOpenAI(ChatOpenAI):
             -> AsyncIterator[ChatGenerationChunk]:
         default_chunk_class = AIMessageChunk
         async for llm_result in stream_iterator:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -17,6 +17,7 @@ from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.configers.llm_configer import LLMConfiger
 from agentuniverse.base.util.logging.logging_util import LOGGER
+from agentuniverse.base.util.rate_limiter import TokenBucket, TokenBucketRegistry
 from agentuniverse.llm.llm_channel.llm_channel import LLMChannel
 from agentuniverse.llm.llm_channel.llm_channel_manager import LLMChannelManager
 from agentuniverse.llm.llm_output import LLMOutput
@@ -58,6 +59,9 @@ class LLM(ComponentBase):
     langchain_instance: Optional[BaseLanguageModel] = None
     channel: Optional[str] = None
     _channel_instance: Optional[LLMChannel] = None
+    # The token bucket pacing of the fan-out calls to the llm, no pacing when unset.
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
 
     def __init__(self, **kwargs):
         """Initialize the llm."""
@@ -140,6 +144,10 @@ class LLM(ComponentBase):
             self._max_context_length = component_configer.configer.value['max_context_length']
         if 'channel' in component_configer.configer.value:
             self.channel = component_configer.configer.value.get('channel')
+        if 'requests_per_second' in component_configer.configer.value:
+            self.requests_per_second = component_configer.configer.value.get('requests_per_second')
+        if 'burst' in component_configer.configer.value:
+            self.burst = component_configer.configer.value.get('burst')
         return self
 
     def set_by_agent_model(self, **kwargs):
@@ -162,6 +170,12 @@ class LLM(ComponentBase):
             copied_obj._max_context_length = kwargs['max_context_length']
         return copied_obj
 
+    def get_rate_limiter(self) -> Optional[TokenBucket]:
+        """Return the token bucket shared by all the copies of the llm, None when the llm is not paced."""
+        if not self.requests_per_second:
+            return None
+        return TokenBucketRegistry().get_bucket(f'llm.{self.name}', self.requests_per_second, self.burst or 1)
+
     def max_context_length(self) -> int:
         """Max context length.
 
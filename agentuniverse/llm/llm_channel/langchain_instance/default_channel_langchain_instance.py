@@ -19,6 +19,8 @@ from langchain_core.outputs import ChatGenerationChunk, ChatGeneration
 from langchain_community.chat_models import ChatOpenAI
 from pydantic.v1 import BaseModel
 
+from agentuniverse.llm.llm_output import get_stream_choice
+
 
 class DefaultChannelLangchainInstance(ChatOpenAI):
     llm_channel: Optional[BaseModel] = None
@@ -78,16 +80,11 @@ class DefaultChannelLangchainInstance(ChatOpenAI):
     def as_langchain_chunk(self, stream, run_manager=None):
         default_chunk_class = AIMessageChunk
         for llm_result in stream:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = self._convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = self._convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -101,16 +98,11 @@ class DefaultChannelLangchainInstance(ChatOpenAI):
             -> AsyncIterator[ChatGenerationChunk]:
         default_chunk_class = AIMessageChunk
         async for llm_result in stream_iterator:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = self._convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = self._convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -172,16 +164,11 @@ class DefaultChannelLangchainInstance(ChatOpenAI):
         for chunk in self.completion_with_retry(
                 messages=message_dicts, run_manager=run_manager, **params
         ):
-            chunk = chunk.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(chunk.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = self._convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = self._convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -207,16 +194,11 @@ class DefaultChannelLangchainInstance(ChatOpenAI):
         async for chunk in await self.acompletion_with_retry(
                 self, messages=message_dicts, run_manager=run_manager, **params
         ):
-            chunk = chunk.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(chunk.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = self._convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = self._convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
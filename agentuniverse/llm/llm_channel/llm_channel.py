@@ -7,9 +7,7 @@
 # @FileName: llm_channel.py
 from typing import Optional, Any, Union, Iterator, AsyncIterator
 
-import httpx
 import openai
-import tiktoken
 from openai import OpenAI, AsyncOpenAI
 from langchain_core.language_models import BaseLanguageModel
 
@@ -19,9 +17,11 @@ from agentuniverse.base.component.component_base import ComponentBase
 from agentuniverse.base.component.component_enum import ComponentEnum
 from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
 from agentuniverse.base.config.component_configer.component_configer import ComponentConfiger
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
+from agentuniverse.base.util.tokenizer_registry import TokenizerRegistry
 from agentuniverse.llm.llm_channel.langchain_instance.default_channel_langchain_instance import \
     DefaultChannelLangchainInstance
-from agentuniverse.llm.llm_output import LLMOutput
+from agentuniverse.llm.llm_output import LLMOutput, get_stream_delta
 
 
 class LLMChannel(ComponentBase):
@@ -105,7 +105,7 @@ class LLMChannel(ComponentBase):
     @trace_llm
     async def acall(self, *args: Any, **kwargs: Any):
         """Asynchronously run the LLM."""
-        return self._acall(*args, **kwargs)
+        return await self._acall(*args, **kwargs)
 
     def _call(self, messages: list, **kwargs: Any) -> Union[LLMOutput, Iterator[LLMOutput]]:
         streaming = kwargs.pop("streaming") if "streaming" in kwargs else self.channel_model_config.get('streaming')
@@ -178,38 +178,34 @@ class LLMChannel(ComponentBase):
         Returns:
             The integer number of tokens in the text.
         """
-
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return TokenizerRegistry().count_tokens(text)
 
     def max_context_length(self) -> int:
         return self.channel_model_config.get('max_context_length')
 
     def _new_client(self):
-        """Initialize the openai client."""
-        if self.client is not None:
-            return self.client
-        return OpenAI(
+        """Get the pooled openai client shared by the channels and llms of the same endpoint."""
+        return HttpClientRegistry().get_client(
+            OpenAI,
+            proxy=self.channel_proxy,
+            timeout=self.channel_model_config.get('request_timeout'),
             api_key=self.channel_api_key,
             organization=self.channel_organization,
             base_url=self.channel_api_base,
-            timeout=self.channel_model_config.get('request_timeout'),
             max_retries=self.channel_model_config.get('max_retries'),
-            http_client=httpx.Client(proxy=self.channel_proxy) if self.channel_proxy else None,
             **(self.channel_model_config.get('client_args') or {}),
         )
 
     def _new_async_client(self):
-        """Initialize the openai async client."""
-        if self.async_client is not None:
-            return self.async_client
-        return AsyncOpenAI(
+        """Get the pooled openai async client shared by the channels and llms of the same endpoint."""
+        return HttpClientRegistry().get_async_client(
+            AsyncOpenAI,
+            proxy=self.channel_proxy,
+            timeout=self.channel_model_config.get('request_timeout'),
             api_key=self.channel_api_key,
             organization=self.channel_organization,
             base_url=self.channel_api_base,
-            timeout=self.channel_model_config.get('request_timeout'),
             max_retries=self.channel_model_config.get('max_retries'),
-            http_client=httpx.AsyncClient(proxy=self.channel_proxy) if self.channel_proxy else None,
             **(self.channel_model_config.get('client_args') or {}),
         )
 
@@ -229,19 +225,20 @@ class LLMChannel(ComponentBase):
 
     @staticmethod
     def parse_result(chunk):
-        """Generate the result of the stream."""
-        chat_completion = chunk
-        if not isinstance(chunk, dict):
-            chunk = chunk.dict()
-        if len(chunk["choices"]) == 0:
+        """Generate the result of the stream.
+
+        The delta is read from the chunk directly and the chunk itself is kept
+        as the raw data, so no serialization happens per token.
+        """
+        delta = get_stream_delta(chunk)
+        if delta is None:
             return
-        choice = chunk["choices"][0]
-        message = choice.get("delta")
-        text = message.get("content")
-        role = message.get("role")
+        text, role = delta
         if text is None:
             text = ""
-        return LLMOutput(text=text, raw=chat_completion.model_dump(), message=Message(content=text, type=role))
+        # the fields come straight from the provider response, skip the pydantic validation per token
+        return LLMOutput.model_construct(text=text, raw=chunk,
+                                         message=Message.model_construct(content=text, type=role))
 
     def get_instance_code(self) -> str:
         """Return the full name of the component."""
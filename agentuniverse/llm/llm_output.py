@@ -5,7 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: llm_output.py
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -18,7 +18,109 @@ class LLMOutput(BaseModel):
     """The text of the llm output."""
     text: str
 
-    """The raw data of the llm output."""
+    """The raw data of the llm output.
+
+    For the chunks of openai style streams it is the chunk object itself, it is
+    only serialized when a consumer needs it, see `raw_dict`.
+    """
     raw: Optional[Any] = None
 
     message: Optional[Message] = None
+
+    def raw_dict(self) -> Optional[dict]:
+        """Return the raw data of the llm output as a dict."""
+        return to_raw_dict(self.raw)
+
+    def get_usage(self) -> Optional[dict]:
+        """Return the token usage reported by the llm provider, without serializing the raw data.
+
+        Returns:
+            Optional[dict]: The dict with the `prompt_tokens`, `completion_tokens` and
+            `total_tokens`, None when the provider reported no usage.
+        """
+        raw = self.raw
+        if raw is None:
+            return None
+        usage = raw.get('usage') if isinstance(raw, dict) else getattr(raw, 'usage', None)
+        if usage is None:
+            return None
+        if not isinstance(usage, dict):
+            usage = to_raw_dict(usage)
+        # the anthropic style usage is named by input and output
+        prompt_tokens = usage.get('prompt_tokens', usage.get('input_tokens'))
+        completion_tokens = usage.get('completion_tokens', usage.get('output_tokens'))
+        if prompt_tokens is None or completion_tokens is None:
+            return None
+        total_tokens = usage.get('total_tokens') or prompt_tokens + completion_tokens
+        return {'completion_tokens': completion_tokens, 'prompt_tokens': prompt_tokens,
+                'total_tokens': total_tokens}
+
+
+def to_raw_dict(raw: Any) -> Optional[dict]:
+    """Convert the raw llm response, a dict or a pydantic response object, to a dict."""
+    if raw is None or isinstance(raw, dict):
+        return raw
+    if hasattr(raw, 'model_dump'):
+        return raw.model_dump()
+    return raw.dict()
+
+
+def get_stream_delta(chunk: Any) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """Read the content and the role of the first choice delta of an openai style
+    stream chunk, without serializing the chunk.
+
+    Args:
+        chunk (Any): The stream chunk, a dict or an openai ChatCompletionChunk object.
+
+    Returns:
+        Optional[Tuple[Optional[str], Optional[str]]]: The (content, role) pair,
+        None when the chunk has no choice.
+    """
+    if isinstance(chunk, dict):
+        choices = chunk.get('choices')
+        if not choices:
+            return None
+        delta = choices[0].get('delta') or {}
+        return delta.get('content'), delta.get('role')
+    choices = chunk.choices
+    if not choices:
+        return None
+    delta = choices[0].delta
+    if delta is None:
+        return None, None
+    return delta.content, delta.role
+
+
+def get_stream_choice(chunk: Any) -> Optional[Tuple[dict, Optional[str]]]:
+    """Read the first choice delta and its finish reason of an openai style stream
+    chunk, without serializing the chunk.
+
+    Only a delta carrying a function or tool call is serialized, the plain text
+    deltas are read field by field.
+
+    Args:
+        chunk (Any): The stream chunk, a dict or an openai ChatCompletionChunk object.
+
+    Returns:
+        Optional[Tuple[dict, Optional[str]]]: The (delta, finish reason) pair, None
+        when the chunk has no choice.
+    """
+    if isinstance(chunk, dict):
+        choices = chunk.get('choices')
+        if not choices:
+            return None
+        return choices[0].get('delta') or {}, choices[0].get('finish_reason')
+    choices = chunk.choices
+    if not choices:
+        return None
+    choice = choices[0]
+    delta = choice.delta
+    if delta is None:
+        return {}, choice.finish_reason
+    if getattr(delta, 'function_call', None) is not None or getattr(delta, 'tool_calls', None) is not None:
+        return to_raw_dict(delta), choice.finish_reason
+    delta_dict = {'role': delta.role, 'content': delta.content}
+    reasoning_content = getattr(delta, 'reasoning_content', None)
+    if reasoning_content:
+        delta_dict['reasoning_content'] = reasoning_content
+    return delta_dict, choice.finish_reason
@@ -7,15 +7,16 @@
 # @FileName: openai_llm.py
 from typing import Any, Optional, AsyncIterator, Iterator, Union
 
-import httpx
 from langchain_core.language_models.base import BaseLanguageModel
 from openai import OpenAI, AsyncOpenAI
 from pydantic import Field
-import tiktoken
 
 from agentuniverse.llm.langchain_instance import LangchainOpenAI
 from agentuniverse.llm.llm import LLM, LLMOutput
+from agentuniverse.llm.llm_output import get_stream_delta
 from agentuniverse.base.util.env_util import get_from_env
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
+from agentuniverse.base.util.tokenizer_registry import TokenizerRegistry
 
 OPENAI_MAX_CONTEXT_LENGTH = {
     "gpt-3.5-turbo": 4096,
@@ -62,26 +63,28 @@ class OpenAILLM(LLM):
     openai_client_args: Optional[dict] = None
 
     def _new_client(self):
-        """Initialize the openai client."""
-        return OpenAI(
+        """Get the pooled openai client shared by the llms of the same endpoint."""
+        return HttpClientRegistry().get_client(
+            OpenAI,
+            proxy=self.openai_proxy,
+            timeout=self.request_timeout,
             api_key=self.openai_api_key,
             organization=self.openai_organization,
             base_url=self.openai_api_base,
-            timeout=self.request_timeout,
             max_retries=self.max_retries,
-            http_client=httpx.Client(proxy=self.openai_proxy) if self.openai_proxy else None,
             **(self.openai_client_args or {}),
         )
 
     def _new_async_client(self):
-        """Initialize the openai async client."""
-        return AsyncOpenAI(
+        """Get the pooled openai async client shared by the llms of the same endpoint."""
+        return HttpClientRegistry().get_async_client(
+            AsyncOpenAI,
+            proxy=self.openai_proxy,
+            timeout=self.request_timeout,
             api_key=self.openai_api_key,
             organization=self.openai_organization,
             base_url=self.openai_api_base,
-            timeout=self.request_timeout,
             max_retries=self.max_retries,
-            http_client=httpx.AsyncClient(proxy=self.openai_proxy) if self.openai_proxy else None,
             **(self.openai_client_args or {}),
         )
 
@@ -164,26 +167,18 @@ class OpenAILLM(LLM):
         Returns:
             The integer number of tokens in the text.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(self.model_name)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return TokenizerRegistry().count_tokens(text, self.model_name)
 
     @staticmethod
     def parse_result(chunk):
         """Generate the result of the stream."""
-        chat_completion = chunk
-        if not isinstance(chunk, dict):
-            chunk = chunk.dict()
-        if len(chunk["choices"]) == 0:
+        delta = get_stream_delta(chunk)
+        if delta is None:
             return
-        choice = chunk["choices"][0]
-        message = choice.get("delta")
-        text = message.get("content")
+        text = delta[0]
         if not text:
             return
-        return LLMOutput(text=text, raw=chat_completion.model_dump())
+        return LLMOutput.model_construct(text=text, raw=chunk)
 
     @classmethod
     def generate_stream_result(cls, stream: Iterator) -> Iterator[LLMOutput]:
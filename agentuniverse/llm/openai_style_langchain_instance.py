@@ -21,6 +21,7 @@ from langchain_community.chat_models import ChatOpenAI
 from pydantic.v1 import BaseModel
 
 from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_output import get_stream_choice
 
 
 async def acompletion_with_retry(
@@ -185,16 +186,11 @@ class LangchainOpenAIStyleInstance(ChatOpenAI):
     def as_langchain_chunk(stream, run_manager=None):
         default_chunk_class = AIMessageChunk
         for llm_result in stream:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -209,16 +205,11 @@ class LangchainOpenAIStyleInstance(ChatOpenAI):
             -> AsyncIterator[ChatGenerationChunk]:
         default_chunk_class = AIMessageChunk
         async for llm_result in stream_iterator:
-            chunk = llm_result.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(llm_result.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -261,16 +252,11 @@ class LangchainOpenAIStyleInstance(ChatOpenAI):
         for chunk in self.completion_with_retry(
                 messages=message_dicts, run_manager=run_manager, **params
         ):
-            chunk = chunk.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(chunk.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
@@ -296,16 +282,11 @@ class LangchainOpenAIStyleInstance(ChatOpenAI):
         async for chunk in await acompletion_with_retry(
                 self, messages=message_dicts, run_manager=run_manager, **params
         ):
-            chunk = chunk.raw
-            if not isinstance(chunk, dict):
-                chunk = chunk.dict()
-            if len(chunk["choices"]) == 0:
+            choice = get_stream_choice(chunk.raw)
+            if choice is None:
                 continue
-            choice = chunk["choices"][0]
-            chunk = _convert_delta_to_message_chunk(
-                choice["delta"], default_chunk_class
-            )
-            finish_reason = choice.get("finish_reason")
+            delta, finish_reason = choice
+            chunk = _convert_delta_to_message_chunk(delta, default_chunk_class)
             generation_info = (
                 dict(finish_reason=finish_reason) if finish_reason is not None else None
             )
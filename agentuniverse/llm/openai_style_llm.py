@@ -8,16 +8,17 @@
 
 from typing import Any, Optional, AsyncIterator, Iterator, Union
 
-import httpx
 import openai
-import tiktoken
 from langchain_core.language_models.base import BaseLanguageModel
 from openai import OpenAI, AsyncOpenAI
 
 from agentuniverse.base.config.component_configer.configers.llm_configer import LLMConfiger
 from agentuniverse.base.util.env_util import get_from_env
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
 from agentuniverse.base.util.system_util import process_yaml_func
+from agentuniverse.base.util.tokenizer_registry import TokenizerRegistry
 from agentuniverse.llm.llm import LLM, LLMOutput
+from agentuniverse.llm.llm_output import get_stream_delta
 from agentuniverse.llm.openai_style_langchain_instance import LangchainOpenAIStyleInstance
 
 
@@ -43,30 +44,28 @@ class OpenAIStyleLLM(LLM):
     client_args: Optional[dict] = None
 
     def _new_client(self):
-        """Initialize the openai client."""
-        if self.client is not None:
-            return self.client
-        return OpenAI(
+        """Get the pooled openai client shared by the llms of the same endpoint."""
+        return HttpClientRegistry().get_client(
+            OpenAI,
+            proxy=self.proxy,
+            timeout=self.request_timeout,
             api_key=self.api_key,
             organization=self.organization,
             base_url=self.api_base,
-            timeout=self.request_timeout,
             max_retries=self.max_retries,
-            http_client=httpx.Client(proxy=self.proxy) if self.proxy else None,
             **(self.client_args or {}),
         )
 
     def _new_async_client(self):
-        """Initialize the openai async client."""
-        if self.async_client is not None:
-            return self.async_client
-        return AsyncOpenAI(
+        """Get the pooled openai async client shared by the llms of the same endpoint."""
+        return HttpClientRegistry().get_async_client(
+            AsyncOpenAI,
+            proxy=self.proxy,
+            timeout=self.request_timeout,
             api_key=self.api_key,
             organization=self.organization,
             base_url=self.api_base,
-            timeout=self.request_timeout,
             max_retries=self.max_retries,
-            http_client=httpx.AsyncClient(proxy=self.proxy) if self.proxy else None,
             **(self.client_args or {}),
         )
 
@@ -142,18 +141,18 @@ class OpenAIStyleLLM(LLM):
 
     @staticmethod
     def parse_result(chunk):
-        """Generate the result of the stream."""
-        chat_completion = chunk
-        if not isinstance(chunk, dict):
-            chunk = chunk.dict()
-        if len(chunk["choices"]) == 0:
+        """Generate the result of the stream.
+
+        The delta is read from the chunk directly and the chunk itself is kept
+        as the raw data, so no serialization happens per token.
+        """
+        delta = get_stream_delta(chunk)
+        if delta is None:
             return
-        choice = chunk["choices"][0]
-        message = choice.get("delta")
-        text = message.get("content")
+        text = delta[0]
         if text is None:
             text = ""
-        return LLMOutput(text=text, raw=chat_completion.model_dump())
+        return LLMOutput.model_construct(text=text, raw=chunk)
 
     def generate_stream_result(self, stream: openai.Stream):
         """Generate the result of the stream."""
@@ -199,11 +198,7 @@ class OpenAIStyleLLM(LLM):
         Returns:
             The integer number of tokens in the text.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(self.model_name)
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+        return TokenizerRegistry().count_tokens(text, self.model_name)
 
     def max_context_length(self) -> int:
         """Return the maximum length of the context."""
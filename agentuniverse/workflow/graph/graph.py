@@ -5,20 +5,33 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: graph.py
-from typing import Optional, Any
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Optional, Dict, List, Tuple
 
 import networkx as nx
 
-from agentuniverse.workflow.node.enum import NodeEnum, NodeStatusEnum
+from agentuniverse.agent_serve.web.thread_with_result import ThreadPoolExecutorWithReturnValue
+
+from agentuniverse.workflow.node.enum import NodeEnum
 from agentuniverse.workflow.node.node import Node
 from agentuniverse.workflow.node.node_constant import NODE_CLS_MAPPING
 from agentuniverse.workflow.node.node_output import NodeOutput
 from agentuniverse.workflow.workflow_output import WorkflowOutput
 
 
+DEFAULT_MAX_CONCURRENCY = 8
+
+
 class Graph(nx.DiGraph):
     """The basic class of the graph."""
 
+    # The max count of the nodes running at the same time, read from the
+    # `max_concurrency` of the graph config.
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+
     def build(self, workflow_id: str, config: dict) -> 'Graph':
         """Build the graph."""
         nodes_config = config.get('nodes')
@@ -33,6 +46,7 @@ class Graph(nx.DiGraph):
             self._add_graph_edge(edge_config)
         if not nx.is_directed_acyclic_graph(self):
             raise ValueError("The provided configuration does not form a DAG.")
+        self.max_concurrency = int(config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
         return self
 
     def _add_graph_node(self, workflow_id: str, node_config: dict) -> None:
@@ -66,54 +80,89 @@ class Graph(nx.DiGraph):
     def run(self, workflow_output: WorkflowOutput) -> None:
         """Run the graph.
 
+        A node runs once all its predecessors are resolved and at least one of
+        its incoming edges is taken, the ready nodes run concurrently on a pool
+        of at most `max_concurrency` threads. The edges of a node returning an
+        `edge_source_handler` are only taken when their `source_handler`
+        matches, the nodes left without a taken edge are pruned.
+
         Args:
             workflow_output: The workflow output.
         """
-        sorted_nodes = list(nx.topological_sort(self))
-        predecessor_node: Node | None = None
-        while True:
-            next_node = self._get_next_node(workflow_output, sorted_nodes, predecessor_node)
-            if not next_node:
-                break
-            if self._has_node_been_executed(workflow_output, next_node.id):
-                predecessor_node = next_node
-                continue
-            self._run_node(cur_node=next_node, workflow_output=workflow_output)
-            if next_node.type == NodeEnum.END:
-                break
-            predecessor_node = next_node
+        scheduler = _GraphScheduler(self, workflow_output)
+        ready = deque(scheduler.start())
+        running = {}
+        executor = None
+        try:
+            while ready or running:
+                if not running and len(ready) == 1:
+                    # a single ready node runs in the caller thread, so a linear
+                    # graph never hops threads
+                    node = ready.popleft()
+                    try:
+                        node_output, elapsed = self._run_timed_node(node, workflow_output)
+                    except Exception as e:
+                        scheduler.fail(e)
+                        continue
+                    ready.extend(scheduler.complete(node, node_output, elapsed))
+                    continue
+                while ready:
+                    if executor is None:
+                        executor = ThreadPoolExecutorWithReturnValue(max_workers=self.max_concurrency,
+                                                                     thread_name_prefix='au_workflow')
+                    node = ready.popleft()
+                    running[executor.submit(self._run_timed_node, node, workflow_output)] = node
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        node_output, elapsed = future.result()
+                    except Exception as e:
+                        scheduler.fail(e)
+                        continue
+                    ready.extend(scheduler.complete(node, node_output, elapsed))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+        scheduler.finish()
 
-    def _get_next_node(self, workflow_output: WorkflowOutput, nodes: Any,
-                       predecessor_node: Optional[Node] = None) -> Optional[Node]:
-        """Get the next node in the graph.
+    async def async_run(self, workflow_output: WorkflowOutput) -> None:
+        """Asynchronously run the graph, the ready nodes run concurrently on the
+        running event loop through `Node.async_run`, at most `max_concurrency`
+        at the same time.
 
         Args:
             workflow_output: The workflow output.
-            nodes: The nodes in the graph.
-            predecessor_node: The predecessor node.
-        Returns:
-            The next node in the graph.
         """
-        if not predecessor_node:
-            for node_id in nodes:
-                if self.nodes[node_id]['type'] == NodeEnum.START.value:
-                    return self.nodes[node_id]['instance']
-        else:
-            predecessor_node_output: NodeOutput = workflow_output.workflow_node_results.get(
-                predecessor_node.id,
-                None
-            )
-            source_handler = predecessor_node_output.edge_source_handler if predecessor_node_output else None
-            successors = self.successors(predecessor_node.id)
-            if not successors:
-                return None
-            successors = list(successors)
-            if source_handler:
-                for s in successors:
-                    if self.get_edge_data(predecessor_node.id, s).get('source_handler') == source_handler:
-                        return self.nodes[s]['instance']
-            else:
-                return self.nodes[successors[0]]['instance']
+        scheduler = _GraphScheduler(self, workflow_output)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_node(node: Node):
+            async with semaphore:
+                start_time = time.perf_counter()
+                node_output = await node.async_run(workflow_output)
+                return node_output, time.perf_counter() - start_time
+
+        running = {asyncio.ensure_future(run_node(node)): node for node in scheduler.start()}
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = running.pop(task)
+                try:
+                    node_output, elapsed = task.result()
+                except Exception as e:
+                    scheduler.fail(e)
+                    continue
+                for next_node in scheduler.complete(node, node_output, elapsed):
+                    running[asyncio.ensure_future(run_node(next_node))] = next_node
+        scheduler.finish()
+
+    @staticmethod
+    def _run_timed_node(cur_node: Node, workflow_output: WorkflowOutput) -> Tuple[NodeOutput, float]:
+        """Run the node and return its output with its wall time in seconds."""
+        start_time = time.perf_counter()
+        node_output = cur_node.run(workflow_output)
+        return node_output, time.perf_counter() - start_time
 
     @staticmethod
     def _has_node_been_executed(workflow_output: WorkflowOutput, node_id: str) -> bool:
@@ -127,14 +176,97 @@ class Graph(nx.DiGraph):
         """
         return node_id in workflow_output.workflow_node_results
 
-    @staticmethod
-    def _run_node(cur_node: Node = None,
-                  workflow_output: WorkflowOutput = None) -> None:
-        """Run the node in the graph.
 
-        Args:
-            cur_node: The current node in the graph.
-            workflow_output: The workflow output.
-        """
-        node_output = cur_node.run(workflow_output)
-        workflow_output.workflow_node_results[cur_node.id] = node_output
+class _GraphScheduler(object):
+    """The dependency bookkeeping of one graph run.
+
+    It hands out the nodes whose predecessors are all resolved, prunes the nodes
+    left without a taken incoming edge, stops handing out nodes once the end
+    node or a failed node is reached, and records the per node wall time and
+    the critical path into the workflow output.
+    """
+
+    def __init__(self, graph: Graph, workflow_output: WorkflowOutput):
+        self.graph = graph
+        self.workflow_output = workflow_output
+        self.unresolved_predecessors: Dict[str, int] = {node_id: graph.in_degree(node_id) for node_id in graph.nodes}
+        self.taken_edges: Dict[str, int] = {node_id: 0 for node_id in graph.nodes}
+        self.wall_times: Dict[str, float] = {}
+        self.stopped = False
+        self.error: Optional[Exception] = None
+        self.start_time = time.perf_counter()
+
+    def start(self) -> List[Node]:
+        """Return the start nodes, the other nodes without predecessors are pruned."""
+        ready = []
+        for node_id in nx.topological_sort(self.graph):
+            if self.unresolved_predecessors[node_id] != 0:
+                continue
+            if self.graph.nodes[node_id]['type'] == NodeEnum.START.value:
+                ready.extend(self._visit(node_id))
+            else:
+                ready.extend(self._resolve(node_id, None))
+        return ready
+
+    def complete(self, node: Node, node_output: NodeOutput, elapsed: float) -> List[Node]:
+        """Record the output of the node and return the nodes getting ready."""
+        self.workflow_output.workflow_node_results[node.id] = node_output
+        self.wall_times[node.id] = elapsed
+        if node.type == NodeEnum.END:
+            self.stopped = True
+        return self._resolve(node.id, node_output)
+
+    def fail(self, error: Exception):
+        """Stop handing out nodes, the first error is raised when the run finishes."""
+        self.stopped = True
+        if self.error is None:
+            self.error = error
+
+    def finish(self):
+        """Raise the error of the run or record the timing into the workflow output."""
+        if self.error is not None:
+            raise self.error
+        finish_times: Dict[str, float] = {}
+        critical_predecessor: Dict[str, Optional[str]] = {}
+        for node_id in nx.topological_sort(self.graph):
+            if node_id not in self.wall_times:
+                continue
+            predecessor = max((p for p in self.graph.predecessors(node_id) if p in finish_times),
+                              key=lambda p: finish_times[p], default=None)
+            critical_predecessor[node_id] = predecessor
+            finish_times[node_id] = self.wall_times[node_id] + (finish_times[predecessor] if predecessor else 0.0)
+        critical_path = []
+        node_id = max(finish_times, key=lambda n: finish_times[n], default=None)
+        latency = finish_times[node_id] if node_id else 0.0
+        while node_id:
+            critical_path.append(node_id)
+            node_id = critical_predecessor[node_id]
+        self.workflow_output.workflow_node_wall_times = self.wall_times
+        self.workflow_output.workflow_critical_path = critical_path[::-1]
+        self.workflow_output.workflow_critical_path_latency = latency
+        self.workflow_output.workflow_wall_time = time.perf_counter() - self.start_time
+
+    def _visit(self, node_id: str) -> List[Node]:
+        # a node with a result of an earlier run is not run again
+        if Graph._has_node_been_executed(self.workflow_output, node_id):
+            return self._resolve(node_id, self.workflow_output.workflow_node_results[node_id])
+        if self.stopped:
+            return []
+        return [self.graph.nodes[node_id]['instance']]
+
+    def _resolve(self, node_id: str, node_output: Optional[NodeOutput]) -> List[Node]:
+        """Resolve the node, node_output is None for a pruned node."""
+        ready = []
+        source_handler = node_output.edge_source_handler if node_output else None
+        for successor in self.graph.successors(node_id):
+            self.unresolved_predecessors[successor] -= 1
+            if node_output is not None and (
+                    not source_handler
+                    or self.graph.get_edge_data(node_id, successor).get('source_handler') == source_handler):
+                self.taken_edges[successor] += 1
+            if self.unresolved_predecessors[successor] == 0:
+                if self.taken_edges[successor] > 0:
+                    ready.extend(self._visit(successor))
+                else:
+                    ready.extend(self._resolve(successor, None))
+        return ready
@@ -5,6 +5,7 @@
 # @Author  : wangchongshi
 # @Email   : wangchongshi.wcs@antgroup.com
 # @FileName: node.py
+import asyncio
 from abc import abstractmethod
 from typing import Optional, Dict, List, Any
 
@@ -43,6 +44,11 @@ class Node(BaseModel):
     def run(self, workflow_output: WorkflowOutput) -> NodeOutput:
         return self._run(workflow_output)
 
+    async def async_run(self, workflow_output: WorkflowOutput) -> NodeOutput:
+        """Asynchronously run the node, the nodes without native async support
+        run in a worker thread."""
+        return await asyncio.to_thread(self.run, workflow_output)
+
     @staticmethod
     def _resolve_input_params(input_params: List[NodeInputParams],
                               workflow_output: WorkflowOutput) -> Dict[str, Any]:
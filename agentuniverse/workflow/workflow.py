@@ -49,6 +49,13 @@ class Workflow(ComponentBase):
         self.graph.run(workflow_output)
         return workflow_output
 
+    async def async_run(self, input_params: dict) -> WorkflowOutput:
+        if self.graph is None:
+            raise ValueError('The graph of the workflow is None.')
+        workflow_output = WorkflowOutput(workflow_id=self.id, workflow_start_params=input_params)
+        await self.graph.async_run(workflow_output)
+        return workflow_output
+
     def initialize_by_component_configer(self, component_configer: WorkflowConfiger) -> 'Workflow':
         """Initialize the Workflow by the ComponentConfiger object.
 
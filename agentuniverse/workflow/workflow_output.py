@@ -22,3 +22,9 @@ class WorkflowOutput(BaseModel):
     workflow_node_results: Optional[Dict[str, NodeOutput]] = dict()
     workflow_start_params: Optional[Dict[str, Any]] = dict()
     workflow_end_params: Optional[Dict[str, Any]] = dict()
+    # The wall time in seconds of every executed node.
+    workflow_node_wall_times: Optional[Dict[str, float]] = dict()
+    # The chain of executed nodes with the longest summed wall time, and that sum.
+    workflow_critical_path: Optional[List[str]] = list()
+    workflow_critical_path_latency: Optional[float] = None
+    workflow_wall_time: Optional[float] = None
@@ -0,0 +1,16 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 07:50
+# @FileName: mock_app_configer.py
+from agentuniverse.base.config.application_configer.app_configer import AppConfiger
+from agentuniverse.base.config.application_configer.application_config_manager import ApplicationConfigManager
+
+
+def ensure_app_configer():
+    """Set an empty application configer unless one is loaded, so the unit tests
+    can build the components without starting the framework."""
+    try:
+        ApplicationConfigManager().app_configer
+    except ValueError:
+        ApplicationConfigManager().app_configer = AppConfiger()
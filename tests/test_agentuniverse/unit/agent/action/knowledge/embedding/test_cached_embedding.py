@@ -0,0 +1,76 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 14:45
+# @FileName: test_cached_embedding.py
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.embedding.cached_embedding import CachedEmbedding
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+EMBEDDED_TEXTS = []
+
+
+class FakeEmbedding(Embedding):
+    """A fake embedding recording the embedded texts."""
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        EMBEDDED_TEXTS.extend(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.get_embeddings(texts, **kwargs)
+
+
+class CachedEmbeddingTest(unittest.TestCase):
+    """
+    Test cases for CachedEmbedding class
+    """
+
+    def setUp(self) -> None:
+        ensure_app_configer()
+        EMBEDDED_TEXTS.clear()
+        fake_embedding = FakeEmbedding(name='test_fake_embedding', embedding_model_name='fake-model')
+        EmbeddingManager().register(fake_embedding.get_instance_code(), fake_embedding)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_get_embeddings(self) -> None:
+        embedding = CachedEmbedding(name='test_cached_embedding', embedding='test_fake_embedding', cache_size=10)
+        self.assertEqual(embedding.get_embeddings(['a', 'bb', 'a']), [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]])
+        self.assertEqual(embedding.get_embeddings(['bb', 'ccc']), [[2.0, 0.5], [3.0, 0.5]])
+        self.assertEqual(EMBEDDED_TEXTS, ['a', 'bb', 'ccc'])
+        # the text type is part of the cache key
+        embedding.get_embeddings(['a'], text_type='query')
+        self.assertEqual(EMBEDDED_TEXTS, ['a', 'bb', 'ccc', 'a'])
+        self.assertEqual(asyncio.run(embedding.async_get_embeddings(['ccc'])), [[3.0, 0.5]])
+        stats = embedding.get_cache_stats()
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_lru_eviction_and_disk_cache(self) -> None:
+        disk_cache_path = os.path.join(self.temp_dir.name, 'embedding_cache.db')
+        embedding = CachedEmbedding(name='test_cached_embedding', embedding='test_fake_embedding',
+                                    cache_size=1, disk_cache_path=disk_cache_path)
+        embedding.get_embeddings(['a', 'bb'])
+        self.assertEqual(embedding.get_cache_stats()['size'], 1)
+        self.assertEqual(embedding.get_embeddings(['a']), [[1.0, 0.5]])
+        self.assertEqual(embedding.get_cache_stats()['disk_hits'], 1)
+
+        # a new process reuses the disk tier
+        new_embedding = CachedEmbedding(name='test_cached_embedding', embedding='test_fake_embedding',
+                                        disk_cache_path=disk_cache_path)
+        self.assertEqual(new_embedding.get_embeddings(['bb']), [[2.0, 0.5]])
+        self.assertEqual(EMBEDDED_TEXTS, ['a', 'bb'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:10
+# @FileName: test_reader_processes.py
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from typing import Dict, List, Optional, Tuple
+
+from agentuniverse.agent.action.knowledge.reader.reader import Reader
+from agentuniverse.agent.action.knowledge.reader.reader_manager import ReaderManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class PageReader(Reader):
+    """A CPU bound reader of the files with one page per line."""
+    shard_pages: int = 4
+    rounds: int = 2000
+
+    def _load_data(self, file: str, ext_info: Optional[Dict] = None) -> List[Document]:
+        return self.load_shard(None, file, ext_info)
+
+    def get_shards(self, file: str, ext_info: Optional[Dict] = None) -> List[Tuple[int, int]]:
+        with open(file, encoding='utf-8') as f:
+            num_pages = sum(1 for _ in f)
+        return [(start, min(start + self.shard_pages, num_pages)) for start in range(0, num_pages, self.shard_pages)]
+
+    def load_shard(self, shard: Optional[Tuple[int, int]], file: str, ext_info: Optional[Dict] = None) -> \
+            List[Document]:
+        with open(file, encoding='utf-8') as f:
+            pages = f.read().splitlines()
+        start, end = shard or (0, len(pages))
+        documents = []
+        for page in range(start, end):
+            digest = pages[page].encode('utf-8')
+            for _ in range(self.rounds):
+                digest = hashlib.sha256(digest).digest()
+            documents.append(Document(text=f'{pages[page]} {digest.hex()[:8]}',
+                                      metadata={'file_name': os.path.basename(file), 'page': page}))
+        return documents
+
+
+class ReaderProcessesTest(unittest.TestCase):
+    """Test cases for the process pool parsing mode of the readers."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+        reader = PageReader(name='test_process_page_reader')
+        ReaderManager().register(reader.get_instance_code(), reader)
+        cls.readers = {'pages': 'test_process_page_reader'}
+        cls.corpus = tempfile.TemporaryDirectory()
+        for i in range(8):
+            with open(os.path.join(cls.corpus.name, f'file_{i}.pages'), 'w', encoding='utf-8') as f:
+                f.writelines(f'file {i} page {page}\n' for page in range(10))
+        # no reader for the file type, it is skipped
+        with open(os.path.join(cls.corpus.name, 'notes.unknown'), 'w', encoding='utf-8') as f:
+            f.write('skipped')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.corpus.cleanup()
+
+    def _load(self, process_num: int) -> Tuple[List[Document], float]:
+        start = time.perf_counter()
+        documents = [document for batch in ReaderManager().load_data_in_processes(
+            [self.corpus.name], process_num=process_num, readers=self.readers) for document in batch]
+        return documents, time.perf_counter() - start
+
+    def test_sharded_parsing(self):
+        serial, serial_time = self._load(1)
+        # 3 shards of every file
+        self.assertEqual(80, len(serial))
+        self.assertEqual(['file 0 page 0', 'file 0 page 1'], [doc.text.rsplit(' ', 1)[0] for doc in serial[:2]])
+
+        process_num = max(2, min(4, os.cpu_count() or 1))
+        parallel, parallel_time = self._load(process_num)
+        self.assertEqual([(doc.text, doc.metadata) for doc in serial],
+                         [(doc.text, doc.metadata) for doc in parallel])
+        print(f"\nparsed 80 pages in {serial_time:.2f}s serially, {parallel_time:.2f}s "
+              f"in {process_num} processes on {os.cpu_count()} cores")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 13:40
+# @FileName: test_batch_ingestor.py
+import tempfile
+import threading
+import time
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.agent.action.knowledge.store.batch_ingestor import BatchIngestor, estimate_tokens, iter_document_batches
+from agentuniverse.agent.action.knowledge.store.chroma_store import ChromaStore
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+EMBEDDING_CALLS = []
+
+
+class CountingEmbedding(Embedding):
+    """An embedding recording its calls, the vector is derived from the text length."""
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        EMBEDDING_CALLS.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.get_embeddings(texts)
+
+
+class SkewedEmbedding(Embedding):
+    """An embedding whose latency is taken from the text, the slow texts finish last."""
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        time.sleep(0.2 if any(text.startswith('slow') for text in texts) else 0.01)
+        if any('fail' in text for text in texts):
+            raise RuntimeError('embedding failed')
+        return [[1.0] for _ in texts]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.get_embeddings(texts)
+
+
+class BatchIngestorTest(unittest.TestCase):
+    """
+    Test cases for BatchIngestor class
+    """
+
+    def setUp(self) -> None:
+        ensure_app_configer()
+        EMBEDDING_CALLS.clear()
+        self.embedding = CountingEmbedding(name='test_counting_embedding')
+        EmbeddingManager().register(self.embedding.get_instance_code(), self.embedding)
+        self.documents = [Document(text=f'document {i}' + 'x' * i) for i in range(100)]
+
+    def test_iter_document_batches(self) -> None:
+        batches = list(iter_document_batches(self.documents, batch_size=30))
+        self.assertEqual([len(batch) for batch in batches], [30, 30, 30, 10])
+        batches = list(iter_document_batches(self.documents[:10], batch_size=30, batch_max_tokens=40))
+        self.assertTrue(all(sum(len(doc.text) for doc in batch) <= 40 for batch in batches if len(batch) > 1))
+        self.assertEqual(sum(len(batch) for batch in batches), 10)
+        # an emoji is one character but up to 4 byte-level tokens
+        self.assertEqual(estimate_tokens('a\U0001F600'), 5)
+        batches = list(iter_document_batches([Document(text='\U0001F600' * 5)] * 4, batch_size=30,
+                                             batch_max_tokens=40))
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+
+    def test_ingest(self) -> None:
+        written = []
+        lock = threading.Lock()
+
+        def write_batch(batch, embeddings):
+            with lock:
+                written.extend(zip(batch, embeddings))
+
+        metrics = BatchIngestor(embedding_model='test_counting_embedding', batch_size=16,
+                                concurrency=4).ingest(iter(self.documents), write_batch)
+        self.assertEqual(metrics.document_count, 100)
+        self.assertEqual(metrics.batch_count, 7)
+        self.assertEqual(len(EMBEDDING_CALLS), 7)
+        self.assertEqual(len(written), 100)
+        for document, embedding in written:
+            self.assertEqual(embedding, [float(len(document.text)), 1.0])
+
+    def test_write_in_submission_order(self) -> None:
+        embedding = SkewedEmbedding(name='test_skewed_embedding')
+        EmbeddingManager().register(embedding.get_instance_code(), embedding)
+        ingestor = BatchIngestor(embedding_model='test_skewed_embedding', batch_size=1, concurrency=4)
+        store = {}
+        order = []
+
+        def write_batch(batch, embeddings):
+            for document in batch:
+                store[document.id] = document.text
+                order.append(document.text)
+
+        # the first version of the document embeds slower than the later one
+        ingestor.ingest([Document(id='same', text='slow v1'), Document(id='x', text='x'),
+                         Document(id='same', text='v2')], write_batch)
+        self.assertEqual(['slow v1', 'x', 'v2'], order)
+        self.assertEqual('v2', store['same'])
+
+        # no batch after a failed one is written, even if it is embedded first
+        order.clear()
+        with self.assertRaises(RuntimeError):
+            ingestor.ingest([Document(text='a'), Document(text='slow fail'), Document(text='b')], write_batch)
+        self.assertEqual(['a'], order)
+
+    def test_chroma_store_batch_insert(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ChromaStore(collection_name='test_batch_ingest', persist_path=temp_dir,
+                                embedding_model='test_counting_embedding', ingest_batch_size=25)
+            store._new_client()
+            store.insert_document(self.documents)
+            self.assertEqual(store.collection.count(), 100)
+            self.assertEqual(EMBEDDING_CALLS, [25, 25, 25, 25])
+            store.upsert_document([Document(text='document 0', metadata={'a': 1})])
+            results = store.query(Query(query_str='document 0', embeddings=[[10.0, 1.0]], similarity_top_k=1))
+            self.assertEqual(results[0].text, 'document 0')
+
+
+if __name__ == '__main__':
+    unittest.main()
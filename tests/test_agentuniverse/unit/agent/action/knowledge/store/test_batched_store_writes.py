@@ -0,0 +1,149 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 04:10
+# @FileName: test_batched_store_writes.py
+import importlib.util
+import time
+import unittest
+from typing import Dict, List
+
+from agentuniverse.agent.action.knowledge.embedding.embedding import Embedding
+from agentuniverse.agent.action.knowledge.embedding.embedding_manager import EmbeddingManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+# the latency of one call to the local stand-ins of the servers
+ROUND_TRIP = 0.001
+
+
+class LatencyEmbedding(Embedding):
+    """An embedding service stand-in, every call costs a round trip."""
+    calls: List[int] = []
+
+    def get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        time.sleep(ROUND_TRIP)
+        self.calls.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def async_get_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return self.get_embeddings(texts)
+
+
+class CollectionStandIn(object):
+    """A milvus collection stand-in keeping the upserted rows by id."""
+
+    def __init__(self):
+        self.rows: Dict[str, tuple] = {}
+        self.upsert_calls = 0
+
+    def upsert(self, data: list):
+        time.sleep(ROUND_TRIP)
+        self.upsert_calls += 1
+        if len(set(data[0])) != len(data[0]):
+            raise ValueError('duplicate primary keys in one upsert')
+        for row in zip(*data):
+            self.rows[row[0]] = row
+
+    def load(self):
+        time.sleep(ROUND_TRIP)
+
+
+class DriverStandIn(object):
+    """A neo4j driver stand-in running the document statements on a dict."""
+
+    def __init__(self):
+        self.nodes: Dict[str, dict] = {}
+        self.run_calls = 0
+        self.transactions = 0
+
+    def session(self) -> 'DriverStandIn':
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute_write(self, transaction_function, *args, **kwargs):
+        # the commit round trip
+        time.sleep(ROUND_TRIP)
+        self.transactions += 1
+        return transaction_function(self, *args, **kwargs)
+
+    def run(self, cypher: str, rows: List[dict] = None, ids: List[str] = None) -> 'DriverStandIn':
+        time.sleep(ROUND_TRIP)
+        self.run_calls += 1
+        if 'DELETE' in cypher:
+            for node_id in ids:
+                self.nodes.pop(node_id, None)
+        for row in rows or []:
+            if 'MERGE' in cypher or row['id'] in self.nodes:
+                self.nodes[row['id']] = row
+        return self
+
+    def consume(self):
+        pass
+
+
+class BatchedStoreWritesTest(unittest.TestCase):
+    """Test cases for the batched writes of the milvus and neo4j stores, against local stand-ins."""
+
+    def setUp(self) -> None:
+        ensure_app_configer()
+        self.embedding = LatencyEmbedding(name='test_latency_embedding', calls=[])
+        EmbeddingManager().register(self.embedding.get_instance_code(), self.embedding)
+        self.documents = [Document(text=f'document {i}', metadata={'index': i}) for i in range(300)]
+
+    @unittest.skipIf(importlib.util.find_spec('pymilvus') is None, 'pymilvus is not installed')
+    def test_milvus_batched_upsert(self):
+        from agentuniverse.agent.action.knowledge.store.milvus_store import MilvusStore
+
+        def upsert(batch_size: int) -> float:
+            store = MilvusStore(name='test_batched_milvus', embedding_model='test_latency_embedding',
+                                ingest_batch_size=batch_size, ingest_concurrency=1)
+            store.collection = CollectionStandIn()
+            self.embedding.calls.clear()
+            start = time.perf_counter()
+            # the repeated document is written once
+            store.upsert_document(self.documents + self.documents[:1])
+            elapsed = time.perf_counter() - start
+            self.assertEqual(300, len(store.collection.rows))
+            self.assertEqual(-(-301 // batch_size), store.collection.upsert_calls)
+            self.assertEqual(-(-301 // batch_size), len(self.embedding.calls))
+            return elapsed
+
+        per_document = upsert(1)
+        batched = upsert(64)
+        print(f"\nmilvus upsert of 300 documents: {per_document:.2f}s one by one, {batched:.2f}s in batches")
+        self.assertLess(batched, per_document / 5)
+
+    @unittest.skipIf(importlib.util.find_spec('neo4j') is None, 'neo4j is not installed')
+    def test_neo4j_unwind_batches(self):
+        from agentuniverse.agent.action.knowledge.store.neo4j_store import Neo4jStore
+
+        def insert(batch_size: int) -> float:
+            store = Neo4jStore(name='test_batched_neo4j', driver=DriverStandIn(), ingest_batch_size=batch_size)
+            start = time.perf_counter()
+            store.insert_document(self.documents)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(300, len(store.driver.nodes))
+            self.assertEqual(-(-300 // batch_size), store.driver.transactions)
+            self.assertEqual(-(-300 // batch_size), store.driver.run_calls)
+
+            store.update_document([Document(id=self.documents[0].id, text='updated'), Document(text='unknown')])
+            self.assertEqual('updated', store.driver.nodes[self.documents[0].id]['text'])
+            self.assertEqual(300, len(store.driver.nodes))
+            store.delete_documents([document.id for document in self.documents[:100]])
+            self.assertEqual(200, len(store.driver.nodes))
+            return elapsed
+
+        per_document = insert(1)
+        batched = insert(128)
+        print(f"\nneo4j insert of 300 documents: {per_document:.2f}s one by one, {batched:.2f}s in batches")
+        self.assertLess(batched, per_document / 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 07:30
+# @FileName: test_chroma_store.py
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from chromadb import QueryResult
+
+from agentuniverse.agent.action.knowledge.store.chroma_store import ChromaStore
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
+
+
+class ChromaClientStandIn(object):
+    """A remote chroma client stand-in recording the queried collections."""
+
+    def __init__(self):
+        self.collection_ids = []
+
+    async def query(self, collection_id: str, query_embeddings, n_results: int) -> QueryResult:
+        self.collection_ids.append(collection_id)
+        return QueryResult(ids=[['doc_1']], documents=[['text 1']], embeddings=None, metadatas=None,
+                           distances=[[0.1]], uris=None, data=None)
+
+
+class ChromaStoreTest(unittest.TestCase):
+    """Test cases for the async query of the chroma store."""
+
+    def test_async_query_without_collection(self):
+        store = ChromaStore(name='test_unconfigured_chroma')
+        self.assertEqual([], asyncio.run(store.async_query(Query(embeddings=[[1.0, 0.0]]))))
+
+    def test_async_query_default_port(self):
+        store = ChromaStore(name='test_remote_chroma', persist_path='http://chroma.local',
+                            collection=types.SimpleNamespace(id='collection_1'))
+        client = ChromaClientStandIn()
+        with mock.patch.object(HttpClientRegistry(), 'get_async_client', return_value=client) as get_async_client:
+            documents = asyncio.run(store.async_query(Query(embeddings=[[1.0, 0.0]], similarity_top_k=1)))
+        # the url without port is sent to the default port of chroma, like by the sync client
+        self.assertEqual('http://chroma.local:8000', get_async_client.call_args.kwargs['base_url'])
+        self.assertEqual(('http', 'chroma.local', 8000), store._remote_server())
+        self.assertEqual(['collection_1'], client.collection_ids)
+        self.assertEqual(['text 1'], [document.text for document in documents])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 03:20
+# @FileName: test_numpy_store.py
+import os
+import tempfile
+import unittest
+from typing import List
+
+import numpy as np
+
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.numpy_store import NumpyStore
+from agentuniverse.agent.action.knowledge.store.query import Query
+
+
+class NumpyStoreTest(unittest.TestCase):
+    """Test cases for the memory-mapped numpy vector store."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'numpy_store')
+        self.rng = np.random.default_rng(7)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _store(self, **kwargs) -> NumpyStore:
+        store = NumpyStore(name='test_numpy_store', persist_path=self.path, **kwargs)
+        store._new_client()
+        return store
+
+    def _documents(self, vectors: np.ndarray, start: int = 0, **metadata) -> List[Document]:
+        return [Document(id=f'doc_{start + i}', text=f'text {start + i}', embedding=vector.tolist(),
+                         metadata={'group': (start + i) % 3, **metadata}) for i, vector in enumerate(vectors)]
+
+    def _query(self, store: NumpyStore, vector: np.ndarray, top_k: int = 5, **ext_info) -> List[str]:
+        return [document.id for document in store.query(
+            Query(embeddings=[vector.tolist()], similarity_top_k=top_k, ext_info=ext_info))]
+
+    def test_exact_top_k(self):
+        vectors = self.rng.standard_normal((500, 16)).astype(np.float32)
+        query = self.rng.standard_normal(16).astype(np.float32)
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = {
+            'cosine': np.argsort(-(normalized @ query)),
+            'ip': np.argsort(-(vectors @ query)),
+            'l2': np.argsort(np.linalg.norm(vectors - query, axis=1)),
+        }
+        for metric, order in expected.items():
+            self.path = os.path.join(self.temp_dir.name, metric)
+            store = self._store(metric=metric, ingest_batch_size=64)
+            store.insert_document(self._documents(vectors))
+            self.assertEqual([f'doc_{i}' for i in order[:5]], self._query(store, query), metric)
+
+        # metadata filter, a list value matches any of its values
+        self.assertEqual([f'doc_{i}' for i in order if i % 3 == 1][:5], self._query(store, query, metadata_filter={
+            'group': 1}))
+        self.assertEqual([f'doc_{i}' for i in order if i % 3 != 0][:5], self._query(store, query, metadata_filter={
+            'group': [1, 2]}))
+        self.assertEqual([], self._query(store, query, metadata_filter={'group': 5}))
+
+        # the filter index is carried by the next snapshots and only extended with the appended rows
+        filter_index = store._snapshot.filter_index
+        store.insert_document(self._documents(vectors[:2] * 2, start=500, group=5))
+        store.delete_documents(['doc_500'])
+        self.assertIs(filter_index, store._snapshot.filter_index)
+        self.assertEqual(['doc_501'], self._query(store, query, metadata_filter={'group': 5}))
+
+    def test_upsert_delete_and_compaction(self):
+        vectors = self.rng.standard_normal((100, 8)).astype(np.float32)
+        store = self._store(compaction_threshold=0.3)
+        store.insert_document(self._documents(vectors))
+        # replacing a document tombstones its previous row
+        store.upsert_document([Document(id='doc_0', text='replaced', embedding=(-vectors[1]).tolist())])
+        self.assertEqual('replaced', store.query(Query(embeddings=[(-vectors[1]).tolist()],
+                                                       similarity_top_k=1))[0].text)
+        store.delete_documents([f'doc_{i}' for i in range(1, 20)])
+        self.assertEqual(101, store._snapshot.count)
+        self.assertNotIn('doc_5', self._query(store, vectors[5], top_k=100))
+
+        # more than 30% tombstones, the files are compacted into a new generation
+        store.delete_documents([f'doc_{i}' for i in range(20, 40)])
+        self.assertEqual(1, store._snapshot.generation)
+        self.assertEqual(61, store._snapshot.count)
+        self.assertEqual(['meta.json', 'rows.1.jsonl', 'vectors.1.f32'], sorted(os.listdir(self.path)))
+        self.assertEqual(['doc_50'], self._query(store, vectors[50], top_k=1))
+
+        reopened = self._store()
+        self.assertEqual(sorted(store._id_to_row), sorted(reopened._id_to_row))
+        self.assertEqual(self._query(store, vectors[70], top_k=10), self._query(reopened, vectors[70], top_k=10))
+
+    def test_read_only_refresh_and_recovery(self):
+        vectors = self.rng.standard_normal((20, 8)).astype(np.float32)
+        writer = self._store()
+        writer.insert_document(self._documents(vectors[:10]))
+        reader = self._store(read_only=True, refresh_interval=0)
+        self.assertEqual(['doc_3'], self._query(reader, vectors[3], top_k=1))
+        self.assertIsInstance(reader._snapshot.vectors, np.memmap)
+        with self.assertRaises(Exception):
+            reader.insert_document(self._documents(vectors[10:]))
+
+        # the rows appended by the writer are read from the end of the rows file
+        ids = reader._snapshot.ids
+        writer.insert_document(self._documents(vectors[10:], start=10))
+        writer.delete_documents(['doc_3'])
+        self.assertEqual(['doc_15'], self._query(reader, vectors[15], top_k=1))
+        self.assertIs(ids, reader._snapshot.ids)
+        self.assertEqual(20, reader._snapshot.count)
+        self.assertNotIn('doc_3', reader._id_to_row)
+        self.assertNotIn('doc_3', self._query(reader, vectors[3], top_k=3))
+
+        # the rows written after the last commit by a crashed writer are dropped
+        with open(os.path.join(self.path, 'vectors.0.f32'), 'ab') as f:
+            f.write(b'\0' * 40)
+        with open(os.path.join(self.path, 'rows.0.jsonl'), 'a', encoding='utf-8') as f:
+            f.write('{"id": "torn')
+        writer = self._store()
+        writer.insert_document(self._documents(vectors[:1], start=20))
+        self.assertEqual(21, self._store(read_only=True)._snapshot.count)
+        self.assertEqual({'doc_20', 'doc_0'}, set(self._query(writer, vectors[0], top_k=2)))
+
+    def test_ivf_recall(self):
+        centers = self.rng.standard_normal((64, 32)).astype(np.float32) * 4
+        vectors = (centers[self.rng.integers(0, 64, 20000)]
+                   + self.rng.standard_normal((20000, 32)).astype(np.float32))
+        store = self._store(metric='l2', ivf_nlist=64, ivf_nprobe=8, ivf_min_rows=1000, ingest_batch_size=4096)
+        store.insert_document(self._documents(vectors))
+        queries = centers[:20] + self.rng.standard_normal((20, 32)).astype(np.float32)
+        recall = []
+        for query in queries:
+            exact = np.argsort(np.linalg.norm(vectors - query, axis=1))[:10]
+            recall.append(len({f'doc_{i}' for i in exact} & set(self._query(store, query, top_k=10))) / 10)
+        self.assertIsNotNone(store._ivf)
+        self.assertGreaterEqual(np.mean(recall), 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 11:30
+# @FileName: test_sqlite_store.py
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import jieba
+
+from agentuniverse.agent.action.knowledge.doc_processor.doc_processor_manager import DocProcessorManager
+from agentuniverse.agent.action.knowledge.doc_processor.jieba_keyword_extractor import JiebaKeywordExtractor
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.sqlite_store import SQLiteStore
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    """
+    Test cases for SQLiteStore class
+    """
+
+    def setUp(self) -> None:
+        ensure_app_configer()
+        extractor = JiebaKeywordExtractor(name='test_sqlite_store_keyword_extractor', top_k=5)
+        DocProcessorManager().register(extractor.get_instance_code(), extractor)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SQLiteStore(db_path=os.path.join(self.temp_dir.name, 'test.db'),
+                                 keyword_extractor='test_sqlite_store_keyword_extractor',
+                                 similarity_top_k=2)
+        self.store._new_client()
+        self.documents = [
+            Document(text='apple banana apple orchard harvest'),
+            Document(text='banana smoothie recipe with milk'),
+            Document(text='apple pie recipe with cinnamon'),
+        ]
+        self.word_counts = [len(jieba.lcut(doc.text)) for doc in self.documents]
+
+    def tearDown(self) -> None:
+        self.store.conn.close()
+        self.temp_dir.cleanup()
+
+    def test_query(self) -> None:
+        self.store.insert_document(self.documents)
+        self.assertEqual(self.store._get_corpus_stats(), (3, sum(self.word_counts)))
+        results = self.store.query(Query(query_str='apple recipe', keywords={'apple', 'recipe'}))
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].text, 'apple pie recipe with cinnamon')
+
+    def test_upsert_and_delete_keep_stats(self) -> None:
+        self.store.insert_document(self.documents)
+        self.store.upsert_document([self.documents[0]])
+        self.assertEqual(self.store._get_corpus_stats(), (3, sum(self.word_counts)))
+        self.store.delete_document(self.documents[0].id)
+        self.assertEqual(self.store._get_corpus_stats(), (2, sum(self.word_counts[1:])))
+        results = self.store.query(Query(query_str='apple', keywords={'apple'}))
+        self.assertEqual([doc.text for doc in results], ['apple pie recipe with cinnamon'])
+
+    def test_legacy_index_backfill(self) -> None:
+        self.store.conn.close()
+        legacy_db = os.path.join(self.temp_dir.name, 'legacy.db')
+        conn = sqlite3.connect(legacy_db)
+        conn.execute('CREATE TABLE documents (id TEXT PRIMARY KEY, text TEXT, word_count INT, metadata TEXT)')
+        conn.execute('CREATE TABLE inverted_index (term TEXT, doc_id TEXT)')
+        conn.execute("INSERT INTO documents VALUES ('1', 'apple apple pie', 5, NULL)")
+        conn.execute("INSERT INTO inverted_index VALUES ('apple', '1')")
+        conn.commit()
+        conn.close()
+        self.store.db_path = legacy_db
+        self.store._new_client()
+        self.assertEqual(self.store._get_corpus_stats(), (1, 5))
+        term_freq = self.store.conn.execute(
+            "SELECT term_freq FROM inverted_index WHERE doc_id = '1' AND term = 'apple'").fetchone()[0]
+        self.assertEqual(term_freq, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 01:30
+# @FileName: test_ingest_pipeline.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import List
+
+from agentuniverse.agent.action.knowledge.ingest_pipeline import IngestPipeline
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.reader.file.txt_reader import LineTxtReader
+from agentuniverse.agent.action.knowledge.reader.reader_manager import ReaderManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class RecordingStore(Store):
+    """A store keeping the texts of the inserted documents."""
+    texts: List[str] = []
+    delay: float = 0
+
+    def insert_document(self, documents: List[Document], **kwargs):
+        time.sleep(self.delay)
+        self.texts.extend(document.text for document in documents)
+
+
+class IngestPipelineTest(unittest.TestCase):
+    """Test cases for the streaming ingest pipeline of the knowledge."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+
+    def test_bounded_backpressure(self):
+        lock = threading.Lock()
+        state = {'in_flight': 0, 'max_in_flight': 0}
+
+        def documents():
+            for i in range(2000):
+                with lock:
+                    state['in_flight'] += 1
+                    state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+                yield Document(text=f'doc {i}')
+
+        written = []
+
+        def slow_write(batch: List[Document]):
+            time.sleep(0.002)
+            written.extend(document.text for document in batch)
+            with lock:
+                state['in_flight'] -= len(batch)
+
+        def failing_write(batch: List[Document]):
+            raise RuntimeError('store down')
+
+        metrics = IngestPipeline(batch_size=50, queue_size=2).run(documents(), lambda batch: batch,
+                                                                   {'slow': slow_write, 'failing': failing_write})
+        self.assertEqual([f'doc {i}' for i in range(2000)], written)
+        # the queued batches, the batch being written, the batch being read and
+        # the document starting the next batch
+        self.assertLessEqual(state['max_in_flight'], (2 + 2) * 50 + 1)
+        self.assertEqual(2000, metrics['read'].document_count)
+        self.assertEqual(40, metrics['slow'].batch_count)
+        self.assertGreater(metrics['slow'].throughput, 0)
+        self.assertIsInstance(metrics['failing'].error, RuntimeError)
+        self.assertEqual(0, metrics['failing'].document_count)
+
+    def test_insert_knowledge(self):
+        reader = LineTxtReader(name='test_ingest_line_reader')
+        ReaderManager().register(reader.get_instance_code(), reader)
+        store = RecordingStore(name='test_ingest_store', texts=[], delay=0.001)
+        StoreManager().register(store.get_instance_code(), store)
+        knowledge = Knowledge(name='test_ingest_knowledge', stores=['test_ingest_store'],
+                              readers={'txt': 'test_ingest_line_reader'}, ingest_batch_size=16)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'lines.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(f'line {i}\n' for i in range(100))
+            metrics = knowledge.insert_knowledge(source_path=path)
+        self.assertEqual([f'line {i}\n' for i in range(100)], store.texts)
+        self.assertEqual(7, metrics['test_ingest_store'].batch_count)
+        self.assertEqual(100, metrics['process'].document_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
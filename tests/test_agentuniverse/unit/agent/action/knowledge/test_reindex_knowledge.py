@@ -0,0 +1,110 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 02:40
+# @FileName: test_reindex_knowledge.py
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.reader.file.txt_reader import LineTxtReader
+from agentuniverse.agent.action.knowledge.reader.reader_manager import ReaderManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class DictStore(Store):
+    """A store keeping the documents by id and counting the written ones."""
+    documents: Dict[str, str] = {}
+    written: int = 0
+
+    def insert_document(self, documents: List[Document], **kwargs):
+        self.written += len(documents)
+        self.documents.update((document.id, document.text) for document in documents)
+
+    def delete_document(self, document_id: str, **kwargs):
+        self.documents.pop(document_id, None)
+
+
+class ReindexKnowledgeTest(unittest.TestCase):
+    """Test cases for the incremental re-index of the knowledge."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+        reader = LineTxtReader(name='test_reindex_line_reader')
+        ReaderManager().register(reader.get_instance_code(), reader)
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp_dir.name, 'corpus')
+        os.makedirs(self.corpus)
+        self.store = DictStore(name='test_reindex_store', documents={})
+        StoreManager().register(self.store.get_instance_code(), self.store)
+        self.knowledge = Knowledge(name='test_reindex_knowledge', stores=['test_reindex_store'],
+                                   readers={'txt': 'test_reindex_line_reader'},
+                                   manifest_path=os.path.join(self.tmp_dir.name, 'manifest.json'))
+        self._write('a.txt', ['shared header', 'a 1', 'a 2'])
+        self._write('b.txt', ['shared header', 'b 1'])
+        self._write('c.txt', ['c 1', 'c 2'])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, lines: List[str]):
+        with open(os.path.join(self.corpus, name), 'w', encoding='utf-8') as f:
+            f.writelines(f'{line}\n' for line in lines)
+
+    def _texts(self) -> List[str]:
+        return sorted(text.strip() for text in self.store.documents.values())
+
+    def test_incremental_reindex(self):
+        report = self.knowledge.reindex_knowledge(self.corpus)
+        self.assertEqual(3, len(report.added))
+        # the shared header is written once
+        self.assertEqual(6, len(report.new_chunk_ids))
+        self.assertEqual(['a 1', 'a 2', 'b 1', 'c 1', 'c 2', 'shared header'], self._texts())
+
+        self.store.written = 0
+        report = self.knowledge.reindex_knowledge(self.corpus)
+        self.assertEqual(3, len(report.unchanged))
+        self.assertEqual(0, self.store.written)
+
+        self._write('a.txt', ['shared header', 'a 1', 'a 2 changed'])
+        os.utime(os.path.join(self.corpus, 'b.txt'), ns=(0, 0))
+        os.remove(os.path.join(self.corpus, 'c.txt'))
+        with open(self.knowledge.manifest_path, encoding='utf-8') as f:
+            manifest = f.read()
+        report = self.knowledge.reindex_knowledge(self.corpus, dry_run=True)
+        self.assertEqual([os.path.join(self.corpus, 'a.txt')], report.changed)
+        self.assertEqual([os.path.join(self.corpus, 'c.txt')], report.removed)
+        self.assertEqual(1, len(report.new_chunk_ids))
+        self.assertEqual(3, len(report.orphan_chunk_ids))
+        self.assertEqual(0, self.store.written)
+        self.assertEqual(6, len(self.store.documents))
+        with open(self.knowledge.manifest_path, encoding='utf-8') as f:
+            self.assertEqual(manifest, f.read())
+
+        report = self.knowledge.reindex_knowledge(self.corpus)
+        self.assertEqual(1, self.store.written)
+        self.assertEqual(['a 1', 'a 2 changed', 'b 1', 'shared header'], self._texts())
+        self.assertEqual({'dry_run': False, 'added': 0, 'changed': 1, 'unchanged': 1, 'removed': 1,
+                          'new_chunk_count': 1, 'orphan_chunk_count': 3},
+                         {key: len(value) if isinstance(value, list) else value
+                          for key, value in report.to_dict().items() if key != 'metrics'})
+
+        # the shared header stays while a source refers to it
+        os.remove(os.path.join(self.corpus, 'a.txt'))
+        self.knowledge.reindex_knowledge(self.corpus)
+        self.assertEqual(['b 1', 'shared header'], self._texts())
+        with open(self.knowledge.manifest_path, encoding='utf-8') as f:
+            self.assertEqual([os.path.join(self.corpus, 'b.txt')], list(json.load(f)['sources']))
+
+
+if __name__ == '__main__':
+    unittest.main()
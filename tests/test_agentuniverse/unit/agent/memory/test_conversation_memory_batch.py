@@ -0,0 +1,158 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:40
+# @FileName: test_conversation_memory_batch.py
+import datetime
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from sqlalchemy import event, text
+
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_module import ConversationMemoryModule
+from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
+from agentuniverse.agent.memory.conversation_memory.memory_storage.sqlite_conversation_memory_storage import \
+    SqliteMemoryStorage, DefaultMemoryConverter
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.memory_manager import MemoryManager
+from agentuniverse.agent.memory.memory_storage.memory_storage_manager import MemoryStorageManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+# a process buffering messages and queueing a trace event right before it exits
+EXIT_SCRIPT = """
+import sys
+from agentuniverse.agent.memory.conversation_memory.conversation_memory_module import ConversationMemoryModule
+from agentuniverse.agent.memory.conversation_memory.memory_storage.sqlite_conversation_memory_storage import \\
+    SqliteMemoryStorage, DefaultMemoryConverter
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.memory_manager import MemoryManager
+from agentuniverse.agent.memory.memory_storage.memory_storage_manager import MemoryStorageManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+from test_conversation_memory_batch import build_message
+
+ensure_app_configer()
+storage = SqliteMemoryStorage(name='exit_storage', sqldb_path=sys.argv[1],
+                              memory_converter=DefaultMemoryConverter('batch_memory'))
+storage._new_client()
+MemoryStorageManager().register(storage.get_instance_code(), storage)
+memory = Memory(name='exit_memory', memory_storages=['exit_storage'], memory_retrieval_storage='exit_storage')
+MemoryManager().register(memory.get_instance_code(), memory)
+module = ConversationMemoryModule()
+# nothing is flushed before the exit, where the pools are shut down before the atexit hooks run
+module.flush_interval = 60
+module._add_message('exit_memory', build_message(0), 'session_exit')
+module.queue.put_nowait(lambda: module._add_message('exit_memory', build_message(1), 'session_exit'))
+"""
+
+
+def build_message(index: int) -> ConversationMessage:
+    return ConversationMessage(id=f'message_{index}', content=f'content {index}', type='input', source='user',
+                               source_type='user', target='demo_agent', target_type='agent',
+                               metadata={'timestamp': datetime.datetime(2026, 1, 1) + datetime.timedelta(seconds=index)})
+
+
+class ConversationMemoryBatchTest(unittest.TestCase):
+    """Test cases for the batched writes of the conversation memory."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+        cls.db_dir = tempfile.TemporaryDirectory()
+        cls.storage = SqliteMemoryStorage(name='test_batch_storage',
+                                          sqldb_path=f"sqlite:///{os.path.join(cls.db_dir.name, 'memory.db')}",
+                                          memory_converter=DefaultMemoryConverter('batch_memory'))
+        cls.storage._new_client()
+        MemoryStorageManager().register(cls.storage.get_instance_code(), cls.storage)
+        memory = Memory(name='test_batch_memory', memory_storages=['test_batch_storage'],
+                        memory_retrieval_storage='test_batch_storage')
+        MemoryManager().register(memory.get_instance_code(), memory)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.storage.engine.dispose()
+        cls.db_dir.cleanup()
+
+    def setUp(self) -> None:
+        with self.storage.engine.begin() as conn:
+            conn.execute(text('DELETE FROM batch_memory'))
+
+    def _record_statements(self, func):
+        statements = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.storage.engine, 'before_cursor_execute', before_execute)
+        try:
+            func()
+        finally:
+            event.remove(self.storage.engine, 'before_cursor_execute', before_execute)
+        return statements
+
+    def _stored_count(self, session_id: str) -> int:
+        with self.storage.engine.connect() as conn:
+            return conn.execute(text('SELECT COUNT(*) FROM batch_memory WHERE session_id = :session_id'),
+                                {'session_id': session_id}).scalar()
+
+    def test_bulk_insert_ignores_stored_messages(self):
+        messages = [build_message(i) for i in range(20)]
+        statements = self._record_statements(
+            lambda: self.storage.add(messages + messages[:5], session_id='session_1'))
+        self.assertEqual(1, len([statement for statement in statements if statement.startswith('INSERT')]))
+        self.assertEqual(20, self._stored_count('session_1'))
+        # the stored messages are skipped by the database
+        self.storage.add([build_message(i) for i in range(15, 25)], session_id='session_1')
+        self.assertEqual(25, self._stored_count('session_1'))
+        self.assertEqual([f'content {i}' for i in range(20, 25)],
+                         [message.content for message in self.storage.get(session_id='session_1', top_k=5)])
+
+    def test_module_batches_by_memory_and_session(self):
+        module = ConversationMemoryModule()
+        module.flush()
+
+        def add_messages():
+            for i in range(30):
+                module._add_message('test_batch_memory', build_message(i), 'session_2' if i % 2 else 'session_3')
+                # the same message reaching the memory through a sub agent is written once
+                module._add_message('test_batch_memory', build_message(i), 'session_2' if i % 2 else 'session_3')
+
+        add_messages()
+        statements = self._record_statements(module.flush)
+        self.assertEqual(2, len([statement for statement in statements if statement.startswith('INSERT')]))
+        self.assertEqual((15, 15), (self._stored_count('session_2'), self._stored_count('session_3')))
+
+    def test_consumer_flushes_after_interval(self):
+        module = ConversationMemoryModule()
+        flush_interval = module.flush_interval
+        module.flush_interval = 0.1
+        try:
+            module.queue.put_nowait(lambda: module._add_message('test_batch_memory', build_message(100),
+                                                                'session_4'))
+            module.queue.join()
+            deadline = time.monotonic() + 2
+            while self._stored_count('session_4') == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(1, self._stored_count('session_4'))
+        finally:
+            module.flush_interval = flush_interval
+
+    def test_flush_at_exit(self):
+        db_path = os.path.join(self.db_dir.name, 'exit.db')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(__file__)] + sys.path))
+        process = subprocess.run([sys.executable, '-c', EXIT_SCRIPT, f'sqlite:///{db_path}'], env=env,
+                                 capture_output=True, text=True, timeout=120)
+        self.assertEqual(0, process.returncode, process.stderr)
+        self.assertNotIn('cannot schedule new futures', process.stderr)
+        with sqlite3.connect(db_path) as conn:
+            contents = [row[0] for row in conn.execute(
+                "SELECT content FROM batch_memory WHERE session_id = 'session_exit' ORDER BY content")]
+        # the buffered message and the queued trace event are both written
+        self.assertEqual(['content 0', 'content 1'], contents)
+
+if __name__ == '__main__':
+    unittest.main()
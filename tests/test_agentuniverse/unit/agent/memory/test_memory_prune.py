@@ -0,0 +1,75 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:20
+# @FileName: test_memory_prune.py
+import unittest
+from typing import Any, ClassVar, Optional
+
+from agentuniverse.agent.memory.memory import Memory
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.util.memory_util import get_memory_tokens
+from agentuniverse.llm.llm import LLM
+from agentuniverse.llm.llm_manager import LLMManager
+from agentuniverse.llm.llm_output import LLMOutput
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class WordCountLLM(LLM):
+    """The llm counting the words as the tokens."""
+
+    calls: ClassVar[int] = 0
+
+    def _call(self, *args: Any, **kwargs: Any) -> Optional[LLMOutput]:
+        pass
+
+    async def _acall(self, *args: Any, **kwargs: Any) -> Optional[LLMOutput]:
+        pass
+
+    def max_context_length(self) -> int:
+        return 8000
+
+    def get_num_tokens(self, text: str) -> int:
+        WordCountLLM.calls += 1
+        return len(text.split())
+
+
+class MemoryPruneTest(unittest.TestCase):
+    """Test cases for the incremental token counting of Memory.prune."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+        llm = WordCountLLM(name='test_word_count_llm')
+        LLMManager().register(llm.get_instance_code(), llm)
+
+    def setUp(self) -> None:
+        self.memory = Memory(max_tokens=200)
+        self.memory.agent_llm_name = 'test_word_count_llm'
+        self.messages = [Message(type='human' if i % 2 == 0 else 'ai', content=f'message {i} ' + 'word ' * (i % 7))
+                         for i in range(500)]
+
+    def test_prune_keeps_latest_messages_within_max_tokens(self):
+        pruned = self.memory.prune(self.messages)
+        self.assertEqual(self.messages[-len(pruned):], pruned)
+        self.assertLessEqual(get_memory_tokens(pruned, 'test_word_count_llm'), self.memory.max_tokens)
+        # one more message would exceed the max tokens
+        self.assertGreater(get_memory_tokens(self.messages[-len(pruned) - 1:], 'test_word_count_llm'),
+                           self.memory.max_tokens)
+
+    def test_one_tokenization_pass(self):
+        WordCountLLM.calls = 0
+        self.memory.prune(self.messages)
+        # every message and the separator are tokenized once
+        self.assertEqual(len(self.messages) + 1, WordCountLLM.calls)
+        WordCountLLM.calls = 0
+        self.memory.prune(self.messages)
+        self.assertEqual(1, WordCountLLM.calls)
+
+    def test_no_prune_within_max_tokens(self):
+        self.assertEqual(self.messages[-5:], self.memory.prune(self.messages[-5:]))
+        self.assertEqual([], self.memory.prune([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 23:10
+# @FileName: test_memory_storage_top_k.py
+import datetime
+import os
+import tempfile
+import time
+import unittest
+
+from sqlalchemy import text
+
+from agentuniverse.agent.memory.conversation_memory.conversation_message import ConversationMessage
+from agentuniverse.agent.memory.conversation_memory.memory_storage.sqlite_conversation_memory_storage import \
+    SqliteMemoryStorage, DefaultMemoryConverter as ConversationMemoryConverter
+from agentuniverse.agent.memory.memory_storage.sql_alchemy_memory_storage import SqlAlchemyMemoryStorage, \
+    DefaultMemoryConverter
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.base.config.component_configer.configers.sqldb_wrapper_config import SQLDBWrapperConfiger
+from agentuniverse.database.sqldb_wrapper import SQLDBWrapper
+
+# the timing is only checked on opt-in, run with e.g. `AU_MEMORY_BENCHMARK_ROWS=1000000 pytest -s` for the 1M
+# row table
+BENCHMARK = 'AU_MEMORY_BENCHMARK_ROWS' in os.environ
+BENCHMARK_ROWS = int(os.environ.get('AU_MEMORY_BENCHMARK_ROWS', 100000))
+BASE_TIME = datetime.datetime(2026, 1, 1)
+
+
+def build_conversation_message(index: int) -> ConversationMessage:
+    return ConversationMessage(id=f'message_{index}', content=f'content {index}', type='input', source='user',
+                               source_type='user', target='demo_agent', target_type='agent',
+                               metadata={'timestamp': BASE_TIME + datetime.timedelta(seconds=index)})
+
+
+class MemoryStorageTopKTest(unittest.TestCase):
+    """Test cases for the top_k pushed down into the sql of the memory storages."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db_dir = tempfile.TemporaryDirectory()
+        cls.conversation_storage = SqliteMemoryStorage(
+            sqldb_path=f"sqlite:///{os.path.join(cls.db_dir.name, 'conversation.db')}",
+            memory_converter=ConversationMemoryConverter('conversation_memory'))
+        cls.conversation_storage._new_client()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.conversation_storage.engine.dispose()
+        cls.db_dir.cleanup()
+
+    def test_conversation_latest_messages(self):
+        self.conversation_storage.add([build_conversation_message(i) for i in range(30)], session_id='session_1')
+        messages = self.conversation_storage.get(session_id='session_1', top_k=5)
+        self.assertEqual([f'content {i}' for i in range(25, 30)], [message.content for message in messages])
+        self.assertEqual(5, len(self.conversation_storage.get(session_id='session_1', agent_id='demo_agent',
+                                                              top_k=5, type='input')))
+        self.assertEqual(30, len(self.conversation_storage.get(session_id='session_1', top_k=0)))
+
+    def test_sql_alchemy_latest_messages(self):
+        configer = SQLDBWrapperConfiger()
+        configer.db_uri = f"sqlite:///{os.path.join(self.db_dir.name, 'memory.db')}"
+        storage = SqlAlchemyMemoryStorage(sqldb_wrapper_name='test_memory_db',
+                                          memory_converter=DefaultMemoryConverter('memory'))
+        storage._sqldb_wrapper = SQLDBWrapper(name='test_memory_db', db_wrapper_configer=configer)
+        storage._create_table_if_not_exists()
+        # the messages added in the same second are kept in the insertion order
+        storage.add([Message(type='human', content=f'content {i}') for i in range(30)],
+                    session_id='session_1', agent_id='demo_agent')
+        messages = storage.get(session_id='session_1', agent_id='demo_agent', top_k=5)
+        self.assertEqual([f'content {i}' for i in range(25, 30)], [message.content for message in messages])
+        engine = storage._sqldb_wrapper.sql_database._engine
+        with engine.connect() as conn:
+            indexes = [row[1] for row in conn.execute(text("PRAGMA index_list('memory')"))]
+        self.assertIn('idx_memory_session_id_agent_id_gmt_created', indexes)
+
+    def test_load_benchmark(self):
+        """The latest messages of a session are read along the index, so the load time does
+        not grow with the table. The timing is checked with `AU_MEMORY_BENCHMARK_ROWS` set,
+        run with `-s` to see it."""
+        storage = SqliteMemoryStorage(
+            sqldb_path=f"sqlite:///{os.path.join(self.db_dir.name, 'benchmark.db')}",
+            memory_converter=ConversationMemoryConverter('benchmark_memory'))
+        storage._new_client()
+        raw_connection = storage.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            cursor.execute('PRAGMA synchronous=OFF')
+            # half of the rows belong to one long session, the others to 1000 short ones
+            cursor.executemany(
+                "INSERT INTO benchmark_memory (session_id, content, type, target, timestamp, message_id, "
+                "additional_args) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (('long_session' if i % 2 == 0 else f'session_{i % 1000}', f'content {i}', 'input', 'demo_agent',
+                  (BASE_TIME + datetime.timedelta(seconds=i)).isoformat(sep=' '), f'message_{i}', '{}')
+                 for i in range(BENCHMARK_ROWS)))
+            raw_connection.commit()
+        finally:
+            raw_connection.close()
+
+        start = time.perf_counter()
+        messages = storage.get(session_id='long_session', top_k=20)
+        cost = time.perf_counter() - start
+        self.assertEqual([f'content {BENCHMARK_ROWS - 40 + i * 2 - BENCHMARK_ROWS % 2}' for i in range(20)],
+                         [message.content for message in messages])
+        if BENCHMARK:
+            print(f"\nload the latest 20 of {BENCHMARK_ROWS // 2} messages in a {BENCHMARK_ROWS} row table: "
+                  f"{cost * 1000:.2f}ms")
+            self.assertLess(cost, 0.2)
+
+        with storage.engine.connect() as conn:
+            plan = ' '.join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM benchmark_memory WHERE session_id = 'long_session' "
+                "ORDER BY timestamp DESC, id DESC LIMIT 20")))
+        # no full read and sort of the session
+        self.assertIn('USING INDEX', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        storage.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
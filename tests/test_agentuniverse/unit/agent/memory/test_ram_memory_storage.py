@@ -0,0 +1,78 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:10
+# @FileName: test_ram_memory_storage.py
+import os
+import tempfile
+import time
+import unittest
+
+from agentuniverse.agent.memory.memory_storage.ram_memory_storage import RamMemoryStorage
+from agentuniverse.agent.memory.message import Message
+
+
+def build_messages(count: int, prefix: str = 'message') -> list:
+    return [Message(type='human', content=f'{prefix} {i}') for i in range(count)]
+
+
+class RamMemoryStorageTest(unittest.TestCase):
+    """Test cases for the bounded ram memory storage."""
+
+    def test_session_message_cap(self):
+        storage = RamMemoryStorage(max_session_messages=5)
+        storage.add(build_messages(8), session_id='session_1', agent_id='agent_1')
+        storage.add(build_messages(2, 'more'), session_id='session_1', agent_id='agent_1')
+        self.assertEqual(['message 5', 'message 6', 'message 7', 'more 0', 'more 1'],
+                         [message.content for message in storage.get('session_1', 'agent_1', top_k=10)])
+        stats = storage.get_stats()
+        self.assertEqual((5, 5), (stats['resident_messages'], stats['evicted_messages']))
+
+    def test_lru_session_eviction(self):
+        storage = RamMemoryStorage(max_sessions=2)
+        storage.add(build_messages(1), session_id='session_1', agent_id='agent_1')
+        storage.add(build_messages(1), session_id='session_2', agent_id='agent_1')
+        # reading session_1 makes session_2 the least recently used
+        storage.get('session_1', 'agent_1')
+        storage.add(build_messages(1), session_id='session_3', agent_id='agent_1')
+        self.assertEqual([], storage.get('session_2', 'agent_1'))
+        self.assertEqual(1, len(storage.get('session_1', 'agent_1')))
+        self.assertEqual(1, storage.get_stats()['evicted_sessions'])
+
+    def test_byte_budget(self):
+        storage = RamMemoryStorage(max_bytes=100)
+        for i in range(10):
+            storage.add([Message(type='human', content='x' * 30)], session_id=f'session_{i}', agent_id='agent_1')
+        stats = storage.get_stats()
+        self.assertLessEqual(stats['resident_bytes'], 100)
+        self.assertEqual(3, stats['resident_sessions'])
+        storage.delete('session_9')
+        self.assertEqual(60, storage.get_stats()['resident_bytes'])
+
+    def test_session_ttl(self):
+        storage = RamMemoryStorage(session_ttl=0.05)
+        storage.add(build_messages(3), session_id='session_1', agent_id='agent_1')
+        time.sleep(0.1)
+        storage.add(build_messages(1), session_id='session_2', agent_id='agent_1')
+        self.assertEqual([], storage.get('session_1', 'agent_1'))
+        self.assertEqual(1, storage.get_stats()['expired_sessions'])
+
+    def test_spill_and_restore(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            storage = RamMemoryStorage(max_sessions=1, spill_path=os.path.join(spill_dir, 'spill.db'))
+            storage.add(build_messages(3), session_id='session_1', agent_id='agent_1')
+            storage.add(build_messages(2), session_id='session_2', agent_id='agent_1')
+            self.assertEqual(['session_2'], list(storage.messages.keys()))
+            # the spilled session is loaded back and the other one spilled in turn
+            self.assertEqual(['message 0', 'message 1', 'message 2'],
+                             [message.content for message in storage.get('session_1', 'agent_1')])
+            self.assertEqual(['session_1'], list(storage.messages.keys()))
+            self.assertEqual(2, len(storage.get('session_2', 'agent_1')))
+            stats = storage.get_stats()
+            self.assertEqual((3, 2), (stats['spilled_sessions'], stats['restored_sessions']))
+            storage.delete('session_1')
+            self.assertEqual([], storage.get('session_1', 'agent_1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
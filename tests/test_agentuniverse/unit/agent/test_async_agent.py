@@ -0,0 +1,194 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 17:40
+# @FileName: test_async_agent.py
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, List, Optional
+
+from agentuniverse.agent.action.knowledge.knowledge import Knowledge
+from agentuniverse.agent.action.knowledge.knowledge_manager import KnowledgeManager
+from agentuniverse.agent.action.knowledge.rag_router.base_router import BaseRouter
+from agentuniverse.agent.action.knowledge.rag_router.rag_router_manager import RagRouterManager
+from agentuniverse.agent.action.knowledge.store.document import Document
+from agentuniverse.agent.action.knowledge.store.query import Query
+from agentuniverse.agent.action.knowledge.store.store import Store
+from agentuniverse.agent.action.knowledge.store.store_manager import StoreManager
+from agentuniverse.agent.action.tool.tool import Tool, ToolInput
+from agentuniverse.agent.action.tool.tool_manager import ToolManager
+from agentuniverse.agent.agent import Agent
+from agentuniverse.agent.agent_model import AgentModel
+from agentuniverse.agent.input_object import InputObject
+from agentuniverse.agent.plan.planner.rag_planner.rag_planner import RagPlanner
+from agentuniverse.base.util.blocking_executor import run_blocking
+from agentuniverse.llm.llm_manager import LLMManager
+from agentuniverse.llm.llm_output import LLMOutput
+from agentuniverse.llm.openai_llm import OpenAILLM
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+class SleepTool(Tool):
+    """A tool waiting on io natively."""
+
+    def execute(self, tool_input: ToolInput):
+        time.sleep(0.2)
+        return f"sync {tool_input.get_data('input')}"
+
+    async def async_execute(self, tool_input: ToolInput):
+        await asyncio.sleep(0.2)
+        return f"async {tool_input.get_data('input')}"
+
+
+class SyncTool(Tool):
+    """A tool only implementing the sync execute."""
+
+    def execute(self, tool_input: ToolInput):
+        return f"sync {tool_input.get_data('input')}"
+
+
+class AsyncStore(Store):
+    """A store with a native async query."""
+
+    def query(self, query: Query, **kwargs) -> List[Document]:
+        raise AssertionError('the native async query must be used')
+
+    async def async_query(self, query: Query, **kwargs) -> List[Document]:
+        await asyncio.sleep(0.2)
+        return [Document(id='shared', text='shared'), Document(id='async', text=f'async {query.query_str}')]
+
+
+class SyncStore(Store):
+    """A store only implementing the sync query."""
+
+    def query(self, query: Query, **kwargs) -> List[Document]:
+        return [Document(id='shared', text='shared'), Document(id='sync', text=f'sync {query.query_str}')]
+
+
+class FailingStore(Store):
+
+    async def async_query(self, query: Query, **kwargs) -> List[Document]:
+        raise ValueError('store unavailable')
+
+
+class SleepLLM(OpenAILLM):
+    """A llm waiting on io natively, the sync call must not be used."""
+
+    def _call(self, *args: Any, **kwargs: Any) -> Optional[LLMOutput]:
+        raise AssertionError('the native async call must be used')
+
+    async def _acall(self, *args: Any, **kwargs: Any) -> Optional[LLMOutput]:
+        await asyncio.sleep(0.2)
+        question = kwargs['messages'][-1]['content']
+        return LLMOutput(text=question, raw={
+            'choices': [{'message': {'role': 'assistant', 'content': f'answer to {question}'},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}})
+
+    def max_context_length(self) -> int:
+        return 8000
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class AsyncTestAgent(Agent):
+
+    def input_keys(self) -> list[str]:
+        return ['input']
+
+    def output_keys(self) -> list[str]:
+        return ['output']
+
+    def parse_input(self, input_object: InputObject, agent_input: dict) -> dict:
+        agent_input['input'] = input_object.get_data('input')
+        return agent_input
+
+    def parse_result(self, agent_result: dict) -> dict:
+        return agent_result
+
+    async def async_execute(self, input_object: InputObject, agent_input: dict) -> dict:
+        tool_res = await self.async_invoke_tools(input_object)
+        knowledge_res = await self.async_invoke_knowledge(agent_input.get('input'), input_object)
+        return {'output': f'{tool_res}|{knowledge_res}'}
+
+
+class AsyncAgentTest(unittest.TestCase):
+    """Test cases for the native async agent execution path."""
+
+    def setUp(self) -> None:
+        ensure_app_configer()
+        self._register(RagRouterManager(), BaseRouter(name='base_router'))
+        for tool in (SleepTool(name='test_async_sleep_tool', description='sleep tool', input_keys=['input']),
+                     SyncTool(name='test_async_sync_tool', description='sync tool', input_keys=['input'])):
+            self._register(ToolManager(), tool)
+        for store in (AsyncStore(name='test_async_store'), SyncStore(name='test_sync_store'),
+                      FailingStore(name='test_failing_store')):
+            self._register(StoreManager(), store)
+        self._register(KnowledgeManager(), Knowledge(
+            name='test_async_knowledge', stores=['test_async_store', 'test_sync_store', 'test_failing_store']))
+        self._register(LLMManager(), SleepLLM(name='test_async_sleep_llm'))
+        self.agent = AsyncTestAgent()
+        self.agent.agent_model = AgentModel(info={'name': 'test_async_agent'}, profile={}, plan={}, memory={},
+                                            action={'tool': ['test_async_sleep_tool'],
+                                                    'knowledge': ['test_async_knowledge']})
+
+    @staticmethod
+    def _register(manager, component):
+        manager.register(component.get_instance_code(), component)
+
+    def test_tool_async_run(self):
+        sleep_tool = ToolManager().get_instance_obj('test_async_sleep_tool')
+        sync_tool = ToolManager().get_instance_obj('test_async_sync_tool')
+        self.assertEqual('async hi', asyncio.run(sleep_tool.async_run(input='hi')))
+        self.assertEqual('sync hi', asyncio.run(sync_tool.async_run(input='hi')))
+        # the sync fallbacks run on the sized blocking executor, not the default executor of the loop
+        self.assertTrue(asyncio.run(run_blocking(lambda: threading.current_thread().name)).startswith('au_blocking'))
+        self.assertEqual('async hi', asyncio.run(sleep_tool.as_langchain().ainvoke('hi')))
+
+    def test_async_query_knowledge(self):
+        knowledge = KnowledgeManager().get_instance_obj('test_async_knowledge')
+        docs = asyncio.run(knowledge.async_query_knowledge(query_str='apple'))
+        self.assertEqual(['shared', 'async', 'sync'], [doc.id for doc in docs])
+        self.assertEqual('sync apple', docs[2].text)
+
+    def test_concurrent_agents_on_one_loop(self):
+        async def run_all():
+            return await asyncio.gather(*[self.agent.async_run(input=f'q{i}') for i in range(200)])
+
+        thread_count = threading.active_count()
+        start = time.perf_counter()
+        outputs = asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+        self.assertEqual(200, len(outputs))
+        self.assertEqual('async q7|shared\n=========================================\nasync q7'
+                         '\n=========================================\nsync q7',
+                         outputs[7].get_data('output'))
+        # 200 requests each waiting 0.4s on io share one loop instead of one thread per request
+        self.assertLess(elapsed, 5)
+        self.assertLessEqual(threading.active_count() - thread_count, 64)
+
+    def test_planner_async_invoke(self):
+        agent_model = AgentModel(info={'name': 'test_async_rag_agent'}, memory={}, plan={},
+                                 profile={'introduction': 'an assistant', 'target': 'answer',
+                                          'instruction': '{background} {input}',
+                                          'llm_model': {'name': 'test_async_sleep_llm'}},
+                                 action={'tool': ['test_async_sleep_tool']})
+
+        async def run_all():
+            return await asyncio.gather(*[RagPlanner().async_invoke(
+                agent_model, {'input': f'q{i}', 'background': ''}, InputObject({'input': f'q{i}'}))
+                for i in range(20)])
+
+        thread_count = threading.active_count()
+        results = asyncio.run(run_all())
+        # the tool result is in the background of the prompt, the llm is called by acall
+        self.assertEqual('async q7', results[7]['background'])
+        self.assertEqual('answer to async q7 q7', results[7]['output'])
+        self.assertLessEqual(threading.active_count() - thread_count, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 19:50
+# @FileName: test_request_executor.py
+import threading
+import time
+import unittest
+
+from agentuniverse.agent_serve.web.request_executor import RequestExecutor, RequestWatchdog, \
+    ServiceOverloadedError
+from agentuniverse.agent_serve.web.request_task import RequestTask
+from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+
+
+def stepping_service(output_stream, **kwargs):
+    for i in range(3):
+        output_stream.put_nowait(f'step{i}')
+    output_stream.put_nowait('{"type": "EOF"}')
+    return 'done'
+
+
+class RequestExecutorTest(unittest.TestCase):
+    """Test cases for the shared request executor and watchdog."""
+
+    def setUp(self) -> None:
+        self.executor = RequestExecutor()
+        self.max_workers, self.queue_size = self.executor.max_workers, self.executor.queue_size
+        self.executor.shutdown()
+
+    def tearDown(self) -> None:
+        self.executor.max_workers, self.executor.queue_size = self.max_workers, self.queue_size
+        self.executor.shutdown()
+
+    def test_admission_control(self):
+        self.executor.max_workers, self.executor.queue_size = 2, 1
+        release = threading.Event()
+        futures = [self.executor.submit(release.wait, 5) for _ in range(3)]
+        time.sleep(0.1)
+        self.assertRaises(ServiceOverloadedError, self.executor.submit, release.wait, 5)
+        stats = self.executor.get_stats()
+        self.assertEqual((2, 1, 1), (stats['running'], stats['queued'], stats['rejected']))
+        release.set()
+        self.assertEqual([True, True, True], [future.result(timeout=1) for future in futures])
+        stats = self.executor.get_stats()
+        self.assertEqual((3, 0), (stats['completed'], stats['queued']))
+        # the queued request waited for a free worker
+        self.assertGreater(stats['max_queue_wait'], 0.05)
+        self.assertTrue(self.executor.submit(release.wait, 5).result(timeout=1))
+
+    def test_context_propagation(self):
+        token = FrameworkContextManager().set_context('test_executor_var', 'request_1')
+        try:
+            future = self.executor.submit(FrameworkContextManager().get_context, 'test_executor_var')
+            self.assertEqual('request_1', future.result(timeout=1))
+        finally:
+            FrameworkContextManager().reset_context('test_executor_var', token)
+
+    def test_async_run(self):
+        task = RequestTask(stepping_service, saved=False)
+        task.async_run()
+        task.future.result(timeout=1)
+        self.assertEqual('finished', task.request_state())
+        self.assertEqual(['step0', 'step1', 'step2'], task.__request_do__.steps)
+
+    def test_watchdog_fails_stopped_task(self):
+        task = RequestTask(stepping_service, saved=False)
+        task.async_run()
+        task.future.result(timeout=1)
+        self.assertTrue(task.check_state())
+        stopped = RequestTask(stepping_service, saved=False)
+        stopped.async_run()
+        stopped.future.result(timeout=1)
+        stopped.finished()
+        # a service stopped without an end state is failed after one more check
+        stopped.__request_do__.state = 'running'
+        self.assertFalse(stopped.check_state())
+        self.assertTrue(stopped.check_state())
+        self.assertEqual('fail', stopped.request_state())
+
+        RequestWatchdog().watch(task)
+        RequestWatchdog().check()
+        self.assertEqual(0, RequestWatchdog().watched_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 20:30
+# @FileName: test_request_library.py
+import datetime
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import event, inspect
+
+from agentuniverse.agent_serve.web.dal.entity.request_do import RequestDO
+from agentuniverse.agent_serve.web.dal.request_library import RequestLibrary
+from agentuniverse.base.config.configer import Configer
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+
+def build_request_do(request_id: str) -> RequestDO:
+    return RequestDO(request_id=request_id, session_id='', query='hello', state='init', result=dict(), steps=[],
+                     additional_args=dict(), gmt_create=datetime.datetime.now(),
+                     gmt_modified=datetime.datetime.now())
+
+
+class RequestLibraryTest(unittest.TestCase):
+    """Test cases for the write-behind persistence of the request tasks."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+        cls.db_dir = tempfile.TemporaryDirectory()
+        configer = Configer().load_by_raw_value({'DB': {
+            'system_db_uri': f"sqlite:///{os.path.join(cls.db_dir.name, 'request.db')}",
+            # only the explicit flushes write in the test
+            'write_behind_interval': 3600
+        }})
+        cls.library = RequestLibrary(configer=configer)
+        cls.engine = cls.library.sqldb_wrapper.sql_database._engine
+
+    def _count_statements(self, func):
+        statements = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.engine, 'before_cursor_execute', before_execute)
+        try:
+            func()
+        finally:
+            event.remove(self.engine, 'before_cursor_execute', before_execute)
+        return statements
+
+    def test_coalesced_bulk_flush(self):
+        request_dos = [build_request_do(f'write_behind_{i}') for i in range(50)]
+
+        def stream_steps():
+            for request_do in request_dos:
+                self.library.add_request(request_do)
+            for step in range(10):
+                for request_do in request_dos:
+                    request_do.state = 'running'
+                    request_do.steps.append(f'step{step}')
+                    self.library.update_request(request_do)
+                    self.library.update_gmt_modified(request_do.request_id)
+
+        self.assertEqual([], self._count_statements(stream_steps))
+        self.library.flush()
+        for request_do in request_dos[:25]:
+            request_do.state = 'finished'
+            request_do.result['result'] = 'done'
+            self.library.update_request(request_do)
+        for request_do in request_dos[25:]:
+            self.library.update_gmt_modified(request_do.request_id)
+        statements = self._count_statements(self.library.flush)
+        # one bulk update of the finished requests and one of the active ones
+        self.assertEqual(2, len([statement for statement in statements if statement.startswith('UPDATE')]))
+
+        stored = self.library.query_request_by_request_id('write_behind_3')
+        self.assertEqual('finished', stored.state)
+        self.assertEqual([f'step{i}' for i in range(10)], stored.steps)
+        self.assertEqual({'result': 'done'}, stored.result)
+        self.assertEqual('running', self.library.query_request_by_request_id('write_behind_30').state)
+
+    def test_read_your_writes(self):
+        request_do = build_request_do('write_behind_read')
+        self.library.add_request(request_do)
+        request_do.state = 'running'
+        self.library.update_request(request_do)
+        self.assertEqual('running', self.library.query_request_by_request_id('write_behind_read').state)
+        self.assertIsNone(self.library.query_request_by_request_id('write_behind_missing'))
+
+    def test_request_id_index(self):
+        self.library.flush()
+        indexes = inspect(self.engine).get_indexes(self.library.request_table_name)
+        self.assertIn(['request_id'], [index['column_names'] for index in indexes])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 18:50
+# @FileName: test_request_task_stream.py
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from agentuniverse.agent_serve.web.request_task import RequestTask, HEARTBEAT_FRAME
+from agentuniverse.agent_serve.web.stream_queue import StreamQueue, AsyncStreamQueue
+from agentuniverse.agent_serve.web.web_util import FlaskServerManager
+from agentuniverse.base.util.common_util import stream_output
+
+TOKEN_COUNT = 20
+TOKEN_INTERVAL = 0.01
+
+
+def sync_service(output_stream, delay: float = 0, **kwargs):
+    time.sleep(delay)
+    for i in range(TOKEN_COUNT):
+        stream_output(output_stream, f'token{i}')
+        time.sleep(TOKEN_INTERVAL)
+    return 'done'
+
+
+async def async_service(output_stream, delay: float = 0, **kwargs):
+    await asyncio.sleep(delay)
+    for i in range(TOKEN_COUNT):
+        stream_output(output_stream, f'token{i}')
+        await asyncio.sleep(TOKEN_INTERVAL)
+    return 'done'
+
+
+async def threaded_service(output_stream, **kwargs):
+    # a sync producer run in a worker thread, e.g. a sync llm streaming through asyncio.to_thread
+    return await asyncio.to_thread(sync_service, output_stream)
+
+
+async def silent_service(output_stream, **kwargs):
+    await asyncio.sleep(0.3)
+    return 'done'
+
+
+def measure(frames):
+    """Return the time to first byte, the max inter-token gap and the frames of a SSE stream."""
+    start = time.perf_counter()
+    arrivals, collected = [], []
+    for frame in frames:
+        arrivals.append(time.perf_counter())
+        collected.append(frame)
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    return arrivals[0] - start, max(gaps), collected
+
+
+async def async_measure(frames):
+    start = time.perf_counter()
+    arrivals, collected = [], []
+    async for frame in frames:
+        arrivals.append(time.perf_counter())
+        collected.append(frame)
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    return arrivals[0] - start, max(gaps), collected
+
+
+class RequestTaskStreamTest(unittest.TestCase):
+    """Test cases and latency benchmark of the SSE streams of the request task,
+    run with `-s` to see the latencies."""
+
+    def setUp(self) -> None:
+        self.heartbeat_interval = FlaskServerManager().sse_heartbeat_interval
+        self.idle_timeout = FlaskServerManager().sse_idle_timeout
+
+    def tearDown(self) -> None:
+        FlaskServerManager().sse_heartbeat_interval = self.heartbeat_interval
+        FlaskServerManager().sse_idle_timeout = self.idle_timeout
+
+    def _check_frames(self, frames):
+        process = [json.loads(frame[len('data:'):])['process'] for frame in frames[:-1]]
+        self.assertEqual([f'token{i}' for i in range(TOKEN_COUNT)], process)
+        self.assertEqual({'result': 'done'}, json.loads(frames[-1][len('data:'):]))
+
+    def test_sync_stream_latency(self):
+        task = RequestTask(sync_service, saved=False)
+        ttfb, max_gap, frames = measure(task.stream_run())
+        print(f"sync sse, time to first byte: {ttfb * 1000:.1f}ms, max inter-token gap: {max_gap * 1000:.1f}ms")
+        self._check_frames(frames)
+        self.assertLess(ttfb, 0.2)
+        self.assertEqual('finished', task.request_state())
+
+    def test_async_stream_latency(self):
+        task = RequestTask(async_service, saved=False)
+        ttfb, max_gap, frames = asyncio.run(async_measure(task.async_stream_run()))
+        print(f"async sse, time to first byte: {ttfb * 1000:.1f}ms, max inter-token gap: {max_gap * 1000:.1f}ms")
+        self._check_frames(frames)
+        # the polling stream waited for 0.5s plus a 1s sleep whenever the queue was empty
+        self.assertLess(ttfb, 0.2)
+        self.assertLess(max_gap, 0.2)
+        self.assertEqual('finished', task.request_state())
+
+    def test_async_stream_thread_producer(self):
+        task = RequestTask(threaded_service, saved=False)
+        ttfb, max_gap, frames = asyncio.run(async_measure(task.async_stream_run()))
+        self._check_frames(frames)
+        self.assertLess(max_gap, 0.2)
+
+    def test_heartbeat(self):
+        FlaskServerManager().sse_heartbeat_interval = 0.05
+        task = RequestTask(sync_service, saved=False, delay=0.3)
+        frames = list(task.stream_run())
+        self.assertEqual(HEARTBEAT_FRAME, frames[0])
+        self._check_frames([frame for frame in frames if frame != HEARTBEAT_FRAME])
+        async_task = RequestTask(silent_service, saved=False)
+        frames = asyncio.run(async_measure(async_task.async_stream_run()))[2]
+        self.assertEqual(HEARTBEAT_FRAME, frames[0])
+        self.assertEqual({'result': 'done'}, json.loads(frames[-1][len('data:'):]))
+
+    def test_idle_timeout(self):
+        FlaskServerManager().sse_heartbeat_interval = 0.05
+        FlaskServerManager().sse_idle_timeout = 0.1
+        task = RequestTask(sync_service, saved=False, delay=0.5)
+        frames = list(task.stream_run())
+        self.assertIn('error', json.loads(frames[-1][len('data:'):]))
+        async_task = RequestTask(async_service, saved=False, delay=0.5)
+        frames = asyncio.run(async_measure(async_task.async_stream_run()))[2]
+        self.assertIn('error', json.loads(frames[-1][len('data:'):]))
+        self.assertTrue(async_task.async_task.cancelled())
+
+    def test_backpressure(self):
+        stream_queue = StreamQueue(maxsize=2, put_timeout=5)
+        stream_queue.put('a')
+        stream_queue.put('b')
+        producer = threading.Thread(target=stream_queue.put, args=('c',))
+        producer.start()
+        time.sleep(0.05)
+        # the producer waits for the slow consumer instead of failing
+        self.assertTrue(producer.is_alive())
+        self.assertEqual('a', stream_queue.get())
+        producer.join(timeout=1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(['b', 'c'], [stream_queue.get_nowait(), stream_queue.get_nowait()])
+        # put_nowait never blocks, a full queue fails the stream after the queued data
+        stream_queue.put_nowait('d')
+        stream_queue.put_nowait('e')
+        stream_queue.put_nowait('f')
+        stream_queue.put_nowait('g')
+        self.assertIsNotNone(stream_queue.error)
+        self.assertEqual(['d', 'e', None], [stream_queue.get_nowait() for _ in range(3)])
+        self.assertTrue(stream_queue.empty())
+        # the producer never blocks once the consumer is gone
+        stream_queue.close()
+        for i in range(10):
+            stream_queue.put(i)
+        self.assertTrue(stream_queue.empty())
+
+    def test_full_queue_error(self):
+        task = RequestTask(sync_service, saved=False)
+        task.queue = StreamQueue(maxsize=2, put_timeout=0.05)
+        frames = []
+        for frame in task.stream_run():
+            frames.append(frame)
+            # a client slower than the service
+            time.sleep(0.1)
+        process = [json.loads(frame[len('data:'):])['process'] for frame in frames[:-1]]
+        # the stream ends with an error instead of missing chunks
+        self.assertLess(len(process), TOKEN_COUNT)
+        self.assertEqual([f'token{i}' for i in range(len(process))], process)
+        self.assertIn('error', json.loads(frames[-1][len('data:'):]))
+
+        async def put_from_thread():
+            stream_queue = AsyncStreamQueue(maxsize=2, put_timeout=0.05)
+            await asyncio.to_thread(lambda: [stream_queue.put_wait(i) for i in range(4)])
+            return stream_queue, [await stream_queue.get() for _ in range(3)]
+
+        stream_queue, items = asyncio.run(put_from_thread())
+        self.assertIsNotNone(stream_queue.error)
+        self.assertEqual([0, 1, None], items)
+        self.assertTrue(stream_queue.empty())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,5 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:50
+# @FileName: __init__.py
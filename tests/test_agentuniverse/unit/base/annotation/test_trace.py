@@ -0,0 +1,108 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:50
+# @FileName: test_trace.py
+import contextvars
+import os
+import time
+import unittest
+import uuid
+from unittest import mock
+
+from agentuniverse.base.annotation import trace
+from agentuniverse.base.annotation.trace import trace_tool
+from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
+from tests.test_agentuniverse.mock.mock_app_configer import ensure_app_configer
+
+# the overhead is only checked on opt-in, run with `AU_TRACE_BENCHMARK=1 pytest -s` to see it
+BENCHMARK = 'AU_TRACE_BENCHMARK' in os.environ
+
+
+class EchoTool(object):
+    name = 'echo_tool'
+
+    def execute(self, input: str, suffix: str = '') -> str:
+        return input + suffix
+
+    traced_execute = trace_tool(execute)
+
+
+class TraceTest(unittest.TestCase):
+    """Test cases for the tracing modes of the trace decorators."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        ensure_app_configer()
+
+    def setUp(self) -> None:
+        self.monitor = Monitor()
+        self.saved = (self.monitor.trace_mode, self.monitor.trace_sample_rate, self.monitor.log_activate,
+                      self.monitor.activate)
+        # the benchmark measures the decorator, not the log sinks
+        self.monitor.log_activate = False
+        self.monitor.activate = False
+        self.monitor.reset_metrics()
+        self.tool = EchoTool()
+
+    def tearDown(self) -> None:
+        (self.monitor.trace_mode, self.monitor.trace_sample_rate, self.monitor.log_activate,
+         self.monitor.activate) = self.saved
+
+    def test_metrics_mode(self):
+        self.monitor.trace_mode = 'metrics'
+        with mock.patch.object(trace, '_get_input', wraps=trace._get_input) as get_input:
+            self.assertEqual('ab', contextvars.copy_context().run(self.tool.traced_execute, 'a', suffix='b'))
+        get_input.assert_not_called()
+        metrics = self.monitor.get_metrics()['tool.echo_tool']
+        self.assertEqual(1, metrics['count'])
+        self.assertGreaterEqual(metrics['max_time'], 0)
+
+        self.monitor.trace_mode = 'full'
+        with mock.patch.object(trace, '_get_input', wraps=trace._get_input) as get_input:
+            contextvars.copy_context().run(self.tool.traced_execute, 'a')
+        get_input.assert_called_once()
+        self.assertEqual(2, self.monitor.get_metrics()['tool.echo_tool']['count'])
+
+    def test_sampling_by_trace(self):
+        self.monitor.trace_sample_rate = 0.25
+
+        def sampled() -> bool:
+            AuTraceManager().reset_trace()
+            AuTraceManager().set_trace_id(uuid.uuid4().hex)
+            details = self.monitor.trace_details()
+            # all the invocations of a request are sampled alike
+            self.assertEqual(details, self.monitor.trace_details())
+            return details
+
+        ratio = sum(contextvars.copy_context().run(sampled) for _ in range(4000)) / 4000
+        self.assertAlmostEqual(0.25, ratio, delta=0.05)
+
+    def test_decorator_overhead(self):
+        calls = 2000
+
+        def per_call(func) -> float:
+            def run():
+                AuTraceManager().reset_trace()
+                start = time.perf_counter()
+                for _ in range(calls):
+                    func('a', suffix='b')
+                return (time.perf_counter() - start) / calls
+
+            return contextvars.copy_context().run(run)
+
+        baseline = per_call(self.tool.execute)
+        self.monitor.trace_mode = 'full'
+        full = per_call(self.tool.traced_execute) - baseline
+        self.monitor.trace_mode = 'metrics'
+        metrics = per_call(self.tool.traced_execute) - baseline
+        self.assertEqual(2 * calls, self.monitor.get_metrics()['tool.echo_tool']['count'])
+        if BENCHMARK:
+            print(f"\ntrace_tool overhead per call: full {full * 1e6:.1f}us, metrics {metrics * 1e6:.1f}us")
+            self.assertLess(metrics, 0.001)
+            self.assertLess(full, 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 10:40
+# @FileName: test_component_scanner.py
+import os
+import sys
+import tempfile
+import unittest
+
+from agentuniverse.base.component.component_enum import ComponentEnum
+from agentuniverse.base.config.component_scanner import ComponentScanner
+from agentuniverse.base.config.config_type_enum import ConfigTypeEnum
+
+AGENT_YAML = """
+info:
+  name: 'demo_agent'
+metadata:
+  type: 'AGENT'
+  module: 'demo.agent'
+  class: 'DemoAgent'
+"""
+
+TOOL_YAML = """
+name: 'demo_tool'
+metadata:
+  type: 'TOOL'
+  module: 'demo.tool'
+  class: 'DemoTool'
+"""
+
+
+class ComponentScannerTest(unittest.TestCase):
+    """
+    Test cases for ComponentScanner class
+    """
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        package_dir = os.path.join(self.tmp_dir.name, 'scanner_demo_pkg')
+        os.makedirs(os.path.join(package_dir, 'agent'))
+        open(os.path.join(package_dir, '__init__.py'), 'w').close()
+        open(os.path.join(package_dir, 'agent', '__init__.py'), 'w').close()
+        with open(os.path.join(package_dir, 'agent', 'demo_agent.yaml'), 'w') as f:
+            f.write(AGENT_YAML)
+        with open(os.path.join(package_dir, 'demo_tool.yaml'), 'w') as f:
+            f.write(TOOL_YAML)
+        sys.path.insert(0, self.tmp_dir.name)
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache', 'scan_cache.pkl')
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.tmp_dir.name)
+        self.tmp_dir.cleanup()
+
+    def test_scan_parses_each_file_once(self) -> None:
+        scanner = ComponentScanner(ConfigTypeEnum.YAML)
+        agents = scanner.scan(['scanner_demo_pkg'], ComponentEnum.AGENT)
+        tools = scanner.scan(['scanner_demo_pkg'], ComponentEnum.TOOL)
+        sub_agents = scanner.scan(['scanner_demo_pkg.agent'], ComponentEnum.AGENT)
+        self.assertEqual([c.configer.value['info']['name'] for c in agents], ['demo_agent'])
+        self.assertEqual([c.configer.value['name'] for c in tools], ['demo_tool'])
+        self.assertEqual(len(sub_agents), 1)
+        self.assertEqual(scanner.get_scan_stats()['parsed_count'], 2)
+
+    def test_scan_cache(self) -> None:
+        scanner = ComponentScanner(ConfigTypeEnum.YAML, self.cache_path)
+        scanner.scan(['scanner_demo_pkg'], ComponentEnum.AGENT)
+        scanner.save_cache()
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        warm_scanner = ComponentScanner(ConfigTypeEnum.YAML, self.cache_path)
+        agents = warm_scanner.scan(['scanner_demo_pkg'], ComponentEnum.AGENT)
+        self.assertEqual(agents[0].configer.value['info']['name'], 'demo_agent')
+        self.assertEqual(warm_scanner.get_scan_stats()['parsed_count'], 0)
+        self.assertEqual(warm_scanner.get_scan_stats()['cache_hit_count'], 2)
+
+        # a modified file invalidates its cache entry
+        tool_path = os.path.join(self.tmp_dir.name, 'scanner_demo_pkg', 'demo_tool.yaml')
+        with open(tool_path, 'w') as f:
+            f.write(TOOL_YAML.replace('demo_tool', 'demo_tool_v2'))
+        changed_scanner = ComponentScanner(ConfigTypeEnum.YAML, self.cache_path)
+        tools = changed_scanner.scan(['scanner_demo_pkg'], ComponentEnum.TOOL)
+        self.assertEqual(tools[0].configer.value['name'], 'demo_tool_v2')
+        self.assertEqual(changed_scanner.get_scan_stats()['parsed_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/19 00:20
+# @FileName: test_context_snapshot.py
+import contextvars
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from agentuniverse.agent_serve.web.thread_with_result import ThreadWithReturnValue
+from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+from agentuniverse.base.util.monitor.monitor import Monitor
+from agentuniverse.base.util.tracing.au_trace_manager import AuTraceManager
+
+
+class ContextSnapshotTest(unittest.TestCase):
+    """Test cases for the copy-on-write context snapshot."""
+
+    def setUp(self) -> None:
+        # every test runs in a context of its own
+        self.context = contextvars.copy_context()
+
+    def test_snapshot_isolation(self):
+        def run():
+            manager = FrameworkContextManager()
+            manager.set_context('snapshot_chain', [{'source': 'parent'}])
+            manager.set_context('snapshot_name', 'parent')
+            snapshot = manager.snapshot()
+
+            def worker():
+                chain = manager.get_context('snapshot_chain')
+                chain.append({'source': 'worker'})
+                manager.set_context('snapshot_name', 'worker')
+                return list(manager.get_context('snapshot_chain')), manager.get_context('snapshot_name')
+
+            with ThreadPoolExecutor(4) as executor:
+                results = list(executor.map(lambda _: snapshot.run(worker), range(4)))
+            for chain, name in results:
+                self.assertEqual([{'source': 'parent'}, {'source': 'worker'}], chain)
+                self.assertEqual('worker', name)
+            self.assertEqual([{'source': 'parent'}], manager.get_context('snapshot_chain'))
+            self.assertEqual('parent', manager.get_context('snapshot_name'))
+
+        self.context.run(run)
+
+    def test_token_usage_merge_back(self):
+        def run():
+            AuTraceManager().reset_trace()
+            Monitor.init_token_usage()
+            Monitor.add_token_usage({'prompt_tokens': 5, 'total_tokens': 5})
+            snapshot = FrameworkContextManager().snapshot()
+
+            def worker():
+                Monitor.add_token_usage({'prompt_tokens': 1, 'completion_tokens': 2, 'total_tokens': 3})
+                # nested workers merge into the worker, then into the request
+                FrameworkContextManager().snapshot().run(Monitor.add_token_usage, {'total_tokens': 10})
+
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(lambda _: snapshot.run(worker), range(8)))
+            thread = ThreadWithReturnValue(target=Monitor.add_token_usage, args=({'total_tokens': 100},))
+            thread.start()
+            thread.result()
+            self.assertEqual({'prompt_tokens': 13, 'completion_tokens': 16, 'total_tokens': 209},
+                             Monitor.get_token_usage())
+
+        self.context.run(run)
+
+    def test_capture_cost_is_constant(self):
+        def capture_time(size: int) -> float:
+            def run():
+                manager = FrameworkContextManager()
+                manager.set_context('snapshot_large', [{'index': i, 'payload': 'x' * 32} for i in range(size)])
+                start = time.perf_counter()
+                for _ in range(1000):
+                    manager.snapshot()
+                return time.perf_counter() - start
+
+            return contextvars.copy_context().run(run)
+
+        capture_time(10)
+        # a deep copy of a 50000 entries context is orders of magnitude slower
+        self.assertLess(capture_time(50000), capture_time(10) * 20 + 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:50
+# @FileName: test_fan_out_executor.py
+import asyncio
+import threading
+import time
+import unittest
+
+from agentuniverse.base.context.framework_context_manager import FrameworkContextManager
+from agentuniverse.base.util.fan_out_executor import FanOutExecutor, HungActionsError, run_actions, \
+    async_run_actions
+from agentuniverse.base.util.rate_limiter import TokenBucket, TokenBucketRegistry
+
+
+class FanOutExecutorTest(unittest.TestCase):
+    """Test cases for the shared fan-out executor and the token bucket pacing."""
+
+    def test_results_as_completed(self):
+        def work(index):
+            time.sleep(0.3 if index == 0 else 0.05)
+            return index
+
+        start = time.perf_counter()
+        results = list(FanOutExecutor().map_as_completed(work, range(10), concurrency=10))
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(set(range(10)), set(results))
+        # the slow first subtask does not hold back the others
+        self.assertEqual(0, results[-1])
+
+    def test_concurrency_bound(self):
+        lock = threading.Lock()
+        counters = {'running': 0, 'max_running': 0}
+
+        def work(index):
+            with lock:
+                counters['running'] += 1
+                counters['max_running'] = max(counters['max_running'], counters['running'])
+            time.sleep(0.05)
+            with lock:
+                counters['running'] -= 1
+            return index
+
+        self.assertEqual(8, len(list(FanOutExecutor().map_as_completed(work, range(8), concurrency=3))))
+        self.assertEqual(3, counters['max_running'])
+
+    def test_pacing(self):
+        start_times = []
+        bucket = TokenBucket(rate=20, capacity=2)
+        list(FanOutExecutor().map_as_completed(lambda i: start_times.append(time.perf_counter()), range(6),
+                                               concurrency=6, rate_limiter=bucket))
+        # a burst of 2, then one start every 50ms instead of a fixed one second sleep
+        elapsed = max(start_times) - min(start_times)
+        self.assertGreater(elapsed, 0.15)
+        self.assertLess(elapsed, 0.5)
+
+    def test_nested_fan_out(self):
+        executor = FanOutExecutor()
+
+        def outer(index):
+            return sum(executor.map_as_completed(lambda i: i, range(index + 1), concurrency=4))
+
+        results = list(executor.map_as_completed(outer, range(executor.max_workers * 2),
+                                                 concurrency=executor.max_workers * 2))
+        self.assertEqual(executor.max_workers * 2, len(results))
+
+    def test_error(self):
+        def work(index):
+            if index == 2:
+                raise ValueError('subtask failed')
+            return index
+
+        with self.assertRaisesRegex(ValueError, 'subtask failed'):
+            list(FanOutExecutor().map_as_completed(work, range(4), concurrency=2))
+
+    def test_async_acquire_and_registry(self):
+        bucket = TokenBucketRegistry().get_bucket('test.llm', 10)
+        self.assertIs(bucket, TokenBucketRegistry().get_bucket('test.llm', 10))
+        self.assertIsNot(bucket, TokenBucketRegistry().get_bucket('test.llm', 20))
+
+        async def acquire_all():
+            start = time.perf_counter()
+            await asyncio.gather(*[bucket.async_acquire() for _ in range(3)])
+            return time.perf_counter() - start
+
+        bucket = TokenBucketRegistry().get_bucket('test.llm', 10)
+        self.assertGreater(asyncio.run(acquire_all()), 0.15)
+
+
+class RunActionsTest(unittest.TestCase):
+    """Test cases for the concurrent tool, knowledge and agent actions."""
+
+    @staticmethod
+    def sleep_action(seconds: float, result):
+        def action():
+            time.sleep(seconds)
+            return result
+
+        return action
+
+    def test_ordered_concurrent_results(self):
+        actions = [(f'tool_{i}', self.sleep_action(0.2 - i * 0.05, i)) for i in range(4)]
+        start = time.perf_counter()
+        self.assertEqual([0, 1, 2, 3], run_actions(actions))
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_timeout_and_partial_failure(self):
+        def failing_action():
+            raise ValueError('tool failed')
+
+        actions = [('slow_tool', self.sleep_action(1, 'slow')), ('failing_tool', failing_action),
+                   ('fast_tool', self.sleep_action(0, 'fast'))]
+        start = time.perf_counter()
+        self.assertEqual(['fast'], run_actions(actions, timeout=0.2))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        with self.assertRaisesRegex(ValueError, 'tool failed'):
+            run_actions([('failing_tool', failing_action)])
+
+    def test_hung_actions(self):
+        executor = FanOutExecutor()
+        release = threading.Event()
+        max_hung_actions = executor.max_hung_actions
+        executor.max_hung_actions = 2
+        try:
+            for _ in range(2):
+                self.assertEqual(['fast'], run_actions([('hung_tool', release.wait),
+                                                        ('fast_tool', self.sleep_action(0, 'fast'))], timeout=0.05))
+            self.assertEqual(2, executor.hung_action_count())
+            # the hung actions never hold the workers of the shared pool
+            self.assertEqual([0, 1], sorted(executor.map_as_completed(lambda i: i, range(2), concurrency=2)))
+            with self.assertRaises(HungActionsError):
+                run_actions([('fast_tool', self.sleep_action(0, 'fast'))], timeout=0.05)
+        finally:
+            release.set()
+            executor.max_hung_actions = max_hung_actions
+        for _ in range(100):
+            if executor.hung_action_count() == 0:
+                break
+            time.sleep(0.01)
+        self.assertEqual(0, executor.hung_action_count())
+        self.assertEqual(['fast'], run_actions([('fast_tool', self.sleep_action(0, 'fast'))], timeout=0.05))
+
+    def test_context_propagation(self):
+        token = FrameworkContextManager().set_context('test_action_var', 'trace_1')
+        try:
+            actions = [(f'tool_{i}', lambda: FrameworkContextManager().get_context('test_action_var'))
+                       for i in range(2)]
+            self.assertEqual(['trace_1', 'trace_1'], run_actions(actions))
+        finally:
+            FrameworkContextManager().reset_context('test_action_var', token)
+
+    def test_async_run_actions(self):
+        async def sleep_action(seconds: float, result):
+            await asyncio.sleep(seconds)
+            return result
+
+        actions = [('slow_tool', lambda: sleep_action(1, 'slow')), ('tool_1', lambda: sleep_action(0.1, 1)),
+                   ('tool_2', lambda: sleep_action(0.05, 2))]
+        start = time.perf_counter()
+        self.assertEqual([1, 2], asyncio.run(async_run_actions(actions, timeout=0.3)))
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 16:20
+# @FileName: test_http_client_registry.py
+import asyncio
+import unittest
+
+from openai import OpenAI, AsyncOpenAI
+
+from agentuniverse.base.util.http_client_registry import HttpClientRegistry
+from agentuniverse.llm.openai_style_llm import OpenAIStyleLLM
+
+
+class HttpClientRegistryTest(unittest.TestCase):
+    """Test cases for the pooled api client registry."""
+
+    def setUp(self) -> None:
+        self.registry = HttpClientRegistry()
+        self.registry.reset()
+
+    def test_shared_client(self):
+        client = self.registry.get_client(OpenAI, timeout=30, api_key='sk-a', base_url='http://localhost:1/v1')
+        same = self.registry.get_client(OpenAI, timeout=30, api_key='sk-a', base_url='http://localhost:1/v1')
+        other_key = self.registry.get_client(OpenAI, timeout=30, api_key='sk-b', base_url='http://localhost:1/v1')
+        other_timeout = self.registry.get_client(OpenAI, timeout=60, api_key='sk-a',
+                                                 base_url='http://localhost:1/v1')
+        self.assertIs(client, same)
+        self.assertIsNot(client, other_key)
+        self.assertIsNot(client, other_timeout)
+        self.assertEqual(3, self.registry.get_stats()['client_count'])
+        pool = client._client._transport._pool
+        self.assertEqual(self.registry.max_connections, pool._max_connections)
+
+    def test_llm_copies_share_client(self):
+        llm = OpenAIStyleLLM(name='test_registry_llm', model_name='gpt-4o', api_key='sk-a',
+                             api_base='http://localhost:1/v1', request_timeout=30)
+        copied = llm.create_copy()
+        self.assertIs(llm._new_client(), copied._new_client())
+        changed = llm.set_by_agent_model(api_key='sk-b')
+        self.assertIsNot(llm._new_client(), changed._new_client())
+
+    def test_async_client_per_loop(self):
+        async def get_client():
+            return self.registry.get_async_client(AsyncOpenAI, api_key='sk-a', base_url='http://localhost:1/v1')
+
+        async def get_twice():
+            return await get_client(), await get_client()
+
+        first, second = asyncio.run(get_twice())
+        self.assertIs(first, second)
+        other_loop = asyncio.run(get_client())
+        self.assertIsNot(first, other_loop)
+
+    def test_reset(self):
+        client = self.registry.get_client(OpenAI, api_key='sk-a', base_url='http://localhost:1/v1')
+        self.registry.reset()
+        self.assertIsNot(client, self.registry.get_client(OpenAI, api_key='sk-a', base_url='http://localhost:1/v1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 22:55
+# @FileName: test_tokenizer_registry.py
+import unittest
+from unittest import mock
+
+from agentuniverse.base.util.tokenizer_registry import TokenizerRegistry
+from agentuniverse.llm.llm_output import LLMOutput
+from agentuniverse.llm.openai_style_llm import OpenAIStyleLLM
+
+
+class WordEncoding(object):
+    """The encoding splitting the text by the whitespaces."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.encode_calls = 0
+
+    def encode(self, text: str) -> list:
+        self.encode_calls += 1
+        return text.split()
+
+
+class TokenizerRegistryTest(unittest.TestCase):
+    """Test cases for the shared tokenizer registry and the provider usage."""
+
+    def setUp(self) -> None:
+        self.registry = TokenizerRegistry()
+        self.registry.reset()
+        self.cache_size = self.registry.cache_size
+        self.encoding = WordEncoding('word')
+        self.loaded_models = []
+
+        def load_encoding(model_name):
+            self.loaded_models.append(model_name)
+            return self.encoding
+
+        self.patcher = mock.patch.object(self.registry, '_load_encoding', load_encoding)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.registry.cache_size = self.cache_size
+        self.registry.reset()
+
+    def test_encoding_loaded_once(self):
+        llm = OpenAIStyleLLM(name='test_tokenizer_llm', model_name='gpt-4o', api_key='sk-a',
+                             api_base='http://localhost:1/v1')
+        for _ in range(3):
+            self.assertEqual(3, llm.get_num_tokens('how are you'))
+            self.assertEqual(2, llm.create_copy().get_num_tokens('hello world'))
+        self.assertEqual(['gpt-4o'], self.loaded_models)
+        # the repeated texts are counted from the cache
+        self.assertEqual(2, self.encoding.encode_calls)
+        self.assertEqual(4, self.registry.get_stats()['hits'])
+
+    def test_prewarm(self):
+        self.registry.prewarm(['gpt-4o', None]).join(timeout=1)
+        self.assertEqual(['gpt-4o', 'cl100k_base'], self.registry.get_stats()['encodings'])
+
+    def test_bounded_cache(self):
+        self.registry.cache_size = 2
+        for text in ['a', 'b', 'a', 'c', 'b']:
+            self.registry.count_tokens(text)
+        # b was evicted by c as the least recently used
+        self.assertEqual(4, self.encoding.encode_calls)
+        self.assertEqual(2, self.registry.get_stats()['cached_counts'])
+
+    def test_provider_usage(self):
+        output = LLMOutput(text='hi', raw={'usage': {'prompt_tokens': 10, 'completion_tokens': 2,
+                                                     'total_tokens': 12}})
+        self.assertEqual({'prompt_tokens': 10, 'completion_tokens': 2, 'total_tokens': 12}, output.get_usage())
+        output = LLMOutput(text='hi', raw={'usage': {'input_tokens': 10, 'output_tokens': 2}})
+        self.assertEqual(12, output.get_usage()['total_tokens'])
+        self.assertIsNone(LLMOutput(text='hi', raw={'choices': []}).get_usage())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 15:20
+# @FileName: test_stream_parse_benchmark.py
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from langchain_community.chat_models import openai as langchain_openai
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from openai.types.chat import ChatCompletionChunk
+
+from agentuniverse.agent.memory.message import Message
+from agentuniverse.llm.langchain_instance import LangchainOpenAI
+from agentuniverse.llm.llm_channel.llm_channel import LLMChannel
+from agentuniverse.llm.llm_output import LLMOutput, to_raw_dict
+from agentuniverse.llm.openai_llm import OpenAILLM
+from agentuniverse.llm import openai_style_langchain_instance
+from agentuniverse.llm.openai_style_langchain_instance import LangchainOpenAIStyleInstance
+from agentuniverse.llm.openai_style_llm import OpenAIStyleLLM
+
+CHUNK_COUNT = 2000
+
+
+def build_chunks(count: int):
+    chunks = []
+    for i in range(count):
+        chunks.append(ChatCompletionChunk.model_validate({
+            'id': 'chatcmpl-benchmark',
+            'object': 'chat.completion.chunk',
+            'created': 1700000000,
+            'model': 'gpt-4o',
+            'choices': [{
+                'index': 0,
+                'delta': {'role': 'assistant' if i == 0 else None, 'content': f'token{i} '},
+                'finish_reason': None
+            }]
+        }))
+    chunks.append(ChatCompletionChunk.model_validate({
+        'id': 'chatcmpl-benchmark', 'object': 'chat.completion.chunk', 'created': 1700000000,
+        'model': 'gpt-4o', 'choices': []
+    }))
+    return chunks
+
+
+def build_tail_chunks():
+    """The tool call and the finish chunks ending a stream."""
+    return [ChatCompletionChunk.model_validate({
+        'id': 'chatcmpl-benchmark', 'object': 'chat.completion.chunk', 'created': 1700000000, 'model': 'gpt-4o',
+        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+    }) for delta, finish_reason in [
+        ({'tool_calls': [{'index': 0, 'id': 'call_1', 'type': 'function',
+                          'function': {'name': 'search', 'arguments': '{"q": 1}'}}]}, None),
+        ({'content': 'done', 'reasoning_content': 'because'}, None),
+        ({}, 'stop')
+    ]]
+
+
+def legacy_langchain_chunks(stream, convert_delta):
+    """The langchain chunk path before the streaming fast path, serializing every chunk."""
+    default_chunk_class = AIMessageChunk
+    for llm_result in stream:
+        chunk = llm_result.raw
+        if not isinstance(chunk, dict):
+            chunk = chunk.dict()
+        if len(chunk["choices"]) == 0:
+            continue
+        choice = chunk["choices"][0]
+        chunk = convert_delta(choice["delta"], default_chunk_class)
+        finish_reason = choice.get("finish_reason")
+        generation_info = dict(finish_reason=finish_reason) if finish_reason is not None else None
+        default_chunk_class = chunk.__class__
+        yield ChatGenerationChunk(message=chunk, generation_info=generation_info)
+
+
+def legacy_parse_result(chunk):
+    """The per chunk parsing before the streaming fast path, serializing every chunk twice."""
+    chat_completion = chunk
+    chunk = chunk.dict()
+    if len(chunk["choices"]) == 0:
+        return
+    message = chunk["choices"][0].get("delta")
+    text = message.get("content") or ""
+    return LLMOutput(text=text, raw=chat_completion.model_dump(),
+                     message=Message(content=text, type=message.get("role")))
+
+
+class StreamParseBenchmarkTest(unittest.TestCase):
+    """Micro-benchmark of the per token parsing of the llm streams, run with `-s` to see the throughput."""
+
+    def setUp(self) -> None:
+        self.chunks = build_chunks(CHUNK_COUNT)
+
+    @staticmethod
+    def _run(parse, chunks):
+        start = time.perf_counter()
+        outputs = [parse(chunk) for chunk in chunks]
+        return outputs, time.perf_counter() - start
+
+    def test_outputs_equivalent(self):
+        legacy_outputs, _ = self._run(legacy_parse_result, self.chunks)
+        for parse in (OpenAIStyleLLM.parse_result, LLMChannel.parse_result):
+            outputs, _ = self._run(parse, self.chunks)
+            self.assertIsNone(outputs[-1])
+            for legacy, output in zip(legacy_outputs[:-1], outputs[:-1]):
+                self.assertEqual(legacy.text, output.text)
+                self.assertEqual(legacy.raw, output.raw_dict())
+        channel_outputs, _ = self._run(LLMChannel.parse_result, self.chunks)
+        self.assertEqual('assistant', channel_outputs[0].message.type)
+        self.assertEqual(legacy_outputs[1].message.content, channel_outputs[1].message.content)
+        self.assertEqual(legacy_outputs[0].text, OpenAILLM.parse_result(self.chunks[0]).text)
+        self.assertEqual({'a': 1}, to_raw_dict({'a': 1}))
+
+    def test_dict_chunk(self):
+        output = OpenAIStyleLLM.parse_result({'choices': [{'delta': {'content': 'hi', 'role': 'assistant'}}]})
+        self.assertEqual('hi', output.text)
+        self.assertIsNone(OpenAIStyleLLM.parse_result({'choices': []}))
+
+    def test_langchain_chunks(self):
+        chunks = self.chunks + build_tail_chunks()
+
+        def outputs():
+            return [LLMOutput(text='', raw=chunk) for chunk in chunks]
+
+        # the chunks are read without being serialized
+        with mock.patch.object(ChatCompletionChunk, 'dict', side_effect=AssertionError), \
+                mock.patch.object(ChatCompletionChunk, 'model_dump', side_effect=AssertionError):
+            style_chunks = [(chunk.message, chunk.generation_info)
+                            for chunk in LangchainOpenAIStyleInstance.as_langchain_chunk(outputs())]
+            openai_chunks = [(chunk.message, chunk.generation_info)
+                             for chunk in LangchainOpenAI.as_langchain_chunk(outputs())]
+
+            async def collect():
+                return [(chunk.message, chunk.generation_info) async for chunk in
+                        LangchainOpenAIStyleInstance.as_langchain_achunk(self._aiter(outputs()))]
+
+            style_achunks = asyncio.run(collect())
+        legacy = [(chunk.message, chunk.generation_info) for chunk in legacy_langchain_chunks(
+            outputs(), openai_style_langchain_instance._convert_delta_to_message_chunk)]
+        self.assertEqual(legacy, style_chunks)
+        self.assertEqual(legacy, style_achunks)
+        self.assertEqual([(chunk.message, chunk.generation_info) for chunk in legacy_langchain_chunks(
+            outputs(), langchain_openai._convert_delta_to_message_chunk)], openai_chunks)
+        self.assertEqual('search', legacy[-3][0].additional_kwargs['tool_calls'][0]['function']['name'])
+        self.assertEqual('because', legacy[-2][0].additional_kwargs['reasoning_content'])
+        self.assertEqual({'finish_reason': 'stop'}, legacy[-1][1])
+
+    @staticmethod
+    async def _aiter(items):
+        for item in items:
+            yield item
+
+    def _best_time(self, parse, rounds: int = 5):
+        return min(self._run(parse, self.chunks)[1] for _ in range(rounds))
+
+    def test_throughput(self):
+        legacy_time = self._best_time(legacy_parse_result)
+        channel_time = self._best_time(LLMChannel.parse_result)
+        style_time = self._best_time(OpenAIStyleLLM.parse_result)
+        print(f"stream parse throughput per worker, legacy: {CHUNK_COUNT / legacy_time:.0f} chunks/s, "
+              f"llm channel: {CHUNK_COUNT / channel_time:.0f} chunks/s, "
+              f"openai style: {CHUNK_COUNT / style_time:.0f} chunks/s")
+        self.assertLess(channel_time, legacy_time)
+        self.assertLess(style_time, legacy_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
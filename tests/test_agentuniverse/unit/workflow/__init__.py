@@ -0,0 +1,5 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:00
+# @FileName: __init__.py
@@ -0,0 +1,113 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+# @Time    : 2026/10/18 21:00
+# @FileName: test_graph.py
+import asyncio
+import time
+import unittest
+from typing import Optional
+
+from agentuniverse.workflow.graph.graph import Graph
+from agentuniverse.workflow.node.enum import NodeEnum, NodeStatusEnum
+from agentuniverse.workflow.node.node import Node
+from agentuniverse.workflow.node.node_output import NodeOutput
+from agentuniverse.workflow.workflow_output import WorkflowOutput
+
+
+class SleepNode(Node):
+    """A node waiting on io for `sleep` seconds."""
+
+    sleep: float = 0
+    handler: Optional[str] = None
+    fail: bool = False
+
+    def _run(self, workflow_output: WorkflowOutput) -> NodeOutput:
+        time.sleep(self.sleep)
+        if self.fail:
+            raise ValueError(f'{self.id} failed')
+        return NodeOutput(node_id=self.id, status=NodeStatusEnum.SUCCEEDED, edge_source_handler=self.handler)
+
+
+def build_graph(nodes: dict, edges: list) -> Graph:
+    graph = Graph()
+    for node_id, node in nodes.items():
+        node.id = node_id
+        graph.add_node(node_id, instance=node, type=node.type.value)
+    for edge in edges:
+        graph.add_edge(edge[0], edge[1], source_handler=edge[2] if len(edge) > 2 else None)
+    return graph
+
+
+def fan_out_graph() -> Graph:
+    # start -> knowledge, tool -> llm -> end
+    return build_graph({
+        'start': SleepNode(type=NodeEnum.START),
+        'knowledge': SleepNode(type=NodeEnum.KNOWLEDGE, sleep=0.3),
+        'tool': SleepNode(type=NodeEnum.TOOL, sleep=0.2),
+        'llm': SleepNode(type=NodeEnum.LLM, sleep=0.1),
+        'end': SleepNode(type=NodeEnum.END),
+    }, [('start', 'knowledge'), ('start', 'tool'), ('knowledge', 'llm'), ('tool', 'llm'), ('llm', 'end')])
+
+
+def condition_graph() -> Graph:
+    return build_graph({
+        'start': SleepNode(type=NodeEnum.START),
+        'condition': SleepNode(type=NodeEnum.CONDITION, handler='branch-default'),
+        'yes': SleepNode(type=NodeEnum.LLM),
+        'yes_next': SleepNode(type=NodeEnum.TOOL),
+        'no': SleepNode(type=NodeEnum.TOOL),
+        'end': SleepNode(type=NodeEnum.END),
+    }, [('start', 'condition'), ('condition', 'yes', 'branch-yes'), ('condition', 'no', 'branch-default'),
+        ('yes', 'yes_next'), ('yes_next', 'end'), ('no', 'end')])
+
+
+class GraphTest(unittest.TestCase):
+    """Test cases for the dependency driven scheduling of the workflow graph."""
+
+    def _check_fan_out(self, workflow_output: WorkflowOutput, elapsed: float):
+        self.assertEqual({'start', 'knowledge', 'tool', 'llm', 'end'}, set(workflow_output.workflow_node_results))
+        # the knowledge and the tool branches overlap instead of running one after another
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(['start', 'knowledge', 'llm', 'end'], workflow_output.workflow_critical_path)
+        self.assertAlmostEqual(0.4, workflow_output.workflow_critical_path_latency, delta=0.1)
+        self.assertAlmostEqual(0.2, workflow_output.workflow_node_wall_times['tool'], delta=0.1)
+
+    def test_parallel_branches(self):
+        workflow_output = WorkflowOutput(workflow_id='test')
+        start = time.perf_counter()
+        fan_out_graph().run(workflow_output)
+        self._check_fan_out(workflow_output, time.perf_counter() - start)
+
+    def test_async_parallel_branches(self):
+        workflow_output = WorkflowOutput(workflow_id='test')
+        start = time.perf_counter()
+        asyncio.run(fan_out_graph().async_run(workflow_output))
+        self._check_fan_out(workflow_output, time.perf_counter() - start)
+
+    def test_condition_pruning(self):
+        for run in (lambda g, o: g.run(o), lambda g, o: asyncio.run(g.async_run(o))):
+            workflow_output = WorkflowOutput(workflow_id='test')
+            run(condition_graph(), workflow_output)
+            self.assertEqual({'start', 'condition', 'no', 'end'}, set(workflow_output.workflow_node_results))
+
+    def test_max_concurrency(self):
+        graph = build_graph({'start': SleepNode(type=NodeEnum.START), 'end': SleepNode(type=NodeEnum.END),
+                             **{f'tool{i}': SleepNode(type=NodeEnum.TOOL, sleep=0.1) for i in range(4)}},
+                            [('start', f'tool{i}') for i in range(4)] + [(f'tool{i}', 'end') for i in range(4)])
+        graph.max_concurrency = 2
+        start = time.perf_counter()
+        graph.run(WorkflowOutput(workflow_id='test'))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+    def test_node_failure(self):
+        graph = fan_out_graph()
+        graph.nodes['tool']['instance'].fail = True
+        workflow_output = WorkflowOutput(workflow_id='test')
+        with self.assertRaisesRegex(ValueError, 'tool failed'):
+            graph.run(workflow_output)
+        self.assertNotIn('llm', workflow_output.workflow_node_results)
+
+
+if __name__ == '__main__':
+    unittest.main()